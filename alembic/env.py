@@ -16,13 +16,17 @@ from sqlalchemy import engine_from_config, pool
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # 모델 import (여기에 프로젝트 내 모든 Base import)
-from src.repository.models.base import Base
-from src.repository.models.index_table import Index
-from src.repository.models.price_table import Price
-from src.repository.models.user_table import User
-from src.repository.models.account_table import Account
-from src.repository.models.order_table import Order
-from src.repository.models.profit_table import Profit
+from app.trifin.data.repository.models.base import Base
+from app.trifin.data.repository.models.index_table import Index
+from app.trifin.data.repository.models.price_table import Price
+from app.trifin.data.repository.models.user_table import User
+from app.trifin.data.repository.models.account_table import Account
+from app.trifin.data.repository.models.order_table import Order
+from app.trifin.data.repository.models.profit_table import Profit
+from app.trifin.data.repository.models.pnl_snapshot_table import PnlSnapshot
+from app.trifin.data.repository.models.position_snapshot_table import PositionSnapshot
+from app.trifin.data.repository.models.job_lock_table import JobLock
+from app.trifin.data.repository.models.job_run_table import JobRun
 
 load_dotenv()
 
@@ -0,0 +1,60 @@
+"""create pnl snapshot tables
+
+Revision ID: 7b2d4f1a9c3e
+Revises: 3e3292521012
+Create Date: 2025-06-16 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d4f1a9c3e'
+down_revision: Union[str, None] = '3e3292521012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 금액/수량은 MySQL DOUBLE (FLOAT는 단정밀도라 pnl_snapshot 증분 갱신의 상태 복원 시 오차 누적)
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pnl_snapshot',
+    sa.Column('account_id', sa.BigInteger(), nullable=False, comment='계좌 ID'),
+    sa.Column('date', sa.Date(), nullable=False, comment='스냅샷 기준 일자'),
+    sa.Column('user_id', sa.BigInteger(), nullable=False, comment='유저 ID'),
+    sa.Column('cash', sa.Float(precision=53), nullable=False, comment='현금'),
+    sa.Column('total_deposit', sa.Float(precision=53), nullable=False, comment='누적 입금액'),
+    sa.Column('realized_pnl', sa.Float(precision=53), nullable=False, comment='누적 실현손익'),
+    sa.Column('cost_basis', sa.Float(precision=53), nullable=False, comment='보유 종목 취득원가 합계'),
+    sa.Column('market_value', sa.Float(precision=53), nullable=False, comment='보유 종목 평가액 합계'),
+    sa.Column('unrealized_pnl', sa.Float(precision=53), nullable=False, comment='평가손익'),
+    sa.Column('total_pnl', sa.Float(precision=53), nullable=False, comment='총손익'),
+    sa.Column('profit', sa.Float(precision=53), nullable=False, comment='수익률(%)'),
+    sa.Column('last_order_id', sa.BigInteger(), nullable=True, comment='반영된 최대 주문 ID'),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'date')
+    )
+    op.create_index('ix_pnl_snapshot_user_id_date', 'pnl_snapshot', ['user_id', 'date'], unique=False)
+    op.create_table('position_snapshot',
+    sa.Column('account_id', sa.BigInteger(), nullable=False, comment='계좌 ID'),
+    sa.Column('date', sa.Date(), nullable=False, comment='스냅샷 기준 일자'),
+    sa.Column('symbol', sa.String(length=50), nullable=False, comment='종목 심볼'),
+    sa.Column('unit', sa.Enum('KRW', 'USD', name='unitenum'), nullable=False, comment='화폐 단위 (KRW, USD)'),
+    sa.Column('size', sa.Float(precision=53), nullable=False, comment='보유 수량'),
+    sa.Column('cost_basis', sa.Float(precision=53), nullable=False, comment='취득원가 (원화)'),
+    sa.Column('close', sa.Float(precision=53), nullable=True, comment='기준 일자 종가'),
+    sa.Column('market_value', sa.Float(precision=53), nullable=False, comment='평가액 (원화)'),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'date', 'symbol')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('position_snapshot')
+    op.drop_index('ix_pnl_snapshot_user_id_date', table_name='pnl_snapshot')
+    op.drop_table('pnl_snapshot')
@@ -0,0 +1,51 @@
+"""create job lock and job run tables
+
+Revision ID: 9c1e5a7d2b46
+Revises: 7b2d4f1a9c3e
+Create Date: 2025-06-18 09:41:07.512836
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e5a7d2b46'
+down_revision: Union[str, None] = '7b2d4f1a9c3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_lock',
+    sa.Column('name', sa.String(length=50), nullable=False, comment='작업 이름'),
+    sa.Column('owner', sa.String(length=100), nullable=True, comment='잠금 보유자'),
+    sa.Column('locked_until', sa.DateTime(), nullable=False, comment='잠금 만료 시각 (UTC)'),
+    sa.Column('acquired_at', sa.DateTime(), nullable=True, comment='잠금 획득 시각 (UTC)'),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('job_run',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False, comment='고유 식별자'),
+    sa.Column('job_name', sa.String(length=50), nullable=False, comment='작업 이름'),
+    sa.Column('scheduled_at', sa.DateTime(), nullable=False, comment='예정 실행 시각 (UTC)'),
+    sa.Column('attempt', sa.Integer(), nullable=False, comment='시도 횟수'),
+    sa.Column('owner', sa.String(length=100), nullable=True, comment='실행 스케줄러'),
+    sa.Column('status', sa.Enum('running', 'success', 'failed', name='jobrunstatusenum'), nullable=False, comment='실행 상태 (running, success, failed)'),
+    sa.Column('started_at', sa.DateTime(), nullable=False, comment='시작 시각 (UTC)'),
+    sa.Column('finished_at', sa.DateTime(), nullable=True, comment='종료 시각 (UTC)'),
+    sa.Column('duration_seconds', sa.Float(), nullable=True, comment='소요 시간(초)'),
+    sa.Column('rows', sa.Integer(), nullable=True, comment='저장 건수'),
+    sa.Column('error', sa.Text(), nullable=True, comment='오류 메시지'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_run_job_name_scheduled_at', 'job_run', ['job_name', 'scheduled_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_run_job_name_scheduled_at', table_name='job_run')
+    op.drop_table('job_run')
+    op.drop_table('job_lock')
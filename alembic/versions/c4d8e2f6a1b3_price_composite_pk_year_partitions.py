@@ -0,0 +1,75 @@
+"""price composite primary key and yearly range partitions
+
+Revision ID: c4d8e2f6a1b3
+Revises: 9c1e5a7d2b46
+Create Date: 2025-06-19 10:12:44.301958
+
+price 테이블의 클러스터드 인덱스를 (symbol, timestamp)로 바꾸고 연도별 RANGE 파티션을 적용합니다. (MySQL 전용)
+
+- 기존: id 기본키(적재 순서 = 날짜 순) → 한 종목의 기간 조회가 날짜마다 다른 페이지를 읽음
+- 변경: (symbol, timestamp) 기본키 → 한 종목의 기간 조회가 연속된 페이지 범위 스캔
+    - uq_symbol_timestamp(기본키와 중복), ix_price_timestamp(단독 timestamp 조회 없음) 제거
+    - 파티션 테이블의 모든 유니크 키는 파티션 컬럼(timestamp)을 포함해야 하므로 id는 일반 인덱스(ix_price_id)로 유지
+- 파티션: p_old(~1999), p2000 ~ p{LAST_YEAR}, p_max(MAXVALUE)
+    - 연도 조건이 있는 조회는 해당 파티션만 읽고(pruning), 신규 적재는 마지막 파티션에만 추가됨
+    - LAST_YEAR 이후 데이터는 p_max에 쌓이므로 그 전에 분할:
+        ALTER TABLE price REORGANIZE PARTITION p_max INTO (
+            PARTITION p2036 VALUES LESS THAN (2037), PARTITION p_max VALUES LESS THAN MAXVALUE);
+- 대용량 테이블에서는 테이블 재작성이 발생하므로 점검 시간에 실행 (pt-online-schema-change 등으로 대체 가능)
+- MySQL이 아닌 DB(SQLite 개발 DB 등)에서는 아무것도 하지 않음
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f6a1b3'
+down_revision: Union[str, None] = '9c1e5a7d2b46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FIRST_YEAR = 2000
+LAST_YEAR = 2035
+
+
+def _partitions_sql() -> str:
+    partitions = [f"PARTITION p_old VALUES LESS THAN ({FIRST_YEAR})"]
+    partitions += [f"PARTITION p{year} VALUES LESS THAN ({year + 1})" for year in range(FIRST_YEAR, LAST_YEAR + 1)]
+    partitions.append("PARTITION p_max VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (YEAR(`timestamp`)) (\n    " + ",\n    ".join(partitions) + "\n)"
+
+
+def _is_mysql() -> bool:
+    return op.get_bind().dialect.name == 'mysql'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _is_mysql():
+        return
+    op.execute(
+        "ALTER TABLE price "
+        "MODIFY id BIGINT NOT NULL AUTO_INCREMENT COMMENT '고유 식별자', "
+        "DROP PRIMARY KEY, "
+        "ADD PRIMARY KEY (symbol, `timestamp`), "
+        "ADD KEY ix_price_id (id), "
+        "DROP INDEX uq_symbol_timestamp, "
+        "DROP INDEX ix_price_timestamp"
+    )
+    op.execute("ALTER TABLE price " + _partitions_sql())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_mysql():
+        return
+    op.execute("ALTER TABLE price REMOVE PARTITIONING")
+    op.execute(
+        "ALTER TABLE price "
+        "DROP PRIMARY KEY, "
+        "ADD PRIMARY KEY (id), "
+        "DROP INDEX ix_price_id, "
+        "ADD UNIQUE KEY uq_symbol_timestamp (symbol, `timestamp`), "
+        "ADD KEY ix_price_timestamp (`timestamp`)"
+    )
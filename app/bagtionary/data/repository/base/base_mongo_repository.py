@@ -2,49 +2,72 @@ from typing import Optional
 
 from motor.motor_asyncio import AsyncIOMotorCollection
 
-from core.db.mongo import mongo
+from core.common.metrics import tag_methods
+from core.db.mongo import ReadRoute, mongo
 from core.util.log_util import logger
 
 
 class DefaultMongoRepository:
-    collection: Optional[AsyncIOMotorCollection] = None
 
     def __init__(self, collection):
-        self.collection = mongo.db[collection]
+        # 컬렉션은 사용 시점에 조회 (앱 시작 전 생성된 인스턴스도 연결 후 동작)
+        self.collection_name = collection
+
+    @property
+    def collection(self) -> Optional[AsyncIOMotorCollection]:
+        """primary 경로 (상세 조회, 쓰기)"""
+        return mongo.collection(self.collection_name)
+
+    def routed_collection(self, route: ReadRoute) -> Optional[AsyncIOMotorCollection]:
+        """
+        조회 경로별 컬렉션 (core.db.mongo.ReadRoute)
+        - listing: 목록/홈 조회, 약간 지연된 세컨더리 데이터 허용
+        - analytics: 전체 문서를 훑는 무거운 집계, analytics 태그 노드 우선
+        """
+        return mongo.collection(self.collection_name, route)
+
+    def __init_subclass__(cls, **kwargs):
+        # 하위 리포지토리 메서드의 Mongo 명령을 ClassName.method 라벨로 계측
+        super().__init_subclass__(**kwargs)
+        tag_methods(cls)
 
     async def is_empty(self) -> bool:
         return await self.count() <= 0
 
-    async def count(self, filter: Optional[dict] = None, default=None) -> Optional[int]:
-        if self.collection is not None:
-            return await self.collection.count_documents(filter)
+    async def count(self, filter: Optional[dict] = None, default=None, route: ReadRoute = ReadRoute.primary) -> Optional[int]:
+        collection = self.routed_collection(route)
+        if collection is not None:
+            return await collection.count_documents(filter)
         return default
 
     async def paged_select(self, filter: Optional[dict] = None, projection: Optional[dict] = None, page: int = 0, size: int = 0,
-                           sort: Optional[dict] = None) -> list:
-        if self.collection is not None:
+                           sort: Optional[dict] = None, route: ReadRoute = ReadRoute.primary) -> list:
+        collection = self.routed_collection(route)
+        if collection is not None:
             # self.collection.find(filter=filter, projection=projection).skip(skip).limit(limit).sort(sort).to_list(limit)
             skip = page * size if page is not None and size is not None else 0
             limit = size if size is not None else 0
-            cursor = self.collection.find(filter=filter, projection=projection, sort=sort, skip=skip, limit=limit)
+            cursor = collection.find(filter=filter, projection=projection, sort=sort, skip=skip, limit=limit)
             return await cursor.to_list(None)
         else:
             logger.w("collection is None")
         return []
 
     async def select(self, filter: Optional[dict] = None, projection: Optional[dict] = None, limit: int = 0, skip: int = 0,
-                     sort: Optional[dict] = None) -> list:
-        if self.collection is not None:
+                     sort: Optional[dict] = None, route: ReadRoute = ReadRoute.primary) -> list:
+        collection = self.routed_collection(route)
+        if collection is not None:
             # self.collection.find(filter=filter, projection=projection).skip(skip).limit(limit).sort(sort).to_list(limit)
-            cursor = self.collection.find(filter=filter, projection=projection, sort=sort, skip=skip, limit=limit)
+            cursor = collection.find(filter=filter, projection=projection, sort=sort, skip=skip, limit=limit)
             return await cursor.to_list(None)
         else:
             logger.w("collection is None")
         return []
 
-    async def aggregate(self, pipeline: list) -> list:
-        if self.collection is not None:
-            return await self.collection.aggregate(pipeline).to_list(None)
+    async def aggregate(self, pipeline: list, route: ReadRoute = ReadRoute.primary) -> list:
+        collection = self.routed_collection(route)
+        if collection is not None:
+            return await collection.aggregate(pipeline).to_list(None)
         return []
 
     async def insert(self, obj: dict = ()):
@@ -74,5 +97,8 @@ class DefaultMongoRepository:
             logger.d(f'deleted {result.deleted_count}')
 
 
+tag_methods(DefaultMongoRepository)
+
+
 def get_repository(collection: str) -> DefaultMongoRepository:
     return DefaultMongoRepository(collection)
@@ -3,6 +3,7 @@ from typing import Optional
 
 from app.bagtionary.data.repository.base.base_mongo_repository import DefaultMongoRepository
 from app.bagtionary.domain.product.product_model import FilterOptions, GetProductListVO
+from core.db.mongo import ReadRoute
 from core.util.constants import MAX_SIZE
 from core.util.log_util import logger
 
@@ -61,7 +62,7 @@ class ProductRepository(DefaultMongoRepository):
         return await self.find_products(query, sort_condition, page, size)
 
     async def find_products(self, query: dict, sort: dict, page: Optional[int], size: Optional[int]) -> GetProductListVO:
-        count = await self.count(filter=query, default=0)
+        count = await self.count(filter=query, default=0, route=ReadRoute.listing)
 
         brand_list = await self.aggregate(
             pipeline=[
@@ -71,13 +72,15 @@ class ProductRepository(DefaultMongoRepository):
                     "brand": "$_id",
                     "_id": 0
                 }}
-            ]
+            ],
+            # 조건에 맞는 전체 문서를 훑는 집계 → analytics 노드
+            route=ReadRoute.analytics
         )
         brands = list(map(lambda x: x['brand'], brand_list))
 
         logger.d(f"query option: {query} {sort} {page} {size}")
 
-        products = await self.paged_select(filter=query, sort=sort, page=page, size=size)
+        products = await self.paged_select(filter=query, sort=sort, page=page, size=size, route=ReadRoute.listing)
         divided = size if size is not None else len(products)
         last_page = int(ceil((count / divided)) - 1)
 
@@ -87,3 +90,17 @@ class ProductRepository(DefaultMongoRepository):
         # logger.debug(f"res: {res}")
 
         return GetProductListVO(**res)
+
+    async def find_catalogue_documents(self, projection: dict, route: ReadRoute = ReadRoute.analytics) -> list:
+        # 홈 카탈로그 스냅샷 생성용 전체 조회 (필요한 필드만) → 기본 analytics 노드, 변경 직후에는 primary
+        return await self.select(filter={}, projection=projection, route=route)
+
+    async def find_modified_since(self, since: int, limit: int) -> list:
+        # 변경 감지 폴링용 (change stream 미지원 시), lastModifiedDate 오름차순
+        return await self.select(filter={"lastModifiedDate": {"$gte": since}},
+                                 projection={"_id": 0, "rawId": 1, "brand": 1, "lastModifiedDate": 1},
+                                 sort={"lastModifiedDate": 1}, limit=limit)
+
+    async def find_last_modified_date(self) -> Optional[int]:
+        latest = await self.select(projection={"_id": 0, "lastModifiedDate": 1}, sort={"lastModifiedDate": -1}, limit=1)
+        return latest[0].get("lastModifiedDate") if latest else None
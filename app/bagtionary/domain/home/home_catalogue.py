@@ -0,0 +1,287 @@
+"""
+home_catalogue.py
+
+홈 화면용 국가별 상품 카탈로그 스냅샷 (프로세스 메모리, 워커별)
+
+- 홈 카테고리(최근 출시, 가격 변동, 가격대, 데님)에 필요한 필드만 읽어 썸네일 레코드로 보관
+- 국가별로 미리 정렬한 인덱스 (HomeService의 Mongo 쿼리와 같은 조건/정렬)
+    - latest: launchedDate 내림차순, rawId 내림차순 → 기준 시각 이후 구간을 이분 탐색
+    - price_changed: 가격 이력 중 0보다 큰 값이 2개 이상, latestPrice.timestamp 내림차순, rawId 내림차순
+    - by_price: latestPrice.value 오름차순, rawId 내림차순 → 가격대 구간을 이분 탐색
+    - denim[language]: desc.{language}.description에 "데님" 포함, launchedDate 내림차순, rawId 내림차순
+- 요청 처리: 페이지 구간만 GetProductListVO로 변환 (브랜드 목록은 구간별로 한 번 계산 후 재사용)
+- 갱신: 백그라운드 태스크가 refresh_seconds마다 (또는 request_refresh() 호출 시) 다시 읽고 별도 스레드에서 생성 후 교체
+    - 생성 전이거나 설정되지 않은 국가/언어는 None → HomeService가 Mongo 쿼리로 처리
+    - 변경 감지(request_refresh) 후 settle_seconds(세컨더리 maxStaleness) 동안은 primary에서 읽음
+    - 변경 반영 스냅샷으로 교체하면 홈 응답 캐시(scope "home") 무효화
+        - 교체 전 구 스냅샷으로 만든 응답이 긴 ttl로 남지 않도록
+- 설정 (.env)
+    - HOME_CATALOGUE_ENABLED: 1/0 (기본 1)
+    - HOME_CATALOGUE_REFRESH_SECONDS: 주기 갱신 간격 (기본 300)
+    - HOME_CATALOGUE_MIN_INTERVAL_SECONDS: 연속 갱신 최소 간격 (기본 10)
+    - HOME_CATALOGUE_COUNTRIES, HOME_CATALOGUE_LANGUAGES: 스냅샷 대상 (기본 KR,US / KO,EN)
+    - MONGO_MAX_STALENESS_SECONDS: 변경 후 primary 조회 유지 시간 (기본 90)
+- 작성일: 2025-06-20
+"""
+
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from math import ceil
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.bagtionary.domain.product.product_model import GetProductListVO
+from core.common.http_cache import RESULT_CACHE, ResultCache
+from core.db.mongo import ReadRoute
+from core.util.log_util import logger
+from core.util.op_util import safe_dict_value
+
+DENIM_KEYWORD = "데님"
+
+
+class CatalogueItem(NamedTuple):
+    """국가별 썸네일 레코드 (ThumbnailProductVO.create 입력 형태로 변환)"""
+    raw_id: str
+    image_url: Optional[str]
+    brand: Optional[str]
+    names: Dict[str, str]
+    display: Optional[str]
+    launched: Optional[int]
+
+    def to_document(self, country: str) -> dict:
+        sale = {}
+        if self.display is not None:
+            sale["latestPrice"] = {"display": self.display}
+        if self.launched is not None:
+            sale["launchedDate"] = self.launched
+        return {
+            "rawId": self.raw_id,
+            "imageUrl": self.image_url,
+            "brand": self.brand,
+            "desc": {language: {"name": name} for language, name in self.names.items()},
+            "sales": {country: sale},
+        }
+
+
+def _page(items: Sequence[CatalogueItem], start: int, end: int, page: Optional[int], size: Optional[int],
+          country: str, brands: List[str]) -> GetProductListVO:
+    """find_products와 같은 페이지/last_page 계산 (size 0 또는 None이면 전체)"""
+    count = end - start
+    skip = start + (page * size if page is not None and size else 0)
+    stop = min(skip + size, end) if size else end
+    last_page = int(ceil(count / size)) - 1 if size else 0
+    return GetProductListVO(products=[item.to_document(country) for item in items[skip:stop]], total_count=count,
+                            last_page=last_page, brands=brands)
+
+
+class CountryCatalogue:
+    def __init__(self, country: str, languages: Sequence[str], rows: List[tuple]):
+        """
+        Args:
+            rows: [(CatalogueItem, 최근 가격, 최근 가격 시각, 가격 변동 여부, 데님 언어 set)]
+        """
+        self.country = country
+        self._brands: Dict[Tuple[str, int, int], List[str]] = {}
+
+        def newest_first(row) -> tuple:
+            item = row[0]
+            return item.launched is not None, item.launched or 0, item.raw_id
+
+        self.latest = [row[0] for row in sorted((r for r in rows if r[0].launched is not None), key=newest_first, reverse=True)]
+        self._latest_keys = [-item.launched for item in self.latest]
+
+        changed = sorted((r for r in rows if r[3]), key=lambda r: (r[2] is not None, r[2] or 0, r[0].raw_id), reverse=True)
+        self.price_changed = [row[0] for row in changed]
+
+        priced = sorted((r for r in rows if r[1] is not None), key=lambda r: r[0].raw_id, reverse=True)
+        priced.sort(key=lambda r: r[1])
+        self.by_price = [row[0] for row in priced]
+        self._price_values = [row[1] for row in priced]
+
+        self.denim = {language: [row[0] for row in sorted((r for r in rows if language in r[4]), key=newest_first, reverse=True)]
+                      for language in languages}
+
+    def _select(self, name: str, items: Sequence[CatalogueItem], start: int, end: int, page: Optional[int],
+                size: Optional[int]) -> GetProductListVO:
+        key = (name, start, end)
+        brands = self._brands.get(key)
+        if brands is None:
+            brands = self._brands[key] = sorted({item.brand for item in items[start:end] if item.brand is not None})
+        return _page(items, start, end, page, size, self.country, brands)
+
+    def latest_added(self, since_ms: int, page: Optional[int], size: Optional[int]) -> GetProductListVO:
+        """launchedDate > since_ms"""
+        return self._select("latest", self.latest, 0, bisect_left(self._latest_keys, -since_ms), page, size)
+
+    def price_changed_products(self, page: Optional[int], size: Optional[int]) -> GetProductListVO:
+        return self._select("price_changed", self.price_changed, 0, len(self.price_changed), page, size)
+
+    def price_band(self, min_price: int, max_price: Optional[int], page: Optional[int], size: Optional[int]) -> GetProductListVO:
+        """min_price <= latestPrice.value < max_price"""
+        start = bisect_left(self._price_values, min_price)
+        end = bisect_left(self._price_values, max_price) if max_price is not None else len(self._price_values)
+        return self._select("price_band", self.by_price, start, max(start, end), page, size)
+
+    def denim_products(self, language: str, page: Optional[int], size: Optional[int]) -> GetProductListVO:
+        items = self.denim.get(language, [])
+        return self._select(f"denim.{language}", items, 0, len(items), page, size)
+
+
+class CatalogueSnapshot(NamedTuple):
+    countries: Dict[str, CountryCatalogue]
+    languages: Tuple[str, ...]
+    product_count: int
+    built_at: float
+
+
+def catalogue_projection(countries: Sequence[str], languages: Sequence[str]) -> dict:
+    projection = {"_id": 0, "rawId": 1, "imageUrl": 1, "brand": 1}
+    for language in languages:
+        projection[f"desc.{language}.name"] = 1
+        projection[f"desc.{language}.description"] = 1
+    for country in countries:
+        projection[f"sales.{country}.launchedDate"] = 1
+        projection[f"sales.{country}.latestPrice"] = 1
+        projection[f"sales.{country}.price.value"] = 1
+    return projection
+
+
+def _number(value) -> Optional[float]:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def build_catalogue(documents: Iterable[dict], countries: Sequence[str], languages: Sequence[str]) -> CatalogueSnapshot:
+    """projection(catalogue_projection)된 product 문서 → 스냅샷 (CPU 작업, 이벤트 루프 밖에서 실행)"""
+    rows: Dict[str, List[tuple]] = {country: [] for country in countries}
+    product_count = 0
+    for document in documents:
+        raw_id = document.get("rawId")
+        if raw_id is None:
+            continue
+        product_count += 1
+        desc = document.get("desc") or {}
+        names = {language: desc[language]["name"] for language in languages
+                 if isinstance(desc.get(language), dict) and "name" in desc[language]}
+        denim = frozenset(language for language in languages
+                          if DENIM_KEYWORD in (safe_dict_value(desc, [language, "description"]) or ""))
+        sales = document.get("sales") or {}
+        for country in countries:
+            sale = sales.get(country) if isinstance(sales.get(country), dict) else {}
+            latest_price = sale.get("latestPrice") if isinstance(sale.get("latestPrice"), dict) else {}
+            history = sale.get("price") if isinstance(sale.get("price"), list) else []
+            positive = sum(1 for price in history if isinstance(price, dict) and (_number(price.get("value")) or 0) > 0)
+            item = CatalogueItem(raw_id, document.get("imageUrl"), document.get("brand"), names,
+                                 latest_price.get("display"), _number(sale.get("launchedDate")))
+            rows[country].append((item, _number(latest_price.get("value")), _number(latest_price.get("timestamp")),
+                                  positive > 1, denim))
+
+    return CatalogueSnapshot(
+        countries={country: CountryCatalogue(country, languages, country_rows) for country, country_rows in rows.items()},
+        languages=tuple(languages),
+        product_count=product_count,
+        built_at=time.time(),
+    )
+
+
+def _env_list(name: str, default: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in os.getenv(name, default).split(",") if item.strip())
+
+
+class HomeCatalogue:
+    """스냅샷 보관 + 백그라운드 갱신"""
+
+    def __init__(self, repository, countries: Sequence[str] = None, languages: Sequence[str] = None,
+                 refresh_seconds: float = None, min_interval_seconds: float = None, enabled: bool = None,
+                 cache: ResultCache = RESULT_CACHE, scope: str = "home", settle_seconds: float = None):
+        self.repository = repository
+        self.cache = cache
+        self.scope = scope
+        self.settle_seconds = (settle_seconds if settle_seconds is not None
+                               else float(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90")))
+        self.countries = tuple(countries or _env_list("HOME_CATALOGUE_COUNTRIES", "KR,US"))
+        self.languages = tuple(languages or _env_list("HOME_CATALOGUE_LANGUAGES", "KO,EN"))
+        self.refresh_seconds = refresh_seconds or float(os.getenv("HOME_CATALOGUE_REFRESH_SECONDS", "300"))
+        self.min_interval_seconds = (min_interval_seconds if min_interval_seconds is not None
+                                     else float(os.getenv("HOME_CATALOGUE_MIN_INTERVAL_SECONDS", "10")))
+        self.enabled = enabled if enabled is not None else os.getenv("HOME_CATALOGUE_ENABLED", "1") == "1"
+        self.snapshot: Optional[CatalogueSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._changed = False
+        self._changed_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.snapshot is not None
+
+    def get(self, country: str, language: str) -> Optional[CountryCatalogue]:
+        """스냅샷에 없는 국가/언어(상품명 없음)는 None"""
+        snapshot = self.snapshot
+        if snapshot is None or language not in snapshot.languages:
+            return None
+        return snapshot.countries.get(country)
+
+    def read_route(self) -> ReadRoute:
+        """변경 직후(settle_seconds 이내)에는 세컨더리 지연을 피해 primary"""
+        if self._changed_at is not None and time.monotonic() - self._changed_at < self.settle_seconds:
+            return ReadRoute.primary
+        return ReadRoute.analytics
+
+    async def refresh(self) -> CatalogueSnapshot:
+        if self.repository.collection is None:
+            raise RuntimeError("mongo is not connected")
+        changed, self._changed = self._changed, False
+        route = self.read_route()
+        started = time.perf_counter()
+        try:
+            documents = await self.repository.find_catalogue_documents(catalogue_projection(self.countries, self.languages),
+                                                                       route)
+            loaded = time.perf_counter()
+            snapshot = await asyncio.to_thread(build_catalogue, documents, self.countries, self.languages)
+        except BaseException:
+            self._changed = self._changed or changed
+            raise
+        first = self.snapshot is None
+        self.snapshot = snapshot
+        if changed or first:
+            # 이전 스냅샷(또는 Mongo 조회)으로 만든 홈 응답 제거
+            self.cache.invalidate(self.scope)
+        logger.i(f"[home catalogue] {snapshot.product_count} products ({route.value}), load {(loaded - started) * 1000:.0f}ms, "
+                 f"build {(time.perf_counter() - loaded) * 1000:.0f}ms")
+        return snapshot
+
+    def request_refresh(self) -> None:
+        """상품 변경 반영: 다음 갱신을 앞당김 (최소 간격 이후 실행, 여러 번 호출해도 한 번만 갱신)"""
+        self._changed = True
+        self._changed_at = time.monotonic()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="home-catalogue")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.refresh()
+            except Exception as e:
+                # 실패 시 이전 스냅샷 유지 (없으면 Mongo 쿼리로 처리)
+                logger.e(f"[home catalogue] refresh failed: {e}")
+            await asyncio.sleep(self.min_interval_seconds)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(self.refresh_seconds - self.min_interval_seconds, 0))
+            except asyncio.TimeoutError:
+                pass
@@ -7,15 +7,19 @@ from app.bagtionary.common.middleware.verifier import verify_country, verify_pag
 from app.bagtionary.domain.home.home_handler import HomeHandler
 from app.bagtionary.domain.home.home_model import GetHomeCategoryListResult, GetHomeProductListItem
 from app.bagtionary.inject import get_home_handler
+from core.common.http_cache import CachedRoute, cache_policy
 from core.util.log_util import logger
 
 home_router = APIRouter(
     prefix="/home",
-    tags=["bagtionary/home"]
+    tags=["bagtionary/home"],
+    route_class=CachedRoute,
 )
 
 
 @home_router.get("/category/list", response_model=GetHomeCategoryListResult)
+@cache_policy(max_age=300, stale_while_revalidate=600, vary=("X-Bagtionary-Language", "X-Bagtionary-Version"), keys=("ctr",),
+              scope="home", watched_ttl=1800)
 async def get_home_category_list(
         request: Request,
         ctr: str = Depends(verify_country),
@@ -32,6 +36,7 @@ async def get_home_category_list(
 
 
 @home_router.get("/product/list/{category}", response_model=GetHomeProductListItem)
+@cache_policy(max_age=60, stale_while_revalidate=300, keys=("ctr",), scope="home", watched_ttl=1800)
 async def get_home_product_list(
         category: str,
         request: Request,
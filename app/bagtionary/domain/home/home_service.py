@@ -3,6 +3,7 @@ import time
 from typing import Optional
 
 from app.bagtionary.data.repository.product_repository import ProductRepository
+from app.bagtionary.domain.home.home_catalogue import CountryCatalogue, HomeCatalogue
 from app.bagtionary.domain.home.home_model import GetHomeCategoryListItem, HomeCategory, GetHomeProductListItem, HomeCategoryItem
 from app.bagtionary.domain.product.product_model import ThumbnailProductVO, GetProductListVO
 from core.util.constants import WEEK_EPOCH_MILLIS
@@ -10,24 +11,30 @@ from core.util.log_util import logger
 
 
 class HomeService:
-    def __init__(self, repository: ProductRepository):
+    def __init__(self, repository: ProductRepository, catalogue: Optional[HomeCatalogue] = None):
         self.repository = repository
+        # 메모리 스냅샷이 준비된 국가/언어는 스냅샷에서 처리, 그 외에는 Mongo 조회
+        self.catalogue = catalogue
+
+    def catalogue_for(self, country: str, language: str) -> Optional[CountryCatalogue]:
+        # 스냅샷에는 설정된 언어의 상품명만 있으므로 언어도 확인
+        return self.catalogue.get(country, language) if self.catalogue is not None else None
 
     async def get_home_category_list(self, language: str, country: str, include_dynamic_category: bool) -> list[GetHomeCategoryListItem]:
         result_list = []
         # 최근 추가 가방
-        latest_added_product = await self.get_latest_added_product(country, 0, 10)
+        latest_added_product = await self.get_latest_added_product(language, country, 0, 10)
         if len(latest_added_product.products) > 0:
             result_list.append(self.create_category_list(language, country, HomeCategory.latest_added.create_item(), latest_added_product))
 
         # 가격 변동 가방
-        price_changed_product = await self.get_price_changed_product(country, 0, 10)
+        price_changed_product = await self.get_price_changed_product(language, country, 0, 10)
         if len(price_changed_product.products) > 0:
             result_list.append(self.create_category_list(language, country, HomeCategory.price_changed.create_item(), price_changed_product))
 
         if include_dynamic_category:
             # 가격대별 가방
-            min_price, price_band_product = await self.get_price_band_product(country, 0, 10)
+            min_price, price_band_product = await self.get_price_band_product(language, country, 0, 10)
             if len(price_band_product.products) > 0:
                 result_list.append(
                     self.create_category_list(language, country, HomeCategoryItem(HomeCategory.price_band, min_price), price_band_product))
@@ -45,15 +52,15 @@ class HomeService:
     async def get_home_product_list(self, category: HomeCategory, price: Optional[int], page: int, size: int, language: str,
                                     country: str) -> GetHomeProductListItem:
         if category == HomeCategory.latest_added:
-            product_list = await self.get_latest_added_product(country, page, size)
+            product_list = await self.get_latest_added_product(language, country, page, size)
             return self.create_product_list(language, country, category.create_item(), product_list)
 
         elif category == HomeCategory.price_changed:
-            product_list = await self.get_price_changed_product(country, page, size)
+            product_list = await self.get_price_changed_product(language, country, page, size)
             return self.create_product_list(language, country, category.create_item(), product_list)
 
         elif category == HomeCategory.price_band:
-            min_price, product_list = await self.get_price_band_product(country, page, size, price)
+            min_price, product_list = await self.get_price_band_product(language, country, page, size, price)
             return self.create_product_list(language, country, HomeCategoryItem(category, min_price), product_list)
 
         elif category == HomeCategory.denim:
@@ -62,14 +69,20 @@ class HomeService:
         else:
             return GetHomeProductListItem()
 
-    async def get_latest_added_product(self, country: str, page: int, size: int) -> GetProductListVO:
+    async def get_latest_added_product(self, language: str, country: str, page: int, size: int) -> GetProductListVO:
         # 최근 추가 가방 (new 붙은 애들만)
         now = int(time.time() * 1000)
         two_weeks_ago = now - (WEEK_EPOCH_MILLIS * 2)
+        catalogue = self.catalogue_for(country, language)
+        if catalogue is not None:
+            return catalogue.latest_added(two_weeks_ago, page, size)
         return await self.repository.find_products(query={f"sales.{country}.launchedDate": {"$gt": two_weeks_ago}},
                                                    sort={f"sales.{country}.launchedDate": -1, "rawId": -1}, page=page, size=size)
 
-    async def get_price_changed_product(self, country: str, page: int, size: int) -> GetProductListVO:
+    async def get_price_changed_product(self, language: str, country: str, page: int, size: int) -> GetProductListVO:
+        catalogue = self.catalogue_for(country, language)
+        if catalogue is not None:
+            return catalogue.price_changed_products(page, size)
         return await self.repository.find_products(query={
             "$expr": {
                 "$gt": [
@@ -88,7 +101,7 @@ class HomeService:
             page=page,
             size=size)
 
-    async def get_price_band_product(self, country: str, page: int, size: int, price: Optional[int] = None) -> (int, GetProductListVO):
+    async def get_price_band_product(self, language: str, country: str, page: int, size: int, price: Optional[int] = None) -> (int, GetProductListVO):
         ranges = [(1000000, 2000000), (2000000, 3000000), (3000000, 4000000), (4000000, 5000000), (5000000, 6000000), (6000000, 7000000),
                   (10000000, None)]
 
@@ -105,6 +118,10 @@ class HomeService:
         min_price: int = selected_range[0]
         max_price: Optional[int] = selected_range[1]
 
+        catalogue = self.catalogue_for(country, language)
+        if catalogue is not None:
+            return min_price, catalogue.price_band(min_price, max_price, page, size)
+
         comparator = {"$gte": min_price}
         if max_price is not None:
             comparator["$lt"] = max_price
@@ -116,6 +133,9 @@ class HomeService:
                                                               size=size)
 
     async def get_denim_product(self, language: str, country: str, page: int, size: int) -> GetProductListVO:
+        catalogue = self.catalogue_for(country, language)
+        if catalogue is not None:
+            return catalogue.denim_products(language, page, size)
         return await self.repository.find_products(query={f"desc.{language}.description": {"$regex": "데님"}},
                                                    sort={f"sales.{country}.launchedDate": -1, "rawId": -1},
                                                    page=page,
@@ -0,0 +1,77 @@
+from app.bagtionary.domain.home.home_catalogue import build_catalogue
+
+
+def _product(raw_id: str, brand: str, launched, prices: list, description: str = "") -> dict:
+    history = [{"timestamp": launched + i, "value": value, "display": f"₩{value:,}"} for i, value in enumerate(prices)]
+    return {
+        "rawId": raw_id,
+        "brand": brand,
+        "imageUrl": f"https://img/{raw_id}.jpg",
+        "desc": {"KO": {"name": raw_id, "description": description}},
+        "sales": {"KR": {"launchedDate": launched, "price": history, "latestPrice": history[-1] if history else None}},
+    }
+
+
+def test_catalogue_matches_home_query_order_and_paging():
+    snapshot = build_catalogue([
+        _product("A-1", "A", 1_000, [1_500_000]),
+        _product("A-2", "A", 3_000, [1_000_000, 2_500_000], "데님 소재"),
+        _product("B-1", "B", 3_000, [2_000_000, 0]),
+        _product("B-2", "B", 2_000, [1_900_000, 1_800_000], "블루 데님"),
+        _product("C-1", "C", 500, []),
+    ], countries=("KR",), languages=("KO",))
+    kr = snapshot.countries["KR"]
+
+    # launchedDate > 1500, launchedDate 내림차순 → rawId 내림차순
+    latest = kr.latest_added(1_500, 0, 2)
+    assert [p["rawId"] for p in latest.products] == ["B-1", "A-2"]
+    assert (latest.total_count, latest.last_page, sorted(latest.brands)) == (3, 1, ["A", "B"])
+    assert [p["rawId"] for p in kr.latest_added(1_500, 1, 2).products] == ["B-2"]
+
+    # 0보다 큰 가격이 2개 이상
+    assert [p["rawId"] for p in kr.price_changed_products(0, 10).products] == ["A-2", "B-2"]
+
+    # min <= latestPrice.value < max, 가격 오름차순
+    band = kr.price_band(1_000_000, 2_000_000, 0, 10)
+    assert [p["rawId"] for p in band.products] == ["A-1", "B-2"]
+    assert kr.price_band(10_000_000, None, 0, 10).last_page == -1
+
+    assert [p["rawId"] for p in kr.denim_products("KO", 0, 10).products] == ["A-2", "B-2"]
+    assert kr.denim_products("EN", 0, 10).total_count == 0
+
+    document = latest.products[0]
+    assert document["sales"]["KR"] == {"latestPrice": {"display": "₩0"}, "launchedDate": 3_000}
+    assert document["desc"] == {"KO": {"name": "B-1"}}
+
+
+def test_unconfigured_language_falls_back_to_repository():
+    import asyncio
+    import time
+
+    from app.bagtionary.domain.home.home_catalogue import HomeCatalogue
+    from app.bagtionary.domain.home.home_model import HomeCategory
+    from app.bagtionary.domain.home.home_service import HomeService
+    from app.bagtionary.domain.product.product_model import GetProductListVO
+
+    document = _product("A-2", "A", int(time.time() * 1000), [1_000_000, 1_500_000])
+    document["desc"]["JA"] = {"name": "バッグ"}
+
+    class Repository:
+        queries = []
+
+        async def find_products(self, query, sort, page, size):
+            self.queries.append(query)
+            return GetProductListVO(products=[document], total_count=1, last_page=0, brands=["A"])
+
+    catalogue = HomeCatalogue(Repository(), countries=("KR",), languages=("KO",))
+    catalogue.snapshot = build_catalogue([document], countries=("KR",), languages=("KO",))
+    service = HomeService(Repository(), catalogue)
+
+    for category, price in ((HomeCategory.latest_added, None), (HomeCategory.price_changed, None),
+                            (HomeCategory.price_band, 1_000_000)):
+        Repository.queries.clear()
+        assert asyncio.run(service.get_home_product_list(category, price, 0, 10, "KO", "KR")).products[0].name == "A-2"
+        assert Repository.queries == []
+        # 스냅샷에 없는 언어는 Mongo 조회 (상품명 유지)
+        assert asyncio.run(service.get_home_product_list(category, price, 0, 10, "JA", "KR")).products[0].name == "バッグ"
+        assert len(Repository.queries) == 1
@@ -0,0 +1,280 @@
+"""
+product_change_watcher.py
+
+product 컬렉션 변경 감지 → 응답 캐시(RESULT_CACHE) / 홈 카탈로그 스냅샷 무효화 (워커별 백그라운드 태스크)
+
+- change stream (replica set / sharded cluster)
+    - 필요한 필드만 projection: 변경 종류, rawId, brand, 변경된 필드 경로, sales 국가 목록
+    - 변경 → 키: rawId, brand, 국가(sales.{country}.*)
+        - 국가/브랜드를 특정할 수 없는 변경(desc 등 공통 필드, brand 변경, replace, delete)은 해당 키 전체
+        - lastModifiedDate 처럼 응답에 쓰이지 않는 필드만 바뀐 경우는 범위를 넓히지 않음
+    - batch_seconds 동안 모은 변경을 한 번에 적용 (scope별 RESULT_CACHE.invalidate(scope, keys) + 카탈로그 갱신 요청)
+        - scope: product(상품 목록), home(홈 목록, 카탈로그 스냅샷 교체 시 한 번 더 무효화)
+    - resume token: 적용이 끝난 위치까지만 기록 → 재연결 시 이어서 수신
+        - token 없이 시작하거나 이력이 사라진 경우(ChangeStreamHistoryLost) 전체 무효화
+    - 수신 중에는 RESULT_CACHE.watch(scope) → 정책의 watched_ttl(긴 ttl) 사용, 중단 시 unwatch(전체 무효화)
+        - 긴 ttl 응답은 primary 조회로 생성 (http_cache 참고)
+- 폴링 (change stream 미지원: standalone 등)
+    - poll_seconds 마다 lastModifiedDate 이후 변경 조회 → 같은 방식으로 무효화
+    - 삭제는 감지하지 못하므로 긴 ttl은 사용하지 않음 (정책 ttl 유지)
+- 설정 (.env)
+    - PRODUCT_WATCH_ENABLED: 1/0 (기본 1)
+    - PRODUCT_WATCH_POLL_SECONDS: 폴링 간격 (기본 30)
+    - PRODUCT_WATCH_BATCH_SECONDS: 변경 모음 간격 (기본 0.5)
+- 메트릭: tricorn_product_changes_total{source=stream|poll}, tricorn_cache_invalidations_total{kind=keys|full}
+- 작성일: 2025-06-20
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence
+
+from pymongo.errors import OperationFailure
+
+from app.bagtionary.data.repository.product_repository import ProductRepository
+from app.bagtionary.domain.home.home_catalogue import HomeCatalogue
+from core.common.http_cache import RESULT_CACHE, ResultCache
+from core.common.metrics import REGISTRY, Counter
+from core.util.log_util import logger
+
+# $changeStream 미지원 (replica set 아님)
+CHANGE_STREAM_UNSUPPORTED = {40573}
+# resume token 위치의 oplog가 사라짐 / 재개 불가
+CHANGE_STREAM_HISTORY_LOST = {280, 286}
+
+# 목록/홈 응답에 쓰이지 않는 필드 (변경 범위를 넓히지 않음)
+NEUTRAL_FIELDS = {"_id", "lastModifiedDate", "createdDate"}
+# 홈 카탈로그 스냅샷에 쓰이는 필드 (desc는 name/description만)
+CATALOGUE_FIELDS = {"rawId", "imageUrl", "brand", "sales"}
+CATALOGUE_DESC_FIELDS = {"name", "description"}
+
+CHANGE_PIPELINE = [
+    {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+    {"$project": {
+        "operationType": 1,
+        "documentKey": 1,
+        "fullDocument.rawId": 1,
+        "fullDocument.brand": 1,
+        "updatedFields": {"$map": {"input": {"$objectToArray": {"$ifNull": ["$updateDescription.updatedFields", {}]}},
+                                   "in": "$$this.k"}},
+        "removedFields": "$updateDescription.removedFields",
+        "countries": {"$map": {"input": {"$objectToArray": {"$ifNull": ["$fullDocument.sales", {}]}}, "in": "$$this.k"}},
+    }},
+]
+
+PRODUCT_CHANGES = REGISTRY.register(Counter(
+    "tricorn_product_changes_total", "감지한 product 변경 수", ("source",)))
+CACHE_INVALIDATIONS = REGISTRY.register(Counter(
+    "tricorn_cache_invalidations_total", "product 변경에 따른 캐시 무효화 수", ("kind",)))
+
+
+class ProductChange(NamedTuple):
+    """
+    Attributes:
+        raw_id: 변경된 상품 rawId (알 수 없으면 None)
+        brands: 영향받는 브랜드, None이면 전체
+        countries: 영향받는 국가, None이면 전체
+        catalogue: 홈 카탈로그 필드 변경 여부
+    """
+    raw_id: Optional[str]
+    brands: Optional[FrozenSet[str]]
+    countries: Optional[FrozenSet[str]]
+    catalogue: bool
+
+
+def _is_catalogue_field(parts: List[str]) -> bool:
+    if parts[0] == "desc":
+        return len(parts) < 3 or parts[2] in CATALOGUE_DESC_FIELDS
+    return parts[0] in CATALOGUE_FIELDS
+
+
+def change_from_event(event: dict) -> Optional[ProductChange]:
+    """CHANGE_PIPELINE으로 projection된 change event → 영향 키 (응답에 쓰이지 않는 필드만 바뀌면 None)"""
+    operation = event.get("operationType")
+    document = event.get("fullDocument") or {}
+    raw_id = document.get("rawId")
+    brand = document.get("brand")
+
+    if operation == "insert":
+        countries = event.get("countries")
+        return ProductChange(raw_id, frozenset([brand]) if brand else None,
+                             frozenset(countries) if countries else None, True)
+    if operation != "update":
+        # replace/delete: 이전 문서의 브랜드/국가를 알 수 없음
+        return ProductChange(raw_id, None, None, True)
+
+    paths = list(event.get("updatedFields") or []) + list(event.get("removedFields") or [])
+    countries = set()
+    all_countries = False
+    catalogue = False
+    for path in paths:
+        parts = path.split(".")
+        if parts[0] in NEUTRAL_FIELDS:
+            continue
+        catalogue = catalogue or _is_catalogue_field(parts)
+        if parts[0] == "sales" and len(parts) > 1:
+            countries.add(parts[1])
+        else:
+            all_countries = True
+    if not countries and not all_countries:
+        return None
+    brands = frozenset([brand]) if brand and "brand" not in paths else None
+    return ProductChange(raw_id, brands, None if all_countries else frozenset(countries), catalogue)
+
+
+def merge_keys(changes: Iterable[ProductChange]) -> Dict[str, Optional[FrozenSet[str]]]:
+    """변경 목록 → RESULT_CACHE.invalidate keys (하나라도 전체면 전체)"""
+    merged: Dict[str, Optional[set]] = {"ctr": set(), "brand": set()}
+    for change in changes:
+        for name, values in (("ctr", change.countries), ("brand", change.brands)):
+            if values is None:
+                merged[name] = None
+            elif merged[name] is not None:
+                merged[name].update(values)
+    return {name: frozenset(values) if values is not None else None for name, values in merged.items()}
+
+
+class ProductChangeWatcher:
+    def __init__(self, repository: ProductRepository, catalogue: Optional[HomeCatalogue] = None,
+                 cache: ResultCache = RESULT_CACHE, scopes: Sequence[str] = ("product", "home"), poll_seconds: float = None,
+                 batch_seconds: float = None, enabled: bool = None):
+        self.repository = repository
+        self.catalogue = catalogue
+        self.cache = cache
+        self.scopes = tuple(scopes)
+        self.poll_seconds = poll_seconds or float(os.getenv("PRODUCT_WATCH_POLL_SECONDS", "30"))
+        self.batch_seconds = batch_seconds or float(os.getenv("PRODUCT_WATCH_BATCH_SECONDS", "0.5"))
+        self.enabled = enabled if enabled is not None else os.getenv("PRODUCT_WATCH_ENABLED", "1") == "1"
+        self.mode = "stream"
+        self.resume_token: Optional[dict] = None
+        self._poll_since: Optional[int] = None
+        self._poll_seen: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="product-change-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def apply(self, changes: Optional[List[ProductChange]], source: str) -> None:
+        """변경 적용 (None이면 전체 무효화)"""
+        if changes is None:
+            removed = sum(self.cache.invalidate(scope) for scope in self.scopes)
+            CACHE_INVALIDATIONS.inc(kind="full")
+            logger.i(f"[product watcher] full invalidation ({source}), {removed} cached responses")
+            if self.catalogue is not None:
+                self.catalogue.request_refresh()
+            return
+        if not changes:
+            return
+        PRODUCT_CHANGES.inc(len(changes), source=source)
+        keys = merge_keys(changes)
+        removed = sum(self.cache.invalidate(scope, keys) for scope in self.scopes)
+        CACHE_INVALIDATIONS.inc(kind="keys")
+        logger.d(f"[product watcher] {len(changes)} changes ({source}) {keys}, {removed} cached responses")
+        if self.catalogue is not None and any(change.catalogue for change in changes):
+            self.catalogue.request_refresh()
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                if self.mode == "stream":
+                    await self._watch()
+                else:
+                    await self._poll()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED:
+                    logger.w(f"[product watcher] change stream unavailable, polling every {self.poll_seconds}s: {e}")
+                    self.mode = "poll"
+                    continue
+                if e.code in CHANGE_STREAM_HISTORY_LOST:
+                    logger.w(f"[product watcher] resume token expired: {e}")
+                    self.resume_token = None
+                    continue
+                logger.e(f"[product watcher] {e}")
+            except NotImplementedError as e:
+                logger.w(f"[product watcher] change stream unavailable, polling every {self.poll_seconds}s: {e}")
+                self.mode = "poll"
+                continue
+            except Exception as e:
+                logger.e(f"[product watcher] {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    async def _watch(self) -> None:
+        collection = self.repository.collection
+        if collection is None:
+            raise RuntimeError("mongo is not connected")
+        stream = collection.watch(CHANGE_PIPELINE, full_document="updateLookup", resume_after=self.resume_token,
+                                  max_await_time_ms=int(self.batch_seconds * 1000))
+        async with stream:
+            if self.resume_token is None:
+                # 수신 시작 이전 변경은 알 수 없으므로 전체 무효화
+                self.apply(None, "stream")
+            self.resume_token = stream.resume_token
+            for scope in self.scopes:
+                self.cache.watch(scope)
+            logger.i("[product watcher] change stream started")
+            try:
+                pending: List[ProductChange] = []
+                deadline = 0.0
+                while stream.alive:
+                    event = await stream.try_next()
+                    change = change_from_event(event) if event is not None else None
+                    if change is not None:
+                        if not pending:
+                            deadline = time.monotonic() + self.batch_seconds
+                        pending.append(change)
+                    if pending and (event is None or time.monotonic() >= deadline):
+                        self.apply(pending, "stream")
+                        pending = []
+                    if not pending:
+                        # 적용한 위치까지만 기록 (적용 전 끊기면 다시 수신)
+                        self.resume_token = stream.resume_token
+            finally:
+                for scope in self.scopes:
+                    self.cache.unwatch(scope)
+
+    async def _poll(self) -> None:
+        limit = 1000
+        if self._poll_since is None:
+            self._poll_since = await self.repository.find_last_modified_date() or int(time.time() * 1000)
+            self._poll_seen = {(document.get("rawId"), document.get("lastModifiedDate"))
+                               for document in await self.repository.find_modified_since(self._poll_since, limit)}
+            self.apply(None, "poll")
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            documents = await self.repository.find_modified_since(self._poll_since, limit)
+            if len(documents) >= limit:
+                # 변경이 많으면 전체 무효화 후 마지막 시각부터 다시
+                self._poll_since = documents[-1].get("lastModifiedDate") or self._poll_since
+                self._poll_seen = set()
+                self.apply(None, "poll")
+                continue
+            changes = []
+            for document in documents:
+                modified = document.get("lastModifiedDate") or 0
+                key = (document.get("rawId"), modified)
+                # $gte 조회 → 같은 시각에 이미 처리한 문서는 제외
+                if key in self._poll_seen:
+                    continue
+                if modified > self._poll_since:
+                    self._poll_since = modified
+                    self._poll_seen = set()
+                self._poll_seen.add(key)
+                brand = document.get("brand")
+                changes.append(ProductChange(document.get("rawId"), frozenset([brand]) if brand else None, None, True))
+            self.apply(changes, "poll")
@@ -4,16 +4,20 @@ from app.bagtionary.common.middleware.verifier import verify_country, verify_pag
 from app.bagtionary.domain.product.product_handler import ProductHandler
 from app.bagtionary.domain.product.product_model import GetProductListResult, GetProductResult
 from app.bagtionary.inject import get_product_handler
+from core.common.http_cache import CachedRoute, cache_policy
 from core.util.log_util import logger
 from core.util.op_util import safe_int, safe_dict_value
 
 product_router = APIRouter(
     prefix="/product",
-    tags=["bagtionary/product"]
+    tags=["bagtionary/product"],
+    route_class=CachedRoute,
 )
 
 
+# 필터/정렬이 KR 가격 기준이라 ctr로는 무효화 범위를 좁히지 않음 (brand 필터만)
 @product_router.get("/list", response_model=GetProductListResult)
+@cache_policy(max_age=30, stale_while_revalidate=120, keys=("brand",), watched_ttl=3600)
 async def get_product_list(
         request: Request,
         ctr: str = Depends(verify_country),
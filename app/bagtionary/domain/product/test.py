@@ -0,0 +1,94 @@
+from app.bagtionary.domain.product.product_change_watcher import change_from_event, merge_keys
+from core.common.http_cache import ResultCache
+
+
+def test_change_event_keys_invalidate_only_affected_responses():
+    document = {"rawId": "LV-1", "brand": "LV"}
+    price = change_from_event({"operationType": "update", "fullDocument": document,
+                               "updatedFields": ["sales.US.latestPrice", "sales.US.price.3", "lastModifiedDate"]})
+    assert (price.brands, price.countries, price.catalogue) == (frozenset(["LV"]), frozenset(["US"]), True)
+    # 응답에 쓰이지 않는 필드만 변경
+    assert change_from_event({"operationType": "update", "fullDocument": document, "updatedFields": ["lastModifiedDate"]}) is None
+    # 공통 필드/브랜드 변경, 삭제는 전체
+    assert change_from_event({"operationType": "update", "fullDocument": document, "updatedFields": ["desc.KO.spec"]}).countries is None
+    assert change_from_event({"operationType": "update", "fullDocument": document, "updatedFields": ["brand"]}).brands is None
+    assert change_from_event({"operationType": "delete", "documentKey": {"_id": 1}}).brands is None
+
+    cache = ResultCache()
+    generation = cache.generation("product")
+    for name, keys in (("us", {"ctr": frozenset(["US"])}), ("kr", {"ctr": frozenset(["KR"])}),
+                       ("lv", {"brand": frozenset(["LV", "DIOR"])}), ("gucci", {"brand": frozenset(["GUCCI"])}),
+                       ("all", {"brand": None})):
+        cache.put((name,), "product", generation, b"{}", "application/json", 60, keys)
+
+    assert merge_keys([price]) == {"ctr": frozenset(["US"]), "brand": frozenset(["LV"])}
+    assert cache.invalidate("product", merge_keys([price])) == 3
+    assert cache.get(("kr",)) is not None and cache.get(("gucci",)) is not None
+    assert cache.get(("us",)) is None and cache.get(("lv",)) is None and cache.get(("all",)) is None
+
+    # 무효화 전에 생성을 시작한 응답은 저장하지 않음
+    cache.put(("late",), "product", generation, b"{}", "application/json", 60)
+    assert cache.get(("late",)) is None
+
+
+def test_changed_price_is_not_cached_from_old_snapshot():
+    import asyncio
+    import copy
+
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.bagtionary.domain.home.home_catalogue import HomeCatalogue
+    from app.bagtionary.domain.product.product_change_watcher import ProductChangeWatcher
+    from core.common.http_cache import RESULT_CACHE, CachedRoute, cache_policy
+    from core.db import mongo as mongo_module
+    from core.db.mongo import ReadRoute
+
+    class Repository:
+        collection = object()
+        routes = []
+        documents = [{"rawId": "LV-1", "brand": "LV", "desc": {"KO": {"name": "가방"}},
+                      "sales": {"KR": {"launchedDate": 1, "latestPrice": {"value": 1_500_000, "display": "₩1,500,000"}}}}]
+
+        async def find_catalogue_documents(self, projection, route):
+            self.routes.append(route)
+            return copy.deepcopy(self.documents)
+
+    repository = Repository()
+    catalogue = HomeCatalogue(repository, countries=("KR",), languages=("KO",), settle_seconds=90)
+    watcher = ProductChangeWatcher(repository, catalogue)
+    asyncio.run(catalogue.refresh())
+
+    router = APIRouter(route_class=CachedRoute)
+    primary = []
+
+    @router.get("/home")
+    @cache_policy(max_age=60, keys=("ctr",), scope="home", watched_ttl=1800)
+    async def home(ctr: str):
+        primary.append(mongo_module._PRIMARY_READS.get())
+        return catalogue.get(ctr, "KO").price_band(1_000_000, 2_000_000, 0, 10).products[0]["sales"][ctr]["latestPrice"]
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    for scope in watcher.scopes:
+        RESULT_CACHE.watch(scope)
+    try:
+        assert client.get("/home?ctr=KR").json()["display"] == "₩1,500,000"
+        # 긴 ttl로 저장할 응답은 primary 조회
+        assert primary == [True]
+
+        Repository.documents[0]["sales"]["KR"]["latestPrice"] = {"value": 1_600_000, "display": "₩1,600,000"}
+        watcher.apply([change_from_event({"operationType": "update", "fullDocument": {"rawId": "LV-1", "brand": "LV"},
+                                          "updatedFields": ["sales.KR.latestPrice"]})], "stream")
+        # 스냅샷 교체 전 요청은 이전 스냅샷으로 생성
+        assert client.get("/home?ctr=KR").json()["display"] == "₩1,500,000"
+
+        asyncio.run(catalogue.refresh())
+        # 변경 직후 갱신은 primary에서 읽고, 교체 시 이전 스냅샷으로 만든 응답 제거
+        assert repository.routes == [ReadRoute.analytics, ReadRoute.primary]
+        assert client.get("/home?ctr=KR").json()["display"] == "₩1,600,000"
+    finally:
+        for scope in watcher.scopes:
+            RESULT_CACHE.unwatch(scope)
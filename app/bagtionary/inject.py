@@ -4,8 +4,10 @@ from fastapi import Depends
 
 from app.bagtionary.data.repository.product_repository import ProductRepository
 from app.bagtionary.data.repository.product_view_count_repository import ProductViewCountRepository
+from app.bagtionary.domain.home.home_catalogue import HomeCatalogue
 from app.bagtionary.domain.home.home_handler import HomeHandler
 from app.bagtionary.domain.home.home_service import HomeService
+from app.bagtionary.domain.product.product_change_watcher import ProductChangeWatcher
 from app.bagtionary.domain.product.product_handler import ProductHandler
 from app.bagtionary.domain.product.product_service import ProductService
 
@@ -29,14 +31,23 @@ def get_product_view_count_repository() -> ProductViewCountRepository:
 
 
 # Home
+__home_catalogue_instance: Optional[HomeCatalogue] = None
 __home_service_instance: Optional[HomeService] = None
 __home_handler_instance: Optional[HomeHandler] = None
 
 
-def get_home_service(product_repository: ProductRepository = Depends(get_product_repository)) -> HomeService:
+def get_home_catalogue() -> HomeCatalogue:
+    global __home_catalogue_instance
+    if __home_catalogue_instance is None:
+        __home_catalogue_instance = HomeCatalogue(get_product_repository())
+    return __home_catalogue_instance
+
+
+def get_home_service(product_repository: ProductRepository = Depends(get_product_repository),
+                     home_catalogue: HomeCatalogue = Depends(get_home_catalogue)) -> HomeService:
     global __home_service_instance
     if __home_service_instance is None:
-        __home_service_instance = HomeService(product_repository)
+        __home_service_instance = HomeService(product_repository, home_catalogue)
     return __home_service_instance
 
 
@@ -48,10 +59,18 @@ def get_home_handler(home_service: HomeService = Depends(get_home_service)) -> H
 
 
 # Product
+__product_change_watcher_instance: Optional[ProductChangeWatcher] = None
 __product_service_instance: Optional[ProductService] = None
 __product_handler_instance: Optional[ProductHandler] = None
 
 
+def get_product_change_watcher() -> ProductChangeWatcher:
+    global __product_change_watcher_instance
+    if __product_change_watcher_instance is None:
+        __product_change_watcher_instance = ProductChangeWatcher(get_product_repository(), get_home_catalogue())
+    return __product_change_watcher_instance
+
+
 def get_product_service(product_repository: ProductRepository = Depends(get_product_repository),
                         product_view_count_repository: ProductViewCountRepository = Depends(get_product_view_count_repository)) -> ProductService:
     global __product_service_instance
@@ -6,21 +6,24 @@ Index 모델을 이용한 경제지표 데이터의 삽입, 삭제, 검색 기
 - 의존성: SQLAlchemy
 - 사용법:
     from repository.index_repository import insert_indexes_bulk, insert_indexes_ignore_bulk, insert_index, get_index_by_id, get_indexes_by_symbol, delete_index_by_id
-- 버전: 1.0.0
+- 버전: 1.1.0
 - 작성일: 2025-05-18
 - 작성자: 사용자 요청 기반
 - 변경이력:
     - v1.0.0: 최초 작성
+    - v1.1.0: 지표별 마지막 일자 조회 추가
 
 참고: 트랜잭션/세션 관리는 외부에서 주입
 """
 
 import logging
+from datetime import date
 from typing import List, Optional
 
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
-from src.config.db import get_db
-from src.repository.models.index_table import Index
+from core.config.db import get_db
+from app.trifin.data.repository.models.index_table import Index
 
 logger = logging.getLogger(__name__)
 
@@ -164,6 +167,20 @@ def get_indexes_by_symbol(symbol: str, limit: int = 100) -> List[Index]:
         )
 
 
+def get_latest_index_date(symbol: str) -> Optional[date]:
+    """
+    특정 지표의 마지막 데이터 일자를 조회합니다. (증분 수집 시작점)
+
+    Args:
+        symbol (str): 지표 코드(예: 'DGS10')
+
+    Returns:
+        Optional[date]: 마지막 일자 또는 None(데이터 없음)
+    """
+    with get_db() as session:
+        return session.query(func.max(Index.date)).filter(Index.symbol == symbol).scalar()
+
+
 def delete_index_by_id(index_id: int) -> bool:
     """
     ID로 인덱스 데이터를 삭제합니다.
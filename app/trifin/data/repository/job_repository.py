@@ -0,0 +1,150 @@
+"""
+job_repository.py
+
+JobLock / JobRun 모델을 이용한 배치 작업 잠금 획득/해제와 실행 이력 기록 기능 제공
+
+- 의존성: SQLAlchemy
+- 잠금: 만료 시각이 지났거나 같은 보유자일 때만 성공하는 조건부 UPDATE (행이 없으면 INSERT, 동시 INSERT는 실패 처리)
+- 시각은 모두 UTC naive datetime
+- 사용법:
+    from app.trifin.data.repository.job_repository import acquire_lock, release_lock, start_run, finish_run
+- 버전: 1.0.0
+- 작성일: 2025-06-18
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.trifin.data.repository.models.job_lock_table import JobLock
+from app.trifin.data.repository.models.job_run_table import JobRun, JobRunStatusEnum
+from core.config.db import get_db
+from core.util.log_util import logger
+
+ERROR_MAX_LENGTH = 4_000
+
+
+# =====================
+# 잠금
+# =====================
+def acquire_lock(name: str, owner: str, ttl: timedelta, now: datetime) -> bool:
+    """
+    작업 잠금을 획득합니다. (만료됐거나 같은 보유자일 때만)
+    Args:
+        name (str): 작업 이름
+        owner (str): 잠금 보유자
+        ttl (timedelta): 잠금 유지 시간 (작업 최대 소요 시간보다 길게)
+        now (datetime): 현재 시각 (UTC)
+    Returns:
+        bool: 획득 여부
+    """
+    values = {"owner": owner, "locked_until": now + ttl, "acquired_at": now}
+    with get_db() as session:
+        try:
+            result = session.execute(
+                update(JobLock)
+                .where(JobLock.name == name, or_(JobLock.locked_until <= now, JobLock.owner == owner))
+                .values(**values)
+            )
+            if result.rowcount == 0:
+                if session.get(JobLock, name) is not None:
+                    session.rollback()
+                    return False
+                session.add(JobLock(name=name, **values))
+            session.commit()
+            return True
+        except IntegrityError:
+            # 다른 실행이 같은 작업의 잠금 행을 먼저 생성
+            session.rollback()
+            return False
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.e(f"작업 잠금 획득 실패: {name}, {e}")
+            raise
+
+
+def release_lock(name: str, owner: str, now: datetime) -> None:
+    """보유 중인 작업 잠금을 즉시 만료시킵니다."""
+    with get_db() as session:
+        try:
+            session.execute(
+                update(JobLock).where(JobLock.name == name, JobLock.owner == owner).values(locked_until=now)
+            )
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.e(f"작업 잠금 해제 실패: {name}, {e}")
+            raise
+
+
+# =====================
+# 실행 이력
+# =====================
+def start_run(job_name: str, scheduled_at: datetime, attempt: int, owner: str, now: datetime) -> int:
+    """
+    실행 시작을 기록합니다.
+    Returns:
+        int: JobRun ID
+    """
+    with get_db() as session:
+        try:
+            run = JobRun(
+                job_name=job_name,
+                scheduled_at=scheduled_at,
+                attempt=attempt,
+                owner=owner,
+                status=JobRunStatusEnum.running,
+                started_at=now,
+            )
+            session.add(run)
+            session.commit()
+            return run.id
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.e(f"작업 실행 기록 실패: {job_name}, {e}")
+            raise
+
+
+def finish_run(
+        run_id: int,
+        status: JobRunStatusEnum,
+        now: datetime,
+        rows: Optional[int] = None,
+        error: Optional[str] = None,
+) -> None:
+    """실행 종료(상태, 소요 시간, 저장 건수, 오류)를 기록합니다."""
+    with get_db() as session:
+        try:
+            run = session.get(JobRun, run_id)
+            run.status = status
+            run.finished_at = now
+            run.duration_seconds = (now - run.started_at).total_seconds()
+            run.rows = rows
+            run.error = error[:ERROR_MAX_LENGTH] if error else None
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.e(f"작업 종료 기록 실패: run_id={run_id}, {e}")
+            raise
+
+
+def get_last_run(job_name: str) -> Optional[JobRun]:
+    """작업의 마지막 실행 (예정 시각, 시도 횟수 순)"""
+    with get_db() as session:
+        return (
+            session.query(JobRun)
+            .filter(JobRun.job_name == job_name)
+            .order_by(JobRun.scheduled_at.desc(), JobRun.attempt.desc())
+            .first()
+        )
+
+
+def get_recent_runs(job_name: Optional[str] = None, limit: int = 20) -> List[JobRun]:
+    """최근 실행 이력 (시작 시각 내림차순)"""
+    with get_db() as session:
+        query = session.query(JobRun)
+        if job_name is not None:
+            query = query.filter(JobRun.job_name == job_name)
+        return query.order_by(JobRun.started_at.desc()).limit(limit).all()
@@ -22,7 +22,7 @@ from datetime import date
 from sqlalchemy import Column, Float, BigInteger, Date, String
 from sqlalchemy import UniqueConstraint
 
-from src.repository.models.base import Base
+from app.trifin.data.repository.models.base import Base
 
 
 class Index(Base):
@@ -0,0 +1,44 @@
+"""
+job_lock_table.py
+
+배치 작업 중복 실행 방지용 잠금(JobLock) 테이블에 대응하는 SQLAlchemy ORM 모델 파일.
+
+- 의존성: SQLAlchemy
+- 용도: 작업별 한 행, 잠금 보유자(owner)와 만료 시각(locked_until) 저장
+    - 만료 시각이 지났거나 같은 보유자일 때만 조건부 UPDATE로 잠금 획득 (여러 스케줄러/수동 실행 간 겹침 방지)
+    - 프로세스가 비정상 종료해도 만료 시각 이후 다른 실행이 잠금 획득 가능
+- 사용법:
+    from job_lock_table import JobLock
+- 버전: 1.0.0
+- 작성일: 2025-06-18
+- 변경이력:
+    - v1.0.0: 최초 작성
+
+"""
+
+from sqlalchemy import Column, DateTime, String
+
+from app.trifin.data.repository.models.base import Base
+
+
+class JobLock(Base):
+    """
+    JobLock(배치 작업 잠금) 테이블에 대응하는 SQLAlchemy ORM 모델 클래스.
+    시각은 모두 UTC 기준.
+
+    Attributes:
+        name (str): 작업 이름, 기본키
+        owner (str): 잠금 보유자 (호스트명:PID)
+        locked_until (datetime): 잠금 만료 시각
+        acquired_at (datetime): 잠금 획득 시각
+    """
+
+    __tablename__ = "job_lock"
+
+    name = Column(String(50), primary_key=True, comment="작업 이름")
+    owner = Column(String(100), nullable=True, comment="잠금 보유자")
+    locked_until = Column(DateTime, nullable=False, comment="잠금 만료 시각 (UTC)")
+    acquired_at = Column(DateTime, nullable=True, comment="잠금 획득 시각 (UTC)")
+
+    def __repr__(self) -> str:
+        return f"<JobLock(name={self.name}, owner={self.owner}, locked_until={self.locked_until})>"
@@ -0,0 +1,71 @@
+"""
+job_run_table.py
+
+배치 작업 실행 이력(JobRun) 테이블에 대응하는 SQLAlchemy ORM 모델 파일.
+
+- 의존성: SQLAlchemy
+- 용도: 스케줄 실행마다 예정 시각, 시작/종료 시각, 소요 시간, 저장 건수, 오류 저장
+    - 작업별 마지막 실행의 예정 시각으로 누락(misfire) 실행과 실패 재시도 여부 판단
+- 사용법:
+    from job_run_table import JobRun, JobRunStatusEnum
+- 버전: 1.0.0
+- 작성일: 2025-06-18
+- 변경이력:
+    - v1.0.0: 최초 작성
+
+"""
+
+import enum
+
+from sqlalchemy import Column, BigInteger, DateTime, Float, Index, Integer, String, Text, Enum as SAEnum
+
+from app.trifin.data.repository.models.base import Base
+
+
+class JobRunStatusEnum(str, enum.Enum):
+    running = "running"
+    success = "success"
+    failed = "failed"
+
+
+class JobRun(Base):
+    """
+    JobRun(배치 작업 실행 이력) 테이블에 대응하는 SQLAlchemy ORM 모델 클래스.
+    시각은 모두 UTC 기준.
+
+    Attributes:
+        id (int): 고유 식별자, 기본키, 자동 증가
+        job_name (str): 작업 이름
+        scheduled_at (datetime): 예정 실행 시각
+        attempt (int): 같은 예정 시각에 대한 시도 횟수 (1부터)
+        owner (str): 실행한 스케줄러 (호스트명:PID)
+        status (JobRunStatusEnum): 실행 상태 (running, success, failed)
+        started_at (datetime): 시작 시각
+        finished_at (datetime): 종료 시각
+        duration_seconds (float): 소요 시간(초)
+        rows (int): 저장(시도) 건수
+        error (str): 오류 메시지
+    """
+
+    __tablename__ = "job_run"
+    __table_args__ = (
+        Index("ix_job_run_job_name_scheduled_at", "job_name", "scheduled_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="고유 식별자")
+    job_name = Column(String(50), nullable=False, comment="작업 이름")
+    scheduled_at = Column(DateTime, nullable=False, comment="예정 실행 시각 (UTC)")
+    attempt = Column(Integer, nullable=False, default=1, comment="시도 횟수")
+    owner = Column(String(100), nullable=True, comment="실행 스케줄러")
+    status = Column(SAEnum(JobRunStatusEnum), nullable=False, comment="실행 상태 (running, success, failed)")
+    started_at = Column(DateTime, nullable=False, comment="시작 시각 (UTC)")
+    finished_at = Column(DateTime, nullable=True, comment="종료 시각 (UTC)")
+    duration_seconds = Column(Float, nullable=True, comment="소요 시간(초)")
+    rows = Column(Integer, nullable=True, comment="저장 건수")
+    error = Column(Text, nullable=True, comment="오류 메시지")
+
+    def __repr__(self) -> str:
+        return (
+            f"<JobRun(id={self.id}, job_name={self.job_name}, scheduled_at={self.scheduled_at}, "
+            f"attempt={self.attempt}, status={self.status}, duration_seconds={self.duration_seconds}, rows={self.rows})>"
+        )
@@ -0,0 +1,66 @@
+"""
+pnl_snapshot_table.py
+
+계좌별 일별 손익 스냅샷(PnlSnapshot) 테이블에 대응하는 SQLAlchemy ORM 모델 파일.
+
+- 의존성: SQLAlchemy
+- 용도: 주문/가격 데이터로 미리 계산해 둔 계좌별 일별 현금, 입금액, 취득원가, 평가액, 손익 저장
+- 갱신: batch/trifin/pnl_snapshot.py (마지막 처리 주문 이후 증분 갱신)
+- 사용법:
+    from pnl_snapshot_table import PnlSnapshot
+- 버전: 1.0.1
+- 작성일: 2025-06-16
+- 변경이력:
+    - v1.0.0: 최초 작성
+    - v1.0.1: 금액/수량 컬럼을 DOUBLE(Float(precision=53))로 변경 (증분 갱신 시 상태 복원 오차 누적 방지)
+
+"""
+
+from sqlalchemy import Column, BigInteger, Float, Date, ForeignKey, Index
+
+from app.trifin.data.repository.models.base import Base
+
+
+class PnlSnapshot(Base):
+    """
+    PnlSnapshot(계좌별 일별 손익 스냅샷) 테이블에 대응하는 SQLAlchemy ORM 모델 클래스.
+    금액은 모두 원화 기준, (account_id, date)가 기본키.
+
+    Attributes:
+        account_id (int): 계좌 ID (FK)
+        date (date): 스냅샷 기준 일자
+        user_id (int): 유저 ID (FK)
+        cash (float): 현금
+        total_deposit (float): 누적 입금액
+        realized_pnl (float): 누적 실현손익
+        cost_basis (float): 보유 종목 취득원가 합계
+        market_value (float): 보유 종목 평가액 합계
+        unrealized_pnl (float): 평가손익 (market_value - cost_basis)
+        total_pnl (float): 총손익 (realized_pnl + unrealized_pnl)
+        profit (float): 수익률(%) (total_pnl / total_deposit)
+        last_order_id (int): 스냅샷에 반영된 주문 중 최대 주문 ID
+    """
+
+    __tablename__ = "pnl_snapshot"
+    __table_args__ = (
+        Index("ix_pnl_snapshot_user_id_date", "user_id", "date"),
+    )
+
+    account_id = Column(BigInteger, ForeignKey("account.id"), primary_key=True, comment="계좌 ID")
+    date = Column(Date, primary_key=True, comment="스냅샷 기준 일자")
+    user_id = Column(BigInteger, ForeignKey("user.id"), nullable=False, comment="유저 ID")
+    cash = Column(Float(precision=53), nullable=False, comment="현금")
+    total_deposit = Column(Float(precision=53), nullable=False, comment="누적 입금액")
+    realized_pnl = Column(Float(precision=53), nullable=False, comment="누적 실현손익")
+    cost_basis = Column(Float(precision=53), nullable=False, comment="보유 종목 취득원가 합계")
+    market_value = Column(Float(precision=53), nullable=False, comment="보유 종목 평가액 합계")
+    unrealized_pnl = Column(Float(precision=53), nullable=False, comment="평가손익")
+    total_pnl = Column(Float(precision=53), nullable=False, comment="총손익")
+    profit = Column(Float(precision=53), nullable=False, comment="수익률(%)")
+    last_order_id = Column(BigInteger, nullable=True, comment="반영된 최대 주문 ID")
+
+    def __repr__(self) -> str:
+        return (
+            f"<PnlSnapshot(account_id={self.account_id}, date={self.date}, total_deposit={self.total_deposit}, "
+            f"market_value={self.market_value}, total_pnl={self.total_pnl}, profit={self.profit})>"
+        )
@@ -0,0 +1,56 @@
+"""
+position_snapshot_table.py
+
+계좌/종목별 일별 보유 포지션 스냅샷(PositionSnapshot) 테이블에 대응하는 SQLAlchemy ORM 모델 파일.
+
+- 의존성: SQLAlchemy
+- 용도: 보유 수량, 취득원가(평균단가 기준), 종가 기준 평가액 저장 (보유 수량 0인 종목은 저장하지 않음)
+- 갱신: batch/trifin/pnl_snapshot.py
+- 사용법:
+    from position_snapshot_table import PositionSnapshot
+- 버전: 1.0.1
+- 작성일: 2025-06-16
+- 변경이력:
+    - v1.0.0: 최초 작성
+    - v1.0.1: 금액/수량 컬럼을 DOUBLE(Float(precision=53))로 변경 (증분 갱신 시 상태 복원 오차 누적 방지)
+
+"""
+
+from sqlalchemy import Column, BigInteger, String, Float, Date, ForeignKey, Enum as SAEnum
+
+from app.trifin.data.repository.models.base import Base
+from app.trifin.data.repository.models.order_table import UnitEnum
+
+
+class PositionSnapshot(Base):
+    """
+    PositionSnapshot(계좌/종목별 일별 포지션 스냅샷) 테이블에 대응하는 SQLAlchemy ORM 모델 클래스.
+    (account_id, date, symbol)이 기본키.
+
+    Attributes:
+        account_id (int): 계좌 ID (FK)
+        date (date): 스냅샷 기준 일자
+        symbol (str): 종목 심볼
+        unit (str): 거래 화폐 단위 (KRW, USD)
+        size (float): 보유 수량
+        cost_basis (float): 취득원가 (원화)
+        close (float): 기준 일자 종가 (거래 화폐 기준, 가격 없으면 None)
+        market_value (float): 평가액 (원화, 가격 없으면 취득원가)
+    """
+
+    __tablename__ = "position_snapshot"
+
+    account_id = Column(BigInteger, ForeignKey("account.id"), primary_key=True, comment="계좌 ID")
+    date = Column(Date, primary_key=True, comment="스냅샷 기준 일자")
+    symbol = Column(String(50), primary_key=True, comment="종목 심볼")
+    unit = Column(SAEnum(UnitEnum), nullable=False, comment="화폐 단위 (KRW, USD)")
+    size = Column(Float(precision=53), nullable=False, comment="보유 수량")
+    cost_basis = Column(Float(precision=53), nullable=False, comment="취득원가 (원화)")
+    close = Column(Float(precision=53), nullable=True, comment="기준 일자 종가")
+    market_value = Column(Float(precision=53), nullable=False, comment="평가액 (원화)")
+
+    def __repr__(self) -> str:
+        return (
+            f"<PositionSnapshot(account_id={self.account_id}, date={self.date}, symbol={self.symbol}, "
+            f"size={self.size}, cost_basis={self.cost_basis}, market_value={self.market_value})>"
+        )
@@ -8,21 +8,24 @@ MySQL의 price 테이블에 대응하는 Price 모델 정의 파일.
 - 사용법:
     from price_model import Price
     # SQLAlchemy 세션에서 사용
-- 버전: 1.0.0
+- 버전: 1.1.0
 - 작성일: 2025-05-17
 - 작성자: 사용자 요청 기반
 - 변경이력:
     - v1.0.0: 최초 작성
+    - v1.1.0: (symbol, timestamp) 복합 기본키(InnoDB 클러스터드 인덱스), 연도별 RANGE 파티션 (alembic c4d8e2f6a1b3)
 
-참고: 추후 인덱스, 복합키, 성능 최적화 등 확장 가능
+참고:
+    - 모든 조회가 symbol 조건 후 timestamp 범위/정렬이므로 기본키 순서대로 연속 페이지를 읽음
+    - 파티션(MySQL 전용, 마이그레이션에서 관리): RANGE (YEAR(timestamp)), 기간 조회는 해당 연도 파티션만 읽음
+    - id는 기본키가 아닌 AUTO_INCREMENT 컬럼 (ix_price_id, 데이터 품질 검사 watermark/단건 조회용)
 """
 
 from datetime import datetime
 
-from sqlalchemy import Column, Float, BigInteger, DateTime, String
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Column, Float, BigInteger, DateTime, FetchedValue, Index, String
 
-from src.repository.models.base import Base
+from app.trifin.data.repository.models.base import Base
 
 
 class Price(Base):
@@ -30,13 +33,14 @@ class Price(Base):
     MySQL의 price 테이블에 대응하는 SQLAlchemy ORM 모델 클래스.
 
     Attributes:
-        id (int): 고유 식별자, 기본키, 자동 증가
+        id (int): 고유 식별자, 자동 증가
+        symbol (str): 종목 심볼 (기본키)
         open (float): 시가
         high (float): 고가
         low (float): 저가
         close (float): 종가
         volume (float): 거래량
-        timestamp (datetime): 가격 데이터의 기준 시각 (UTC)
+        timestamp (datetime): 가격 데이터의 기준 시각 (UTC, 기본키)
 
     예시:
         >>> price = Price(open=100.0, high=110.0, low=95.0, close=105.0, volume=12345.6, timestamp=datetime.utcnow())
@@ -44,19 +48,17 @@ class Price(Base):
 
     __tablename__ = "price"
     __table_args__ = (
-        UniqueConstraint("symbol", "timestamp", name="uq_symbol_timestamp"),
+        Index("ix_price_id", "id"),
     )
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="고유 식별자")
-    symbol = Column(String(20), nullable=False, comment="종목 심볼")
+    id = Column(BigInteger, nullable=False, server_default=FetchedValue(), comment="고유 식별자")
+    symbol = Column(String(20), primary_key=True, comment="종목 심볼")
     open = Column(Float, nullable=False, comment="시가")
     high = Column(Float, nullable=False, comment="고가")
     low = Column(Float, nullable=False, comment="저가")
     close = Column(Float, nullable=False, comment="종가")
     volume = Column(Float, nullable=False, comment="거래량")
-    timestamp = Column(
-        DateTime, nullable=False, index=True, comment="가격 데이터의 기준 시각 (UTC)"
-    )
+    timestamp = Column(DateTime, primary_key=True, comment="가격 데이터의 기준 시각 (UTC)")
 
     def __repr__(self) -> str:
         """
@@ -67,7 +69,7 @@ class Price(Base):
             f"close={self.close}, volume={self.volume}, timestamp={self.timestamp})>"
         )
 
-    # TODO: 복합 인덱스 추가, 데이터 정합성 검증, 추가 필드 확장 등
+    # TODO: 데이터 정합성 검증, 추가 필드 확장 등
 
 # 에러 처리 전략:
 # - 모든 필드는 nullable=False로 설정하여 데이터 누락 방지
@@ -75,8 +77,8 @@ class Price(Base):
 # - 예외 발생 시 상위 레이어에서 적절히 핸들링 필요
 
 # 성능 및 확장 고려사항:
-# - timestamp 필드에 인덱스 적용
-# - 대량 데이터 처리 시 파티셔닝, 샤딩 등 고려
+# - (symbol, timestamp) 클러스터드 기본키 + 연도별 RANGE 파티션
+# - 새 연도 파티션은 p_max를 REORGANIZE PARTITION으로 분할 (alembic c4d8e2f6a1b3 참고)
 # - 추가 필드/인덱스 확장 용이하게 설계
 
 # 단위 테스트 예시 (pytest 등에서 활용):
@@ -0,0 +1,186 @@
+"""
+pnl_snapshot_repository.py
+
+PnlSnapshot / PositionSnapshot 모델을 이용한 일별 손익 스냅샷의 조회, 교체 저장 기능 제공
+
+- 의존성: SQLAlchemy
+- 조회: 계좌/유저별 최신 스냅샷은 (account_id, date) 기본키, (user_id, date) 인덱스를 타므로
+        주문 이력 길이와 무관하게 계좌당 한 건만 읽음
+- 저장: 기준 일자 이후 스냅샷을 삭제 후 chunk 단위 Core bulk insert (한 트랜잭션)
+- 사용법:
+    from app.trifin.data.repository.pnl_snapshot_repository import get_latest_snapshot_by_account_id
+- 버전: 1.0.0
+- 작성일: 2025-06-16
+"""
+
+from datetime import date
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.trifin.data.repository.models.pnl_snapshot_table import PnlSnapshot
+from app.trifin.data.repository.models.position_snapshot_table import PositionSnapshot
+from core.config.db import get_db
+from core.util.log_util import logger
+
+INSERT_CHUNK_SIZE = 5_000
+
+
+# =====================
+# API 조회
+# =====================
+def get_latest_snapshot_by_account_id(account_id: int) -> Optional[PnlSnapshot]:
+    """
+    특정 계좌의 최신 손익 스냅샷을 조회합니다.
+    Args:
+        account_id (int): 계좌 ID
+    Returns:
+        Optional[PnlSnapshot]: 최신 스냅샷 또는 None
+    """
+    with get_db() as session:
+        return (
+            session.query(PnlSnapshot)
+            .filter(PnlSnapshot.account_id == account_id)
+            .order_by(PnlSnapshot.date.desc())
+            .first()
+        )
+
+
+def get_latest_snapshots_by_user_id(user_id: int) -> List[PnlSnapshot]:
+    """
+    특정 유저의 계좌별 최신 손익 스냅샷 목록을 조회합니다.
+    (배치가 모든 계좌를 같은 일자까지 갱신하므로 유저의 최신 일자 스냅샷 = 계좌별 최신 스냅샷)
+    Args:
+        user_id (int): 유저 ID
+    Returns:
+        List[PnlSnapshot]: 계좌 ID 순 스냅샷 리스트
+    """
+    with get_db() as session:
+        latest = (
+            session.query(func.max(PnlSnapshot.date))
+            .filter(PnlSnapshot.user_id == user_id)
+            .scalar_subquery()
+        )
+        return (
+            session.query(PnlSnapshot)
+            .filter(PnlSnapshot.user_id == user_id, PnlSnapshot.date == latest)
+            .order_by(PnlSnapshot.account_id.asc())
+            .all()
+        )
+
+
+def get_snapshots_by_account_id(
+        account_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: int = 100,
+) -> List[PnlSnapshot]:
+    """
+    특정 계좌의 일별 손익 스냅샷을 최신 일자부터 조회합니다.
+    Args:
+        account_id (int): 계좌 ID
+        start (date): 시작 일자 (포함)
+        end (date): 종료 일자 (포함)
+        limit (int): 최대 반환 개수
+    Returns:
+        List[PnlSnapshot]: 일자 내림차순 스냅샷 리스트
+    """
+    with get_db() as session:
+        query = session.query(PnlSnapshot).filter(PnlSnapshot.account_id == account_id)
+        if start is not None:
+            query = query.filter(PnlSnapshot.date >= start)
+        if end is not None:
+            query = query.filter(PnlSnapshot.date <= end)
+        return query.order_by(PnlSnapshot.date.desc()).limit(limit).all()
+
+
+def get_positions_by_account_id(account_id: int, snapshot_date: Optional[date] = None) -> List[PositionSnapshot]:
+    """
+    특정 계좌의 보유 포지션 스냅샷을 조회합니다.
+    Args:
+        account_id (int): 계좌 ID
+        snapshot_date (date): 기준 일자 (None이면 최신 일자)
+    Returns:
+        List[PositionSnapshot]: 종목 순 포지션 리스트
+    """
+    with get_db() as session:
+        if snapshot_date is None:
+            snapshot_date = (
+                session.query(func.max(PositionSnapshot.date))
+                .filter(PositionSnapshot.account_id == account_id)
+                .scalar_subquery()
+            )
+        return (
+            session.query(PositionSnapshot)
+            .filter(PositionSnapshot.account_id == account_id, PositionSnapshot.date == snapshot_date)
+            .order_by(PositionSnapshot.symbol.asc())
+            .all()
+        )
+
+
+# =====================
+# 배치 갱신용
+# =====================
+def get_latest_snapshot_date() -> Optional[date]:
+    """전체 스냅샷의 최신 일자 (스냅샷이 없으면 None)"""
+    with get_db() as session:
+        return session.query(func.max(PnlSnapshot.date)).scalar()
+
+
+def get_snapshot_date_before(target: date) -> Optional[date]:
+    """target 이전(미포함) 스냅샷 중 최신 일자"""
+    with get_db() as session:
+        return session.query(func.max(PnlSnapshot.date)).filter(PnlSnapshot.date < target).scalar()
+
+
+def get_last_order_id() -> Optional[int]:
+    """스냅샷에 반영된 최대 주문 ID"""
+    with get_db() as session:
+        return session.query(func.max(PnlSnapshot.last_order_id)).scalar()
+
+
+def get_snapshot_state(snapshot_date: date) -> tuple[List[PnlSnapshot], List[PositionSnapshot]]:
+    """
+    증분 갱신 시작점 복원용: 기준 일자의 계좌별 스냅샷과 포지션 스냅샷을 조회합니다.
+    """
+    with get_db() as session:
+        accounts = session.query(PnlSnapshot).filter(PnlSnapshot.date == snapshot_date).all()
+        positions = session.query(PositionSnapshot).filter(PositionSnapshot.date == snapshot_date).all()
+        return accounts, positions
+
+
+def replace_snapshots_after(
+        base_date: Optional[date],
+        snapshot_rows: Sequence[dict],
+        position_rows: Sequence[dict],
+        chunk_size: int = INSERT_CHUNK_SIZE,
+) -> None:
+    """
+    base_date 이후(미포함) 스냅샷을 삭제하고 새 스냅샷을 한 트랜잭션으로 저장합니다.
+    Args:
+        base_date (date): 유지할 마지막 일자 (None이면 전체 삭제 후 재생성)
+        snapshot_rows (Sequence[dict]): PnlSnapshot 컬럼 dict 목록
+        position_rows (Sequence[dict]): PositionSnapshot 컬럼 dict 목록
+        chunk_size (int): insert 한 번에 보낼 행 수
+    Raises:
+        SQLAlchemyError: DB 저장 중 오류 발생 시
+    """
+    with get_db() as session:
+        try:
+            for model in (PositionSnapshot, PnlSnapshot):
+                statement = delete(model)
+                if base_date is not None:
+                    statement = statement.where(model.date > base_date)
+                session.execute(statement)
+            for model, rows in ((PnlSnapshot, snapshot_rows), (PositionSnapshot, position_rows)):
+                for start in range(0, len(rows), chunk_size):
+                    session.execute(insert(model), list(rows[start:start + chunk_size]))
+            session.commit()
+            logger.i(
+                f"손익 스냅샷 저장 성공: 기준일 {base_date} 이후 계좌 {len(snapshot_rows)}건, 포지션 {len(position_rows)}건"
+            )
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.e(f"손익 스냅샷 저장 실패: {e}")
+            raise
@@ -6,25 +6,30 @@ Price 모델을 이용한 가격 데이터의 삽입, 삭제, 검색 기능 제
 - 의존성: SQLAlchemy
 - 사용법:
     from repository.price_repository import insert_price, get_price_by_id, get_prices_by_symbol, delete_price_by_id
-- 버전: 1.0.0
+- 버전: 1.1.0
 - 작성일: 2025-05-17
 - 작성자: 사용자 요청 기반
 - 변경이력:
     - v1.0.0: 최초 작성
+    - v1.1.0: 컬럼 dict row 기반 chunk INSERT IGNORE(insert_price_rows_ignore_bulk), 종목별 마지막 시각 조회 추가
 
 참고: 트랜잭션/세션 관리는 외부에서 주입
 """
 
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence
 
+from sqlalchemy import func, inspect
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.config.db import get_db
-from src.repository.models.price_table import Price
+from core.config.db import get_db
+from app.trifin.data.repository.models.price_table import Price
 
 logger = logging.getLogger(__name__)
 
+INSERT_CHUNK_SIZE = 5_000
+
 
 def insert_prices_bulk(price_objs: List[Price]) -> int:
     """
@@ -78,22 +83,38 @@ def insert_prices_ignore_bulk(price_objs: List[Price]) -> int:
         - MySQL에서만 동작 (prefix_with("IGNORE") 사용)
         - id(auto increment)는 제외하고 insert
     """
+    columns = [c.name for c in inspect(Price).columns if c.name != "id"]
+    return insert_price_rows_ignore_bulk([{name: getattr(obj, name) for name in columns} for obj in price_objs])
+
+
+def insert_price_rows_ignore_bulk(rows: Sequence[dict], chunk_size: int = INSERT_CHUNK_SIZE) -> int:
+    """
+    price 컬럼 dict 목록을 ORM 객체 생성 없이 chunk 단위 INSERT IGNORE로 저장합니다. (MySQL 전용)
+
+    Args:
+        rows (Sequence[dict]): symbol, open, high, low, close, volume, timestamp 컬럼 dict 목록
+        chunk_size (int): insert 한 번에 보낼 행 수
+
+    Returns:
+        int: 시도한 row 개수(실제 저장된 row는 DB에서 중복을 제외한 수)
+
+    Raises:
+        SQLAlchemyError: DB 삽입 중 오류 발생 시
+    """
     from sqlalchemy.dialects.mysql import insert as mysql_insert
-    from sqlalchemy import inspect
 
-    values = [
-        {c.name: getattr(obj, c.name) for c in inspect(Price).columns if c.name != "id"}
-        for obj in price_objs
-    ]
+    if not rows:
+        return 0
     with get_db() as session:
         try:
-            stmt = mysql_insert(Price).values(values).prefix_with("IGNORE")
-            session.execute(stmt)
+            for start in range(0, len(rows), chunk_size):
+                stmt = mysql_insert(Price).values(list(rows[start:start + chunk_size])).prefix_with("IGNORE")
+                session.execute(stmt)
             session.commit()
             logger.info(
-                f"Price {len(price_objs)}건 중 중복 제외 신규만 bulk 저장 시도 완료"
+                f"Price {len(rows)}건 중 중복 제외 신규만 bulk 저장 시도 완료"
             )
-            return len(price_objs)
+            return len(rows)
         except SQLAlchemyError as e:
             session.rollback()
             logger.error(f"Price IGNORE bulk 저장 실패: {e}")
@@ -166,6 +187,20 @@ def get_prices_by_symbol(symbol: str, limit: int = 100) -> List[Price]:
         )
 
 
+def get_latest_price_timestamp(symbol: str) -> Optional[datetime]:
+    """
+    특정 종목의 마지막 가격 데이터 시각을 조회합니다. (증분 수집 시작점)
+
+    Args:
+        symbol (str): 종목명(예: 'KRW-BTC')
+
+    Returns:
+        Optional[datetime]: 마지막 timestamp 또는 None(데이터 없음)
+    """
+    with get_db() as session:
+        return session.query(func.max(Price.timestamp)).filter(Price.symbol == symbol).scalar()
+
+
 def delete_price_by_id(price_id: int) -> bool:
     """
     ID로 가격 데이터를 삭제합니다.
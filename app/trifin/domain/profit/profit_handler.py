@@ -5,11 +5,12 @@ ProfitHandler: 수익률 관련 API 요청 처리
 - ProfitService 의존
 """
 
+from datetime import date
 from typing import Optional, List
 
 from fastapi import HTTPException
 
-from app.trifin.domain.profit.profit_model import ProfitRead
+from app.trifin.domain.profit.profit_model import PositionSnapshotRead, ProfitRead, ProfitSnapshotRead
 from app.trifin.domain.profit.profit_service import ProfitService
 
 
@@ -23,14 +24,24 @@ class ProfitHandler:
             raise HTTPException(status_code=404, detail="Profit not found")
         return ProfitRead.model_validate(profit)
 
-    async def list_profits_by_user(
-            self, user_id: int, limit: int = 100
-    ) -> List[ProfitRead]:
-        profits = await self.profit_service.list_profits_by_user(user_id, limit)
-        return [ProfitRead.model_validate(p) for p in profits]
+    async def list_profits_by_user(self, user_id: int) -> List[ProfitSnapshotRead]:
+        snapshots = await self.profit_service.list_profits_by_user(user_id)
+        return [ProfitSnapshotRead.model_validate(s) for s in snapshots]
 
     async def list_profits_by_account(
-            self, account_id: int, limit: int = 100
-    ) -> List[ProfitRead]:
-        profits = await self.profit_service.list_profits_by_account(account_id, limit)
-        return [ProfitRead.model_validate(p) for p in profits]
+            self, account_id: int, start: Optional[date] = None, end: Optional[date] = None, limit: int = 100
+    ) -> List[ProfitSnapshotRead]:
+        snapshots = await self.profit_service.list_profits_by_account(account_id, start, end, limit)
+        return [ProfitSnapshotRead.model_validate(s) for s in snapshots]
+
+    async def get_latest_profit_by_account(self, account_id: int) -> ProfitSnapshotRead:
+        snapshot = await self.profit_service.get_latest_profit_by_account(account_id)
+        if not snapshot:
+            raise HTTPException(status_code=404, detail="Profit snapshot not found")
+        return ProfitSnapshotRead.model_validate(snapshot)
+
+    async def list_positions_by_account(
+            self, account_id: int, snapshot_date: Optional[date] = None
+    ) -> List[PositionSnapshotRead]:
+        positions = await self.profit_service.list_positions_by_account(account_id, snapshot_date)
+        return [PositionSnapshotRead.model_validate(p) for p in positions]
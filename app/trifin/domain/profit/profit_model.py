@@ -3,8 +3,13 @@ profit_model.py (Domain)
 
 - 목적: 수익률(Profit) 도메인용 Pydantic Request/Response 모델 정의
 - 작성일: 2025-06-07
+- 변경이력:
+    - 계좌별 일별 손익/포지션 스냅샷 응답 모델 추가 (2025-06-16)
 """
 
+from datetime import date
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -15,4 +20,35 @@ class ProfitRead(BaseModel):
     profit: float
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class ProfitSnapshotRead(BaseModel):
+    account_id: int
+    user_id: int
+    date: date
+    cash: float
+    total_deposit: float
+    realized_pnl: float
+    cost_basis: float
+    market_value: float
+    unrealized_pnl: float
+    total_pnl: float
+    profit: float
+
+    class Config:
+        from_attributes = True
+
+
+class PositionSnapshotRead(BaseModel):
+    account_id: int
+    date: date
+    symbol: str
+    unit: str
+    size: float
+    cost_basis: float
+    close: Optional[float] = None
+    market_value: float
+
+    class Config:
+        from_attributes = True
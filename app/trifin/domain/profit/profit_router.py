@@ -2,14 +2,16 @@
 profit_router.py
 
 Profit 관련 API 라우터 정의
+- 유저/계좌별 손익은 일별 스냅샷(pnl_snapshot, position_snapshot) 조회
 """
 
-from typing import List
+from datetime import date
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends
 
 from app.trifin.domain.profit.profit_handler import ProfitHandler
-from app.trifin.domain.profit.profit_model import ProfitRead
+from app.trifin.domain.profit.profit_model import PositionSnapshotRead, ProfitRead, ProfitSnapshotRead
 from app.trifin.domain.profit.profit_service import ProfitService
 
 profit_router = APIRouter(prefix="/api/profit")
@@ -30,17 +32,35 @@ async def get_profit(
     return await handler.get_profit(profit_id)
 
 
-@profit_router.get("/user/{user_id}", response_model=List[ProfitRead])
+@profit_router.get("/user/{user_id}", response_model=List[ProfitSnapshotRead])
 async def list_profits_by_user(
-        user_id: int, limit: int = 100, handler: ProfitHandler = Depends(get_profit_handler)
+        user_id: int, handler: ProfitHandler = Depends(get_profit_handler)
 ):
-    return await handler.list_profits_by_user(user_id, limit)
+    return await handler.list_profits_by_user(user_id)
 
 
-@profit_router.get("/account/{account_id}", response_model=List[ProfitRead])
+@profit_router.get("/account/{account_id}", response_model=List[ProfitSnapshotRead])
 async def list_profits_by_account(
         account_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
         limit: int = 100,
         handler: ProfitHandler = Depends(get_profit_handler),
 ):
-    return await handler.list_profits_by_account(account_id, limit)
+    return await handler.list_profits_by_account(account_id, start, end, limit)
+
+
+@profit_router.get("/account/{account_id}/latest", response_model=ProfitSnapshotRead)
+async def get_latest_profit_by_account(
+        account_id: int, handler: ProfitHandler = Depends(get_profit_handler)
+):
+    return await handler.get_latest_profit_by_account(account_id)
+
+
+@profit_router.get("/account/{account_id}/positions", response_model=List[PositionSnapshotRead])
+async def list_positions_by_account(
+        account_id: int,
+        snapshot_date: Optional[date] = None,
+        handler: ProfitHandler = Depends(get_profit_handler),
+):
+    return await handler.list_positions_by_account(account_id, snapshot_date)
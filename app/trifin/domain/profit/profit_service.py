@@ -3,11 +3,21 @@ profit_service.py
 
 ProfitService: 수익률 관련 비즈니스 로직 담당 서비스 계층
 - insert, get 등 repository 연동
+- 계좌/유저별 손익은 배치(batch/trifin/pnl_snapshot.py)가 미리 계산한 일별 스냅샷을 조회 (요청 시 재계산하지 않음)
 """
+from datetime import date
 from typing import Optional, List
 
+from app.trifin.data.repository.models.pnl_snapshot_table import PnlSnapshot
+from app.trifin.data.repository.models.position_snapshot_table import PositionSnapshot
 from app.trifin.data.repository.models.profit_table import Profit
-from app.trifin.data.repository.profit_repository import insert_profit, get_profit_by_id, get_profits_by_user_id, get_profits_by_account_id
+from app.trifin.data.repository.pnl_snapshot_repository import (
+    get_latest_snapshot_by_account_id,
+    get_latest_snapshots_by_user_id,
+    get_positions_by_account_id,
+    get_snapshots_by_account_id,
+)
+from app.trifin.data.repository.profit_repository import insert_profit, get_profit_by_id
 
 
 class ProfitService:
@@ -17,8 +27,18 @@ class ProfitService:
     async def get_profit(self, profit_id: int) -> Optional[Profit]:
         return get_profit_by_id(profit_id)
 
-    async def list_profits_by_user(self, user_id: int, limit: int = 100) -> List[Profit]:
-        return get_profits_by_user_id(user_id, limit)
+    async def list_profits_by_user(self, user_id: int) -> List[PnlSnapshot]:
+        return get_latest_snapshots_by_user_id(user_id)
 
-    async def list_profits_by_account(self, account_id: int, limit: int = 100) -> List[Profit]:
-        return get_profits_by_account_id(account_id, limit)
+    async def list_profits_by_account(
+            self, account_id: int, start: Optional[date] = None, end: Optional[date] = None, limit: int = 100
+    ) -> List[PnlSnapshot]:
+        return get_snapshots_by_account_id(account_id, start, end, limit)
+
+    async def get_latest_profit_by_account(self, account_id: int) -> Optional[PnlSnapshot]:
+        return get_latest_snapshot_by_account_id(account_id)
+
+    async def list_positions_by_account(
+            self, account_id: int, snapshot_date: Optional[date] = None
+    ) -> List[PositionSnapshot]:
+        return get_positions_by_account_id(account_id, snapshot_date)
@@ -1,8 +1,8 @@
 import sys
 
 from batch.trifin.backtesting.rebalance import run_backtesting
-from lib.exception_utils import print_exception_detail
-from lib.logger import get_logger
+from core.util.exception_utils import print_exception_detail
+from core.util.logger import get_logger
 
 logger = get_logger()
 
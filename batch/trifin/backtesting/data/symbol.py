@@ -6,6 +6,7 @@ class Symbol(str, Enum):
     SPY = "SPY"  # S&P500 ETF
     SCHD = "SCHD"  # 배당 ETF
     BTC = "BTC-USD"  # 비트코인
+    BTC_KRW = "KRW-BTC"  # 비트코인 원화 (빗썸)
     GOLD = "GLD"  # 금 ETF
     TLT = "TLT"  # 미국 장기채 ETF
     BOND_ANNUAL_3_5 = "BOND_ANNUAL_3_5"  # 연 3.5% 이자 채권(가상)
@@ -33,8 +33,8 @@ import pandas as pd
 from batch.trifin.backtesting import USDT_APR, BOND_ANNUAL_3_5_APR
 from batch.trifin.backtesting.config import DYNAMIC_DEFENSE_WEIGHTS, GROWTH_ASSETS
 from batch.trifin.backtesting.data.symbol import Symbol
-from lib.exception_utils import print_exception_detail
-from lib.logger import get_logger
+from core.util.exception_utils import print_exception_detail
+from core.util.logger import get_logger
 
 logger = get_logger()
 
@@ -12,6 +12,9 @@ dynamic_rebalance.py
 - 예외처리 및 robust 설계
 - 변경이력:
     - v1.0.0: 최초 작성 (2025-05-23)
+    - v1.1.0: 전고점(pastPeak) 상태를 가격 시계열 전체에 대해 한 번에 계산해 일자 간 상태 유지,
+              CHANGE_ALLOC_TABLE 조회를 searchsorted 기반으로 변경
+    - v1.1.1: 조회/전고점 캐시가 DataFrame을 weakref로만 참조 (파라미터 스윕 반복 실행 시 메모리 누적 방지)
 - TODO:
     - 거래비용/세금 반영
     - 리밸런싱 주기/날짜 파라미터화
@@ -20,6 +23,9 @@ dynamic_rebalance.py
 참고: 자세한 비중 조정 방법은 Readme.MD 참조
 """
 
+import weakref
+
+import numpy as np
 import pandas as pd
 
 from batch.trifin.backtesting import USDT_APR, BOND_ANNUAL_3_5_APR
@@ -31,7 +37,7 @@ from batch.trifin.backtesting.config import (
     DYNAMIC_DEFENSE_WEIGHTS,
 )
 from batch.trifin.backtesting.data.symbol import Symbol
-from lib.logger import get_logger
+from core.util.logger import get_logger
 
 logger = get_logger()
 
@@ -99,6 +105,7 @@ def get_dynamic_alloc(drawdown: float, table: pd.DataFrame, symbol: str) -> floa
 def get_change_alloc(change: float, table: pd.DataFrame, symbol: str) -> float:
     """
     상승폭에 따라 개별 성장자산의 동적 비중을 반환 (전저점 기준)
+    - change 이하인 구간 중 가장 큰 구간의 비중, 해당 구간이 없으면 가장 작은 구간의 비중
     Args:
         change (float): 해당 자산의 전저점 대비 상승률(%)
         table (pd.DataFrame): change-비중 매핑 테이블
@@ -109,18 +116,98 @@ def get_change_alloc(change: float, table: pd.DataFrame, symbol: str) -> float:
         >>> get_change_alloc(13, CHANGE_ALLOC_TABLE, Symbol.QQQ)
         0.16
     """
-    filtered_change: pd.Series
-    filtered = table[table["change"] <= change]
-    if not isinstance(filtered["change"], pd.Series):
-        filtered_change = pd.Series(filtered["change"])
-    else:
-        filtered_change = filtered["change"]  # pyright: ignore[reportAssignmentType]
-    if not filtered.empty:
-        idx = filtered_change.idxmax()
-    else:
-        idx = table["change"].idxmin()
-    row = table.loc[[idx]]
-    return float(row[symbol.name].values[0])
+    changes, allocs = _get_change_alloc_lookup(table)
+    idx = int(np.searchsorted(changes, change, side="right")) - 1
+    if idx < 0 or np.isnan(change):
+        idx = 0
+    return float(allocs[symbol.name][idx])
+
+
+class _FrameCache:
+    """
+    DataFrame 객체 단위 계산 결과 캐시 (DataFrame은 hash 불가하므로 id 키 + weakref)
+    - DataFrame을 강하게 참조하지 않으며, DataFrame이 GC되면 항목도 제거
+      (sweep 등에서 매 실행 deepcopy된 테이블/가격 데이터가 캐시에 누적되지 않음)
+    """
+
+    def __init__(self):
+        self._entries = {}  # id(DataFrame) -> (weakref, 계산 결과)
+
+    def get(self, frame: pd.DataFrame, compute):
+        key = id(frame)
+        entry = self._entries.get(key)
+        if entry is None or entry[0]() is not frame:
+            entry = self._entries[key] = (weakref.ref(frame), compute(frame))
+            weakref.finalize(frame, self._entries.pop, key, None)
+        return entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_change_alloc_lookup_cache = _FrameCache()
+
+
+def _build_change_alloc_lookup(table: pd.DataFrame) -> tuple:
+    sorted_table = table.sort_values("change", kind="stable")
+    allocs = {
+        column: sorted_table[column].to_numpy(dtype=float)
+        for column in sorted_table.columns
+        if column != "change"
+    }
+    return sorted_table["change"].to_numpy(dtype=float), allocs
+
+
+def _get_change_alloc_lookup(table: pd.DataFrame) -> tuple:
+    """
+    change-비중 테이블을 change 오름차순 배열로 변환해 캐시 (테이블 객체 단위)
+    :return: (정렬된 change 배열, {심볼명: 비중 배열})
+    """
+    return _change_alloc_lookup_cache.get(table, _build_change_alloc_lookup)
+
+
+# =====================
+# 전고점(pastPeak) 상태 추적
+# =====================
+def calc_peak_change(prices) -> np.ndarray:
+    """
+    가격 시계열 전체에 대해 전고점(pastPeak) 상태 머신을 한 번에 계산 (Readme.MD '전고점의 판단')
+    - highest: 시계열 시작부터의 누적 최고가
+    - 하락장(현재가 < highest): pastPeak = highest
+    - 하락장에서 highest를 돌파하는 순간 pastPeak = 그 순간의 highest, 이후 상승장 동안 유지
+    Args:
+        prices: 일자 오름차순 가격 배열
+    Returns:
+        np.ndarray: 일자별 pastPeak 대비 변화율(%)
+    Example:
+        >>> calc_peak_change([100, 110, 99, 120, 130]).round(2)
+        array([ 0.  , 10.  , -10.  ,  0.  ,  8.33])
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.size == 0:
+        return prices
+    highest = np.fmax.accumulate(prices)
+    in_downtrend = prices < highest
+    # 시계열 첫날과 하락장 -> 상승장 전환일이 상승장의 기준점
+    was_downtrend = np.concatenate(([True], in_downtrend[:-1]))
+    breakout = pd.Series(np.where(~in_downtrend & was_downtrend, prices, np.nan)).ffill().to_numpy()
+    past_peak = np.where(in_downtrend, highest, breakout)
+    return (prices - past_peak) / past_peak * 100
+
+
+_peak_change_cache = _FrameCache()
+
+
+def _build_peak_change(price_df: pd.DataFrame) -> tuple:
+    price_series = price_df["price"].sort_index()
+    return price_series.index, calc_peak_change(price_series.to_numpy())
+
+
+def _get_peak_change(price_df: pd.DataFrame) -> tuple:
+    """
+    가격 DataFrame별 (일자 index, 전고점 대비 변화율 배열)을 캐시해 리밸런싱일마다 재계산하지 않음
+    """
+    return _peak_change_cache.get(price_df, _build_peak_change)
 
 
 # =====================
@@ -184,44 +271,13 @@ def get_dynamic_target_alloc(reb_date, price_data):
     growth_alloc = {}
     growth_sum = 0.0
 
-    # 각 자산별 전고점(pastPeak) 및 역대 최고가(highest) 상태 관리
-    pastPeak = {sym: None for sym in GROWTH_ASSETS}
-    highest = {sym: None for sym in GROWTH_ASSETS}
-    in_downtrend = {sym: False for sym in GROWTH_ASSETS}
-
     for sym in GROWTH_ASSETS:
-        price_series = price_data[sym]["price"]
-        # pandas Series로 보장: idxmin/idxmax 등 사용 가능
-        price_now = price_series[price_series.index <= reb_date].iloc[-1]
-
-        # 전고점/최고가 관리 (Readme.MD 규칙)
-        if highest[sym] is None:
-            highest[sym] = price_now
-            pastPeak[sym] = price_now
-            in_downtrend[sym] = False
-
-        # 최고가 갱신
-        if price_now >= highest[sym]:
-            highest[sym] = price_now
-            # 상승장: 최고가 갱신 시 pastPeak는 그대로 유지
-            # 단, 하락장에서 최고가를 돌파하면 pastPeak도 갱신
-            if in_downtrend[sym]:
-                pastPeak[sym] = highest[sym]
-                in_downtrend[sym] = False
-        elif price_now < highest[sym]:
-            # 하락장 진입: pastPeak = highest
-            if not in_downtrend[sym]:
-                pastPeak[sym] = highest[sym]
-                in_downtrend[sym] = True
-            # 하락장에서 가격이 다시 상승장으로 전환될 때 pastPeak = 이 순간의 highest
-            # (위의 if문에서 처리)
-        # 상승장에서 가격이 최고가보다 낮아지는 순간, pastPeak = 현재가격
-        if not in_downtrend[sym] and price_now < highest[sym]:
-            pastPeak[sym] = price_now
-            in_downtrend[sym] = True
-
-        # delta만 계산 (전고점 기준)
-        change = (price_now - pastPeak[sym]) / pastPeak[sym] * 100  # %
+        # 전고점 상태는 가격 시계열 전체에 대해 미리 계산된 값을 reb_date 시점으로 조회
+        dates, peak_changes = _get_peak_change(price_data[sym])
+        pos = dates.searchsorted(reb_date, side="right") - 1
+        if pos < 0:
+            raise IndexError(f"{sym}: {reb_date} 이전 가격 데이터가 없습니다.")
+        change = peak_changes[pos]  # %
 
         alloc = get_change_alloc(change, CHANGE_ALLOC_TABLE, sym)
         # if change >= 0:
@@ -373,3 +429,36 @@ def test_get_change_alloc():
     assert get_change_alloc(15, CHANGE_ALLOC_TABLE, Symbol.QQQ) == 0.14
     assert get_change_alloc(40, CHANGE_ALLOC_TABLE, Symbol.QQQ) == 0.12
     logger.debug("[테스트] get_upward_alloc 정상 동작 확인")
+
+
+def test_calc_peak_change():
+    """
+    calc_peak_change 함수의 단위 테스트
+    - 하락장 진입 시 pastPeak = highest, 하락장에서 최고가 돌파 시 pastPeak = 그 시점 최고가로 상태가 이어지는지 검증
+    """
+    changes = calc_peak_change([100, 110, 99, 105, 120, 130, 125])
+    expected = [0.0, 10.0, -10.0, -100 / 22, 0.0, 100 / 12, -100 / 26]
+    assert np.allclose(changes, expected)
+
+
+def test_frame_cache_releases_frames():
+    """
+    _FrameCache 단위 테스트
+    - 같은 DataFrame은 재계산하지 않고, DataFrame이 GC되면 캐시 항목도 제거되는지 검증
+    """
+    import copy
+    import gc
+
+    cache = _FrameCache()
+    calls = []
+    table = CHANGE_ALLOC_TABLE.copy()
+    compute = lambda frame: calls.append(id(frame)) or len(frame)
+    assert cache.get(table, compute) == cache.get(table, compute) == len(table)
+    assert len(calls) == 1
+    for _ in range(5):
+        cache.get(copy.deepcopy(table), compute)
+    gc.collect()
+    assert len(calls) == 6 and len(cache) == 1
+    del table
+    gc.collect()
+    assert len(cache) == 0
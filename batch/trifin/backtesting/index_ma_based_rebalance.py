@@ -23,7 +23,7 @@ from batch.trifin.backtesting.config import (
     GROWTH_ASSETS,
 )
 from batch.trifin.backtesting.data.symbol import Symbol
-from lib.logger import get_logger
+from core.util.logger import get_logger
 
 logger = get_logger()
 
@@ -0,0 +1,247 @@
+"""
+metrics.py
+
+백테스트 자산가치 곡선의 성과 지표를 벡터 연산으로 한 번에 계산하는 모듈
+
+- 지표: 최종 자산가치, 누적 수익률, CAGR, MDD(+ 고점/저점/회복 일자), Calmar, 변동성, Sharpe, Sortino,
+        underwater(전고점 미만) 비율 및 최장 기간
+- 수익률은 불입액을 반영한 기간 수익률 사용: r_t = V_t / (V_{t-1} + C_t) - 1
+- compute_metrics: history DataFrame의 여러 전략 컬럼을 한 번에 계산
+- compute_metrics_array: (곡선 수, 기간 수) 2차원 배열로 쌓인 다수 곡선(sweep 결과 등)을 한 번에 계산
+- rolling_volatility: 전략별 rolling 연환산 변동성
+
+사용 예시:
+    metrics_df = compute_metrics(df_hist, ["static_rebalance", "dynamic_rebalance"], years=10, periods_per_year=12)
+    metrics = compute_metrics_array(np.vstack(curves), periods_per_year=12)
+
+작성일: 2025-06-15
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+RISK_FREE_RATE = 0.035  # 연간 무위험 수익률 (utils.get_sharpe_ratio 기본값과 동일)
+
+
+# =====================
+# 내부 계산 (곡선 = 행)
+# =====================
+def _as_contributions(contributions, values: np.ndarray) -> np.ndarray:
+    """
+    불입액을 (곡선 수 또는 1, 기간 수) 배열로 정규화
+    - None: 첫 시점 자산가치를 1회 불입한 것으로 간주
+    - 스칼라: 매 기간(첫 시점 포함) 동일 금액 불입
+    - 1차원/2차원 배열: 기간별 불입액
+    """
+    n_curves, n_periods = values.shape
+    if contributions is None:
+        result = np.zeros((n_curves, n_periods))
+        result[:, 0] = values[:, 0]
+        return result
+    if np.isscalar(contributions):
+        return np.full((1, n_periods), float(contributions))
+    result = np.asarray(contributions, dtype=float)
+    if result.ndim == 1:
+        result = result[np.newaxis, :]
+    if result.shape[-1] != n_periods:
+        raise ValueError(f"불입액 기간 수({result.shape[-1]})가 자산가치 기간 수({n_periods})와 다릅니다.")
+    return result
+
+
+def _period_returns(values: np.ndarray, contributions: np.ndarray) -> np.ndarray:
+    """불입액을 반영한 기간 수익률 (첫 시점 제외)"""
+    base = values[:, :-1] + contributions[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return values[:, 1:] / base - 1
+
+
+def _drawdown_stats(values: np.ndarray) -> dict:
+    n_curves, n_periods = values.shape
+    rows = np.arange(n_curves)
+    positions = np.broadcast_to(np.arange(n_periods), values.shape)
+
+    running_max = np.fmax.accumulate(values, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = values / running_max - 1
+    drawdown = np.nan_to_num(drawdown, nan=0.0)
+
+    trough = drawdown.argmin(axis=1)
+    # 각 시점까지의 최고가 위치 → 저점 직전 고점 위치
+    peak_positions = np.maximum.accumulate(np.where(values >= running_max, positions, 0), axis=1)
+    peak = peak_positions[rows, trough]
+    # 저점 이후 고점 수준을 회복한 첫 시점 (낙폭이 없거나 미회복이면 -1)
+    recovered = (positions > trough[:, None]) & (values >= running_max[rows, trough][:, None])
+    has_recovery = recovered.any(axis=1) & (drawdown.min(axis=1) < 0)
+    recovery = np.where(has_recovery, recovered.argmax(axis=1), -1)
+
+    # underwater: 전고점 미만 구간 비율 및 최장 연속 기간(기간 수)
+    underwater = drawdown < 0
+    cumulative = np.cumsum(underwater, axis=1)
+    reset = np.maximum.accumulate(np.where(underwater, 0, cumulative), axis=1)
+    streak = cumulative - reset
+    return {
+        "mdd": drawdown.min(axis=1) * 100,
+        "mdd_peak_pos": peak,
+        "mdd_trough_pos": trough,
+        "mdd_recovery_pos": recovery,
+        "underwater_ratio": underwater.mean(axis=1),
+        "max_underwater_periods": streak.max(axis=1),
+        "max_underwater_end_pos": streak.argmax(axis=1),
+    }
+
+
+def _metrics_2d(
+        values: np.ndarray,
+        contributions=None,
+        years: Optional[float] = None,
+        periods_per_year: float = 12,
+        risk_free_rate: float = RISK_FREE_RATE,
+) -> dict:
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    contributions = _as_contributions(contributions, values)
+    n_periods = values.shape[1]
+    if years is None:
+        years = max(n_periods - 1, 1) / periods_per_year
+
+    final_value = values[:, -1]
+    total_contributed = np.broadcast_to(contributions.sum(axis=1), final_value.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = final_value / total_contributed
+        cagr = (np.power(growth, 1 / years) - 1) * 100
+    stats = _drawdown_stats(values)
+    mdd = stats["mdd"]
+
+    returns = _period_returns(values, contributions)
+    excess = returns - risk_free_rate / periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if returns.shape[1] >= 2:
+            mean_excess = np.nanmean(excess, axis=1) * periods_per_year
+            volatility = np.nanstd(returns, axis=1, ddof=1) * np.sqrt(periods_per_year)
+            std_excess = np.nanstd(excess, axis=1, ddof=1) * np.sqrt(periods_per_year)
+            downside = np.sqrt(np.nanmean(np.minimum(excess, 0) ** 2, axis=1)) * np.sqrt(periods_per_year)
+        else:
+            mean_excess = volatility = std_excess = downside = np.full(values.shape[0], np.nan)
+        sharpe = np.where(std_excess > 0, mean_excess / std_excess, np.nan)
+        sortino = np.where(downside > 0, mean_excess / downside, np.nan)
+        calmar = np.where(mdd != 0, cagr / -mdd, 0.0)
+
+    return {
+        "total_contributed": total_contributed.astype(float),
+        "final_value": final_value,
+        "cumulative_return": growth * 100,
+        "cagr": cagr,
+        "mdd": mdd,
+        "calmar_ratio": calmar,
+        "volatility": volatility * 100,
+        "sharpe_ratio": sharpe,
+        "sortino_ratio": sortino,
+        **{k: v for k, v in stats.items() if k != "mdd"},
+    }
+
+
+# =====================
+# 공개 함수
+# =====================
+def compute_metrics_array(
+        values,
+        contributions=None,
+        years: Optional[float] = None,
+        periods_per_year: float = 12,
+        risk_free_rate: float = RISK_FREE_RATE,
+) -> dict:
+    """
+    (곡선 수, 기간 수) 2차원 배열로 쌓인 자산가치 곡선들의 지표를 한 번에 계산
+    Args:
+        values: 자산가치 곡선 배열 (행 = 곡선, 열 = 기간)
+        contributions: 불입액 (None=첫 시점 1회, 스칼라=매 기간, 배열=기간별)
+        years: 투자 연수 (None이면 기간 수 / periods_per_year)
+        periods_per_year: 연간 기간 수 (월 리밸런싱이면 12)
+        risk_free_rate: 연간 무위험 수익률
+    Returns:
+        dict: 지표명 -> (곡선 수,) 배열. MDD 고점/저점/회복, underwater 종료 시점은 기간 위치(-1=미회복)
+    """
+    return _metrics_2d(values, contributions, years, periods_per_year, risk_free_rate)
+
+
+def infer_periods_per_year(index) -> float:
+    """일자 index 간격의 중앙값으로 연간 기간 수 추정 (월별이면 약 12)"""
+    dates = pd.to_datetime(pd.Index(index))
+    if len(dates) < 2:
+        return 12.0
+    median_days = np.median(np.diff(dates.values).astype("timedelta64[s]").astype(float)) / 86400
+    return 365.25 / median_days if median_days > 0 else 12.0
+
+
+def compute_metrics(
+        df: pd.DataFrame,
+        columns: Optional[Sequence[str]] = None,
+        contributions=None,
+        years: Optional[float] = None,
+        periods_per_year: Optional[float] = None,
+        risk_free_rate: float = RISK_FREE_RATE,
+) -> pd.DataFrame:
+    """
+    history DataFrame의 전략 컬럼별 지표를 한 번에 계산
+    Args:
+        df: 전략별 자산가치 시계열 (index=date)
+        columns: 계산할 컬럼 (None이면 숫자형 컬럼 전체)
+        contributions: 불입액 (compute_metrics_array 참고)
+        years: 투자 연수 (None이면 첫/마지막 일자 차이)
+        periods_per_year: 연간 기간 수 (None이면 일자 간격으로 추정)
+    Returns:
+        pd.DataFrame: index=컬럼명, MDD 고점/저점/회복 일자 및 최장 underwater 일수 포함
+    """
+    if columns is None:
+        columns = list(df.select_dtypes("number").columns)
+    dates = pd.to_datetime(pd.Index(df.index))
+    if years is None and len(dates) >= 2:
+        years = (dates[-1] - dates[0]).days / 365.25
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(dates)
+
+    metrics = _metrics_2d(
+        df[list(columns)].to_numpy(dtype=float).T,
+        contributions,
+        years,
+        periods_per_year,
+        risk_free_rate,
+    )
+    result = pd.DataFrame(
+        {k: v for k, v in metrics.items() if not k.endswith("_pos")}, index=pd.Index(columns, name="strategy")
+    )
+
+    def to_date(positions):
+        return pd.DatetimeIndex([dates[p] if p >= 0 else pd.NaT for p in positions])
+
+    result["mdd_peak_date"] = to_date(metrics["mdd_peak_pos"])
+    result["mdd_trough_date"] = to_date(metrics["mdd_trough_pos"])
+    result["mdd_recovery_date"] = to_date(metrics["mdd_recovery_pos"])
+    # 최장 underwater 구간: 시작 직전 고점 ~ 마지막 underwater 시점
+    end = metrics["max_underwater_end_pos"]
+    start = np.maximum(end - metrics["max_underwater_periods"], 0)
+    result["max_underwater_days"] = np.where(
+        metrics["max_underwater_periods"] > 0,
+        (dates[end] - dates[start]).days,
+        0,
+    )
+    return result
+
+
+def rolling_volatility(
+        df: pd.DataFrame,
+        window: int = 12,
+        columns: Optional[Sequence[str]] = None,
+        contributions=None,
+        periods_per_year: Optional[float] = None,
+) -> pd.DataFrame:
+    """전략 컬럼별 불입액 반영 기간 수익률의 rolling 연환산 변동성(%)"""
+    if columns is None:
+        columns = list(df.select_dtypes("number").columns)
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(df.index)
+    values = df[list(columns)].to_numpy(dtype=float).T
+    returns = _period_returns(values, _as_contributions(contributions, values))
+    returns = pd.DataFrame(returns.T, index=df.index[1:], columns=list(columns))
+    return returns.rolling(window).std() * np.sqrt(periods_per_year) * 100
@@ -23,6 +23,9 @@ TODO:
     - 리포트/시각화 기능 추가
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
 from batch.trifin.backtesting.buy_and_hold import get_buy_and_hold
@@ -39,7 +42,10 @@ from batch.trifin.backtesting.dynamic_ma_based_rebalance import (
 )
 from batch.trifin.backtesting.dynamic_rebalance import get_dynamic_rebalance_history
 from batch.trifin.backtesting.index_based_rebalance import get_index_based_rebalance_history
-from batch.trifin.backtesting.index_ma_based_rebalance import get_index_ma_based_rebalance_history, get_today_index_ma_based_allocation
+from batch.trifin.backtesting.index_ma_based_rebalance import (
+    get_index_ma_based_rebalance_history,
+    get_today_index_ma_based_allocation,
+)
 from batch.trifin.backtesting.single_asset_strategy import run_single_asset_strategy
 from batch.trifin.backtesting.static_rebalance import get_static_rebalance_history
 from batch.trifin.backtesting.utils import (
@@ -49,36 +55,128 @@ from batch.trifin.backtesting.utils import (
     print_recommand_weight,
     print_final_ratio,
     print_summary,
-    save_result_csv,
-    plot_performance,
 )
-from lib.logger import get_logger
+from batch.trifin.backtesting.report import REPORT_DIR, submit_report, to_allocation
+from batch.trifin.backtesting.result_store import (
+    collect_params,
+    fingerprint_market_data,
+    new_run_id,
+    save_run,
+)
+from core.util.logger import get_logger
 
 logger = get_logger()
 
 
+STRATEGIES = (
+    "buy_and_hold",
+    "static_rebalance",
+    "dynamic_rebalance",
+    "dynamic_ma_based_rebalance",
+    "index_based_rebalance",
+    "index_ma_based_rebalance",
+)
+
+MA_WINDOWS = [5, 20, 60, 120]
+
+
 # =====================
 # 백테스트 메인 로직
 # =====================
-def run_backtesting():
+def run_backtesting(report=True):
     include_single_asset = False
     onetime_invest = True
     """
     10년간 매월 15일 리밸런싱하며 누적/연환산 수익률 계산
+    - report: False면 차트/HTML 리포트 생성 생략
     """
     # 1. 가격 데이터 준비
     price_data = load_all_prices(START_DATE_WITH_GAP, END_DATE)
     rebalance_dates = generate_rebalance_dates(START_DATE, END_DATE)
     index_data = load_all_macro_indices(START_DATE_WITH_GAP, END_DATE)
 
+    # 2~3. 전략별 매월 리밸런싱
+    df_hist, histories, cols_and_labels = run_strategies(
+        price_data,
+        index_data,
+        rebalance_dates,
+        onetime_invest=onetime_invest,
+        include_single_asset=include_single_asset,
+    )
+
+    ratio = get_today_index_ma_based_allocation(price_data, index_data)
+
+    # ====== 공통 함수로 결과 요약/저장/그래프 ======
+    run_id = new_run_id()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # 리포트(차트/HTML)는 결과 저장(SQLite I/O)과 겹쳐 생성 (다수 run은 report.report_runs)
+        report_future = None
+        if report:
+            report_future = submit_report(
+                executor,
+                df_hist,
+                cols_and_labels,
+                os.path.join(REPORT_DIR, f"report_{run_id}.html"),
+                allocation=to_allocation(histories["index_ma_based_rebalance"], "index_ma_based_rebalance"),
+                title=f"run_backtesting {run_id}",
+            )
+        summary = print_summary(df_hist, YEARS, cols_and_labels, onetime_invest=onetime_invest)
+        save_run(
+            df_hist,
+            summary,
+            params=collect_params({"onetime_invest": onetime_invest}),
+            data_fingerprint=fingerprint_market_data(price_data, index_data),
+            run_id=run_id,
+            note="run_backtesting",
+        )
+        # 'index_ma_based_rebalance' 컬럼 제외 후 전달
+        print_recommand_weight(
+            histories["index_ma_based_rebalance"].drop(columns=["index_ma_based_rebalance"])
+        )
+        print_final_ratio(ratio)
+        if report_future is not None:
+            try:
+                report_future.result()
+            except Exception as e:
+                logger.warning(f"[리포트] 리포트 생성 실패: {e}")
+    return df_hist
+
+
+def run_strategies(
+        price_data,
+        index_data,
+        rebalance_dates,
+        strategies=STRATEGIES,
+        onetime_invest=True,
+        include_single_asset=False,
+        init_portfolio=INIT_PORTFOLIO,
+):
+    """
+    이미 로딩된 가격/지표 데이터로 전략별 리밸런싱을 수행하고 결과를 반환 (DB, 파일, 그래프 접근 없음)
+    - run_backtesting 및 파라미터 스윕(sweep.py) 워커에서 공통으로 사용
+    Args:
+        price_data (dict): {symbol: DataFrame(price)}
+        index_data (pd.DataFrame): macro 지표 데이터 (index=date)
+        rebalance_dates (list): 리밸런싱 날짜 리스트
+        strategies (Iterable[str]): 실행할 전략 이름 (STRATEGIES 중 선택)
+        onetime_invest (bool): True면 첫 리밸런싱에만 불입
+        include_single_asset (bool): 단일 자산 몰빵 전략 포함 여부
+        init_portfolio (float): 불입액
+    Returns:
+        tuple: (전략별 평가액이 합쳐진 df_hist, {전략: 자산별 history DataFrame}, cols_and_labels)
+    """
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        raise ValueError(f"알 수 없는 전략: {sorted(unknown)}")
+
     # 2. 포트폴리오 초기화
-    cash = INIT_PORTFOLIO
+    cash = init_portfolio
 
     buy_and_hold_portfolio = {k: 0.0 for k in TOTAL_ASSETS.keys()}
     static_portfolio = {k: 0.0 for k in TOTAL_ASSETS.keys()}
     dynamic_portfolio = {k: 0.0 for k in TOTAL_ASSETS.keys()}
 
-    windows = [5, 20, 60, 120]
+    windows = MA_WINDOWS
     dynamic_ma_portfolios = []
     for _ in range(len(windows) + 1):
         dynamic_ma_portfolios.append({k: 0.0 for k in TOTAL_ASSETS.keys()})
@@ -86,12 +184,7 @@ def run_backtesting():
     index_based_portfolio = {k: 0.0 for k in TOTAL_ASSETS.keys()}
     index_ma_based_portfolio = {k: 0.0 for k in TOTAL_ASSETS.keys()}
 
-    buy_and_hold_history = []
-    static_history = []
-    dynamic_history = []
-    dynamic_ma_based_history = []
-    index_based_history = []
-    index_ma_based_history = []
+    histories = {name: [] for name in strategies}
 
     # 3. 매월 리밸런싱
     single_asset_portfolios_mem = {}
@@ -105,52 +198,58 @@ def run_backtesting():
         # days는 prev_date ~ reb_date 구간의 일수
         days = (reb_date - prev_date).days
 
-        get_buy_and_hold(
-            price_data,
-            reb_date,
-            days,
-            cash,
-            buy_and_hold_portfolio,
-            buy_and_hold_history,
-        )
-        get_static_rebalance_history(
-            price_data,
-            reb_date,
-            days,
-            cash,
-            static_portfolio,
-            static_history,
-        )
-        get_dynamic_rebalance_history(
-            price_data, reb_date, days, cash, dynamic_portfolio, dynamic_history
-        )
-        get_dynamic_ma_based_rebalance_history(
-            price_data,
-            reb_date,
-            days,
-            cash,
-            dynamic_ma_portfolios,
-            dynamic_ma_based_history,
-            windows,
-        )
-        get_index_based_rebalance_history(
-            price_data,
-            index_data,
-            reb_date,
-            days,
-            cash,
-            index_based_portfolio,
-            index_based_history,
-        )
-        get_index_ma_based_rebalance_history(
-            price_data,
-            index_data,
-            reb_date,
-            days,
-            cash,
-            index_ma_based_portfolio,
-            index_ma_based_history,
-        )
+        if "buy_and_hold" in histories:
+            get_buy_and_hold(
+                price_data,
+                reb_date,
+                days,
+                cash,
+                buy_and_hold_portfolio,
+                histories["buy_and_hold"],
+            )
+        if "static_rebalance" in histories:
+            get_static_rebalance_history(
+                price_data,
+                reb_date,
+                days,
+                cash,
+                static_portfolio,
+                histories["static_rebalance"],
+            )
+        if "dynamic_rebalance" in histories:
+            get_dynamic_rebalance_history(
+                price_data, reb_date, days, cash, dynamic_portfolio, histories["dynamic_rebalance"]
+            )
+        if "dynamic_ma_based_rebalance" in histories:
+            get_dynamic_ma_based_rebalance_history(
+                price_data,
+                reb_date,
+                days,
+                cash,
+                dynamic_ma_portfolios,
+                histories["dynamic_ma_based_rebalance"],
+                windows,
+            )
+        if "index_based_rebalance" in histories:
+            get_index_based_rebalance_history(
+                price_data,
+                index_data,
+                reb_date,
+                days,
+                cash,
+                index_based_portfolio,
+                histories["index_based_rebalance"],
+            )
+        if "index_ma_based_rebalance" in histories:
+            get_index_ma_based_rebalance_history(
+                price_data,
+                index_data,
+                reb_date,
+                days,
+                cash,
+                index_ma_based_portfolio,
+                histories["index_ma_based_rebalance"],
+            )
 
         if onetime_invest:
             cash = 0
@@ -194,20 +293,9 @@ def run_backtesting():
                     days,
                 )
 
-    ratio = get_today_index_ma_based_allocation(price_data, index_data)
-
-    df_buy_and_hold_hist = pd.DataFrame(buy_and_hold_history)
-    df_buy_and_hold_hist.set_index("date", inplace=True)
-    df_static_hist = pd.DataFrame(static_history)
-    df_static_hist.set_index("date", inplace=True)
-    df_dynamic_hist = pd.DataFrame(dynamic_history)
-    df_dynamic_hist.set_index("date", inplace=True)
-    df_dynamic_ma_based_hist = pd.DataFrame(dynamic_ma_based_history)
-    df_dynamic_ma_based_hist.set_index("date", inplace=True)
-    df_index_based_hist = pd.DataFrame(index_based_history)
-    df_index_based_hist.set_index("date", inplace=True)
-    df_index_ma_based_hist = pd.DataFrame(index_ma_based_history)
-    df_index_ma_based_hist.set_index("date", inplace=True)
+    history_frames = {
+        name: pd.DataFrame(history).set_index("date") for name, history in histories.items()
+    }
 
     # 단일 자산 전략 결과 DataFrame 생성 및 합치기
     single_asset_histories = getattr(run_backtesting, "single_asset_histories", {})
@@ -220,32 +308,44 @@ def run_backtesting():
                 df.set_index("date", inplace=True)
                 single_asset_dfs.append(df)
 
+    # 기존 출력 순서(정적, 동적, MA, B&H, Index, Index+MA) 유지
+    concat_order = [
+        "static_rebalance",
+        "dynamic_rebalance",
+        "dynamic_ma_based_rebalance",
+        "buy_and_hold",
+        "index_based_rebalance",
+        "index_ma_based_rebalance",
+    ]
     df_hist = pd.concat(
         [
-            df_static_hist,
-            df_dynamic_hist,
-            df_dynamic_ma_based_hist,
-            df_buy_and_hold_hist,
-            df_index_based_hist,
-            df_index_ma_based_hist,
+            *[history_frames[name] for name in concat_order if name in history_frames],
             *single_asset_dfs,
         ],
         axis=1,
     )
 
-    # ====== 공통 함수로 결과 요약/저장/그래프 ======
-    cols_and_labels = [
-        ("buy_and_hold", "buy & hold"),
-        ("static_rebalance", "정적 리밸런싱"),
-        ("dynamic_rebalance", "동적 리밸런싱"),
-        *[
-            (f"dynamic_{window}ma_based_rebalance", f"동적 {window}MA 기반 리밸런싱")
-            for window in windows
-        ],
-        ("dynamic_ensemble_ma_based_rebalance", "동적 앙상블 MA 기반 리밸런싱"),
-        ("index_based_rebalance", "Index 기반 리밸런싱"),
-        ("index_ma_based_rebalance", "Index + MA 기반 리밸런싱"),
-    ]
+    cols_and_labels = []
+    if "buy_and_hold" in histories:
+        cols_and_labels.append(("buy_and_hold", "buy & hold"))
+    if "static_rebalance" in histories:
+        cols_and_labels.append(("static_rebalance", "정적 리밸런싱"))
+    if "dynamic_rebalance" in histories:
+        cols_and_labels.append(("dynamic_rebalance", "동적 리밸런싱"))
+    if "dynamic_ma_based_rebalance" in histories:
+        cols_and_labels.extend(
+            [
+                *[
+                    (f"dynamic_{window}ma_based_rebalance", f"동적 {window}MA 기반 리밸런싱")
+                    for window in windows
+                ],
+                ("dynamic_ensemble_ma_based_rebalance", "동적 앙상블 MA 기반 리밸런싱"),
+            ]
+        )
+    if "index_based_rebalance" in histories:
+        cols_and_labels.append(("index_based_rebalance", "Index 기반 리밸런싱"))
+    if "index_ma_based_rebalance" in histories:
+        cols_and_labels.append(("index_ma_based_rebalance", "Index + MA 기반 리밸런싱"))
 
     if include_single_asset:
         cols_and_labels.extend(
@@ -261,12 +361,4 @@ def run_backtesting():
             ]
         )
 
-    print_summary(df_hist, YEARS, cols_and_labels, onetime_invest=onetime_invest)
-    save_result_csv(df_hist)
-    plot_performance(df_hist, cols_and_labels)
-    # 'index_ma_based_rebalance' 컬럼 제외 후 전달
-    print_recommand_weight(
-        df_index_ma_based_hist.drop(columns=["index_ma_based_rebalance"])
-    )
-    print_final_ratio(ratio)
-    return df_hist
+    return df_hist, history_frames, cols_and_labels
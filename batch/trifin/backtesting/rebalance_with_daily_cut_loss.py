@@ -23,6 +23,10 @@ TODO:
     - 리포트/시각화 기능 추가
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
 from batch.trifin.backtesting.buy_and_hold import get_buy_and_hold
@@ -53,30 +57,42 @@ from batch.trifin.backtesting.utils import (
     print_recommand_weight,
     print_final_ratio,
     print_summary,
-    save_result_csv,
-    plot_performance,
 )
-from lib.logger import get_logger
+from batch.trifin.backtesting.report import REPORT_DIR, submit_report, to_allocation
+from batch.trifin.backtesting.result_store import (
+    collect_params,
+    fingerprint_market_data,
+    new_run_id,
+    save_run,
+)
+from core.util.logger import get_logger
 
 logger = get_logger()
 
+# =====================
+# cut loss 신호 기준
+# =====================
+CUT_LOSS_HIGH_WINDOW = 60  # 직전 N 거래일 최고가 대비 하락률 기준
+CUT_LOSS_MA_WINDOW = 20  # 직전 N 거래일 이동평균
+
 
 # =====================
 # 백테스트 메인 로직
 # =====================
-def run_backtesting_with_cut_loss():
+def run_backtesting_with_cut_loss(report=True):
     """
     10년간 매월 같은날 정기 리밸런싱 + 금락(금리/VIX/가격) 신호 감지시 일중 예외 리밸런싱을 결합한 백테스트
     - robust 예외처리, 한글 문서화, 단위테스트 포함
     - 정기 리밸런싱: 매월 15일 등 rebalance_dates 기준
     - 예외 리밸런싱: cut loss 신호 감지시 해당 일자 즉시 리밸런싱
     - 신호 감지 로직은 is_cut_loss_signal 함수 참고 (TODO: 실제 신호 로직 구체화 필요)
+    - report: False면 차트/HTML 리포트 생성 생략
     """
     # 1. 가격/지표 데이터 준비
     price_data = load_all_prices(START_DATE_WITH_GAP, END_DATE)
     rebalance_dates = generate_rebalance_dates(START_DATE, END_DATE)
     index_data = load_all_macro_indices(START_DATE_WITH_GAP, END_DATE)
-    all_dates = pd.date_range(START_DATE, END_DATE, freq="D").to_list()
+    all_dates = pd.date_range(START_DATE, END_DATE, freq="D")
 
     # 2. 포트폴리오 초기화
     cash = INIT_PORTFOLIO
@@ -98,17 +114,22 @@ def run_backtesting_with_cut_loss():
     single_asset_portfolios_mem = {}
     single_asset_histories_mem = {}
 
-    # 마지막 리밸런싱 일자 추적 (중복 방지)
+    # 마지막 리밸런싱 일자 추적
     last_rebalanced_date = None
-    is_cut_loss_dict = {}
 
-    # 날짜별 루프 (정기+예외 리밸런싱)
-    for i, cur_date in enumerate(all_dates):
-        # 정기 리밸런싱 여부
-        is_regular = cur_date in rebalance_dates
+    # 전 기간 cut loss 신호를 한 번에 계산하고, 정기 리밸런싱일 + 신호 발생일만 순회
+    cut_loss_signals = compute_cut_loss_signals(price_data, index_data, all_dates)
+    regular_mask = all_dates.isin(rebalance_dates)
+    event_mask = regular_mask | cut_loss_signals.any(axis=1).to_numpy()
 
+    # 이벤트 일자 루프 (정기+예외 리밸런싱)
+    for cur_date, is_regular, signal_row in zip(
+            all_dates[event_mask],
+            regular_mask[event_mask],
+            cut_loss_signals.to_numpy()[event_mask],
+    ):
         # 예외 리밸런싱 신호 여부
-        is_cut_loss_dict = is_cut_loss_signal(cur_date, price_data, index_data)
+        is_cut_loss_dict = dict(zip(cut_loss_signals.columns, signal_row.tolist()))
         # TODO 이걸 활용해야 함. 지금은 이거 잡힐 때 룰대로 리밸런싱만 한번 더 함
         # 지금은 cut_loss에 해당하는지 안하는지만 체크하기 때문에 해당 했다 안했다 흔들릴 때 비중이 크게크게 쏠릴 수 있음
         # 그래서 CAGR이 많이 떨어짐
@@ -117,12 +138,6 @@ def run_backtesting_with_cut_loss():
         if any(is_cut_loss_dict.values()):
             logger.info(is_cut_loss_dict)
 
-        # 리밸런싱 중복 방지: 같은 날 2회 이상 금지
-        if not is_regular and not any(is_cut_loss_dict.values()):
-            continue
-        if last_rebalanced_date == cur_date:
-            continue
-
         # prev_date 계산 (첫 리밸런싱은 자기 자신)
         if last_rebalanced_date is None:
             prev_date = rebalance_dates[0]
@@ -274,23 +289,91 @@ def run_backtesting_with_cut_loss():
                 ("bond_only", "채권 몰빵(3.5%)"),
             ]
         )
-    print_summary(df_hist, YEARS, cols_and_labels, onetime_invest=onetime_invest)
-    save_result_csv(df_hist)
-    plot_performance(df_hist, cols_and_labels)
-    try:
-        print_recommand_weight(
-            df_index_ma_based_hist.drop(columns=["index_ma_based_rebalance"])
+    run_id = new_run_id()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # 리포트(차트/HTML)는 결과 저장(SQLite I/O)과 겹쳐 생성 (다수 run은 report.report_runs)
+        report_future = None
+        if report:
+            report_future = submit_report(
+                executor,
+                df_hist,
+                cols_and_labels,
+                os.path.join(REPORT_DIR, f"report_{run_id}.html"),
+                allocation=to_allocation(df_index_ma_based_hist, "index_ma_based_rebalance"),
+                title=f"run_backtesting_with_cut_loss {run_id}",
+            )
+        summary = print_summary(df_hist, YEARS, cols_and_labels, onetime_invest=onetime_invest)
+        save_run(
+            df_hist,
+            summary,
+            params=collect_params({"onetime_invest": onetime_invest}),
+            data_fingerprint=fingerprint_market_data(price_data, index_data),
+            run_id=run_id,
+            note="run_backtesting_with_cut_loss",
         )
-    except Exception as e:
-        logger.warning(f"[리포트] 추천 비중 출력 실패: {e}")
-    print_final_ratio(ratio)
+        try:
+            print_recommand_weight(
+                df_index_ma_based_hist.drop(columns=["index_ma_based_rebalance"])
+            )
+        except Exception as e:
+            logger.warning(f"[리포트] 추천 비중 출력 실패: {e}")
+        print_final_ratio(ratio)
+        if report_future is not None:
+            try:
+                report_future.result()
+            except Exception as e:
+                logger.warning(f"[리포트] 리포트 생성 실패: {e}")
     return df_hist
 
 
+def compute_cut_loss_signals(price_data, index_data, dates) -> pd.DataFrame:
+    """
+    전 기간 cut loss 신호를 한 번에 계산 (is_cut_loss_signal의 벡터화 버전)
+    - 심볼별 직전 60 거래일 최고가, 직전 20 거래일 이동평균을 rolling으로 미리 계산
+    - VIX는 각 일자 기준 마지막 유효값(as-of)을 사용
+    - 해당 일자에 가격이 없거나 이력이 부족하면 False
+    :param dates: 신호를 계산할 일자 (DatetimeIndex)
+    :return: index=dates, columns=GROWTH_ASSETS 인 bool DataFrame
+    """
+    dates = pd.DatetimeIndex(dates)
+    signals = pd.DataFrame(False, index=dates, columns=list(GROWTH_ASSETS))
+    if "^VIX" not in index_data.columns or index_data.empty:
+        return signals
+
+    vix = pd.Series(
+        index_data["^VIX"].to_numpy(dtype=float),
+        index=pd.to_datetime(pd.Index(index_data.index)),
+    )
+    vix = vix.sort_index().ffill()
+    vix = vix[~vix.index.duplicated(keep="last")]
+    vix = vix.reindex(dates, method="ffill").to_numpy()
+
+    for sym in signals.columns:
+        if sym not in price_data:
+            continue
+        prices = price_data[sym]["price"]
+        prev_prices = prices.shift(1)
+        high = prev_prices.rolling(CUT_LOSS_HIGH_WINDOW, min_periods=1).max().to_numpy()
+        ma = prev_prices.rolling(CUT_LOSS_MA_WINDOW, min_periods=1).mean().to_numpy()
+
+        # 해당 일자 가격이 없거나(-1) 직전 거래일 수가 윈도우보다 적으면 신호 계산 제외
+        pos = prices.index.get_indexer(dates)
+        enough = pos >= max(CUT_LOSS_HIGH_WINDOW, CUT_LOSS_MA_WINDOW)
+        pos = np.where(enough, pos, 0)
+        cur_price = prices.to_numpy()[pos]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_ratio = cur_price / high[pos]
+        is_cut_loss = (price_ratio < 0.85) & (vix > 25)
+        is_cut_loss |= (price_ratio < 0.80) & (vix > 22) & (cur_price < ma[pos])
+        signals[sym] = enough & is_cut_loss
+    return signals
+
+
 def is_cut_loss_signal(cur_date, price_data, index_data) -> dict:
     """
     금락(급락) 신호 감지 함수 (예시)
     - VIX, 금리, 가격 하락률 등 임계값 기반 (TODO: 실제 기준 구체화)
+    - 단일 일자 기준 구현. 백테스트 루프에서는 compute_cut_loss_signals 사용
     """
     result = {}
     try:
@@ -301,8 +384,8 @@ def is_cut_loss_signal(cur_date, price_data, index_data) -> dict:
         interest = valid_index_data["^TNX"].ffill().iloc[-1]
         # 가격 하락률: SPY 등 주요 자산 기준
 
-        window1 = 60
-        window2 = 20
+        window1 = CUT_LOSS_HIGH_WINDOW
+        window2 = CUT_LOSS_MA_WINDOW
         for sym in GROWTH_ASSETS:
             if sym in price_data:
                 df = price_data[sym]
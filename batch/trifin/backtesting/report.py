@@ -0,0 +1,251 @@
+"""
+report.py
+
+백테스트 결과를 화면 출력 없이(headless) 파일로 남기는 리포트 모듈
+
+- matplotlib Figure 객체를 직접 생성해 Agg 캔버스로 렌더링 (pyplot/GUI 백엔드 미사용, plt.show() 없음)
+- 자산가치 곡선, drawdown, 자산 비중 추이 차트를 PNG로 저장하거나,
+  PNG를 base64로 내장한 단일 HTML 리포트 생성
+- 한글 폰트는 설치된 폰트 중에서 선택 (없으면 기본 폰트)
+- 단일 실행: submit_report로 스레드 1개에서 실행해 결과 저장(SQLite I/O)과 겹치게 처리
+  (렌더링 자체는 GIL을 잡으므로 CPU 병렬화는 아님)
+- 다수 run: report_runs로 result_store에 저장된 자산가치 곡선을 읽어 ProcessPoolExecutor에서 프로세스 단위로 병렬 생성
+  (sweep은 리포트를 생성하지 않으므로 sweep 이후 상위 run 리포트는 이 경로 사용)
+
+사용 예시:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = submit_report(executor, df_hist, cols_and_labels, "result/report_x.html", allocation=allocation)
+        ...  # 요약/저장
+        future.result()
+
+    report_runs(top_runs(20)["run_id"].unique(), max_workers=4)
+    python -m batch.trifin.backtesting.result_store report --top 20 --metric cagr -j 4
+
+작성일: 2025-06-15
+변경이력:
+- 저장된 run 리포트 일괄 생성(report_runs, 프로세스 풀) 추가: 2025-06-23
+"""
+
+import base64
+import html
+import io
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Iterable, Optional
+
+import pandas as pd
+from matplotlib import rc_context
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from core.util.logger import get_logger
+
+logger = get_logger()
+
+REPORT_DIR = os.path.join(os.path.dirname(__file__), "result")
+
+# 우선순위 순 한글 폰트 후보 (macOS, 나눔, Windows, Noto)
+KOREAN_FONT_CANDIDATES = (
+    "AppleGothic",
+    "NanumGothic",
+    "Malgun Gothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+)
+
+_font_family = None
+
+
+def _get_font_family() -> Optional[str]:
+    """설치된 한글 폰트 이름 (없으면 None → matplotlib 기본 폰트)"""
+    global _font_family
+    if _font_family is None:
+        from matplotlib import font_manager
+
+        installed = {font.name for font in font_manager.fontManager.ttflist}
+        _font_family = next((f for f in KOREAN_FONT_CANDIDATES if f in installed), "")
+    return _font_family or None
+
+
+def _report_rc() -> dict:
+    """리포트 렌더링용 rcParams (한글 폰트, 마이너스 기호)"""
+    rc = {"axes.unicode_minus": False}
+    font_family = _get_font_family()
+    if font_family:
+        rc["font.family"] = font_family
+    return rc
+
+
+def _new_figure(figsize=(14, 6)) -> Figure:
+    """pyplot 상태와 무관한 Agg Figure 생성 (스레드/프로세스 어디서든 사용 가능)"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# =====================
+# 차트
+# =====================
+def to_drawdown(df: pd.DataFrame) -> pd.DataFrame:
+    """자산가치 곡선 → 전고점 대비 하락률(%)"""
+    return (df / df.cummax() - 1) * 100
+
+
+def to_allocation(history: pd.DataFrame, total_column: str) -> pd.DataFrame:
+    """전략 history(자산별 평가액 + 합계 컬럼) → 자산별 비중"""
+    assets = history.drop(columns=[total_column]).select_dtypes("number")
+    assets.columns = [getattr(c, "name", str(c)) for c in assets.columns]
+    return assets.div(assets.sum(axis=1), axis=0).fillna(0.0)
+
+
+def plot_equity(df: pd.DataFrame, cols_and_labels: list) -> Figure:
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    for column, label in cols_and_labels:
+        ax.plot(df.index, df[column], label=label, linewidth=2)
+    ax.set_title("전략별 자산가치 추이")
+    ax.set_xlabel("날짜")
+    ax.set_ylabel("평가액(원화 기준)")
+    ax.legend()
+    ax.grid()
+    fig.tight_layout()
+    return fig
+
+
+def plot_drawdown(df: pd.DataFrame, cols_and_labels: list) -> Figure:
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    drawdown = to_drawdown(df[[column for column, _ in cols_and_labels]])
+    for column, label in cols_and_labels:
+        ax.plot(drawdown.index, drawdown[column], label=label, linewidth=1)
+    ax.set_title("전략별 Drawdown(%)")
+    ax.set_xlabel("날짜")
+    ax.legend()
+    ax.grid()
+    fig.tight_layout()
+    return fig
+
+
+def plot_allocation(allocation: pd.DataFrame, title: str = "자산 비중 추이") -> Figure:
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    ax.stackplot(allocation.index, allocation.T.to_numpy(), labels=list(allocation.columns))
+    ax.set_title(title)
+    ax.set_ylim(0, 1)
+    ax.legend(loc="upper left", fontsize="small")
+    fig.tight_layout()
+    return fig
+
+
+def _render_png(fig: Figure) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100)
+    return buffer.getvalue()
+
+
+def save_figure(fig: Figure, path: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_render_png(fig))
+    logger.info(f"[report] 차트가 {path}에 저장되었습니다.")
+    return path
+
+
+# =====================
+# 리포트
+# =====================
+def write_report(
+        df_hist: pd.DataFrame,
+        cols_and_labels: list,
+        path: str,
+        allocation: Optional[pd.DataFrame] = None,
+        summary: Optional[pd.DataFrame] = None,
+        title: str = "백테스트 리포트",
+) -> str:
+    """
+    자산가치/drawdown/자산 비중 차트와 요약 지표를 담은 단일 HTML 리포트 생성
+    - path가 .png면 자산가치 차트만 PNG로 저장
+    :return: 저장된 파일 경로
+    """
+    with rc_context(_report_rc()):
+        if path.endswith(".png"):
+            return save_figure(plot_equity(df_hist, cols_and_labels), path)
+
+        figures = [plot_equity(df_hist, cols_and_labels), plot_drawdown(df_hist, cols_and_labels)]
+        if allocation is not None and not allocation.empty:
+            figures.append(plot_allocation(allocation))
+        images = "\n".join(
+            f'<img src="data:image/png;base64,{base64.b64encode(_render_png(fig)).decode()}"/>'
+            for fig in figures
+        )
+    summary_html = summary.to_html(index=False, float_format="{:,.2f}".format) if summary is not None else ""
+    document = f"""<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>body{{font-family:sans-serif;margin:24px}}img{{max-width:100%}}table{{border-collapse:collapse}}td,th{{border:1px solid #ccc;padding:4px 8px;text-align:right}}</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+{summary_html}
+{images}
+</body>
+</html>
+"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document)
+    logger.info(f"[report] 리포트가 {path}에 저장되었습니다.")
+    return path
+
+
+def submit_report(executor: Executor, *args, **kwargs) -> Future:
+    """
+    write_report를 executor에서 실행 (단일 실행에서 결과 저장과 겹치게 처리)
+    - 다수 run의 리포트는 report_runs 사용
+    """
+    return executor.submit(write_report, *args, **kwargs)
+
+
+def write_stored_report(run_id: str, db_path: Optional[str] = None, report_dir: Optional[str] = None) -> str:
+    """
+    result_store에 저장된 run 1건의 자산가치 곡선/요약 지표로 리포트 생성 (자산 비중 차트는 저장되지 않아 제외)
+    :return: 저장된 파일 경로 (report_dir/report_{run_id}.html)
+    """
+    from batch.trifin.backtesting.result_store import load_run
+
+    meta, metrics, equity = load_run(run_id, db_path)
+    labels = dict(zip(metrics["strategy"], metrics["label"].fillna(metrics["strategy"])))
+    cols_and_labels = [(strategy, labels.get(strategy, strategy)) for strategy in equity.columns]
+    return write_report(
+        equity,
+        cols_and_labels,
+        os.path.join(report_dir or REPORT_DIR, f"report_{run_id}.html"),
+        summary=metrics.drop(columns=["run_id"]),
+        title=f"백테스트 리포트 {run_id} ({meta['start_date']} ~ {meta['end_date']})",
+    )
+
+
+def report_runs(
+        run_ids: Iterable[str],
+        db_path: Optional[str] = None,
+        report_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+) -> dict:
+    """
+    저장된 여러 run의 리포트를 ProcessPoolExecutor에서 병렬 생성 (렌더링이 CPU 작업이라 프로세스 단위로 분산)
+    - 실패한 run은 경고 로그만 남기고 결과에서 제외
+    :return: {run_id: 리포트 경로}
+    """
+    run_ids = list(dict.fromkeys(run_ids))
+    paths = {}
+    if not run_ids:
+        return paths
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {run_id: executor.submit(write_stored_report, run_id, db_path, report_dir) for run_id in run_ids}
+        for run_id, future in futures.items():
+            try:
+                paths[run_id] = future.result()
+            except Exception as e:
+                logger.warning(f"[report] run {run_id} 리포트 생성 실패: {e}")
+    logger.info(f"[report] {len(paths)}/{len(run_ids)}개 run 리포트 생성")
+    return paths
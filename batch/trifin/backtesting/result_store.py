@@ -0,0 +1,350 @@
+"""
+result_store.py
+
+백테스트 실행 결과를 run id 단위로 로컬 SQLite에 저장/조회하는 모듈
+
+- 저장 항목
+    - runs: 실행 파라미터(JSON), 데이터 기간, 데이터 fingerprint, 코드 버전
+    - metrics: 전략별 요약 지표 (CAGR, MDD, Calmar, Sharpe 등)
+    - equity: 전략별 일자별 자산가치 곡선 (long format)
+- 실행이 끝난 뒤 한 트랜잭션으로 일괄 저장 (sweep 결과는 save_runs로 여러 run을 한번에 저장)
+- 의존성: sqlite3(표준 라이브러리), pandas
+
+사용 예시:
+    run_id = save_run(df_hist, summary, params=collect_params(), data_fingerprint=fingerprint_market_data(p, i))
+    top_runs(10, metric="calmar_ratio", strategy="index_ma_based_rebalance")
+
+    python -m batch.trifin.backtesting.result_store top -n 10 --metric cagr
+    python -m batch.trifin.backtesting.result_store show <run_id>
+    python -m batch.trifin.backtesting.result_store report --top 20 --metric cagr -j 4
+    python -m batch.trifin.backtesting.result_store report <run_id> <run_id> ...
+
+작성일: 2025-06-15
+변경이력:
+- 저장된 run 리포트 일괄 생성(report 명령, report.report_runs) 추가: 2025-06-23
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import subprocess
+import uuid
+from contextlib import closing
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.util.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "result", "backtest_results.sqlite")
+
+METRIC_COLUMNS = (
+    "total_contributed",
+    "final_value",
+    "cumulative_return",
+    "cagr",
+    "mdd",
+    "calmar_ratio",
+    "volatility",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "underwater_ratio",
+    "max_underwater_days",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    params TEXT,
+    data_fingerprint TEXT,
+    code_version TEXT,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    strategy TEXT NOT NULL,
+    label TEXT,
+    {", ".join(f"{c} REAL" for c in METRIC_COLUMNS)},
+    PRIMARY KEY (run_id, strategy)
+);
+CREATE TABLE IF NOT EXISTS equity (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    strategy TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, strategy, date)
+);
+CREATE INDEX IF NOT EXISTS ix_metrics_strategy ON metrics (strategy);
+"""
+
+# collect_params 대상 모듈 (대문자 상수만 수집)
+PARAM_MODULES = (
+    "config",
+    "dynamic_rebalance",
+    "dynamic_ma_based_rebalance",
+    "index_based_rebalance",
+    "index_ma_based_rebalance",
+)
+
+
+# =====================
+# 메타데이터
+# =====================
+def new_run_id() -> str:
+    """정렬 가능한 run id 생성 (yyyyMMdd_HHmmss_랜덤8자리)"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def _to_jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient="records")
+    if isinstance(value, dict):
+        return {str(getattr(k, "value", k)): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return getattr(value, "value", value)
+    return str(value)
+
+
+def collect_params(overrides: Optional[dict] = None) -> dict:
+    """
+    백테스트 결과에 영향을 주는 모듈 상수를 "모듈명.상수명" 키로 수집 (sweep 파라미터 키와 동일 형식)
+    :param overrides: 수집 결과에 덮어쓸 값
+    """
+    params = {}
+    for module_name in PARAM_MODULES:
+        module = importlib.import_module(f"batch.trifin.backtesting.{module_name}")
+        for name, value in vars(module).items():
+            if name.isupper() and not callable(value):
+                params[f"{module_name}.{name}"] = _to_jsonable(value)
+    for key, value in (overrides or {}).items():
+        params[key] = _to_jsonable(value)
+    return params
+
+
+def fingerprint_market_data(price_data: dict, index_data: pd.DataFrame) -> str:
+    """가격/지표 데이터 내용 기반 sha256 fingerprint (동일 데이터면 동일 값)"""
+    digest = hashlib.sha256()
+    for sym in sorted(price_data, key=lambda s: str(getattr(s, "value", s))):
+        digest.update(str(getattr(sym, "value", sym)).encode())
+        digest.update(pd.util.hash_pandas_object(price_data[sym]["price"], index=True).to_numpy().tobytes())
+    digest.update(",".join(str(getattr(c, "value", c)) for c in index_data.columns).encode())
+    digest.update(pd.util.hash_pandas_object(index_data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def get_code_version() -> str:
+    """version.txt + git commit 해시 (git이 없으면 version만)"""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    version = ""
+    try:
+        with open(os.path.join(root, "version.txt")) as f:
+            version = f.read().strip()
+    except OSError:
+        pass
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root, capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return "+".join(v for v in (version, commit) if v)
+
+
+# =====================
+# 저장
+# =====================
+def connect(db_path: Optional[str] = None) -> sqlite3.Connection:
+    db_path = db_path or DEFAULT_DB_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    # 이전 버전 DB에 없는 지표 컬럼 추가
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(metrics)")}
+    for column in METRIC_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE metrics ADD COLUMN {column} REAL")
+    return conn
+
+
+def build_run(
+        df_hist: pd.DataFrame,
+        summary: pd.DataFrame,
+        params: Optional[dict] = None,
+        data_fingerprint: Optional[str] = None,
+        run_id: Optional[str] = None,
+        note: Optional[str] = None,
+) -> dict:
+    """
+    save_runs에 넘길 run 레코드 생성
+    :param df_hist: 전략별 자산가치 시계열 (index=date)
+    :param summary: utils.summarize_results 결과 (strategy 컬럼 = df_hist 컬럼명)
+    """
+    strategies = [s for s in summary["strategy"] if s in df_hist.columns]
+    dates = pd.to_datetime(pd.Index(df_hist.index))
+    return {
+        "run_id": run_id or new_run_id(),
+        "start_date": dates.min().strftime("%Y-%m-%d") if len(dates) else None,
+        "end_date": dates.max().strftime("%Y-%m-%d") if len(dates) else None,
+        "params": params or {},
+        "data_fingerprint": data_fingerprint,
+        "note": note,
+        "summary": summary,
+        "equity": pd.DataFrame(df_hist[strategies].to_numpy(dtype=float), index=dates, columns=strategies),
+    }
+
+
+def save_runs(runs: Iterable[dict], db_path: Optional[str] = None) -> list:
+    """
+    build_run으로 만든 run 레코드들을 한 트랜잭션으로 일괄 저장
+    :return: 저장된 run id 목록
+    """
+    runs = list(runs)
+    created_at = datetime.now().isoformat(timespec="seconds")
+    code_version = get_code_version()
+    run_rows, metric_rows, equity_rows = [], [], []
+    for run in runs:
+        run_id = run["run_id"]
+        run_rows.append(
+            (
+                run_id, created_at, run["start_date"], run["end_date"],
+                json.dumps(run["params"], ensure_ascii=False, default=str),
+                run["data_fingerprint"], code_version, run.get("note"),
+            )
+        )
+        summary = run["summary"].reindex(columns=["strategy", "label", *METRIC_COLUMNS])
+        summary = summary.astype(object).where(summary.notna(), None)
+        metric_rows.extend(
+            (run_id, *(_to_jsonable(v) for v in row)) for row in summary.itertuples(index=False)
+        )
+
+        equity = run["equity"]
+        date_strs = equity.index.strftime("%Y-%m-%d").tolist()
+        for strategy in equity.columns:
+            values = equity[strategy].tolist()
+            equity_rows.extend(zip([run_id] * len(values), [strategy] * len(values), date_strs, values))
+
+    with closing(connect(db_path)) as conn, conn:
+        conn.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", run_rows)
+        conn.executemany(
+            f"INSERT INTO metrics (run_id, strategy, label, {', '.join(METRIC_COLUMNS)}) "
+            f"VALUES ({', '.join(['?'] * (3 + len(METRIC_COLUMNS)))})",
+            metric_rows,
+        )
+        conn.executemany("INSERT OR REPLACE INTO equity VALUES (?, ?, ?, ?)", equity_rows)
+    logger.info(f"[result_store] {len(run_rows)}개 run 저장 ({db_path or DEFAULT_DB_PATH})")
+    return [row[0] for row in run_rows]
+
+
+def save_run(df_hist: pd.DataFrame, summary: pd.DataFrame, db_path: Optional[str] = None, **kwargs) -> str:
+    """단일 run 저장. kwargs는 build_run 인자 (params, data_fingerprint, run_id, note)"""
+    return save_runs([build_run(df_hist, summary, **kwargs)], db_path)[0]
+
+
+# =====================
+# 조회
+# =====================
+def top_runs(
+        n: int = 10,
+        metric: str = "calmar_ratio",
+        strategy: Optional[str] = None,
+        ascending: bool = False,
+        db_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    지표 기준 상위 n개 (run, 전략) 조회
+    :param metric: 정렬 기준 지표 (METRIC_COLUMNS 중 하나)
+    :param strategy: 특정 전략 컬럼만 조회 (None이면 전체)
+    """
+    if metric not in METRIC_COLUMNS:
+        raise ValueError(f"지원하지 않는 지표: {metric} (지원: {', '.join(METRIC_COLUMNS)})")
+    query = f"""
+        SELECT m.run_id, m.strategy, m.label, {", ".join(f"m.{c}" for c in METRIC_COLUMNS)},
+               r.created_at, r.start_date, r.end_date, r.data_fingerprint, r.code_version, r.params
+        FROM metrics m JOIN runs r ON r.run_id = m.run_id
+        WHERE m.{metric} IS NOT NULL {"AND m.strategy = ?" if strategy else ""}
+        ORDER BY m.{metric} {"ASC" if ascending else "DESC"}
+        LIMIT ?
+    """
+    args = ([strategy] if strategy else []) + [n]
+    with closing(connect(db_path)) as conn:
+        return pd.read_sql_query(query, conn, params=args)
+
+
+def load_run(run_id: str, db_path: Optional[str] = None) -> tuple:
+    """
+    run 1건의 (메타데이터 dict, 요약 지표 DataFrame, 자산가치 곡선 DataFrame(index=date, columns=strategy)) 조회
+    """
+    with closing(connect(db_path)) as conn:
+        run = pd.read_sql_query("SELECT * FROM runs WHERE run_id = ?", conn, params=[run_id])
+        if run.empty:
+            raise KeyError(f"run_id {run_id}가 없습니다.")
+        metrics = pd.read_sql_query("SELECT * FROM metrics WHERE run_id = ?", conn, params=[run_id])
+        equity = pd.read_sql_query(
+            "SELECT strategy, date, value FROM equity WHERE run_id = ?", conn, params=[run_id]
+        )
+    meta = run.iloc[0].to_dict()
+    meta["params"] = json.loads(meta["params"]) if meta["params"] else {}
+    equity = equity.pivot(index="date", columns="strategy", values="value")
+    equity.index = pd.to_datetime(equity.index)
+    return meta, metrics, equity
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="백테스트 결과 조회")
+    parser.add_argument("--db", default=None, help=f"SQLite 경로 (기본: {DEFAULT_DB_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    top = sub.add_parser("top", help="지표 기준 상위 N개 run 조회")
+    top.add_argument("-n", type=int, default=10)
+    top.add_argument("--metric", default="calmar_ratio", choices=METRIC_COLUMNS)
+    top.add_argument("--strategy", default=None)
+    top.add_argument("--ascending", action="store_true")
+
+    show = sub.add_parser("show", help="run 1건의 파라미터/지표 조회")
+    show.add_argument("run_id")
+
+    report = sub.add_parser("report", help="저장된 run의 리포트를 프로세스 풀에서 일괄 생성")
+    report.add_argument("run_ids", nargs="*", help="리포트를 만들 run id (없으면 --top 기준)")
+    report.add_argument("--top", type=int, default=10, help="run id를 지정하지 않을 때 지표 기준 상위 N개 (run, 전략)")
+    report.add_argument("--metric", default="calmar_ratio", choices=METRIC_COLUMNS)
+    report.add_argument("--strategy", default=None)
+    report.add_argument("--report-dir", default=None)
+    report.add_argument("-j", "--max-workers", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "report":
+        from batch.trifin.backtesting.report import report_runs
+
+        run_ids = args.run_ids or top_runs(args.top, args.metric, args.strategy, db_path=args.db)["run_id"].tolist()
+        for run_id, path in report_runs(run_ids, args.db, args.report_dir, args.max_workers).items():
+            print(f"{run_id}\t{path}")
+        return
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        if args.command == "top":
+            result = top_runs(args.n, args.metric, args.strategy, args.ascending, args.db)
+            print(result.drop(columns=["params"]).to_string(index=False))
+        else:
+            meta, metrics, equity = load_run(args.run_id, args.db)
+            print(json.dumps(meta, ensure_ascii=False, indent=2, default=str))
+            print(metrics.to_string(index=False))
+            print(f"equity: {equity.index.min()} ~ {equity.index.max()} ({len(equity)} rows)")
+
+
+if __name__ == "__main__":
+    main()
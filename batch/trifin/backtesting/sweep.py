@@ -0,0 +1,348 @@
+"""
+sweep.py
+
+전략 파라미터(GROWTH_WEIGHTS_BY_ZONE, CHANGE_ALLOC_TABLE, INTEREST_WEIGHT, VIX_WEIGHT, MA_STEP, REBALANCE_DAY 등)를
+그리드/랜덤 탐색 공간으로 정의하고, 프로세스 풀에서 병렬로 백테스트를 실행해 순위가 매겨진 결과 테이블을 만드는 스크립트
+
+- 시장 데이터는 부모 프로세스에서 한 번만 .npy 파일로 덤프하고, 워커는 초기화 시 memory-map(read-only)으로 공유
+  (작업(task)마다 DataFrame을 pickle 하지 않음)
+- 파라미터 키는 "모듈명.상수명" 형식 (예: "index_ma_based_rebalance.INTEREST_WEIGHT")
+    - "config.상수명"은 config를 이름으로 import 한 다른 백테스팅 모듈에도 함께 적용
+    - 파생 상수(GROWTH_ASSETS, TOTAL_ASSETS 등)는 재계산되지 않으므로 직접 지정해야 함
+- 작업이 끝나면 모든 상수는 기본값으로 복원
+- store=True면 모든 결과를 부모 프로세스에서 result_store에 한 번에 저장
+
+사용 예시:
+    from batch.trifin.backtesting.sweep import grid_search_space, run_sweep
+    params = grid_search_space({
+        "index_ma_based_rebalance.INTEREST_WEIGHT": [0.2, 0.3, 0.4],
+        "index_ma_based_rebalance.VIX_WEIGHT": [0.1, 0.2],
+        "config.REBALANCE_DAY": [1, 15],
+    })
+    result = run_sweep(params, strategies=["index_ma_based_rebalance"], max_workers=8)
+
+작성일: 2025-06-15
+"""
+
+import copy
+import importlib
+import itertools
+import json
+import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from batch.trifin.backtesting.config import (
+    START_DATE,
+    START_DATE_WITH_GAP,
+    END_DATE,
+    INIT_PORTFOLIO,
+    YEARS,
+)
+from batch.trifin.backtesting.data.index import Index as MacroIndex, IndexFromPrice
+from batch.trifin.backtesting.data.symbol import Symbol
+from core.util.logger import get_logger
+
+logger = get_logger()
+
+BACKTESTING_PACKAGE = "batch.trifin.backtesting"
+
+# 파라미터 적용 대상 모듈 (config 상수 전파 범위)
+BACKTESTING_MODULES = (
+    "config",
+    "utils",
+    "buy_and_hold",
+    "static_rebalance",
+    "dynamic_rebalance",
+    "dynamic_ma_based_rebalance",
+    "index_based_rebalance",
+    "index_ma_based_rebalance",
+    "rebalance",
+)
+
+MANIFEST_FILE = "manifest.json"
+
+# 워커 프로세스 전역 상태 (initializer에서 1회 설정)
+_worker_market_data = None
+_worker_defaults = {}
+
+
+# =====================
+# 탐색 공간 정의
+# =====================
+def grid_search_space(space: dict) -> list:
+    """
+    {파라미터 키: 후보 리스트}의 모든 조합(데카르트 곱)을 반환
+    Example:
+        >>> grid_search_space({"a.X": [1, 2], "b.Y": [3]})
+        [{'a.X': 1, 'b.Y': 3}, {'a.X': 2, 'b.Y': 3}]
+    """
+    keys = list(space.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*space.values())]
+
+
+def random_search_space(space: dict, n_iter: int, seed: Optional[int] = None) -> list:
+    """
+    랜덤 탐색 공간에서 n_iter개의 파라미터 조합을 샘플링
+    - list: 후보 중 하나를 균등 선택
+    - tuple(low, high): float이면 균등분포, int면 정수 균등분포(high 포함)
+    - callable: rng(random.Random)를 받아 값을 반환
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n_iter):
+        params = {}
+        for key, candidates in space.items():
+            if callable(candidates):
+                params[key] = candidates(rng)
+            elif isinstance(candidates, tuple):
+                low, high = candidates
+                if isinstance(low, int) and isinstance(high, int):
+                    params[key] = rng.randint(low, high)
+                else:
+                    params[key] = rng.uniform(low, high)
+            else:
+                params[key] = rng.choice(list(candidates))
+        samples.append(params)
+    return samples
+
+
+# =====================
+# 시장 데이터 공유 (memory-map)
+# =====================
+def dump_market_data(price_data: dict, index_data: pd.DataFrame, path: str) -> str:
+    """
+    가격/지표 데이터를 워커가 memory-map으로 읽을 수 있도록 .npy 파일로 저장
+    :return: manifest 파일 경로
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest = {"prices": {}, "index": {}}
+    for i, (sym, df) in enumerate(price_data.items()):
+        ts_file, value_file = f"price_{i}_ts.npy", f"price_{i}_value.npy"
+        np.save(os.path.join(path, ts_file), df.index.values.astype("datetime64[ns]"))
+        np.save(os.path.join(path, value_file), df["price"].to_numpy(dtype=np.float64))
+        manifest["prices"][str(getattr(sym, "value", sym))] = [ts_file, value_file]
+
+    np.save(
+        os.path.join(path, "index_date.npy"),
+        pd.to_datetime(pd.Index(index_data.index)).values.astype("datetime64[D]"),
+    )
+    np.save(os.path.join(path, "index_value.npy"), index_data.to_numpy(dtype=np.float64))
+    manifest["index"]["columns"] = [str(getattr(c, "value", c)) for c in index_data.columns]
+
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    return manifest_path
+
+
+def load_market_data(path: str) -> tuple:
+    """
+    dump_market_data로 저장한 데이터를 read-only memory-map으로 열어 (price_data, index_data) 형태로 복원
+    - price_data 키는 Symbol, index_data 컬럼은 MacroIndex/IndexFromPrice로 복원 (원본 로딩 함수와 동일)
+    """
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    price_data = {}
+    for sym, (ts_file, value_file) in manifest["prices"].items():
+        ts = np.load(os.path.join(path, ts_file), mmap_mode="r")
+        values = np.load(os.path.join(path, value_file), mmap_mode="r")
+        key = Symbol(sym) if sym in Symbol._value2member_map_ else sym
+        price_data[key] = pd.DataFrame(
+            {"price": values}, index=pd.DatetimeIndex(ts, name="timestamp"), copy=False
+        )
+
+    index_members = {**MacroIndex._value2member_map_, **IndexFromPrice._value2member_map_}
+    dates = np.load(os.path.join(path, "index_date.npy"), mmap_mode="r")
+    values = np.load(os.path.join(path, "index_value.npy"), mmap_mode="r")
+    index_data = pd.DataFrame(
+        values,
+        index=pd.Index(dates.astype(object), name="date", dtype=object),
+        columns=[index_members.get(c, c) for c in manifest["index"]["columns"]],
+        copy=False,
+    )
+    return price_data, index_data
+
+
+# =====================
+# 파라미터 적용/복원
+# =====================
+def _resolve(key: str) -> tuple:
+    module_name, _, attr = key.rpartition(".")
+    if not module_name or module_name not in BACKTESTING_MODULES:
+        raise ValueError(f"지원하지 않는 파라미터 키: {key} (형식: 모듈명.상수명)")
+    module = importlib.import_module(f"{BACKTESTING_PACKAGE}.{module_name}")
+    if not hasattr(module, attr):
+        raise ValueError(f"{module.__name__}에 {attr} 상수가 없습니다.")
+    return module_name, module, attr
+
+
+def _targets(key: str) -> list:
+    """파라미터 키가 실제로 적용될 (module, attr) 목록"""
+    module_name, module, attr = _resolve(key)
+    targets = [(module, attr)]
+    if module_name == "config":
+        original = _worker_defaults.get((module.__name__, attr), getattr(module, attr))
+        for name in BACKTESTING_MODULES:
+            other = importlib.import_module(f"{BACKTESTING_PACKAGE}.{name}")
+            if other is not module and getattr(other, attr, None) is original:
+                targets.append((other, attr))
+    return targets
+
+
+def apply_params(params: dict):
+    """모듈 상수를 params 값으로 교체 (최초 교체 시 기본값을 기억)"""
+    for key, value in params.items():
+        for module, attr in _targets(key):
+            _worker_defaults.setdefault((module.__name__, attr), getattr(module, attr))
+            setattr(module, attr, copy.deepcopy(value))
+
+
+def restore_params():
+    """apply_params로 바꾼 모든 상수를 기본값으로 복원"""
+    for (module_name, attr), value in _worker_defaults.items():
+        module = importlib.import_module(module_name)
+        setattr(module, attr, value)
+
+
+# =====================
+# 워커
+# =====================
+def _init_worker(data_path: str):
+    global _worker_market_data
+    _worker_market_data = load_market_data(data_path)
+
+
+def _run_task(task: tuple) -> tuple:
+    run_no, params, strategies, start, end, years, keep_equity = task
+    from batch.trifin.backtesting import rebalance, utils
+    from batch.trifin.backtesting.result_store import build_run, collect_params
+
+    price_data, index_data = _worker_market_data
+    record = None
+    try:
+        apply_params(params)
+        rebalance_dates = utils.generate_rebalance_dates(start, end)
+        df_hist, _, cols_and_labels = rebalance.run_strategies(
+            price_data, index_data, rebalance_dates, strategies=strategies
+        )
+        summary = utils.summarize_results(
+            df_hist, years, cols_and_labels, INIT_PORTFOLIO, onetime_invest=True
+        )
+        if keep_equity:
+            record = build_run(df_hist, summary, params=collect_params(params), note=f"sweep #{run_no}")
+        rows = summary.drop(columns=["label"]).to_dict(orient="records")
+        error = None
+    except Exception as e:
+        rows, error = [{"strategy": None}], f"{e.__class__.__name__}: {e}"
+    finally:
+        restore_params()
+
+    for row in rows:
+        row["run_no"] = run_no
+        row["error"] = error
+        row["params"] = json.dumps(params, default=str, ensure_ascii=False)
+    if record is not None:
+        for row in rows:
+            row["run_id"] = record["run_id"]
+    return rows, record
+
+
+# =====================
+# 스윕 실행
+# =====================
+def run_sweep(
+        param_sets: Iterable[dict],
+        strategies: Iterable[str] = None,
+        price_data: Optional[dict] = None,
+        index_data: Optional[pd.DataFrame] = None,
+        start: datetime = START_DATE,
+        end: datetime = END_DATE,
+        years: float = YEARS,
+        max_workers: Optional[int] = None,
+        sort_by: str = "calmar_ratio",
+        chunksize: int = 4,
+        store_path: Optional[str] = None,
+        store: bool = False,
+) -> pd.DataFrame:
+    """
+    파라미터 조합들을 프로세스 풀에서 병렬 실행하고 전략별 요약 지표를 하나의 순위 테이블로 반환
+    Args:
+        param_sets: apply_params에 넘길 파라미터 dict 목록 (grid_search_space/random_search_space 결과)
+        strategies: 실행할 전략 (None이면 rebalance.STRATEGIES 전체)
+        price_data, index_data: 미리 로딩한 데이터 (None이면 DB에서 로딩)
+        max_workers: 프로세스 수 (None이면 CPU 수)
+        sort_by: 순위 기준 컬럼 (내림차순)
+        store: True면 결과(파라미터, 지표, 자산가치 곡선)를 result_store에 일괄 저장
+        store_path: result_store SQLite 경로 (None이면 기본 경로)
+    Returns:
+        pd.DataFrame: run_no, strategy, 요약 지표, params(JSON), error 컬럼 + 파라미터별 컬럼
+    """
+    from batch.trifin.backtesting.rebalance import STRATEGIES
+    from batch.trifin.backtesting.utils import load_all_prices, load_all_macro_indices
+
+    param_sets = list(param_sets)
+    strategies = tuple(strategies) if strategies is not None else STRATEGIES
+    if price_data is None:
+        price_data = load_all_prices(START_DATE_WITH_GAP, end)
+    if index_data is None:
+        index_data = load_all_macro_indices(START_DATE_WITH_GAP, end)
+
+    data_path = tempfile.mkdtemp(prefix="backtest_sweep_")
+    try:
+        dump_market_data(price_data, index_data, data_path)
+        tasks = [
+            (run_no, params, strategies, start, end, years, store)
+            for run_no, params in enumerate(param_sets)
+        ]
+        logger.info(f"[sweep] {len(tasks)}개 조합 x {len(strategies)}개 전략 실행 시작")
+        rows, records = [], []
+        with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(data_path,)
+        ) as executor:
+            for task_rows, record in executor.map(_run_task, tasks, chunksize=chunksize):
+                rows.extend(task_rows)
+                if record is not None:
+                    records.append(record)
+    finally:
+        shutil.rmtree(data_path, ignore_errors=True)
+
+    if records:
+        from batch.trifin.backtesting.result_store import fingerprint_market_data, save_runs
+
+        fingerprint = fingerprint_market_data(price_data, index_data)
+        for record in records:
+            record["data_fingerprint"] = fingerprint
+        save_runs(records, store_path)
+
+    result = pd.DataFrame(rows)
+    params_df = pd.DataFrame([{k: str(v) for k, v in p.items()} for p in param_sets])
+    if not params_df.empty:
+        result = result.join(params_df, on="run_no")
+    failed = result["error"].notna().sum()
+    if failed:
+        logger.warning(f"[sweep] {failed}개 조합 실행 실패")
+    if sort_by in result.columns:
+        result = result.sort_values(sort_by, ascending=False, na_position="last")
+    return result.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    space = {
+        "index_ma_based_rebalance.INTEREST_WEIGHT": [0.2, 0.3, 0.4, 0.5],
+        "index_ma_based_rebalance.VIX_WEIGHT": [0.1, 0.2, 0.3],
+        "index_ma_based_rebalance.MA_STEP": [3, 5, 7],
+        "config.REBALANCE_DAY": [1, 15, 25],
+    }
+    result_df = run_sweep(
+        grid_search_space(space), strategies=["index_ma_based_rebalance"], store=True
+    )
+    logger.info(f"\n{result_df.head(20).to_string()}")
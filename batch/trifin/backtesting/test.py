@@ -1,7 +1,17 @@
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+import pytest
+
 from batch.trifin.backtesting import USDT_APR, BOND_ANNUAL_3_5_APR
+from batch.trifin.backtesting.config import GROWTH_ASSETS
+from batch.trifin.backtesting.metrics import compute_metrics_array
 from batch.trifin.backtesting.rebalance import generate_rebalance_dates
+from batch.trifin.backtesting.rebalance_with_daily_cut_loss import (
+    compute_cut_loss_signals,
+    is_cut_loss_signal,
+)
 
 
 # =====================
@@ -31,3 +41,182 @@ def test_note_annual_3_5():
     val = 1000
     after = val * (1 + BOND_ANNUAL_3_5_APR)
     assert abs(after - 1035) < 1
+
+
+def test_compute_cut_loss_signals_matches_daily_signal():
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range("2020-01-01", "2020-12-31")
+    price_data = {}
+    for sym in GROWTH_ASSETS:
+        # 중간에 급락 구간을 넣어 신호가 발생하도록 구성
+        returns = rng.normal(0, 0.01, len(days))
+        returns[100:130] -= 0.01
+        price_data[sym] = pd.DataFrame(
+            {"price": 100 * np.exp(np.cumsum(returns))},
+            index=pd.DatetimeIndex(days, name="timestamp"),
+        )
+    vix = np.clip(20 + rng.normal(0, 1, len(days)).cumsum(), 10, 40)
+    vix[::7] = np.nan
+    index_data = pd.DataFrame(
+        {"^VIX": vix, "^TNX": 2.0}, index=[d.date() for d in days]
+    )
+
+    calendar = pd.date_range("2020-02-01", "2020-12-31")
+    signals = compute_cut_loss_signals(price_data, index_data, calendar)
+    assert signals.to_numpy().any()
+    for cur_date in calendar:
+        expected = is_cut_loss_signal(cur_date, price_data, index_data)
+        fired = {sym for sym, is_cut_loss in expected.items() if is_cut_loss}
+        assert set(signals.columns[signals.loc[cur_date].to_numpy()]) == fired
+
+
+def test_compute_metrics_array():
+    values = np.array(
+        [
+            [100, 110, 99, 121, 121],
+            [100, 100, 100, 100, 100],
+        ]
+    )
+    metrics = compute_metrics_array(values, years=1, risk_free_rate=0)
+    assert np.allclose(metrics["cagr"], [21, 0])
+    assert np.allclose(metrics["mdd"], [-10, 0])
+    assert list(metrics["mdd_peak_pos"]) == [1, 0]
+    assert list(metrics["mdd_trough_pos"]) == [2, 0]
+    assert list(metrics["mdd_recovery_pos"]) == [3, -1]
+    assert list(metrics["max_underwater_periods"]) == [1, 0]
+
+
+def test_report_runs_renders_stored_runs_in_processes(tmp_path):
+    from batch.trifin.backtesting.report import report_runs
+    from batch.trifin.backtesting.result_store import build_run, save_runs
+
+    db_path = str(tmp_path / "runs.sqlite")
+    dates = pd.date_range("2024-01-01", periods=30, freq="B")
+    runs = []
+    for i in range(2):
+        df_hist = pd.DataFrame({"static": np.linspace(100, 110 + i, 30), "dynamic": np.linspace(100, 95 + i, 30)}, index=dates)
+        summary = pd.DataFrame({"strategy": ["static", "dynamic"], "label": ["정적", "동적"], "cagr": [0.1 + i, 0.05]})
+        runs.append(build_run(df_hist, summary, run_id=f"run_{i}"))
+    run_ids = save_runs(runs, db_path)
+
+    paths = report_runs(run_ids + ["missing"], db_path, str(tmp_path / "report"), max_workers=2)
+    # 없는 run은 제외, 저장된 run은 run id 이름으로 생성
+    assert sorted(paths) == ["run_0", "run_1"]
+    for run_id, path in paths.items():
+        assert path == str(tmp_path / "report" / f"report_{run_id}.html")
+        with open(path, encoding="utf-8") as f:
+            document = f.read()
+        assert run_id in document and "정적" in document and document.count("<img") == 2
+
+
+def _sweep_market_data():
+    """SPY는 상승, GLD는 하락, 나머지 성장자산은 보합인 합성 시장 데이터"""
+    from batch.trifin.backtesting.config import DYNAMIC_ASSET_ALLOC
+    from batch.trifin.backtesting.data.symbol import Symbol
+
+    days = pd.bdate_range("2019-01-01", "2020-12-31")
+    trend = {
+        Symbol.SPY: np.linspace(100, 200, len(days)) * (1 + 0.05 * np.sin(np.arange(len(days)) / 20)),
+        Symbol.GOLD: np.linspace(100, 60, len(days)) * (1 + 0.05 * np.sin(np.arange(len(days)) / 20)),
+    }
+    price_data = {
+        sym: pd.DataFrame(
+            {"price": trend.get(sym, np.full(len(days), 100.0))},
+            index=pd.DatetimeIndex(days, name="timestamp"),
+        )
+        for sym in DYNAMIC_ASSET_ALLOC
+    }
+    index_data = pd.DataFrame({"^VIX": 20.0, "^TNX": 2.0}, index=[d.date() for d in days])
+    return price_data, index_data
+
+
+def _only(sym):
+    from batch.trifin.backtesting.config import TOTAL_ASSETS
+
+    return {k: 1.0 if k == sym else 0.0 for k in TOTAL_ASSETS}
+
+
+def test_search_spaces():
+    from batch.trifin.backtesting.sweep import grid_search_space, random_search_space
+
+    assert grid_search_space({"a.X": [1, 2], "b.Y": [3, 4]}) == [
+        {"a.X": 1, "b.Y": 3},
+        {"a.X": 1, "b.Y": 4},
+        {"a.X": 2, "b.Y": 3},
+        {"a.X": 2, "b.Y": 4},
+    ]
+    space = {"a.X": [1, 2, 3], "b.Y": (1, 5), "c.Z": (0.1, 0.2), "d.W": lambda rng: rng.random()}
+    samples = random_search_space(space, 20, seed=7)
+    assert samples == random_search_space(space, 20, seed=7)
+    for params in samples:
+        assert params["a.X"] in (1, 2, 3)
+        assert isinstance(params["b.Y"], int) and 1 <= params["b.Y"] <= 5
+        assert 0.1 <= params["c.Z"] <= 0.2
+
+
+def test_sweep_task_applies_params_and_restores_defaults(tmp_path, monkeypatch):
+    from batch.trifin.backtesting import config, static_rebalance, sweep, utils
+    from batch.trifin.backtesting.data.symbol import Symbol
+
+    monkeypatch.setattr(sweep, "_worker_market_data", None)
+    monkeypatch.setattr(sweep, "_worker_defaults", {})
+    price_data, index_data = _sweep_market_data()
+    sweep.dump_market_data(price_data, index_data, str(tmp_path))
+    sweep._init_worker(str(tmp_path))
+
+    # memory-map 복원 데이터는 원본과 동일
+    loaded_prices, loaded_index = sweep._worker_market_data
+    assert set(loaded_prices) == set(price_data)
+    assert np.allclose(loaded_prices[Symbol.SPY]["price"], price_data[Symbol.SPY]["price"])
+    assert np.allclose(loaded_index.to_numpy(), index_data.to_numpy())
+
+    default_assets = static_rebalance.TOTAL_ASSETS
+    params = {"static_rebalance.TOTAL_ASSETS": _only(Symbol.SPY), "config.REBALANCE_DAY": 5}
+    task = (0, params, ("static_rebalance",), datetime(2019, 2, 1), datetime(2020, 12, 31), 2, True)
+    rows, record = sweep._run_task(task)
+
+    # 실행 중에는 파라미터가 적용됨: config.REBALANCE_DAY는 utils까지 전파, 비중은 SPY 100%
+    assert rows[0]["error"] is None
+    equity = record["equity"]["static_rebalance"]
+    assert set(equity.index.day) == {5}
+    spy = price_data[Symbol.SPY]["price"]
+    first, last = equity.index[0], equity.index[-1]
+    expected = 100 * spy[spy.index <= last].iloc[-1] / spy[spy.index <= first].iloc[-1]
+    assert equity.iloc[-1] == pytest.approx(expected, rel=1e-3)
+
+    # 실행 후에는 기본값으로 복원
+    assert static_rebalance.TOTAL_ASSETS is default_assets
+    assert utils.REBALANCE_DAY == config.REBALANCE_DAY == 15
+
+
+def test_run_sweep_ranks_results_across_processes():
+    from batch.trifin.backtesting import static_rebalance
+    from batch.trifin.backtesting.data.symbol import Symbol
+    from batch.trifin.backtesting.sweep import grid_search_space, run_sweep
+
+    price_data, index_data = _sweep_market_data()
+    default_assets = dict(static_rebalance.TOTAL_ASSETS)
+    params = grid_search_space(
+        {
+            "static_rebalance.TOTAL_ASSETS": [_only(Symbol.GOLD), _only(Symbol.SPY), default_assets],
+            "config.REBALANCE_DAY": [5],
+        }
+    )
+    result = run_sweep(
+        params,
+        strategies=["static_rebalance"],
+        price_data=price_data,
+        index_data=index_data,
+        start=datetime(2019, 2, 1),
+        end=datetime(2020, 12, 31),
+        years=2,
+        max_workers=2,
+        chunksize=1,
+    )
+
+    assert len(result) == 3 and result["error"].isna().all()
+    assert result["calmar_ratio"].is_monotonic_decreasing
+    # SPY 몰빵 > 기본 비중 > 금 몰빵 순
+    assert list(result["run_no"]) == [1, 2, 0]
+    assert result["calmar_ratio"].iloc[-1] < 0
+    assert static_rebalance.TOTAL_ASSETS == default_assets
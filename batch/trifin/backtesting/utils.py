@@ -4,14 +4,13 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
-from matplotlib import pyplot as plt
 
 from batch.trifin.backtesting.config import DYNAMIC_ASSET_ALLOC, REBALANCE_DAY
 from batch.trifin.backtesting.data.index import Index as MacroIndex, IndexFromPrice
-from lib.logger import get_logger
-from src.config.db import get_db
-from src.repository.models.index_table import Index
-from src.repository.models.price_table import Price
+from core.util.logger import get_logger
+from core.config.db import get_db
+from app.trifin.data.repository.models.index_table import Index
+from app.trifin.data.repository.models.price_table import Price
 
 logger = get_logger()
 
@@ -154,13 +153,47 @@ def print_recommand_weight(df):
     logger.info("\n")
 
 
+def summarize_results(
+        df,
+        years,
+        cols_and_labels,
+        monthly_contribution=100,
+        onetime_invest=False,
+) -> pd.DataFrame:
+    """
+    결과 DataFrame에서 전략별 불입액, 자산가치, 수익률, CAGR, MDD, Calmar, 샤프/소르티노 지수 등을 계산
+    - 전략 컬럼 전체를 metrics.compute_metrics로 한 번에 계산
+    - 총 불입액은 실제 불입 시점(리밸런싱일) 기준 합계
+
+    :param df: 전략별 자산가치 시계열 데이터프레임
+    :param years: 전체 투자 연수
+    :param cols_and_labels: (컬럼명, 전략 이름) 목록
+    :param monthly_contribution: 월별 불입액(만원 단위), onetime_invest면 최초 1회 불입액
+    :param onetime_invest: 최초 1회만 불입 여부
+    :return: 전략별 요약 지표 DataFrame (strategy=컬럼명, label=전략 이름)
+    """
+    from batch.trifin.backtesting.metrics import compute_metrics
+
+    if onetime_invest:
+        contributions = np.zeros(len(df))
+        contributions[0] = monthly_contribution
+    else:
+        contributions = monthly_contribution
+    columns = [column_name for column_name, _ in cols_and_labels]
+    summary = compute_metrics(
+        df, columns, contributions=contributions, years=years, periods_per_year=12
+    ).reset_index()
+    summary.insert(1, "label", [strategy_name for _, strategy_name in cols_and_labels])
+    return summary
+
+
 def print_summary(
         df,
         years,
         cols_and_labels,
         monthly_contribution=100,
         onetime_invest=False,
-):
+) -> pd.DataFrame:
     """
     결과 DataFrame에서 불입액, 자산가치, 수익률, CAGR, MDD를 계산/출력
 
@@ -178,43 +211,23 @@ def print_summary(
         :param monthly_contribution:float
             월별 불입액(만원 단위)
         :param onetime_invest:
+    :return: summarize_results 결과 (결과 저장은 result_store.save_run 사용)
     """
-
-    if onetime_invest:
-        total_contributed = monthly_contribution
-    else:
-        total_contributed = monthly_contribution * years * 12
-
-    summary = []
-
-    for column_name, strategy_name in cols_and_labels:
-        final_value = df[column_name].iloc[-1]
-        logger.info(f"[{strategy_name} 결과]")
-        logger.info(f"- 총 불입액: {total_contributed:,.2f}만원")
-        logger.info(f"- 최종 자산가치: {final_value:,.2f}만원")
-        logger.info(f"- 누적 수익률: {(final_value / total_contributed) * 100:.2f}%")
-        cagr = ((final_value / total_contributed) ** (1 / years) - 1) * 100
-        logger.info(f"- CAGR: {cagr:.2f}%")
-        mdd = get_mdd(df[column_name])
-        logger.info(f"- 최대 낙폭(MDD): {mdd:.2f}%")
-        logger.info(f"- Calmar: {cagr / (-1 * mdd) if mdd != 0 else 0:.2f}%\n")
-        # sharpe_ratio = get_sharpe_ratio(df[column_name])
-        # logger.info(f"- 샤프지수: {sharpe_ratio:.2f}\n")
-
-        summary.append(
-            {
-                "strategy": strategy_name,
-                "total_contributed": total_contributed,
-                "final_value": final_value,
-                "cumulative_return": (final_value / total_contributed) * 100,
-                "cagr": cagr,
-                "mdd": mdd,
-                "calmar_ratio": cagr / (-1 * mdd) if mdd != 0 else 0,
-                # "sharpe_ratio": sharpe_ratio,
-            }
-        )
-
-    save_result_csv(pd.DataFrame(summary), "Summary")
+    summary = summarize_results(
+        df, years, cols_and_labels, monthly_contribution, onetime_invest
+    )
+    for row in summary.itertuples():
+        logger.info(f"[{row.label} 결과]")
+        logger.info(f"- 총 불입액: {row.total_contributed:,.2f}만원")
+        logger.info(f"- 최종 자산가치: {row.final_value:,.2f}만원")
+        logger.info(f"- 누적 수익률: {row.cumulative_return:.2f}%")
+        logger.info(f"- CAGR: {row.cagr:.2f}%")
+        logger.info(f"- 최대 낙폭(MDD): {row.mdd:.2f}%")
+        logger.info(f"- MDD 구간: {row.mdd_peak_date:%Y-%m-%d} ~ {row.mdd_trough_date:%Y-%m-%d}")
+        logger.info(f"- Calmar: {row.calmar_ratio:.2f}%")
+        logger.info(f"- 샤프지수: {row.sharpe_ratio:.2f}")
+        logger.info(f"- 소르티노지수: {row.sortino_ratio:.2f}\n")
+    return summary
 
 
 def save_result_csv(df, name="Result"):
@@ -226,24 +239,17 @@ def save_result_csv(df, name="Result"):
     logger.info(f"[INFO] 결과가 {result_path}에 저장되었습니다.")
 
 
-def plot_performance(df, cols_and_labels):
-    plt.rcParams["font.family"] = "AppleGothic"
-    plt.rcParams["axes.unicode_minus"] = False
-    plt.figure(figsize=(14, 7))
-
-    for column, label in cols_and_labels:
-        plt.plot(df.index, df[column], label=label, linewidth=2)
-
-    # for sym in list(Symbol):
-    #     plt.plot(df.index, df[sym.value], label=sym.value, linewidth=2)
+def plot_performance(df, cols_and_labels, path=None):
+    """
+    전략별 자산가치 추이 차트를 PNG 파일로 저장 (headless, 화면 출력 없음)
+    :return: 저장된 파일 경로
+    """
+    from batch.trifin.backtesting.report import REPORT_DIR, write_report
 
-    plt.title("전략별 자산가치 추이")
-    plt.xlabel("날짜")
-    plt.ylabel("평가액(원화 기준)")
-    plt.legend()
-    plt.grid()
-    plt.tight_layout()
-    plt.show()
+    if path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(REPORT_DIR, f"Performance_{timestamp}.png")
+    return write_report(df, cols_and_labels, path)
 
 
 def print_asset_values(df, strategy_name="전략"):
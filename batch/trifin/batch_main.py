@@ -1,12 +1,16 @@
 import sys
-from batch.trifin.information_collector import save_symbol_price
+from batch.trifin.information_collector.save_symbol_price import save_symbol_price
+from batch.trifin.information_collector.save_crypto_price import save_crypto_price
 from batch.trifin.information_collector.save_index_price import save_index_price
+from batch.trifin.pnl_snapshot import update_snapshots
 
 
 def batch_main():
     start = "2005-01-01"
     save_symbol_price(start)
+    save_crypto_price()
     save_index_price(start)
+    update_snapshots()
     return 0
 
 
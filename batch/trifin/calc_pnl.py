@@ -1,67 +1,243 @@
-from src.config.db import get_db
-from src.repository.models.order_table import Order, UnitEnum
+"""
+calc_pnl.py
+
+order 테이블의 주문을 시간순으로 재생(replay)하여 계좌별 현금, 입금액, 실현손익, 보유 포지션을 계산하는 배치 스크립트
+
+- 의존성: SQLAlchemy, pandas, numpy
+- 주문은 DB에서 (date, id) 순으로 chunk 단위 스트리밍 조회 (전체 주문을 ORM 객체로 올리지 않음)
+- USD 주문의 환율은 price 테이블의 KRW=X 종가를 as-of(merge_asof)로 붙임
+    - 주말/공휴일 주문은 직전 영업일 환율 사용
+    - 첫 환율 이전 주문은 첫 환율 사용 (missing_fx 건수로 집계)
+    - 환율 이력이 아예 없으면 USD 주문을 환산할 수 없으므로 ValueError (환율 1로 계산하지 않음)
+- 현금 규칙: 매수 시 현금이 부족하면 부족분을 입금으로 처리, 매도 대금은 현금으로 적립
+- 실현손익: 종목별 이동평균 단가 기준 (매도가 - 평균단가) * 수량, 원화 기준
+
+사용법:
+    python -m batch.trifin.calc_pnl
+
+변경이력:
+    - v1.0.0: 최초 작성
+    - v1.1.0: chunk 스트리밍 + merge_asof 환율 조인 기반 PnlReplay로 변경 (iterrows, 주문별 print 제거)
+    - v1.1.1: KRW=X 환율 이력이 없을 때 USD 주문을 환율 1로 처리하던 문제 수정 (ValueError)
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+import numpy as np
 import pandas as pd
+from sqlalchemy import select
 
+from app.trifin.data.repository.models.order_table import Order, OrderTypeEnum, UnitEnum
+from app.trifin.data.repository.models.price_table import Price
+from core.config.db import engine
+from core.util.logger import get_logger
 
-def run():
+logger = get_logger()
+
+FX_SYMBOL = "KRW=X"
+CHUNK_SIZE = 10_000
+
+
+# =====================
+# 데이터 로딩
+# =====================
+def load_fx_rates(conn) -> pd.DataFrame:
     """
-    order 테이블의 모든 주문을 시간순(오름차순)으로 불러와 DataFrame으로 반환합니다.
+    KRW=X 환율을 일자 오름차순 DataFrame(fx_date, fx)으로 조회
     """
-    with get_db() as session:
-        orders = session.query(Order).order_by(Order.date.asc()).all()
-        df_orders = pd.DataFrame(
-            [
-                {c.name: getattr(row, c.name) for c in Order.__table__.columns}
-                for row in orders
-            ]
-        )
-        print("[INFO] 시간순 주문 내역:")
-        print(df_orders)
-
-        # Price 테이블에서 symbol='KRX=X' 환율 정보를 날짜별로 미리 조회
-        from src.repository.models.price_table import Price
-        price_rows = session.query(Price).filter(Price.symbol == 'KRW=X').all()
-        # 환율 dict: {yyyymmdd: 환율}
-        fx_map = {}
-        for p in price_rows:
-            # timestamp(datetime) → yyyymmdd 문자열로 변환
-            if hasattr(p.timestamp, 'strftime'):
-                date_str = p.timestamp.strftime('%Y-%m-%d')
-            else:
-                # 문자열/타입이 이미 yyyymmdd면 그대로 사용
-                date_str = str(p.timestamp)
-            fx_map[date_str] = p.close
-
-        # 현금 흐름 및 전체 입금액 계산
-        cash = 0.0
-        total_deposit = 0.0
-        for idx, row in df_orders.iterrows():
-            # 환율 결정: USD면 해당 날짜의 환율, 아니면 1
-            if row["unit"] == UnitEnum.USD:
-                fx = fx_map.get(str(row["date"]), None)
-                if fx is None:
-                    print(f"[WARN] 환율 없음: {row['date']} → 1로 처리")
-                    fx = 1.0
+    query = (
+        select(Price.timestamp.label("fx_date"), Price.close.label("fx"))
+        .where(Price.symbol == FX_SYMBOL)
+        .order_by(Price.timestamp.asc())
+    )
+    fx = pd.read_sql(query, conn)
+    fx["fx_date"] = pd.to_datetime(fx["fx_date"]).dt.normalize()
+    return fx.drop_duplicates("fx_date", keep="last").reset_index(drop=True)
+
+
+def iter_orders(
+        conn,
+        after_order_id: Optional[int] = None,
+        chunksize: int = CHUNK_SIZE,
+        from_date: Optional[str] = None,
+        until_date: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    주문을 (date, id) 오름차순으로 chunk 단위 스트리밍 조회
+    :param after_order_id: 이 id보다 큰 주문만 조회 (증분 처리용)
+    :param from_date: 이 일자(YYYY-MM-DD) 이후 주문만 조회 (포함)
+    :param until_date: 이 일자(YYYY-MM-DD) 이전 주문만 조회 (미포함)
+    """
+    query = select(
+        Order.id,
+        Order.account_id,
+        Order.date,
+        Order.type,
+        Order.symbol,
+        Order.size,
+        Order.price,
+        Order.unit,
+    ).order_by(Order.date.asc(), Order.id.asc())
+    if after_order_id is not None:
+        query = query.where(Order.id > after_order_id)
+    # date는 ISO8601 문자열이므로 일자 문자열과 사전순 비교 (시각이 붙은 주문도 같은 일자로 취급)
+    if from_date is not None:
+        query = query.where(Order.date >= from_date)
+    if until_date is not None:
+        query = query.where(Order.date < until_date)
+    conn = conn.execution_options(stream_results=True)
+    for chunk in pd.read_sql(query, conn, chunksize=chunksize):
+        yield chunk
+
+
+def attach_fx(orders: pd.DataFrame, fx: pd.DataFrame) -> pd.DataFrame:
+    """
+    주문 chunk에 원화 환산 환율(fx) 컬럼 추가 (USD만 as-of 환율, KRW는 1)
+    - 입력 순서(date, id)를 유지
+    - USD 주문이 있는데 환율 이력이 비어 있으면 ValueError
+    """
+    orders = orders.copy()
+    orders["order_date"] = pd.to_datetime(orders["date"], format="ISO8601")
+    orders["fx"] = 1.0
+    orders["missing_fx"] = False
+    is_usd = orders["unit"].isin([UnitEnum.USD]).to_numpy()
+    if is_usd.any():
+        if fx.empty:
+            raise ValueError(
+                f"{FX_SYMBOL} 환율 이력이 없어 USD 주문 {int(is_usd.sum())}건을 원화로 환산할 수 없습니다. "
+                f"(환율 수집 후 다시 실행)"
+            )
+        usd = orders.loc[is_usd, ["order_date"]].reset_index()
+        merged = pd.merge_asof(
+            usd.sort_values("order_date"),
+            fx,
+            left_on="order_date",
+            right_on="fx_date",
+            direction="backward",
+        ).set_index("index")
+        missing = merged["fx"].isna()
+        merged["fx"] = merged["fx"].fillna(fx["fx"].iloc[0])
+        orders.loc[merged.index, "fx"] = merged["fx"]
+        orders.loc[merged.index, "missing_fx"] = missing
+    return orders
+
+
+# =====================
+# 재생 엔진
+# =====================
+@dataclass
+class PnlReplay:
+    """
+    주문 스트림을 한 번 순회하며 계좌별 현금/입금/실현손익과 (계좌, 종목)별 보유 수량/취득원가를 갱신
+    - 상태는 chunk 사이에 유지되므로 apply를 여러 번 호출해 이어서 처리 가능
+    """
+
+    cash: dict = field(default_factory=dict)  # account_id -> 현금
+    deposit: dict = field(default_factory=dict)  # account_id -> 누적 입금액
+    realized_pnl: dict = field(default_factory=dict)  # account_id -> 누적 실현손익
+    positions: dict = field(default_factory=dict)  # (account_id, symbol) -> [수량, 취득원가(원화)]
+    last_order_id: Optional[int] = None  # 처리한 주문 중 최대 id
+    last_order_date: Optional[str] = None
+    order_count: int = 0
+    missing_fx_count: int = 0
+
+    def apply(self, orders: pd.DataFrame) -> None:
+        """attach_fx를 거친 주문 chunk 반영"""
+        if orders.empty:
+            return
+        is_buy = orders["type"].isin([OrderTypeEnum.buy]).to_numpy()
+        amounts = (orders["size"] * orders["price"] * orders["fx"]).to_numpy(dtype=float)
+        cash, deposit, realized, positions = self.cash, self.deposit, self.realized_pnl, self.positions
+
+        for account_id, symbol, size, amount, buy in zip(
+                orders["account_id"].tolist(),
+                orders["symbol"].tolist(),
+                orders["size"].tolist(),
+                amounts.tolist(),
+                is_buy.tolist(),
+        ):
+            position = positions.get((account_id, symbol))
+            if position is None:
+                position = positions[(account_id, symbol)] = [0.0, 0.0]
+            balance = cash.get(account_id, 0.0)
+            if buy:
+                balance -= amount
+                # 현금 부족 시 부족분 입금 처리
+                if balance < 0:
+                    deposit[account_id] = deposit.get(account_id, 0.0) - balance
+                    balance = 0.0
+                position[0] += size
+                position[1] += amount
             else:
-                fx = 1.0
-            
-            if row["type"].lower() == "buy":
-                amount = row["size"] * row["price"] * fx
-                cash -= amount
-                # 현금 부족 시 입금 처리
-                if cash < 0:
-                    deposit = -cash
-                    total_deposit += deposit
-                    print(
-                        f"[{row['date']}] 현금 부족 ({row['symbol']}): {deposit:.2f} 입금 (누적 입금: {total_deposit:.2f})"
-                    )
-                    cash = 0.0
-            elif row["type"].lower() == "sell":
-                amount = row["size"] * row["price"] * fx
-                cash += amount
-                print(f"[{row['date']}] 매도: +{amount:.2f} (현금: {cash:.2f})")
-        print(f"\n[RESULT] 전체 입금액: {total_deposit:.2f}")
-        return total_deposit
+                balance += amount
+                # 평균단가 기준 실현손익, 보유 수량 초과 매도분은 원가 0으로 처리
+                sold = min(size, position[0]) if position[0] > 0 else 0.0
+                cost = position[1] / position[0] * sold if sold > 0 else 0.0
+                realized[account_id] = realized.get(account_id, 0.0) + amount - cost
+                position[0] -= sold
+                position[1] -= cost
+            cash[account_id] = balance
+
+        self.order_count += len(orders)
+        self.missing_fx_count += int(orders["missing_fx"].sum())
+        self.last_order_id = max(self.last_order_id or 0, int(orders["id"].max()))
+        self.last_order_date = str(orders["date"].iloc[-1])
+
+    def account_summary(self) -> pd.DataFrame:
+        """계좌별 현금, 누적 입금액, 누적 실현손익, 보유 취득원가"""
+        cost_basis = {}
+        for (account_id, _), (_, cost) in self.positions.items():
+            cost_basis[account_id] = cost_basis.get(account_id, 0.0) + cost
+        accounts = sorted(set(self.cash) | set(self.deposit) | set(cost_basis))
+        return pd.DataFrame(
+            {
+                "account_id": accounts,
+                "cash": [self.cash.get(a, 0.0) for a in accounts],
+                "total_deposit": [self.deposit.get(a, 0.0) for a in accounts],
+                "realized_pnl": [self.realized_pnl.get(a, 0.0) for a in accounts],
+                "cost_basis": [cost_basis.get(a, 0.0) for a in accounts],
+            }
+        )
+
+    def position_summary(self) -> pd.DataFrame:
+        """(계좌, 종목)별 보유 수량, 취득원가, 평균단가 (보유 수량 0 제외)"""
+        rows = [
+            (account_id, symbol, size, cost)
+            for (account_id, symbol), (size, cost) in self.positions.items()
+            if not np.isclose(size, 0.0)
+        ]
+        df = pd.DataFrame(rows, columns=["account_id", "symbol", "size", "cost_basis"])
+        df["avg_price"] = df["cost_basis"] / df["size"]
+        return df
+
+
+def replay_orders(replay: Optional[PnlReplay] = None, chunksize: int = CHUNK_SIZE) -> PnlReplay:
+    """
+    DB 주문을 스트리밍으로 재생
+    :param replay: 이어서 처리할 기존 상태 (None이면 처음부터, 있으면 last_order_id 이후 주문만)
+    """
+    replay = replay or PnlReplay()
+    with engine.connect() as conn:
+        fx = load_fx_rates(conn)
+        for chunk in iter_orders(conn, replay.last_order_id, chunksize):
+            replay.apply(attach_fx(chunk, fx))
+    return replay
+
+
+def run():
+    """
+    전체 주문을 재생해 계좌별 결과를 로그로 출력하고 전체 입금액을 반환
+    """
+    replay = replay_orders()
+    summary = replay.account_summary()
+    if replay.missing_fx_count:
+        logger.warning(f"[calc_pnl] 환율 이력 이전 USD 주문 {replay.missing_fx_count}건은 첫 환율로 처리")
+    logger.info(f"[calc_pnl] 주문 {replay.order_count}건 처리 (마지막 주문 id: {replay.last_order_id})")
+    logger.info(f"[calc_pnl] 계좌별 결과:\n{summary.to_string(index=False)}")
+    total_deposit = float(summary["total_deposit"].sum()) if not summary.empty else 0.0
+    logger.info(f"[RESULT] 전체 입금액: {total_deposit:.2f}")
+    return total_deposit
 
 
 if __name__ == "__main__":
@@ -0,0 +1,347 @@
+"""
+data_quality.py
+
+price / index 테이블의 데이터 품질(누락 거래일, 비정상 가격, 급변, 일자 중복, 갱신 중단)을 검사해 리포트로 저장하는 배치 스크립트
+
+- 의존성: SQLAlchemy, pandas, numpy
+- 검사 항목 (종목별 벡터 연산)
+    - missing_days: 시장 캘린더 거래일(월간 지표는 매월 1일) 대비 첫~마지막 관측일 사이 누락 구간
+    - non_positive: 시가/고가/저가/종가 중 0 이하 (price)
+    - jump: 일간 로그수익률 절대값이 max(종목별 최소 기준, JUMP_SIGMAS * robust sigma(MAD))를 초과
+    - duplicate_day: 같은 일자에 시각만 다른 행이 여러 개 (수집 시간대 불일치)
+    - flat: 같은 값이 종목별 기준 거래일 수 이상 연속 (데이터 공급 중단 의심)
+    - stale: 마지막 관측일 이후 기준 거래일 수(월간 지표는 일수) 이상 신규 데이터 없음
+- 증분 검사
+    - 리포트에 테이블별 마지막 검사 id(watermark)를 저장, 다음 실행은 id > watermark 인 신규 행이 있는 종목만 검사
+    - 신규 행의 최소 일자(걸쳐 있는 기존 이슈가 있으면 그 시작일)부터 다시 검사해 해당 구간 이슈를 교체
+      (급변/sigma 계산용으로 CONTEXT_DAYS 이전 데이터를 함께 읽음), stale은 매번 전 종목 재계산
+- 리포트: REPORT_DIR/latest.json (watermark, 열린 이슈, 재수집 시도 횟수) + 실행별 이슈 CSV
+    - 누락 구간/stale 이슈는 information_collector.refetch_gaps 가 해당 구간만 재수집하는 데 사용
+- 사용법:
+    python -m batch.trifin.data_quality           # 증분 검사
+    python -m batch.trifin.data_quality --full    # 전체 재검사
+- 작성일: 2025-06-18
+"""
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func, or_, select
+
+from app.trifin.data.repository.models.index_table import Index
+from app.trifin.data.repository.models.price_table import Price
+from batch.trifin.information_collector.market_calendar import EVERYDAY, FX, NYSE, US_BOND, MarketCalendar
+from core.config.db import engine
+from core.util.logger import get_logger
+
+logger = get_logger()
+
+REPORT_DIR = os.path.join(os.path.dirname(__file__), "data_quality_result")
+REPORT_FILE = "latest.json"
+CONTEXT_DAYS = 400
+JUMP_SIGMAS = 10.0
+REFETCH_CHECKS = ("missing_days", "stale")
+
+
+# =====================
+# 종목별 검사 기준
+# =====================
+@dataclass(frozen=True)
+class SeriesRule:
+    """
+    Attributes:
+        calendar: 거래일 캘린더 (None이면 월간 지표: 매월 1일 관측)
+        max_jump: 급변으로 보는 최소 일간 로그수익률 절대값
+        flat_days: 같은 값 연속 관측 허용 한도 (None이면 검사 안 함)
+        stale_days: 마지막 관측 후 허용 거래일 수 (월간 지표는 달력 일수)
+    """
+
+    calendar: Optional[MarketCalendar] = NYSE
+    max_jump: float = 0.15
+    flat_days: Optional[int] = 5
+    stale_days: int = 3
+
+
+DEFAULT_RULES = {"price": SeriesRule(), "index": SeriesRule(calendar=US_BOND, flat_days=10)}
+SERIES_RULES: Dict[tuple, SeriesRule] = {
+    ("price", "BTC-USD"): SeriesRule(calendar=EVERYDAY, max_jump=0.3),
+    ("price", "KRW-BTC"): SeriesRule(calendar=EVERYDAY, max_jump=0.3),
+    ("price", "KRW=X"): SeriesRule(calendar=FX, max_jump=0.05),
+    ("price", "^VIX"): SeriesRule(max_jump=0.6, flat_days=None),
+    ("price", "^TNX"): SeriesRule(max_jump=0.25, flat_days=None),
+    ("index", "VIXCLS"): SeriesRule(calendar=NYSE, max_jump=0.6, flat_days=None),
+    ("index", "CPIAUCSL"): SeriesRule(calendar=None, max_jump=0.1, flat_days=None, stale_days=100),
+    ("index", "UNRATE"): SeriesRule(calendar=None, max_jump=1.5, flat_days=None, stale_days=100),
+}
+
+
+def rule_for(table: str, symbol: str) -> SeriesRule:
+    return SERIES_RULES.get((table, symbol), DEFAULT_RULES[table])
+
+
+def expected_days(rule: SeriesRule, start, end) -> pd.DatetimeIndex:
+    if rule.calendar is None:
+        return pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="MS")
+    return rule.calendar.session_index(start, end)
+
+
+# =====================
+# 조회
+# =====================
+def _table_columns(table: str):
+    if table == "price":
+        return Price, Price.timestamp, [Price.id, Price.symbol, Price.timestamp.label("ts"), Price.open, Price.high,
+                                        Price.low, Price.close.label("value")]
+    return Index, Index.date, [Index.id, Index.symbol, Index.date.label("ts"), Index.value]
+
+
+def load_new_rows(conn, table: str, after_id: int) -> pd.DataFrame:
+    """id > after_id 신규 행의 종목별 최소 일자, 최대 id"""
+    model, ts, _ = _table_columns(table)
+    query = (
+        select(model.symbol, func.min(ts).label("first_ts"), func.max(model.id).label("max_id"))
+        .where(model.id > after_id)
+        .group_by(model.symbol)
+    )
+    return pd.DataFrame(conn.execute(query).all(), columns=["symbol", "first_ts", "max_id"])
+
+
+def load_series(conn, table: str, starts: Dict[str, Optional[pd.Timestamp]]) -> pd.DataFrame:
+    """종목별 시작 시각(None이면 전체) 이후 행"""
+    model, ts, columns = _table_columns(table)
+    conditions = [
+        model.symbol == symbol if start is None else and_(model.symbol == symbol, ts >= start.to_pydatetime())
+        for symbol, start in starts.items()
+    ]
+    query = select(*columns).where(or_(*conditions)).order_by(model.symbol, ts)
+    frame = pd.DataFrame(conn.execute(query).all(), columns=[c.name for c in columns])
+    frame["ts"] = pd.to_datetime(frame["ts"])
+    return frame
+
+
+def load_last_observations(conn, table: str) -> pd.DataFrame:
+    model, ts, _ = _table_columns(table)
+    query = select(model.symbol, func.max(ts).label("last_ts")).group_by(model.symbol)
+    frame = pd.DataFrame(conn.execute(query).all(), columns=["symbol", "last_ts"])
+    frame["last_ts"] = pd.to_datetime(frame["last_ts"])
+    return frame
+
+
+def max_id(conn, table: str) -> int:
+    model, _, _ = _table_columns(table)
+    return conn.execute(select(func.max(model.id))).scalar() or 0
+
+
+# =====================
+# 검사
+# =====================
+def _issue(table, symbol, check, start, end, count=1, detail="") -> dict:
+    return {
+        "table": table,
+        "symbol": symbol,
+        "check": check,
+        "start": str(pd.Timestamp(start).date()),
+        "end": str(pd.Timestamp(end).date()),
+        "count": int(count),
+        "detail": detail,
+        "refetch_attempts": 0,
+    }
+
+
+def _runs(expected: pd.DatetimeIndex, flags: np.ndarray):
+    """expected 중 flags가 True인 연속 구간 (시작, 끝, 개수)"""
+    positions = np.flatnonzero(flags)
+    if len(positions) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+    return [(expected[run[0]], expected[run[-1]], len(run)) for run in np.split(positions, breaks)]
+
+
+def scan_series(table: str, symbol: str, frame: pd.DataFrame, rule: SeriesRule) -> List[dict]:
+    """
+    한 종목(일자 오름차순 frame: ts, value[, open, high, low])의 이슈 목록
+    """
+    issues = []
+    days = frame["ts"].dt.normalize()
+
+    duplicated = days.duplicated(keep=False).to_numpy()
+    if duplicated.any():
+        for day, times in frame.loc[duplicated, "ts"].groupby(days[duplicated]):
+            detail = ", ".join(t.strftime("%H:%M:%S") for t in times)
+            issues.append(_issue(table, symbol, "duplicate_day", day, day, len(times), detail))
+
+    daily = frame.assign(day=days).drop_duplicates("day", keep="last").set_index("day")
+    if daily.empty:
+        return issues
+
+    if table == "price":
+        bad = (daily[["open", "high", "low", "value"]] <= 0).any(axis=1).to_numpy()
+        for start, end, count in _runs(daily.index, bad):
+            issues.append(_issue(table, symbol, "non_positive", start, end, count))
+
+    values = daily["value"].where(daily["value"] > 0)
+    returns = np.log(values).diff()
+    sigma = 1.4826 * (returns - returns.median()).abs().median()
+    threshold = max(rule.max_jump, JUMP_SIGMAS * sigma) if np.isfinite(sigma) else rule.max_jump
+    for day, value in returns[returns.abs() > threshold].items():
+        issues.append(_issue(table, symbol, "jump", day, day, 1, f"log return {value:+.4f} (기준 {threshold:.4f})"))
+
+    if rule.flat_days:
+        same = values.diff().eq(0).to_numpy()
+        for start, end, count in _runs(daily.index, same):
+            if count + 1 >= rule.flat_days:
+                # 같은 값 구간은 첫 diff==0 행의 직전 행부터 시작
+                first = daily.index[daily.index.get_loc(start) - 1]
+                issues.append(_issue(table, symbol, "flat", first, end, count + 1, f"value {values[end]}"))
+
+    expected = expected_days(rule, daily.index[0], daily.index[-1])
+    missing = ~expected.isin(daily.index)
+    for start, end, count in _runs(expected, missing):
+        issues.append(_issue(table, symbol, "missing_days", start, end, count))
+    return issues
+
+
+def scan_stale(table: str, last_observations: pd.DataFrame, today: pd.Timestamp) -> List[dict]:
+    issues = []
+    for symbol, last_ts in zip(last_observations["symbol"], last_observations["last_ts"]):
+        rule = rule_for(table, symbol)
+        last_day = last_ts.normalize()
+        if rule.calendar is None:
+            lag = (today - last_day).days
+        else:
+            lag = len(expected_days(rule, last_day + pd.Timedelta(days=1), today - pd.Timedelta(days=1)))
+        if lag > rule.stale_days:
+            issues.append(
+                _issue(table, symbol, "stale", last_day + pd.Timedelta(days=1), today, lag, f"마지막 관측 {last_day.date()}")
+            )
+    return issues
+
+
+# =====================
+# 리포트
+# =====================
+def load_report(report_dir: str = REPORT_DIR) -> dict:
+    path = os.path.join(report_dir, REPORT_FILE)
+    if not os.path.exists(path):
+        return {"watermarks": {}, "issues": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report: dict, report_dir: str = REPORT_DIR) -> str:
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, REPORT_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+    csv_name = f"issues_{pd.Timestamp(report['generated_at']).strftime('%Y%m%d_%H%M%S')}.csv"
+    pd.DataFrame(report["issues"], columns=list(_issue("", "", "", "2000-01-01", "2000-01-01"))).to_csv(
+        os.path.join(report_dir, csv_name), index=False
+    )
+    return path
+
+
+def _issue_key(issue: dict) -> tuple:
+    # stale 이슈의 종료일은 매일 바뀌므로 시작일(마지막 관측 다음 날)까지만 비교
+    end = None if issue["check"] == "stale" else issue["end"]
+    return issue["table"], issue["symbol"], issue["check"], issue["start"], end
+
+
+def _scan_starts(new_rows: pd.DataFrame, open_issues: List[dict]) -> Dict[str, pd.Timestamp]:
+    """종목별 재검사 시작일: 신규 행 최소 일자, 그 일자에 걸친 기존 이슈가 있으면 이슈 시작일까지 당김"""
+    starts = {}
+    for symbol, first_ts in zip(new_rows["symbol"], pd.to_datetime(new_rows["first_ts"])):
+        start = first_ts.normalize()
+        spanning = [
+            pd.Timestamp(i["start"]) for i in open_issues
+            if i["symbol"] == symbol and pd.Timestamp(i["start"]) < start <= pd.Timestamp(i["end"])
+        ]
+        starts[symbol] = min([start] + spanning)
+    return starts
+
+
+def run_scan(full: bool = False, today: Optional[pd.Timestamp] = None, report_dir: str = REPORT_DIR) -> dict:
+    """
+    price/index 테이블을 (증분) 검사하고 리포트를 저장
+    Returns:
+        dict: 리포트 (watermarks, issues, summary)
+    """
+    today = pd.Timestamp.now().normalize() if today is None else pd.Timestamp(today).normalize()
+    previous = {"watermarks": {}, "issues": []} if full else load_report(report_dir)
+    attempts = {_issue_key(i): i.get("refetch_attempts", 0) for i in previous["issues"]}
+    issues = [i for i in previous["issues"] if i["check"] != "stale"]
+    watermarks = {}
+    scanned = {}
+
+    with engine.connect() as conn:
+        for table in ("price", "index"):
+            watermark = previous["watermarks"].get(table, 0)
+            watermarks[table] = max_id(conn, table)
+            new_rows = load_new_rows(conn, table, watermark)
+            scanned[table] = len(new_rows)
+            if not new_rows.empty:
+                table_issues = [i for i in issues if i["table"] == table]
+                starts = {} if full else _scan_starts(new_rows, table_issues)
+                context = {
+                    symbol: None if full else starts[symbol] - pd.Timedelta(days=CONTEXT_DAYS)
+                    for symbol in new_rows["symbol"]
+                }
+                frame = load_series(conn, table, context)
+                found = []
+                for symbol, series in frame.groupby("symbol", sort=False):
+                    series_issues = scan_series(table, symbol, series.reset_index(drop=True), rule_for(table, symbol))
+                    if not full:
+                        series_issues = [i for i in series_issues if pd.Timestamp(i["start"]) >= starts[symbol]]
+                    found.extend(series_issues)
+                # 재검사 구간의 기존 이슈를 새 결과로 교체
+                issues = [
+                    i for i in issues
+                    if not (
+                        i["table"] == table and i["symbol"] in context
+                        and (full or pd.Timestamp(i["start"]) >= starts[i["symbol"]])
+                    )
+                ] + found
+            issues.extend(scan_stale(table, load_last_observations(conn, table), today))
+
+    for issue in issues:
+        issue["refetch_attempts"] = attempts.get(_issue_key(issue), 0)
+    issues.sort(key=lambda i: (i["table"], i["symbol"], i["start"], i["check"]))
+    summary = pd.Series([i["check"] for i in issues], dtype=object).value_counts().to_dict()
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "watermarks": watermarks,
+        "scanned_symbols": scanned,
+        "summary": summary,
+        "issues": issues,
+    }
+    save_report(report, report_dir)
+    logger.info(
+        f"[data_quality] 검사 종목 {scanned}, 이슈 {len(issues)}건 {summary} → {os.path.join(report_dir, REPORT_FILE)}"
+    )
+    return report
+
+
+def refetch_targets(report: dict, max_attempts: int) -> List[dict]:
+    """재수집 대상 이슈 (누락 구간/stale, 시도 횟수 max_attempts 미만, 최근 구간 우선)"""
+    targets = [
+        i for i in report["issues"]
+        if i["check"] in REFETCH_CHECKS and i.get("refetch_attempts", 0) < max_attempts
+    ]
+    return sorted(targets, key=lambda i: i["end"], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="price/index 테이블 데이터 품질 검사")
+    parser.add_argument("--full", action="store_true", help="watermark를 무시하고 전체 재검사")
+    args = parser.parse_args(argv)
+    run_scan(full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,156 +1,253 @@
+"""
+db_insert_from_csv.py
+
+증권사 거래내역 CSV(date, account, symbol, type, size, price)를 account/order 테이블로 적재하는 배치 스크립트
+
+- 의존성: SQLAlchemy, pandas, numpy
+- CSV는 chunk 단위로 읽고 컬럼 단위 벡터 연산으로 변환
+    - date: YYYYMMDD → YYYY-MM-DD
+    - symbol: _USD 접미어면 unit=USD 및 접미어 제거, 아니면 KRW
+    - type: 매수/매도 → buy/sell, size: 매도 음수 수량 → 절대값
+- 계좌 id는 chunk의 신규 계좌명만 한 번의 SELECT로 조회 (없는 계좌는 bulk insert 후 재조회)
+- 주문은 Core bulk insert(INSERT_CHUNK_SIZE 단위)로 저장, ORM 객체 생성 없음
+- 재실행해도 중복 적재되지 않음 (멱등)
+    - 중복 키: (account_id, date, symbol, type, size, price, unit)
+    - 같은 날 동일 주문이 여러 건일 수 있으므로 키별 "몇 번째 발생인지"를 DB 기존 건수와 비교해 초과분만 저장
+    - size/price는 단정밀도 컬럼(MySQL FLOAT)이라 저장 후 값이 달라짐 (123.45 → 123.4499969...)
+        → 비교 시 양쪽 모두 float32 정밀도로 맞춤 (DOUBLE 컬럼이어도 동일하게 동작)
+- 결과는 테이블 전체 출력 대신 건수만 로그로 보고
+
+사용법:
+    python -m batch.trifin.db_insert_from_csv [CSV 경로] [--chunksize 50000]
+
+변경이력:
+    - v1.0.0: 최초 작성
+    - v1.1.0: chunk 읽기/벡터 변환/Core bulk insert 기반 멱등 적재로 변경
+    - v1.1.1: 중복 판정 시 size/price를 float32 정밀도로 비교 (MySQL FLOAT 재적재 중복 수정)
+"""
+
+import argparse
+import os
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import numpy as np
 import pandas as pd
+from sqlalchemy import insert, select
 
-from src.config.db import get_db
-from src.repository.models.account_table import Account
+from app.trifin.data.repository.models.account_table import Account
+from app.trifin.data.repository.models.order_table import Order, OrderTypeEnum, UnitEnum
+from core.config.db import engine
+from core.util.logger import get_logger
 
+logger = get_logger()
 
-def read_csv(filepath: str = "./sample.csv") -> pd.DataFrame:
-    """
-    sample.csv 파일을 읽어 DataFrame으로 반환합니다.
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(__file__), "sample.csv")
+CHUNK_SIZE = 50_000
+INSERT_CHUNK_SIZE = 5_000
 
-    Args:
-        filepath (str): CSV 파일 경로 (기본값: ./sample.csv)
-    Returns:
-        pd.DataFrame: CSV 데이터프레임
+USD_SUFFIX = "_USD"
+ORDER_TYPES = {"매수": OrderTypeEnum.buy.value, "매도": OrderTypeEnum.sell.value}
+# 계좌명 접두어 → 유저 ID
+USER_ID_BY_PREFIX = {"태규": 1, "윤지": 2}
+
+ORDER_KEY = ["account_id", "date", "symbol", "type", "size", "price", "unit"]
+# order.size/price 컬럼 정밀도 (sa.Float → MySQL 단정밀도 FLOAT)
+FLOAT_KEY_COLUMNS = ["size", "price"]
+
+
+# =====================
+# CSV 읽기/변환
+# =====================
+def read_csv_chunks(filepath: str = DEFAULT_CSV_PATH, chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    CSV를 chunk 단위로 읽음
     Raises:
-        FileNotFoundError: 파일이 존재하지 않을 때 발생
+        FileNotFoundError: 파일이 존재하지 않을 때
         pd.errors.ParserError: CSV 파싱 오류
     """
-    try:
-        df = pd.read_csv(filepath)
+    dtype = {"date": str, "account": str, "symbol": str, "type": str, "size": float, "price": float}
+    yield from pd.read_csv(filepath, dtype=dtype, chunksize=chunksize)
 
-        # date 컬럼을 datetime.date 타입으로 변환
-        try:
-            df["date"] = pd.to_datetime(df["date"], format="%Y%m%d").dt.date
-        except Exception as e:
-            print("[ERROR] date 컬럼 변환 실패:", e)
-            raise e
 
-        # 데이터 미리보기 출력 (디버깅용)
-        print("[INFO] CSV 미리보기:\n", df.head())
-    except FileNotFoundError as e:
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {filepath}")
-        raise e
-    except pd.errors.ParserError as e:
-        print(f"[ERROR] CSV 파싱 오류: {filepath}")
-        raise e
+def transform_orders(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    CSV chunk → order 테이블 컬럼(account, date, symbol, type, size, price, unit)으로 벡터 변환
+    Raises:
+        ValueError: 날짜 형식 오류 또는 매수/매도 외 주문 타입
+    """
+    symbol = chunk["symbol"].str.strip()
+    is_usd = symbol.str.endswith(USD_SUFFIX)
+    order_type = chunk["type"].str.strip().map(ORDER_TYPES)
+    if order_type.isna().any():
+        unknown = chunk.loc[order_type.isna(), "type"].unique().tolist()
+        raise ValueError(f"알 수 없는 주문 타입: {unknown}")
+    return pd.DataFrame(
+        {
+            "account": chunk["account"].str.strip(),
+            "date": pd.to_datetime(chunk["date"], format="%Y%m%d").dt.strftime("%Y-%m-%d"),
+            "symbol": symbol.str.removesuffix(USD_SUFFIX),
+            "type": order_type,
+            "size": chunk["size"].abs(),
+            "price": chunk["price"],
+            "unit": np.where(is_usd, UnitEnum.USD.value, UnitEnum.KRW.value),
+        },
+        index=chunk.index,
+    )
+
+
+def get_user_id(account_name: str) -> int:
+    """
+    계좌명 접두어로 유저 ID 결정
+    Raises:
+        ValueError: 등록되지 않은 접두어
+    """
+    for prefix, user_id in USER_ID_BY_PREFIX.items():
+        if account_name.startswith(prefix):
+            return user_id
+    raise ValueError(f"Unexpected Account Name {account_name}")
 
-    df_account = insert_account(df["account"])
-    insert_order(df, df_account)
 
+def _enum_value(value):
+    return getattr(value, "value", value)
 
-def insert_account(series: pd.Series) -> pd.DataFrame:
-    """
-    unique_account 리스트를 Account 테이블에 저장하고, 전체 테이블을 DataFrame으로 반환합니다.
-    Args:
-        series (pd.Series): 계좌명 시리즈 (account 컬럼)
-    """
-    unique_account = series.unique()
-    print("[INFO] 추출된 계좌명:", unique_account)
-
-    with get_db() as session:
-        try:
-            # 이미 존재하는 계좌명은 중복 삽입 방지
-            for name in unique_account:
-                exists = session.query(Account).filter_by(name=name).first()
-                if not exists:
-                    # user_id, balance는 임시로 1, 0.0 사용 (실제 로직에 맞게 수정 필요)
-                    if name.startswith("태규"):
-                        user_id = 1
-                    elif name.startswith("윤지"):
-                        user_id = 2
-                    else:
-                        raise Exception(f"Unexpected Account Name {name}")
-                    acc = Account(user_id=user_id, name=name, balance=0.0)
-                    session.add(acc)
-            session.commit()
-            print("[INFO] Account 테이블 저장 완료")
-
-            # Account 테이블 전체를 DataFrame으로 조회
-            result = session.query(Account).all()
-            df_accounts = pd.DataFrame(
-                [
-                    {c.name: getattr(row, c.name) for c in Account.__table__.columns}
-                    for row in result
-                ]
-            )
-            print("[INFO] Account 테이블 전체:")
-            print(df_accounts)
-            return df_accounts
-        except Exception as e:
-            session.rollback()
-            print("[ERROR] Account 저장/조회 실패:", e)
-            raise e
-
-
-def insert_order(df, df_account):
-    with get_db() as session:
-        # df와 df_account를 계좌명(name) 기준으로 merge하여 account_id 컬럼 추가
-        # df: 원본 데이터프레임, df_account: Account 테이블 전체(id, name 등)
-        try:
-            # account_id 추가를 위해 merge (left join)
-            df_merged = pd.merge(
-                df,
-                df_account[["id", "name"]],
-                how="left",
-                left_on="account",
-                right_on="name",
-            )
-            df_merged = df_merged.rename(columns={"id": "account_id"})
 
-            # 2. symbol이 _USD로 끝나면 unit=USD, 아니면 KRW
-            df_merged["unit"] = df_merged["symbol"].apply(
-                lambda x: "USD" if str(x).endswith("_USD") else "KRW"
-            )
+def _match_keys(orders: pd.DataFrame) -> pd.DataFrame:
+    """중복 비교용 키: size/price를 DB 컬럼 정밀도(float32)로 맞춤"""
+    keys = orders[ORDER_KEY].copy()
+    for column in FLOAT_KEY_COLUMNS:
+        keys[column] = keys[column].astype("float64").astype("float32").astype("float64")
+    return keys
 
-            # 3. symbol에서 _USD 접미어 제거
-            df_merged["symbol"] = df_merged["symbol"].apply(
-                lambda x: str(x)[:-4] if str(x).endswith("_USD") else x
-            )
 
-            df_merged["type"] = df_merged["type"].apply(
-                lambda x: "Buy" if x == "매수" else "Sell"
-            )
+def _lookup(counts: pd.Series, keys: pd.MultiIndex) -> np.ndarray:
+    """키별 건수 Series에서 keys 순서대로 건수 조회 (없으면 0)"""
+    if counts.empty:
+        return np.zeros(len(keys), dtype="int64")
+    return counts.reindex(keys).fillna(0).to_numpy(dtype="int64")
 
-            df_merged["size"] = df_merged["size"].apply(
-                lambda x: x * -1 if x < 0 else x
-            )
 
-            df_merged.drop(columns=["account", "name"], inplace=True)
-
-            print("[INFO] 주문 데이터(account_id 추가):\n", df_merged.head())
-
-            # Order 테이블에 저장
-            from src.repository.models.order_table import Order
-            order_objs = []
-            for _, row in df_merged.iterrows():
-                order = Order(
-                    type=row["type"],
-                    symbol=row["symbol"],
-                    account_id=row["account_id"],
-                    date=row["date"],
-                    size=row["size"],
-                    price=row["price"],
-                    unit=row["unit"]
-                )
-                order_objs.append(order)
-            session.add_all(order_objs)
-            session.commit()
-            print(f"[INFO] {len(order_objs)}건 Order 테이블 저장 완료")
-
-            # Order 테이블 전체를 DataFrame으로 조회
-            result = session.query(Order).all()
-            df_orders = pd.DataFrame([
-                {c.name: getattr(row, c.name) for c in Order.__table__.columns}
-                for row in result
-            ])
-            print("[INFO] Order 테이블 전체:")
-            print(df_orders)
-            return df_orders
-        except Exception as e:
-            print("[ERROR] 주문-계좌 merge 실패:", e)
-            raise e
+def _accumulate(counts: pd.Series, orders: pd.DataFrame) -> pd.Series:
+    """키별 건수 Series에 orders의 키별 건수를 더함"""
+    added = orders.groupby(ORDER_KEY).size()
+    return added if counts.empty else counts.add(added, fill_value=0).astype("int64")
+
+
+# =====================
+# 적재
+# =====================
+@dataclass
+class CsvOrderImport:
+    """
+    chunk 사이에 계좌 id 캐시와 중복 판정용 키별 건수를 유지하며 주문을 적재
+    - seen: 이번 적재에서 지금까지 읽은 키별 건수 (발생 순번 계산용)
+    - inserted: 이번 적재에서 저장한 키별 건수 (DB 건수에서 빼서 기존 건수 계산)
+    """
+
+    account_ids: dict = field(default_factory=dict)  # 계좌명 -> account_id
+    seen: pd.Series = field(default_factory=lambda: pd.Series(dtype="int64"))  # 키 MultiIndex -> 건수
+    inserted: pd.Series = field(default_factory=lambda: pd.Series(dtype="int64"))
+    rows_read: int = 0
+    accounts_created: int = 0
+    orders_inserted: int = 0
+    duplicates_skipped: int = 0
+
+    def resolve_accounts(self, conn, names) -> None:
+        """캐시에 없는 계좌명의 id를 한 번에 조회하고, 없는 계좌는 bulk insert 후 재조회"""
+        missing = [name for name in pd.unique(names) if name not in self.account_ids]
+        if not missing:
+            return
+        query = select(Account.name, Account.id).where(Account.name.in_(missing))
+        self.account_ids.update(dict(conn.execute(query).all()))
+        new_names = [name for name in missing if name not in self.account_ids]
+        if new_names:
+            conn.execute(
+                insert(Account),
+                [{"user_id": get_user_id(name), "name": name, "balance": 0.0} for name in new_names],
+            )
+            self.account_ids.update(dict(conn.execute(query).all()))
+            self.accounts_created += len(new_names)
+
+    def _existing_counts(self, conn, orders: pd.DataFrame) -> pd.Series:
+        """chunk의 계좌/기간에 해당하는 DB 주문의 키별 건수 (이번 적재로 저장한 건수 제외)"""
+        query = select(*(getattr(Order, column) for column in ORDER_KEY)).where(
+            Order.account_id.in_([int(a) for a in orders["account_id"].unique()]),
+            Order.date >= orders["date"].min(),
+            Order.date <= orders["date"].max(),
+        )
+        existing = pd.DataFrame(conn.execute(query).all(), columns=ORDER_KEY)
+        if existing.empty:
+            return pd.Series(dtype="int64")
+        existing["type"] = existing["type"].map(_enum_value)
+        existing["unit"] = existing["unit"].map(_enum_value)
+        counts = _match_keys(existing).groupby(ORDER_KEY).size()
+        return counts - _lookup(self.inserted, counts.index)
+
+    def import_chunk(self, conn, chunk: pd.DataFrame) -> None:
+        orders = transform_orders(chunk)
+        self.rows_read += len(orders)
+        self.resolve_accounts(conn, orders["account"])
+        orders["account_id"] = orders["account"].map(self.account_ids).astype("int64")
+        orders = orders[ORDER_KEY]
+        match_keys = _match_keys(orders)
+
+        # 키별 발생 순번 (이전 chunk 누적 건수 + chunk 내 순번)
+        keys = pd.MultiIndex.from_frame(match_keys)
+        occurrence = match_keys.groupby(ORDER_KEY, sort=False).cumcount().to_numpy()
+        occurrence = occurrence + _lookup(self.seen, keys)
+        is_new = occurrence >= _lookup(self._existing_counts(conn, orders), keys)
+        self.seen = _accumulate(self.seen, match_keys)
+
+        new_orders = orders[is_new]
+        if not new_orders.empty:
+            rows = new_orders.to_dict("records")
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                conn.execute(insert(Order), rows[start:start + INSERT_CHUNK_SIZE])
+            self.inserted = _accumulate(self.inserted, match_keys[is_new])
+        self.orders_inserted += len(new_orders)
+        self.duplicates_skipped += int((~is_new).sum())
+
+    def summary(self) -> dict:
+        return {
+            "rows_read": self.rows_read,
+            "accounts_created": self.accounts_created,
+            "orders_inserted": self.orders_inserted,
+            "duplicates_skipped": self.duplicates_skipped,
+        }
+
+
+def import_csv(filepath: str = DEFAULT_CSV_PATH, chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    CSV 주문 내역을 chunk 단위로 적재 (chunk마다 한 트랜잭션)
+    Returns:
+        dict: 읽은 행 수, 생성 계좌 수, 저장 주문 수, 중복으로 건너뛴 주문 수
+    """
+    job = CsvOrderImport()
+    try:
+        for chunk in read_csv_chunks(filepath, chunksize):
+            with engine.begin() as conn:
+                job.import_chunk(conn, chunk)
+    except FileNotFoundError:
+        logger.error(f"[db_insert_from_csv] 파일을 찾을 수 없습니다: {filepath}")
+        raise
+    except pd.errors.ParserError:
+        logger.error(f"[db_insert_from_csv] CSV 파싱 오류: {filepath}")
+        raise
+    summary = job.summary()
+    logger.info(
+        f"[db_insert_from_csv] {filepath}: {summary['rows_read']}행 읽음, 계좌 {summary['accounts_created']}건 생성, "
+        f"주문 {summary['orders_inserted']}건 저장, 중복 {summary['duplicates_skipped']}건 건너뜀"
+    )
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="증권사 거래내역 CSV를 account/order 테이블로 적재")
+    parser.add_argument("filepath", nargs="?", default=DEFAULT_CSV_PATH, help="CSV 파일 경로")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="CSV chunk 크기")
+    args = parser.parse_args(argv)
+    import_csv(args.filepath, args.chunksize)
 
 
 if __name__ == "__main__":
-    read_csv()
+    main()
@@ -0,0 +1,125 @@
+"""
+market_calendar.py
+
+수집 작업 스케줄/데이터 품질 검사용 시장 캘린더 (거래일 판단, 현지 시각 → UTC 변환)
+
+- 의존성: pandas
+- NYSE: 미국 증시 휴장일 규칙(새해, MLK, 대통령의 날, 성금요일, 메모리얼, 준틴스(2022~), 독립기념일, 노동절,
+        추수감사절, 성탄절) 기반 평일 거래일, 시간대 America/New_York (FRED 일간 지표도 같은 영업일 사용)
+    - 임시 휴장(국장 등)과 조기 폐장은 반영하지 않음 → 수집은 다음 거래일 실행분에서 보충
+- US_BOND: 미국 채권시장(SIFMA) 근사, NYSE 휴장일에서 성금요일 제외 + 콜럼버스의 날, 재향군인의 날 (FRED 국채금리)
+- FX: 평일 24시간 외환시장 (휴장일 없음)
+- EVERYDAY: 휴장 없는 가상자산 시장, 시간대 Asia/Seoul
+- 사용법:
+    from batch.trifin.information_collector.market_calendar import NYSE
+    NYSE.is_session(date(2025, 7, 4))  # False
+    NYSE.to_utc(date(2025, 6, 18), time(17, 0))
+- 작성일: 2025-06-18
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import FrozenSet, Optional, Type
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USColumbusDay,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    rules = [
+        # 새해가 토요일이면 전년 12/31(금)은 휴장하지 않음
+        Holiday("NewYearsDay", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+class USBondHolidayCalendar(AbstractHolidayCalendar):
+    rules = [rule for rule in NYSEHolidayCalendar.rules if rule is not GoodFriday] + [
+        USColumbusDay,
+        Holiday("VeteransDay", month=11, day=11, observance=sunday_to_monday),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _holidays(holiday_calendar: Type[AbstractHolidayCalendar], year: int) -> FrozenSet[date]:
+    days = holiday_calendar().holidays(start=f"{year}-01-01", end=f"{year}-12-31")
+    return frozenset(day.date() for day in days)
+
+
+@dataclass(frozen=True)
+class MarketCalendar:
+    """
+    Attributes:
+        name: 캘린더 이름
+        tz: 시장 시간대 (IANA)
+        weekdays: 거래 요일 (0=월 ~ 6=일)
+        holiday_calendar: 휴장일 규칙 (None이면 휴장 없음)
+    """
+
+    name: str
+    tz: str
+    weekdays: FrozenSet[int] = frozenset(range(5))
+    holiday_calendar: Optional[Type[AbstractHolidayCalendar]] = None
+
+    @property
+    def zone(self) -> ZoneInfo:
+        return ZoneInfo(self.tz)
+
+    def is_session(self, day: date) -> bool:
+        """거래일 여부"""
+        if day.weekday() not in self.weekdays:
+            return False
+        return self.holiday_calendar is None or day not in _holidays(self.holiday_calendar, day.year)
+
+    def local_date(self, moment: datetime) -> date:
+        """UTC(aware) 시각의 시장 현지 일자"""
+        return moment.astimezone(self.zone).date()
+
+    def to_utc(self, day: date, at: time) -> datetime:
+        """시장 현지 일자/시각 → UTC aware datetime (서머타임 반영)"""
+        return datetime.combine(day, at, tzinfo=self.zone).astimezone(timezone.utc)
+
+    def session_index(self, start, end) -> pd.DatetimeIndex:
+        """[start, end] 거래일 DatetimeIndex (자정, 벡터 연산용)"""
+        days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+        mask = days.weekday.isin(list(self.weekdays))
+        if self.holiday_calendar is not None and len(days):
+            holidays = set().union(*(_holidays(self.holiday_calendar, y) for y in range(days[0].year, days[-1].year + 1)))
+            mask &= ~days.isin(pd.DatetimeIndex(sorted(holidays)))
+        return days[mask]
+
+    def sessions(self, start: date, end: date):
+        """[start, end] 거래일 목록"""
+        day = start
+        while day <= end:
+            if self.is_session(day):
+                yield day
+            day += timedelta(days=1)
+
+
+NYSE = MarketCalendar("NYSE", "America/New_York", holiday_calendar=NYSEHolidayCalendar)
+US_BOND = MarketCalendar("US_BOND", "America/New_York", holiday_calendar=USBondHolidayCalendar)
+FX = MarketCalendar("FX", "UTC")
+EVERYDAY = MarketCalendar("EVERYDAY", "Asia/Seoul", weekdays=frozenset(range(7)))
@@ -0,0 +1,88 @@
+"""
+refetch_gaps.py
+
+데이터 품질 리포트(batch.trifin.data_quality)의 누락 구간/갱신 중단 이슈만 골라 해당 구간을 재수집하는 스크립트
+
+- 의존성: httpx(external_service.http_client), SQLAlchemy, pandas
+- 흐름: 증분 품질 검사 → 재수집 대상(missing_days, stale) 선택 → 구간별 병렬 조회 → INSERT IGNORE → 재검사
+    - 대상 구간만 요청 (Yahoo/FRED는 캐시가 커버하는 구간이라도 force로 다시 요청해 캐시도 보정)
+    - 소스: index 테이블 → FRED, KRW- 마켓 → 빗썸, 그 외 price → Yahoo Finance
+    - 이슈별 재수집 시도 횟수를 리포트에 기록, MAX_ATTEMPTS회 이후에는 제외 (제공자에도 없는 실제 휴장/결측)
+- 사용법:
+    python -m batch.trifin.information_collector.refetch_gaps
+- 버전: 1.0.0
+- 작성일: 2025-06-18
+- 참고: data_quality.py, save_symbol_price.py, save_index_price.py, save_crypto_price.py
+"""
+
+import asyncio
+import logging
+from typing import List
+
+import pandas as pd
+
+from app.trifin.data.repository.index_repository import insert_indexes_ignore_bulk
+from app.trifin.data.repository.price_repository import insert_price_rows_ignore_bulk, insert_prices_ignore_bulk
+from batch.trifin.data_quality import REPORT_DIR, refetch_targets, run_scan, save_report
+from external_service.bithumb_service import aget_bithumb_daily_prices, last_closed_day
+from external_service.fred_service import aget_fred_index_price
+from external_service.http_client import run_with_client
+from external_service.yahoo_finance_service import aget_yahoo_finance_ohlcv
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+MAX_ATTEMPTS = 3
+MAX_TARGETS = 50
+
+
+async def fetch_issue(issue: dict):
+    """이슈 구간 [start, end] 조회 (저장 함수, 조회 결과)"""
+    symbol, start, end = issue["symbol"], issue["start"], issue["end"]
+    if issue["table"] == "index":
+        return insert_indexes_ignore_bulk, await aget_fred_index_price(symbol, start, end, force=True)
+    if symbol.startswith("KRW-"):
+        end = min(pd.Timestamp(end), last_closed_day()).strftime("%Y-%m-%d")
+        return insert_price_rows_ignore_bulk, await aget_bithumb_daily_prices(symbol, start, end)
+    # Yahoo end는 미포함
+    end = (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    return insert_prices_ignore_bulk, await aget_yahoo_finance_ohlcv(symbol, start, end, force=True)
+
+
+async def fetch_issues(issues: List[dict]) -> list:
+    return await asyncio.gather(*(fetch_issue(issue) for issue in issues), return_exceptions=True)
+
+
+def refetch_gaps(max_attempts: int = MAX_ATTEMPTS, max_targets: int = MAX_TARGETS, report_dir: str = REPORT_DIR) -> int:
+    """
+    품질 리포트의 누락 구간을 재수집합니다. (최근 구간부터 max_targets개)
+
+    Returns:
+        int: 저장 시도 건수
+    """
+    report = run_scan(report_dir=report_dir)
+    targets = refetch_targets(report, max_attempts)[:max_targets]
+    if not targets:
+        logger.info("재수집 대상 구간 없음")
+        return 0
+
+    results = asyncio.run(run_with_client(fetch_issues(targets)))
+    saved = 0
+    for issue, result in zip(targets, results):
+        issue["refetch_attempts"] += 1
+        label = f"{issue['table']}/{issue['symbol']} {issue['start']}~{issue['end']} ({issue['check']})"
+        if isinstance(result, Exception):
+            logger.warning(f"{label} 재수집 실패: {result}")
+            continue
+        writer, rows = result
+        saved += writer(rows) if rows else 0
+        logger.info(f"{label} 재수집 {len(rows)}건")
+    save_report(report, report_dir)
+    if saved:
+        # 채워진 구간을 리포트에서 제거
+        run_scan(report_dir=report_dir)
+    return saved
+
+
+if __name__ == "__main__":
+    refetch_gaps()
@@ -0,0 +1,86 @@
+"""
+save_crypto_price.py
+
+빗썸에서 crypto_market_list의 원화 일봉을 조회해 price 테이블에 저장하는 스크립트
+
+- 의존성: httpx(external_service.http_client), SQLAlchemy
+- 종목별 마지막 저장 일자 다음 날부터만 증분 조회 (저장된 데이터가 없으면 전체 이력 백필)
+- 마켓별 조회는 asyncio로 병렬 실행 (페이지 단위 동시 요청, "bithumb" 제공자 동시성/rate limit 적용),
+  저장은 ORM 객체 없이 컬럼 row를 chunk INSERT IGNORE
+- 사용법:
+    python -m batch.trifin.information_collector.save_crypto_price
+- 버전: 1.0.0
+- 작성일: 2025-06-17
+- 참고: save_symbol_price.py, bithumb_service.py
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import pandas as pd
+
+from app.trifin.data.repository.price_repository import get_latest_price_timestamp, insert_price_rows_ignore_bulk
+from external_service.bithumb_service import aget_bithumb_daily_prices
+from external_service.http_client import run_with_client
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+crypto_market_list = ["KRW-BTC"]
+
+
+def next_start(market: str) -> Optional[str]:
+    """마지막 저장 일자 다음 날 (저장된 데이터가 없으면 None = 전체 이력)"""
+    latest = get_latest_price_timestamp(market)
+    if latest is None:
+        return None
+    return (pd.Timestamp(latest).normalize() + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+async def fetch_crypto_prices(starts: dict) -> list:
+    """
+    마켓별 시작일(starts)부터 일봉을 병렬 조회
+    Returns:
+        list: 마켓 순서대로 row 리스트 또는 조회 중 발생한 예외
+    """
+    return await asyncio.gather(
+        *(aget_bithumb_daily_prices(market, start) for market, start in starts.items()), return_exceptions=True
+    )
+
+
+def save_crypto_price(markets=None):
+    """
+    빗썸에서 markets(기본 crypto_market_list)의 원화 일봉을 증분 조회하여 DB에 bulk 저장합니다.
+    조회에 실패한 마켓이 있어도 나머지는 저장한 뒤 예외를 발생시킵니다.
+
+    Returns:
+        int: 저장 시도 건수
+
+    Raises:
+        Exception: 저장 실패 또는 데이터 조회 실패 시
+    """
+    markets = crypto_market_list if markets is None else markets
+    starts = {market: next_start(market) for market in markets}
+    results = asyncio.run(run_with_client(fetch_crypto_prices(starts)))
+    failed = []
+    saved = 0
+    try:
+        for market, rows in zip(markets, results):
+            if isinstance(rows, Exception):
+                logger.error(f"{market} 가격 조회 실패: {rows}")
+                failed.append(market)
+                continue
+            logger.info(f"{market} 가격 데이터 {len(rows)}건 수신 (시작일: {starts[market] or '전체'})")
+            saved += insert_price_rows_ignore_bulk(rows)
+            logger.info(f"{market} 가격 데이터 일괄 저장 완료")
+    except Exception as e:
+        logger.error(f"가격 저장 실패: {e}")
+        raise
+    if failed:
+        raise ValueError(f"가격 조회 실패 마켓: {failed}")
+    return saved
+
+
+if __name__ == "__main__":
+    save_crypto_price()
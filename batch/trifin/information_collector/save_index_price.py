@@ -3,19 +3,21 @@ save_index_price.py
 
 FRED API에서 주요 경제지표(DGS10, CPIAUCSL, UNRATE)의 시계열 데이터를 조회하여 DB에 저장하는 스크립트
 
-- 의존성: requests, SQLAlchemy, dotenv
+- 의존성: httpx(external_service.http_client), SQLAlchemy, dotenv
+- 지표별 조회는 asyncio로 병렬 실행 ("fred" 제공자 동시성/rate limit 적용), 저장은 순차 bulk insert
 - 사용법:
-    python save_index_price.py
+    python -m batch.trifin.information_collector.save_index_price
 - 버전: 1.0.0
 - 작성일: 2025-05-18
 - 참고: save_symbol_price.py, fred_service.py
 """
 
+import asyncio
 import logging
 
-from src.external_service.fred_service import get_fred_index_price
-from src.repository.index_repository import insert_indexes_ignore_bulk
-from src.repository.price_repository import insert_prices_ignore_bulk
+from app.trifin.data.repository.index_repository import insert_indexes_ignore_bulk
+from external_service.fred_service import aget_fred_index_price
+from external_service.http_client import run_with_client
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -23,26 +25,52 @@ logging.basicConfig(level=logging.INFO)
 index_list = ["DGS10", "CPIAUCSL", "UNRATE", "VIXCLS"]
 
 
-def save_index_price(start: str):
+async def fetch_index_prices(start: str, symbols=None) -> list:
     """
-    FRED API에서 index_list의 시계열 데이터를 모두 조회하여 DB에 bulk 저장합니다.
+    symbols(기본 index_list)의 지표를 병렬 조회
+    Returns:
+        list: 지표 순서대로 Index 리스트 또는 조회 중 발생한 예외
+    """
+    symbols = index_list if symbols is None else symbols
+    return await asyncio.gather(
+        *(aget_fred_index_price(symbol, start) for symbol in symbols), return_exceptions=True
+    )
+
+
+def save_index_price(start: str, symbols=None):
+    """
+    FRED API에서 index_list의 시계열 데이터를 병렬로 조회하여 DB에 bulk 저장합니다.
+    조회에 실패한 지표가 있어도 나머지는 저장한 뒤 예외를 발생시킵니다.
+
+    Returns:
+        int: 저장 시도 건수
 
     Raises:
         Exception: 저장 실패 또는 데이터 조회 실패 시
     """
+    symbols = index_list if symbols is None else symbols
+    results = asyncio.run(run_with_client(fetch_index_prices(start, symbols)))
+    failed = []
+    saved = 0
     try:
-        for symbol in index_list:
-            prices = get_fred_index_price(symbol, start)
-            logger.info(f"{symbol} 지표 데이터 {len(prices)}건 수신")
-            insert_indexes_ignore_bulk(prices)
+        for symbol, indexes in zip(symbols, results):
+            if isinstance(indexes, Exception):
+                logger.error(f"{symbol} 지표 조회 실패: {indexes}")
+                failed.append(symbol)
+                continue
+            logger.info(f"{symbol} 지표 데이터 {len(indexes)}건 수신")
+            saved += insert_indexes_ignore_bulk(indexes)
             logger.info(f"{symbol} 지표 데이터 일괄 저장 완료")
     except Exception as e:
         logger.error(f"지표 저장 실패: {e}")
         raise
+    if failed:
+        raise ValueError(f"지표 조회 실패: {failed}")
+    return saved
 
 
 if __name__ == "__main__":
-    save_index_price()
+    save_index_price("2005-01-01")
 
 # TODO: 다양한 지표 지원, 스케줄러 연동, 로깅 개선, 에러 상세화
 # 단위 테스트 예시 (pytest 등에서 활용):
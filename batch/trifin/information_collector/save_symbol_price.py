@@ -3,20 +3,24 @@ save_symbol_price.py
 
 Yahoo Finance에서 symbol_list의 가격을 조회해 DB에 저장하는 스크립트
 
-- 의존성: yfinance, SQLAlchemy
+- 의존성: httpx(external_service.http_client), SQLAlchemy
+- 종목별 조회는 asyncio로 병렬 실행 ("yahoo" 제공자 동시성/rate limit 적용), 저장은 순차 bulk insert
 - 사용법:
-    python save_symbol_price.py
+    python -m batch.trifin.information_collector.save_symbol_price
 - 버전: 1.0.0
 - 작성일: 2025-05-17
 - 작성자: 사용자 요청 기반
 - 변경이력:
     - v1.0.0: 최초 작성
+    - v1.1.0: 공용 http_client 기반 병렬 조회
 """
 
+import asyncio
 import logging
 
-from src.external_service.yahoo_finance_service import get_yahoo_finance_ohlcv
-from src.repository.price_repository import insert_prices_ignore_bulk
+from app.trifin.data.repository.price_repository import insert_prices_ignore_bulk
+from external_service.http_client import run_with_client
+from external_service.yahoo_finance_service import aget_yahoo_finance_ohlcv
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -28,26 +32,52 @@ symbol_list = ["SPY", "IVV", "SPLG", "QQQ", "QQQM", "SCHD", "BTC-USD", "GLD", "K
 # VIX: VIX지수
 
 
-def save_symbol_price(start: str):
+async def fetch_symbol_prices(start: str, symbols=None) -> list:
     """
-    Yahoo Finance에서 symbol_list의 가격 정보 전체를 가져와 DB에 bulk 저장합니다.
+    symbols(기본 symbol_list)의 가격을 병렬 조회
+    Returns:
+        list: 종목 순서대로 Price 리스트 또는 조회 중 발생한 예외
+    """
+    symbols = symbol_list if symbols is None else symbols
+    return await asyncio.gather(
+        *(aget_yahoo_finance_ohlcv(symbol, start) for symbol in symbols), return_exceptions=True
+    )
+
+
+def save_symbol_price(start: str, symbols=None):
+    """
+    Yahoo Finance에서 symbol_list의 가격 정보 전체를 병렬로 가져와 DB에 bulk 저장합니다.
+    조회에 실패한 종목이 있어도 나머지는 저장한 뒤 예외를 발생시킵니다.
+
+    Returns:
+        int: 저장 시도 건수
 
     Raises:
         Exception: 저장 실패 또는 데이터 조회 실패 시
     """
+    symbols = symbol_list if symbols is None else symbols
+    results = asyncio.run(run_with_client(fetch_symbol_prices(start, symbols)))
+    failed = []
+    saved = 0
     try:
-        for symbol in symbol_list:
-            prices = get_yahoo_finance_ohlcv(symbol, start)
+        for symbol, prices in zip(symbols, results):
+            if isinstance(prices, Exception):
+                logger.error(f"{symbol} 가격 조회 실패: {prices}")
+                failed.append(symbol)
+                continue
             logger.info(f"{symbol} 가격 데이터 {len(prices)}건 수신")
-            insert_prices_ignore_bulk(prices)
+            saved += insert_prices_ignore_bulk(prices)
             logger.info(f"{symbol} 가격 데이터 일괄 저장 완료")
     except Exception as e:
         logger.error(f"가격 저장 실패: {e}")
         raise
+    if failed:
+        raise ValueError(f"가격 조회 실패 종목: {failed}")
+    return saved
 
 
 if __name__ == "__main__":
-    save_symbol_price()
+    save_symbol_price("2005-01-01")
 
 # TODO: 여러 종목 지원, 스케줄러 연동, 로깅 개선, 에러 상세화
 # 단위 테스트 예시 (pytest 등에서 활용):
@@ -0,0 +1,365 @@
+"""
+scheduler.py
+
+정보 수집 작업(가격/지표/가상자산/손익 스냅샷)을 소스별 주기로 실행하는 스케줄러 데몬
+
+- 의존성: SQLAlchemy, pandas
+- 작업별 실행 시각
+    - 시장 캘린더(market_calendar) 거래일의 현지 시각(at) + 작업 이름 기반 고정 분산 시간(spread_minutes 내)
+      → 모든 수집이 한 번에 몰리지 않고 하루에 나뉘어 실행, 재시작해도 같은 시각 유지
+    - symbol_prices: NYSE 거래일 장 마감 후, fred_daily: NYSE 영업일 저녁, fred_monthly: 매주 금요일,
+      crypto_prices: 매일 09:00 KST 일봉 마감 후, data_quality: 미국 가격 수집 후 품질 검사/누락 구간 재수집,
+      pnl_snapshots: 그 이후 매일 아침(KST)
+- 실행
+    - job_lock 테이블 잠금(만료 시각 포함)으로 여러 스케줄러/수동 실행 간 같은 작업의 중복 실행 방지
+      (잠금 획득 후 마지막 실행 기록으로 실행 대상 여부를 다시 확인)
+    - 마지막 실행의 예정 시각이 직전 예정 시각보다 이르면(데몬 중단 등으로 누락) 한 번만 따라잡아 실행
+      (수집은 DB 마지막 일자부터 증분이므로 누락 기간 전체가 한 번에 보충됨)
+    - 실패 시 retry_delay 후 max_attempts까지 재시도, 비정상 종료된 실행(running)은 lock_ttl 경과 후 재시도
+    - job_run 테이블에 실행마다 예정/시작/종료 시각, 소요 시간, 저장 건수, 오류 기록
+    - 작업은 한 번에 하나씩 순차 실행
+- 사용법:
+    python -m batch.trifin.information_collector.scheduler            # 데몬
+    python -m batch.trifin.information_collector.scheduler --once     # 밀린 작업만 실행 후 종료 (cron용)
+    python -m batch.trifin.information_collector.scheduler --list     # 작업별 다음 실행 시각, 마지막 실행
+    python -m batch.trifin.information_collector.scheduler --run fred_daily  # 즉시 실행
+- 작성일: 2025-06-18
+- 변경이력:
+    - 다음 실행 시각 탐색 범위 확대 (주 1회 작업의 실행 요일이 휴장인 주): 2025-06-23
+    - 잠금 획득 후 실행 대상 여부 재확인 (다른 스케줄러가 먼저 실행한 예정 시각 중복 실행 방지): 2025-06-23
+"""
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time as time_module
+import traceback
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from app.trifin.data.repository.index_repository import get_latest_index_date
+from app.trifin.data.repository.job_repository import (
+    acquire_lock,
+    finish_run,
+    get_last_run,
+    release_lock,
+    start_run,
+)
+from app.trifin.data.repository.models.job_run_table import JobRun, JobRunStatusEnum
+from app.trifin.data.repository.price_repository import get_latest_price_timestamp
+from batch.trifin.information_collector.market_calendar import EVERYDAY, NYSE, MarketCalendar
+from core.util.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_START = "2005-01-01"
+OVERLAP_DAYS = 7
+LOOKBACK_DAYS = 14
+# 주 1회 작업의 실행 요일이 휴장이면 다음 실행은 2주 이상 뒤
+LOOKAHEAD_DAYS = 21
+POLL_SECONDS = 60
+
+FRED_DAILY_SERIES = ["DGS10", "VIXCLS"]
+FRED_MONTHLY_SERIES = ["CPIAUCSL", "UNRATE"]
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _naive(moment: datetime) -> datetime:
+    """UTC aware → DB 저장용 UTC naive"""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# =====================
+# 작업 정의
+# =====================
+@dataclass(frozen=True)
+class JobSpec:
+    """
+    Attributes:
+        name: 작업 이름 (job_lock/job_run 키)
+        run: 실행 함수 (저장 건수 반환)
+        calendar: 실행일 판단/현지 시각 기준 캘린더
+        at: 캘린더 현지 기준 실행 시각
+        weekdays: 추가 요일 제한 (0=월, None이면 캘린더 거래일 전부)
+        spread_minutes: 기준 시각 이후 분산 범위(분), 작업 이름 해시로 고정
+        lock_ttl: 잠금 유지 시간 (최대 소요 시간보다 길게)
+        max_attempts: 같은 예정 시각에 대한 최대 시도 횟수
+        retry_delay: 실패 후 재시도 대기 시간
+    """
+
+    name: str
+    run: Callable[[], Optional[int]]
+    calendar: MarketCalendar
+    at: time
+    weekdays: Optional[FrozenSet[int]] = None
+    spread_minutes: int = 0
+    lock_ttl: timedelta = timedelta(hours=1)
+    max_attempts: int = 3
+    retry_delay: timedelta = timedelta(minutes=30)
+
+    @property
+    def spread_offset(self) -> timedelta:
+        if self.spread_minutes <= 0:
+            return timedelta(0)
+        return timedelta(seconds=zlib.crc32(self.name.encode()) % (self.spread_minutes * 60))
+
+    def is_run_day(self, day) -> bool:
+        return (self.weekdays is None or day.weekday() in self.weekdays) and self.calendar.is_session(day)
+
+    def fire_time(self, day) -> datetime:
+        return self.calendar.to_utc(day, self.at) + self.spread_offset
+
+    def next_fire_time(self, after: datetime) -> Optional[datetime]:
+        """after 이후(미포함) 첫 실행 시각 (UTC aware)"""
+        first = self.calendar.local_date(after) - timedelta(days=1)
+        for day in self.calendar.sessions(first, first + timedelta(days=LOOKAHEAD_DAYS)):
+            if self.is_run_day(day) and self.fire_time(day) > after:
+                return self.fire_time(day)
+        return None
+
+    def previous_fire_time(self, at: datetime) -> Optional[datetime]:
+        """at 이전(포함) 마지막 실행 시각 (UTC aware, LOOKBACK_DAYS 이내)"""
+        last = self.calendar.local_date(at) + timedelta(days=1)
+        days = list(self.calendar.sessions(last - timedelta(days=LOOKBACK_DAYS), last))
+        for day in reversed(days):
+            if self.is_run_day(day) and self.fire_time(day) <= at:
+                return self.fire_time(day)
+        return None
+
+
+def due_attempt(job: JobSpec, last: Optional[JobRun], now: datetime) -> Optional[Tuple[datetime, int]]:
+    """
+    지금 실행할 (예정 시각(UTC naive), 시도 횟수) 또는 None
+    - 직전 예정 시각 실행 기록이 없으면 1회차 (누락분은 여러 번이 아닌 한 번만 실행)
+    - 직전 예정 시각 실행이 실패했으면 retry_delay 후, 중단(running)됐으면 lock_ttl 후 다음 회차
+    """
+    scheduled = job.previous_fire_time(now)
+    if scheduled is None:
+        return None
+    scheduled = _naive(scheduled)
+    if last is None or last.scheduled_at < scheduled:
+        return scheduled, 1
+    if last.scheduled_at > scheduled or last.status == JobRunStatusEnum.success:
+        return None
+    if last.attempt >= job.max_attempts:
+        return None
+    if last.status == JobRunStatusEnum.failed:
+        ready_at = last.finished_at + job.retry_delay
+    else:
+        ready_at = last.started_at + job.lock_ttl
+    return (scheduled, last.attempt + 1) if _naive(now) >= ready_at else None
+
+
+def incremental_start(latest: Iterable) -> str:
+    """종목/지표별 마지막 저장 일자 중 가장 이른 일자 - OVERLAP_DAYS (하나라도 없으면 DEFAULT_START부터)"""
+    latest = list(latest)
+    if not latest or any(day is None for day in latest):
+        return DEFAULT_START
+    return (pd.Timestamp(min(latest)).normalize() - pd.Timedelta(days=OVERLAP_DAYS)).strftime("%Y-%m-%d")
+
+
+def collect_symbol_prices() -> int:
+    from batch.trifin.information_collector.save_symbol_price import save_symbol_price, symbol_list
+
+    return save_symbol_price(incremental_start(get_latest_price_timestamp(s) for s in symbol_list))
+
+
+def collect_fred_daily() -> int:
+    from batch.trifin.information_collector.save_index_price import save_index_price
+
+    start = incremental_start(get_latest_index_date(s) for s in FRED_DAILY_SERIES)
+    return save_index_price(start, FRED_DAILY_SERIES)
+
+
+def collect_fred_monthly() -> int:
+    from batch.trifin.information_collector.save_index_price import save_index_price
+
+    start = incremental_start(get_latest_index_date(s) for s in FRED_MONTHLY_SERIES)
+    return save_index_price(start, FRED_MONTHLY_SERIES)
+
+
+def collect_crypto_prices() -> int:
+    from batch.trifin.information_collector.save_crypto_price import save_crypto_price
+
+    return save_crypto_price()
+
+
+def check_data_quality() -> int:
+    from batch.trifin.information_collector.refetch_gaps import refetch_gaps
+
+    return refetch_gaps()
+
+
+def refresh_pnl_snapshots() -> int:
+    from batch.trifin.pnl_snapshot import update_snapshots
+
+    return update_snapshots()["snapshots"]
+
+
+JOBS: List[JobSpec] = [
+    # 미국 장 마감(16:00 ET) 후 수정주가 반영 시간을 두고 수집
+    JobSpec("symbol_prices", collect_symbol_prices, NYSE, time(17, 30), spread_minutes=30, lock_ttl=timedelta(hours=2)),
+    # FRED 일간 지표(국채금리, VIX)는 당일 저녁~익일 게시, 누락분은 다음 실행의 중첩 구간에서 보충
+    JobSpec("fred_daily", collect_fred_daily, NYSE, time(19, 0), spread_minutes=30),
+    # 월간 지표(CPI, 실업률)는 주 1회 (고용지표 발표일인 금요일)
+    JobSpec("fred_monthly", collect_fred_monthly, NYSE, time(10, 0), weekdays=frozenset({4}), spread_minutes=60),
+    # 빗썸 일봉은 09:00 KST 마감
+    JobSpec("crypto_prices", collect_crypto_prices, EVERYDAY, time(9, 10), spread_minutes=20),
+    # 미국 가격 수집(KST 06:30~08:00) 이후 품질 검사, 누락 구간만 재수집
+    JobSpec("data_quality", check_data_quality, EVERYDAY, time(8, 0), spread_minutes=15),
+    JobSpec("pnl_snapshots", refresh_pnl_snapshots, EVERYDAY, time(8, 40), spread_minutes=15),
+]
+
+
+# =====================
+# 스케줄러
+# =====================
+class CollectorScheduler:
+    def __init__(
+            self,
+            jobs: List[JobSpec] = None,
+            owner: Optional[str] = None,
+            poll_seconds: float = POLL_SECONDS,
+            clock: Callable[[], datetime] = utcnow,
+    ):
+        self.jobs = JOBS if jobs is None else jobs
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = poll_seconds
+        self.clock = clock
+        self.stop_event = threading.Event()
+
+    def job(self, name: str) -> JobSpec:
+        for job in self.jobs:
+            if job.name == name:
+                return job
+        raise ValueError(f"등록되지 않은 작업: {name} (가능: {[job.name for job in self.jobs]})")
+
+    def execute(
+            self, job: JobSpec, scheduled_at: datetime, attempt: int = 1, recheck: bool = False
+    ) -> Optional[JobRunStatusEnum]:
+        """
+        잠금 획득 후 작업 실행 및 이력 기록
+        Args:
+            recheck: 잠금 획득 후 (scheduled_at, attempt)가 여전히 실행 대상인지 다시 확인
+                     (run_pending: 대상 선정 후 다른 스케줄러가 먼저 실행을 마친 경우 중복 실행 방지,
+                      수동 실행(--run)은 확인하지 않음)
+        Returns:
+            실행 결과 상태 (다른 실행이 잠금 보유 중이거나 더 이상 실행 대상이 아니면 None)
+        """
+        if not acquire_lock(job.name, self.owner, job.lock_ttl, _naive(self.clock())):
+            logger.info(f"[scheduler] {job.name} 다른 실행이 잠금 보유 중, 건너뜀")
+            return None
+        try:
+            if recheck and due_attempt(job, get_last_run(job.name), self.clock()) != (scheduled_at, attempt):
+                logger.info(f"[scheduler] {job.name} 다른 실행이 이미 처리함 (예정 {scheduled_at} UTC), 건너뜀")
+                return None
+            run_id = start_run(job.name, scheduled_at, attempt, self.owner, _naive(self.clock()))
+            logger.info(f"[scheduler] {job.name} 시작 (예정 {scheduled_at} UTC, {attempt}회차)")
+            started = time_module.perf_counter()
+            try:
+                rows = job.run()
+            except Exception as e:
+                finish_run(run_id, JobRunStatusEnum.failed, _naive(self.clock()), error=traceback.format_exc())
+                logger.error(f"[scheduler] {job.name} 실패 ({time_module.perf_counter() - started:.1f}s): {e}")
+                return JobRunStatusEnum.failed
+            finish_run(run_id, JobRunStatusEnum.success, _naive(self.clock()), rows=rows)
+            logger.info(f"[scheduler] {job.name} 완료 ({time_module.perf_counter() - started:.1f}s, {rows}건)")
+            return JobRunStatusEnum.success
+        finally:
+            release_lock(job.name, self.owner, _naive(self.clock()))
+
+    def run_pending(self) -> int:
+        """
+        실행할 작업을 예정 시각 순으로 순차 실행
+        Returns:
+            int: 실행한 작업 수
+        """
+        now = self.clock()
+        due = []
+        for job in self.jobs:
+            attempt = due_attempt(job, get_last_run(job.name), now)
+            if attempt is not None:
+                due.append((attempt[0], attempt[1], job))
+        executed = 0
+        for scheduled_at, attempt, job in sorted(due, key=lambda item: item[0]):
+            if self.stop_event.is_set():
+                break
+            if self.execute(job, scheduled_at, attempt, recheck=True) is not None:
+                executed += 1
+        return executed
+
+    def seconds_until_next(self) -> float:
+        """다음 예정 시각까지 대기 시간 (재시도/잠금 대기를 위해 poll_seconds 상한)"""
+        now = self.clock()
+        upcoming = [t for t in (job.next_fire_time(now) for job in self.jobs) if t is not None]
+        if not upcoming:
+            return self.poll_seconds
+        return max(0.0, min(self.poll_seconds, (min(upcoming) - now).total_seconds()))
+
+    def run_forever(self) -> None:
+        logger.info(f"[scheduler] 시작 (owner={self.owner}, 작업 {len(self.jobs)}개)")
+        while not self.stop_event.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                # DB 연결 오류 등: 데몬은 유지하고 다음 주기에 재시도
+                logger.error(f"[scheduler] 실행 루프 오류: {e}")
+            self.stop_event.wait(self.seconds_until_next())
+        logger.info("[scheduler] 종료")
+
+    def stop(self, *_) -> None:
+        self.stop_event.set()
+
+    def describe(self) -> List[dict]:
+        now = self.clock()
+        rows = []
+        for job in self.jobs:
+            last = get_last_run(job.name)
+            rows.append(
+                {
+                    "job": job.name,
+                    "next_fire_utc": job.next_fire_time(now),
+                    "last_scheduled_utc": last.scheduled_at if last else None,
+                    "last_status": last.status.value if last else None,
+                    "last_duration_seconds": last.duration_seconds if last else None,
+                    "last_rows": last.rows if last else None,
+                }
+            )
+        return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="정보 수집 작업 스케줄러")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--once", action="store_true", help="밀린 작업만 실행 후 종료")
+    group.add_argument("--list", action="store_true", help="작업별 다음 실행 시각/마지막 실행 출력")
+    group.add_argument("--run", metavar="JOB", help="지정한 작업을 즉시 실행")
+    args = parser.parse_args(argv)
+
+    scheduler = CollectorScheduler()
+    if args.list:
+        print(pd.DataFrame(scheduler.describe()).to_string(index=False))
+        return 0
+    if args.run:
+        status = scheduler.execute(scheduler.job(args.run), _naive(scheduler.clock()))
+        return 0 if status == JobRunStatusEnum.success else 1
+    if args.once:
+        scheduler.run_pending()
+        return 0
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    signal.signal(signal.SIGINT, scheduler.stop)
+    scheduler.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
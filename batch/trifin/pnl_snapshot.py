@@ -0,0 +1,356 @@
+"""
+pnl_snapshot.py
+
+주문(order)과 가격(price) 데이터로 계좌별 일별 손익 스냅샷(pnl_snapshot)과
+계좌/종목별 일별 포지션 스냅샷(position_snapshot)을 증분 갱신하는 배치 스크립트
+
+- 의존성: SQLAlchemy, pandas, numpy
+- 주문 재생은 calc_pnl.PnlReplay 사용 (평균단가 기준 실현손익, 현금 부족분 입금 처리, USD 주문 as-of 환율)
+- 증분 갱신
+    - 스냅샷에 반영된 최대 주문 id(last_order_id) 이후 신규 주문의 최소 일자와 최신 스냅샷 일자 중
+      이른 일자 직전의 스냅샷을 기준일로 상태(현금/입금/실현손익/포지션)를 복원
+    - 기준일 이후 주문만 다시 재생하고 기준일 이후 스냅샷을 교체 (과거 일자로 입력된 주문도 해당 일자부터 재계산)
+    - 최신 스냅샷 일자는 종가 갱신을 반영하기 위해 매 실행 시 다시 계산
+    - 기존 주문의 수정/삭제는 감지하지 않으므로 --full 로 전체 재계산
+- 평가액: 일자별 as-of 종가(휴일은 직전 종가) * 보유 수량, USD 종목은 KRW=X as-of 환율 적용
+    - KRW=X 환율 이력이 없는데 USD 주문/종목이 있으면 스냅샷을 교체하지 않고 ValueError
+    - 가격 이력이 없는 종목은 취득원가로 평가
+- 주문이 없는 날도 스냅샷을 생성 (보유 상태는 직전 주문일 상태를 forward fill, 평가액만 재계산)
+
+사용법:
+    python -m batch.trifin.pnl_snapshot [--end 2025-06-16] [--full]
+
+작성일: 2025-06-16
+변경이력:
+    - KRW=X 환율 이력이 없을 때 USD 주문/종목을 환율 1(또는 NaN)로 평가하던 문제 수정: 2025-06-23
+"""
+
+import argparse
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+from app.trifin.data.repository import pnl_snapshot_repository
+from app.trifin.data.repository.models.account_table import Account
+from app.trifin.data.repository.models.order_table import Order, UnitEnum
+from app.trifin.data.repository.models.price_table import Price
+from batch.trifin.calc_pnl import CHUNK_SIZE, FX_SYMBOL, PnlReplay, attach_fx, iter_orders, load_fx_rates
+from core.config.db import engine
+from core.util.logger import get_logger
+
+logger = get_logger()
+
+PRICE_LOOKBACK_DAYS = 31  # 시작일 직전 종가를 찾기 위해 추가로 조회하는 기간
+
+ACCOUNT_STATE_COLUMNS = ["date", "account_id", "cash", "total_deposit", "realized_pnl", "last_order_id"]
+POSITION_STATE_COLUMNS = ["date", "account_id", "symbol", "size", "cost_basis"]
+
+
+# =====================
+# 상태 복원/기록
+# =====================
+def restore_replay(snapshot_date: date) -> tuple[PnlReplay, dict]:
+    """
+    기준 일자 스냅샷으로 PnlReplay 상태와 종목별 화폐 단위를 복원
+    """
+    accounts, positions = pnl_snapshot_repository.get_snapshot_state(snapshot_date)
+    replay = PnlReplay()
+    for snapshot in accounts:
+        replay.cash[snapshot.account_id] = snapshot.cash
+        replay.deposit[snapshot.account_id] = snapshot.total_deposit
+        replay.realized_pnl[snapshot.account_id] = snapshot.realized_pnl
+        if snapshot.last_order_id is not None:
+            replay.last_order_id = max(replay.last_order_id or 0, snapshot.last_order_id)
+    units = {}
+    for position in positions:
+        replay.positions[(position.account_id, position.symbol)] = [position.size, position.cost_basis]
+        units[position.symbol] = position.unit
+    return replay, units
+
+
+def capture_state(replay: PnlReplay) -> tuple[list, list]:
+    """
+    현재 재생 상태를 (계좌 상태 행, 보유 포지션 행) 목록으로 복사 (일자 컬럼 제외)
+    """
+    accounts = [
+        (account_id, cash, replay.deposit.get(account_id, 0.0), replay.realized_pnl.get(account_id, 0.0),
+         replay.last_order_id)
+        for account_id, cash in replay.cash.items()
+    ]
+    positions = [
+        (account_id, symbol, size, cost)
+        for (account_id, symbol), (size, cost) in replay.positions.items()
+        if not np.isclose(size, 0.0)
+    ]
+    return accounts, positions
+
+
+def replay_by_day(replay: PnlReplay, orders: pd.DataFrame, states: dict) -> None:
+    """
+    attach_fx를 거친 주문 chunk를 일자 단위로 반영하고, 일자별 마감 상태를 states[일자]에 기록
+    - 한 일자가 chunk 경계에 걸치면 뒤 chunk의 기록이 덮어씀 (누적 상태이므로 마지막 기록이 그 날의 마감 상태)
+    """
+    if orders.empty:
+        return
+    days = orders["order_date"].dt.normalize().to_numpy()
+    bounds = np.flatnonzero(days[1:] != days[:-1]) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(orders)]])
+    for start, end in zip(starts, ends):
+        replay.apply(orders.iloc[start:end])
+        states[pd.Timestamp(days[start])] = capture_state(replay)
+
+
+# =====================
+# 가격 로딩
+# =====================
+def _asof_on_days(series_or_frame, days: pd.DatetimeIndex):
+    """일자 index 데이터를 days 기준 as-of(직전 값)로 맞춤"""
+    combined = series_or_frame.index.union(days)
+    return series_or_frame.reindex(combined).ffill().reindex(days)
+
+
+def load_close_prices(conn, symbols: list, days: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    종목별 일자 as-of 종가 (index=days, columns=symbols, 이력이 없으면 NaN)
+    """
+    if not symbols:
+        return pd.DataFrame(index=days)
+    query = (
+        select(Price.symbol, Price.timestamp, Price.close)
+        .where(Price.symbol.in_(symbols))
+        .where(Price.timestamp >= (days[0] - pd.Timedelta(days=PRICE_LOOKBACK_DAYS)).to_pydatetime())
+        .where(Price.timestamp < (days[-1] + pd.Timedelta(days=1)).to_pydatetime())
+    )
+    prices = pd.read_sql(query, conn)
+    prices["day"] = pd.to_datetime(prices["timestamp"]).dt.normalize()
+    closes = prices.pivot_table(index="day", columns="symbol", values="close", aggfunc="last")
+    return _asof_on_days(closes.reindex(columns=symbols), days)
+
+
+def load_fx_on_days(conn, days: pd.DatetimeIndex) -> pd.Series:
+    """일자별 as-of 원달러 환율 (첫 환율 이전은 첫 환율, 환율 이력이 없으면 NaN)"""
+    fx = load_fx_rates(conn)
+    if fx.empty:
+        return pd.Series(np.nan, index=days)
+    return _asof_on_days(fx.set_index("fx_date")["fx"], days).fillna(fx["fx"].iloc[0])
+
+
+# =====================
+# 스냅샷 계산
+# =====================
+def build_snapshots(
+        states: dict,
+        days: pd.DatetimeIndex,
+        closes: pd.DataFrame,
+        fx: pd.Series,
+        units: dict,
+        user_ids: dict,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    주문일별 마감 상태(states, 시작일 직전 기준 상태 포함)를 days 전체로 forward fill 하고 평가액을 계산
+    Returns:
+        (pnl_snapshot 행 DataFrame, position_snapshot 행 DataFrame)
+    """
+    if not any(accounts for accounts, _ in states.values()):
+        return pd.DataFrame(), pd.DataFrame()
+    recorded = pd.DatetimeIndex(sorted(states))
+    timeline = recorded.union(days)
+    account_state = pd.DataFrame(
+        [(day, *row) for day, (accounts, _) in states.items() for row in accounts], columns=ACCOUNT_STATE_COLUMNS
+    )
+    position_state = pd.DataFrame(
+        [(day, *row) for day, (_, positions) in states.items() for row in positions], columns=POSITION_STATE_COLUMNS
+    )
+
+    # 포지션: 주문일에 없는 종목은 수량 0 → 주문일 사이는 직전 주문일 상태 유지
+    keys = pd.MultiIndex.from_frame(position_state[["account_id", "symbol"]].drop_duplicates())
+    panels = {}
+    for column in ("size", "cost_basis"):
+        panel = position_state.pivot_table(
+            index="date", columns=["account_id", "symbol"], values=column, aggfunc="last", dropna=False
+        ) if not position_state.empty else pd.DataFrame(index=recorded)
+        panel = panel.reindex(index=recorded, columns=keys).fillna(0.0)
+        panels[column] = panel.reindex(timeline).ffill().reindex(days).to_numpy()
+    size, cost = panels["size"], panels["cost_basis"]
+
+    symbols = keys.get_level_values("symbol")
+    close = closes.reindex(index=days, columns=symbols).to_numpy(dtype=float)
+    is_usd = np.array([units.get(symbol) == UnitEnum.USD for symbol in symbols], dtype=bool)
+    multiplier = np.where(is_usd[np.newaxis, :], fx.to_numpy()[:, np.newaxis], 1.0)
+    market_value = np.where(np.isnan(close) | np.isnan(multiplier), cost, size * close * multiplier)
+    held = ~np.isclose(size, 0.0)
+    market_value = np.where(held, market_value, 0.0)
+
+    day_pos, key_pos = np.nonzero(held)
+    positions = pd.DataFrame(
+        {
+            "account_id": keys.get_level_values("account_id")[key_pos].astype("int64"),
+            "date": days[day_pos].date,
+            "symbol": symbols[key_pos],
+            "unit": [units.get(symbol) for symbol in symbols[key_pos]],
+            "size": size[day_pos, key_pos],
+            "cost_basis": cost[day_pos, key_pos],
+            "close": close[day_pos, key_pos],
+            "market_value": market_value[day_pos, key_pos],
+        }
+    )
+    positions["close"] = positions["close"].astype(object).where(positions["close"].notna(), None)
+
+    # 계좌: 첫 주문 이전 일자는 제외 (ffill 후에도 NaN)
+    account_state["last_order_id"] = pd.to_numeric(account_state["last_order_id"]).astype(float)
+    account_panel = account_state.pivot_table(
+        index="date", columns="account_id", values=ACCOUNT_STATE_COLUMNS[2:], aggfunc="last", dropna=False
+    )
+    account_panel = account_panel.reindex(timeline).ffill().reindex(days)
+    account_ids = account_panel["cash"].columns
+    # (종목 키 → 계좌) one-hot 행렬곱으로 계좌별 취득원가/평가액 합산
+    key_accounts = account_ids.get_indexer(keys.get_level_values("account_id"))
+    one_hot = np.zeros((len(key_accounts), len(account_ids)))
+    one_hot[np.arange(len(key_accounts)), key_accounts] = 1.0
+
+    cash = account_panel["cash"].to_numpy()
+    day_pos, account_pos = np.nonzero(~np.isnan(cash))
+    total_deposit = account_panel["total_deposit"].to_numpy()[day_pos, account_pos]
+    realized = account_panel["realized_pnl"].to_numpy()[day_pos, account_pos]
+    cost_basis = (np.where(held, cost, 0.0) @ one_hot)[day_pos, account_pos]
+    value = (market_value @ one_hot)[day_pos, account_pos]
+    unrealized = value - cost_basis
+    total_pnl = realized + unrealized
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit = np.where(total_deposit > 0, total_pnl / total_deposit * 100, 0.0)
+    last_order_id = account_panel["last_order_id"].to_numpy()[day_pos, account_pos]
+
+    account_id_values = account_ids[account_pos].astype("int64")
+    snapshots = pd.DataFrame(
+        {
+            "account_id": account_id_values,
+            "date": days[day_pos].date,
+            "user_id": [user_ids.get(account_id) for account_id in account_id_values],
+            "cash": cash[day_pos, account_pos],
+            "total_deposit": total_deposit,
+            "realized_pnl": realized,
+            "cost_basis": cost_basis,
+            "market_value": value,
+            "unrealized_pnl": unrealized,
+            "total_pnl": total_pnl,
+            "profit": profit,
+            "last_order_id": [int(v) if not np.isnan(v) else None for v in last_order_id],
+        }
+    )
+    return snapshots, positions
+
+
+def _to_rows(df: pd.DataFrame) -> list:
+    """DataFrame → Core insert용 dict 목록 (numpy 스칼라를 파이썬 기본형으로 변환)"""
+    return [
+        {key: value.item() if isinstance(value, np.generic) else value for key, value in row.items()}
+        for row in df.to_dict("records")
+    ]
+
+
+# =====================
+# 증분 갱신
+# =====================
+def plan_base_date() -> Optional[date]:
+    """
+    다시 계산하지 않고 유지할 마지막 스냅샷 일자 (None이면 전체 재계산)
+    - 최신 스냅샷 일자와 신규 주문(last_order_id 초과)의 최소 일자 중 이른 일자의 직전 스냅샷 일자
+    """
+    latest = pnl_snapshot_repository.get_latest_snapshot_date()
+    if latest is None:
+        return None
+    last_order_id = pnl_snapshot_repository.get_last_order_id()
+    query = select(func.min(Order.date))
+    if last_order_id is not None:
+        query = query.where(Order.id > last_order_id)
+    with engine.connect() as conn:
+        first_new_order = conn.execute(query).scalar()
+    rewind = latest
+    if first_new_order is not None:
+        rewind = min(rewind, pd.Timestamp(first_new_order).date())
+    return pnl_snapshot_repository.get_snapshot_date_before(rewind)
+
+
+def update_snapshots(end_date: Optional[date] = None, full: bool = False, chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    기준일 이후 주문을 재생해 end_date까지의 일별 스냅샷을 교체 저장
+    Args:
+        end_date: 마지막 스냅샷 일자 (None이면 오늘)
+        full: True면 기존 스냅샷을 무시하고 전체 재계산
+        chunksize: 주문 스트리밍 chunk 크기
+    Returns:
+        dict: base_date, start_date, end_date, 재생 주문 수, 저장 행 수
+    """
+    end_day = pd.Timestamp(end_date or date.today()).normalize()
+    base_date = None if full else plan_base_date()
+
+    with engine.connect() as conn:
+        if base_date is None:
+            first_order = conn.execute(select(func.min(Order.date))).scalar()
+            if first_order is None:
+                logger.info("[pnl_snapshot] 주문이 없어 스냅샷을 생성하지 않습니다.")
+                return {"base_date": None, "orders": 0, "snapshots": 0, "positions": 0}
+            start_day = pd.Timestamp(first_order).normalize()
+            replay, units = PnlReplay(), {}
+        else:
+            start_day = pd.Timestamp(base_date) + pd.Timedelta(days=1)
+            replay, units = restore_replay(base_date)
+        if start_day > end_day:
+            logger.info(f"[pnl_snapshot] {end_day.date()}까지 스냅샷이 최신 상태입니다.")
+            return {"base_date": base_date, "orders": 0, "snapshots": 0, "positions": 0}
+
+        base_day = start_day - pd.Timedelta(days=1)
+        states = {base_day: capture_state(replay)}
+        fx_rates = load_fx_rates(conn)
+        for chunk in iter_orders(
+                conn,
+                chunksize=chunksize,
+                from_date=start_day.strftime("%Y-%m-%d"),
+                until_date=(end_day + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+        ):
+            units.update(zip(chunk["symbol"], chunk["unit"]))
+            replay_by_day(replay, attach_fx(chunk, fx_rates), states)
+
+        days = pd.date_range(start_day, end_day, freq="D")
+        symbols = sorted({symbol for _, positions in states.values() for _, symbol, _, _ in positions})
+        closes = load_close_prices(conn, symbols, days)
+        fx = load_fx_on_days(conn, days)
+        if fx.isna().all() and UnitEnum.USD in units.values():
+            # 기준일 이전부터 보유한 USD 종목 (신규 USD 주문은 attach_fx에서 검사)
+            raise ValueError(f"{FX_SYMBOL} 환율 이력이 없어 USD 종목 평가액을 원화로 환산할 수 없습니다.")
+        user_ids = dict(conn.execute(select(Account.id, Account.user_id)).all())
+
+    snapshots, positions = build_snapshots(states, days, closes, fx, units, user_ids)
+    pnl_snapshot_repository.replace_snapshots_after(base_date, _to_rows(snapshots), _to_rows(positions))
+
+    order_count = replay.order_count
+    if replay.missing_fx_count:
+        logger.warning(f"[pnl_snapshot] 환율 이력 이전 USD 주문 {replay.missing_fx_count}건은 첫 환율로 처리")
+    logger.info(
+        f"[pnl_snapshot] 기준일 {base_date} 이후 주문 {order_count}건 재생, "
+        f"{start_day.date()} ~ {end_day.date()} 계좌 스냅샷 {len(snapshots)}건 / 포지션 {len(positions)}건 저장"
+    )
+    return {
+        "base_date": base_date,
+        "start_date": start_day.date(),
+        "end_date": end_day.date(),
+        "orders": order_count,
+        "snapshots": len(snapshots),
+        "positions": len(positions),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계좌별 일별 손익/포지션 스냅샷 증분 갱신")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="마지막 스냅샷 일자 (YYYY-MM-DD, 기본 오늘)")
+    parser.add_argument("--full", action="store_true", help="기존 스냅샷을 무시하고 전체 재계산")
+    args = parser.parse_args(argv)
+    update_snapshots(end_date=args.end, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,563 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, create_engine, select, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+from app.trifin.data.repository.models.base import Base
+from app.trifin.data.repository.models.order_table import Order
+from app.trifin.data.repository.models.user_table import User  # noqa: F401 (account.user_id FK 대상 테이블)
+from batch.trifin.db_insert_from_csv import CsvOrderImport
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_big_integer(type_, compiler, **kw):
+    # SQLite는 INTEGER PRIMARY KEY만 자동 증가 (MySQL BIGINT AUTO_INCREMENT 대응)
+    return "INTEGER"
+
+
+def _sqlite_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return engine
+
+
+# =====================
+# 단위테스트 코드 (pytest 등에서 활용)
+# =====================
+def test_csv_reimport_skips_orders_stored_in_single_precision():
+    engine = _sqlite_engine()
+    chunk = pd.DataFrame({
+        "date": ["20240228", "20240228", "20240308"],
+        "account": ["윤지_미래_금"] * 3,
+        "symbol": ["GLD", "GLD", "SPY_USD"],
+        "type": ["매수", "매수", "매도"],
+        "size": [1.1, 1.1, -0.3],
+        "price": [123.45, 123.45, 501.37],
+    })
+    with engine.begin() as conn:
+        CsvOrderImport().import_chunk(conn, chunk)
+        # MySQL FLOAT(단정밀도) 컬럼에서 읽히는 값으로 변경
+        for order_id, size, price in conn.execute(select(Order.id, Order.size, Order.price)).all():
+            conn.execute(update(Order).where(Order.id == order_id)
+                         .values(size=float(np.float32(size)), price=float(np.float32(price))))
+
+    job = CsvOrderImport()
+    with engine.begin() as conn:
+        job.import_chunk(conn, chunk)
+        assert (job.orders_inserted, job.duplicates_skipped) == (0, 3)
+        assert len(conn.execute(select(Order.id)).all()) == 3
+
+
+# =====================
+# 수집 스케줄러 / 작업 잠금
+# =====================
+def _session_db(monkeypatch):
+    """리포지토리(get_db) 세션을 SQLite 엔진으로 교체"""
+    from sqlalchemy.orm import sessionmaker
+
+    from core.config import db
+
+    engine = _sqlite_engine()
+    monkeypatch.setattr(db, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    return engine
+
+
+def _utc(*args):
+    from datetime import datetime, timezone
+
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_due_attempt_catches_up_once_and_retries():
+    from datetime import datetime, time, timedelta
+
+    from app.trifin.data.repository.models.job_run_table import JobRun, JobRunStatusEnum
+    from batch.trifin.information_collector.market_calendar import EVERYDAY
+    from batch.trifin.information_collector.scheduler import JobSpec, due_attempt
+
+    # 매일 09:00 KST = 00:00 UTC
+    job = JobSpec("crypto", lambda: 0, EVERYDAY, time(9, 0))
+    scheduled = datetime(2025, 6, 20)
+
+    def run(status, scheduled_at=scheduled, attempt=1, started=scheduled, finished=None):
+        return JobRun(job_name=job.name, scheduled_at=scheduled_at, attempt=attempt, status=status,
+                      started_at=started, finished_at=finished)
+
+    assert due_attempt(job, None, _utc(2025, 6, 19, 23, 59)) == (datetime(2025, 6, 19), 1)
+    # 3일간 중단 후 재시작: 직전 예정 시각 1회만 실행
+    missed = run(JobRunStatusEnum.success, scheduled_at=datetime(2025, 6, 17))
+    assert due_attempt(job, missed, _utc(2025, 6, 20, 1)) == (scheduled, 1)
+    assert due_attempt(job, run(JobRunStatusEnum.success), _utc(2025, 6, 20, 1)) is None
+
+    # 실패: retry_delay(30분) 후 다음 회차
+    failed = run(JobRunStatusEnum.failed, finished=datetime(2025, 6, 20, 0, 5))
+    assert due_attempt(job, failed, _utc(2025, 6, 20, 0, 34)) is None
+    assert due_attempt(job, failed, _utc(2025, 6, 20, 0, 35)) == (scheduled, 2)
+
+    # 비정상 종료(running): lock_ttl(1시간) 후 다음 회차
+    crashed = run(JobRunStatusEnum.running, attempt=2)
+    assert due_attempt(job, crashed, _utc(2025, 6, 20, 0, 59)) is None
+    assert due_attempt(job, crashed, _utc(2025, 6, 20, 1)) == (scheduled, 3)
+
+    # max_attempts 도달 후에는 다음 예정 시각까지 실행하지 않음
+    exhausted = run(JobRunStatusEnum.failed, attempt=3, finished=datetime(2025, 6, 20, 0, 5))
+    assert due_attempt(job, exhausted, _utc(2025, 6, 20, 12)) is None
+    assert due_attempt(job, exhausted, _utc(2025, 6, 21, 0) + timedelta(seconds=1)) == (datetime(2025, 6, 21), 1)
+
+
+def test_fire_times_follow_dst_and_nyse_holidays():
+    from datetime import time
+
+    from batch.trifin.information_collector.market_calendar import NYSE
+    from batch.trifin.information_collector.scheduler import JobSpec
+
+    job = JobSpec("prices", lambda: 0, NYSE, time(17, 30))
+    # 서머타임 시작(2025-03-09): 17:30 EST = 22:30 UTC → 17:30 EDT = 21:30 UTC
+    assert job.next_fire_time(_utc(2025, 3, 7, 22, 30)) == _utc(2025, 3, 10, 21, 30)
+    assert job.previous_fire_time(_utc(2025, 3, 10, 21, 29)) == _utc(2025, 3, 7, 22, 30)
+    # 서머타임 종료(2025-11-02)
+    assert job.next_fire_time(_utc(2025, 10, 31, 21, 30)) == _utc(2025, 11, 3, 22, 30)
+    # 성금요일(2025-04-18), 준틴스(2025-06-19) 휴장
+    assert job.next_fire_time(_utc(2025, 4, 17, 22)) == _utc(2025, 4, 21, 21, 30)
+    assert job.previous_fire_time(_utc(2025, 4, 21, 12)) == _utc(2025, 4, 17, 21, 30)
+    assert job.next_fire_time(_utc(2025, 6, 18, 22)) == _utc(2025, 6, 20, 21, 30)
+
+    # 요일 제한 작업은 금요일이 휴장이면 그 주를 건너뜀
+    weekly = JobSpec("monthly", lambda: 0, NYSE, time(10, 0), weekdays=frozenset({4}))
+    assert weekly.previous_fire_time(_utc(2025, 4, 20)) == _utc(2025, 4, 11, 14)
+    assert weekly.next_fire_time(_utc(2025, 4, 11, 14)) == _utc(2025, 4, 25, 14)
+
+
+def test_acquire_lock_conditional_update(monkeypatch):
+    from datetime import datetime, timedelta
+
+    from app.trifin.data.repository.job_repository import acquire_lock, release_lock
+
+    _session_db(monkeypatch)
+    ttl = timedelta(hours=1)
+    t0 = datetime(2025, 6, 20)
+
+    assert acquire_lock("prices", "a", ttl, t0)
+    # 만료 전 다른 보유자는 실패
+    assert not acquire_lock("prices", "b", ttl, t0 + timedelta(minutes=10))
+    # 같은 보유자는 연장 (만료 t0+80분)
+    assert acquire_lock("prices", "a", ttl, t0 + timedelta(minutes=20))
+    assert not acquire_lock("prices", "b", ttl, t0 + timedelta(minutes=70))
+    # 만료 후 다른 보유자 획득
+    assert acquire_lock("prices", "b", ttl, t0 + timedelta(minutes=80))
+    # 보유자가 아니면 해제되지 않음
+    release_lock("prices", "a", t0 + timedelta(minutes=81))
+    assert not acquire_lock("prices", "a", ttl, t0 + timedelta(minutes=82))
+    release_lock("prices", "b", t0 + timedelta(minutes=83))
+    assert acquire_lock("prices", "a", ttl, t0 + timedelta(minutes=83))
+    # 다른 작업 잠금과는 무관
+    assert acquire_lock("fred", "b", ttl, t0 + timedelta(minutes=84))
+
+
+def test_scheduler_records_runs_and_retries_failures(monkeypatch):
+    from datetime import time, timedelta
+
+    from app.trifin.data.repository.job_repository import get_last_run, get_recent_runs
+    from app.trifin.data.repository.models.job_run_table import JobRunStatusEnum
+    from batch.trifin.information_collector.market_calendar import EVERYDAY
+    from batch.trifin.information_collector.scheduler import CollectorScheduler, JobSpec
+
+    _session_db(monkeypatch)
+    calls = []
+
+    def flaky():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("timeout")
+        return 42
+
+    now = [_utc(2025, 6, 20, 0, 10)]
+    scheduler = CollectorScheduler([JobSpec("crypto", flaky, EVERYDAY, time(9, 0))], owner="test", clock=lambda: now[0])
+
+    assert scheduler.run_pending() == 1
+    assert get_last_run("crypto").status == JobRunStatusEnum.failed
+    now[0] += timedelta(minutes=10)
+    assert scheduler.run_pending() == 0
+    now[0] += timedelta(minutes=30)
+    assert scheduler.run_pending() == 1
+
+    last = get_last_run("crypto")
+    assert (last.attempt, last.status, last.rows) == (2, JobRunStatusEnum.success, 42)
+    now[0] += timedelta(hours=1)
+    assert scheduler.run_pending() == 0
+    assert [run.attempt for run in get_recent_runs("crypto")] == [2, 1]
+    assert "timeout" in get_recent_runs("crypto")[-1].error
+
+
+def test_scheduler_skips_run_finished_by_another_scheduler(monkeypatch):
+    from datetime import time
+
+    from app.trifin.data.repository.job_repository import get_recent_runs
+    from batch.trifin.information_collector.market_calendar import EVERYDAY
+    from batch.trifin.information_collector.scheduler import CollectorScheduler, JobSpec
+
+    _session_db(monkeypatch)
+    calls = []
+    clock = lambda: _utc(2025, 6, 20, 0, 10)
+    fx = JobSpec("fx", lambda: calls.append("fx") or 1, EVERYDAY, time(8, 0))
+    other = CollectorScheduler([fx], owner="other", clock=clock)
+
+    def crypto():
+        # crypto 실행 중 다른 스케줄러가 fx를 먼저 실행 완료
+        calls.append("crypto")
+        assert other.run_pending() == 1
+        return 1
+
+    scheduler = CollectorScheduler(
+        [JobSpec("crypto", crypto, EVERYDAY, time(7, 0)), fx], owner="test", clock=clock
+    )
+    # fx는 실행 대상으로 선정됐지만 잠금 획득 후 재확인에서 건너뜀
+    assert scheduler.run_pending() == 1
+    assert calls == ["crypto", "fx"]
+    assert [run.owner for run in get_recent_runs("fx")] == ["other"]
+
+    # 수동 실행(--run)은 재확인 없이 실행
+    assert scheduler.execute(fx, clock().replace(tzinfo=None)) is not None
+    assert calls == ["crypto", "fx", "fx"]
+
+
+# =====================
+# 데이터 품질 검사 / 누락 구간 재수집
+# =====================
+def _index_rows(symbol: str, days, skip=(), start_value: float = 4.0) -> list:
+    return [
+        {"symbol": symbol, "date": day.date(), "value": start_value + 0.01 * i}
+        for i, day in enumerate(days) if str(day.date()) not in skip
+    ]
+
+
+def _insert_index_rows(engine, rows: list) -> int:
+    from sqlalchemy import insert
+
+    from app.trifin.data.repository.models.index_table import Index
+
+    with engine.begin() as conn:
+        conn.execute(insert(Index), rows)
+    return len(rows)
+
+
+def _checks(issues: list) -> list:
+    return [(i["check"], i["start"], i["end"], i["count"]) for i in issues]
+
+
+def test_scan_series_flags_gaps_jumps_flat_runs_and_duplicates():
+    from batch.trifin.data_quality import SeriesRule, scan_series
+    from batch.trifin.information_collector.market_calendar import NYSE
+
+    days = NYSE.session_index("2025-06-02", "2025-06-27")
+    days = days[~days.isin(pd.to_datetime(["2025-06-10", "2025-06-11"]))]
+    values = [100.0 + 0.1 * i + 0.05 * (i % 3) for i in range(len(days))]
+    values[:5] = [100.0] * 5
+    frame = pd.DataFrame({"ts": days + pd.Timedelta(hours=4), "value": values})
+    frame.loc[days == "2025-06-24", "value"] *= 1.3
+    frame = frame.assign(open=frame["value"], high=frame["value"], low=frame["value"])
+    frame.loc[days == "2025-06-13", "low"] = 0.0
+    # 같은 일자의 다른 시각 행 (마지막 행 사용)
+    duplicate = frame[days == "2025-06-12"].assign(ts=pd.Timestamp("2025-06-12 20:00"))
+    frame = pd.concat([frame, duplicate]).sort_values("ts", kind="stable").reset_index(drop=True)
+
+    issues = scan_series("price", "SPY", frame, SeriesRule(calendar=NYSE, max_jump=0.15, flat_days=5))
+    assert sorted(_checks(issues)) == sorted([
+        ("duplicate_day", "2025-06-12", "2025-06-12", 2),
+        ("non_positive", "2025-06-13", "2025-06-13", 1),
+        ("jump", "2025-06-24", "2025-06-24", 1),
+        ("jump", "2025-06-25", "2025-06-25", 1),
+        ("flat", "2025-06-02", "2025-06-06", 5),
+        # 준틴스(2025-06-19) 휴장은 누락이 아님
+        ("missing_days", "2025-06-10", "2025-06-11", 2),
+    ])
+
+    # 변동성이 큰 종목은 MAD 기반 기준(JUMP_SIGMAS * sigma)이 최소 기준보다 우선
+    sessions = NYSE.session_index("2025-06-02", "2025-06-27")
+    noisy = pd.DataFrame({"ts": sessions, "value": [100.0 * (1.03 if i % 2 else 1.0) for i in range(len(sessions))]})
+    noisy.loc[10, "value"] *= 1.1
+    noisy.loc[len(noisy) - 1, "value"] *= 3
+    jumps = scan_series("index", "VIX", noisy, SeriesRule(calendar=NYSE, max_jump=0.05, flat_days=None))
+    assert _checks(jumps) == [("jump", "2025-06-27", "2025-06-27", 1)]
+
+
+def test_incremental_scan_replaces_rescanned_issues_and_keeps_attempts(monkeypatch, tmp_path):
+    from batch.trifin import data_quality
+    from batch.trifin.information_collector.market_calendar import NYSE, US_BOND
+
+    engine = _sqlite_engine()
+    monkeypatch.setattr(data_quality, "engine", engine)
+    report_dir = str(tmp_path)
+    _insert_index_rows(engine, _index_rows("DGS10", US_BOND.session_index("2025-04-01", "2025-05-30"),
+                                           skip=("2025-05-06", "2025-05-14", "2025-05-15", "2025-05-21")))
+    _insert_index_rows(engine, _index_rows("VIXCLS", NYSE.session_index("2025-04-01", "2025-05-20"), start_value=15))
+
+    report = data_quality.run_scan(today="2025-06-02", report_dir=report_dir)
+    assert _checks(report["issues"]) == [
+        ("missing_days", "2025-05-06", "2025-05-06", 1),
+        ("missing_days", "2025-05-14", "2025-05-15", 2),
+        ("missing_days", "2025-05-21", "2025-05-21", 1),
+        # 05-21 ~ 05-30 NYSE 거래일 7일 (메모리얼 데이 제외)
+        ("stale", "2025-05-21", "2025-06-02", 7),
+    ]
+    for issue, attempts in zip(report["issues"], (2, 1, 1, 1)):
+        issue["refetch_attempts"] = attempts
+    data_quality.save_report(report, report_dir)
+
+    _insert_index_rows(engine, [{"symbol": "DGS10", "date": pd.Timestamp(day).date(), "value": 4.5}
+                                for day in ("2025-05-15", "2025-06-02", "2025-06-03")])
+    # 신규 행 최소 일자(05-15)에 걸친 기존 이슈가 있으면 그 시작일부터 재검사
+    new_rows = pd.DataFrame({"symbol": ["DGS10"], "first_ts": [pd.Timestamp("2025-05-15")], "max_id": [0]})
+    assert data_quality._scan_starts(new_rows, report["issues"]) == {"DGS10": pd.Timestamp("2025-05-14")}
+
+    report = data_quality.run_scan(today="2025-06-04", report_dir=report_dir)
+    assert report["scanned_symbols"] == {"price": 0, "index": 1}
+    assert [(*check, i["refetch_attempts"]) for check, i in zip(_checks(report["issues"]), report["issues"])] == [
+        # 재검사 구간 밖 이슈는 유지
+        ("missing_days", "2025-05-06", "2025-05-06", 1, 2),
+        # 재검사로 바뀐 구간은 새 이슈 (시도 횟수 0), 같은 이슈는 시도 횟수 유지
+        ("missing_days", "2025-05-14", "2025-05-14", 1, 0),
+        ("missing_days", "2025-05-21", "2025-05-21", 1, 1),
+        # stale은 매번 재계산, 종료일이 바뀌어도 같은 이슈
+        ("stale", "2025-05-21", "2025-06-04", 9, 1),
+    ]
+
+    # 신규 행이 없으면 watermark 이후 검사 대상 없음
+    again = data_quality.run_scan(today="2025-06-04", report_dir=report_dir)
+    assert again["scanned_symbols"] == {"price": 0, "index": 0}
+    assert again["issues"] == report["issues"]
+
+
+def test_refetch_targets_and_refetch_gaps(monkeypatch, tmp_path):
+    from batch.trifin import data_quality
+    from batch.trifin.data_quality import refetch_targets
+    from batch.trifin.information_collector import refetch_gaps as refetch_module
+    from batch.trifin.information_collector.market_calendar import US_BOND
+
+    def issue(symbol, check, end, attempts=0):
+        return {"table": "index", "symbol": symbol, "check": check, "start": "2025-05-01", "end": end,
+                "count": 1, "detail": "", "refetch_attempts": attempts}
+
+    report = {"issues": [issue("A", "missing_days", "2025-05-02"), issue("B", "jump", "2025-05-09"),
+                         issue("C", "stale", "2025-05-08"), issue("D", "missing_days", "2025-05-30", attempts=3)]}
+    # 누락/stale만, 시도 횟수 한도 미만, 최근 구간 우선
+    assert [i["symbol"] for i in refetch_targets(report, max_attempts=3)] == ["C", "A"]
+    assert [i["symbol"] for i in refetch_targets(report, max_attempts=4)] == ["D", "C", "A"]
+
+    engine = _sqlite_engine()
+    monkeypatch.setattr(data_quality, "engine", engine)
+    today = pd.Timestamp.now().normalize()
+    days = US_BOND.session_index(today - pd.Timedelta(days=60), today - pd.Timedelta(days=1))
+    gap = days[-20:-18]
+    _insert_index_rows(engine, _index_rows("DGS10", days, skip={str(d.date()) for d in gap}))
+    _insert_index_rows(engine, _index_rows("DGS2", days[:-10]))
+
+    requested = []
+
+    async def fetch_issue(target):
+        requested.append((target["symbol"], target["check"]))
+        if target["symbol"] == "DGS2":
+            raise RuntimeError("FRED 응답 없음")
+        rows = [{"symbol": "DGS10", "date": day.date(), "value": 4.0} for day in gap]
+        return (lambda r: _insert_index_rows(engine, r)), rows
+
+    monkeypatch.setattr(refetch_module, "fetch_issue", fetch_issue)
+    assert refetch_module.refetch_gaps(report_dir=str(tmp_path)) == 2
+    assert sorted(requested) == [("DGS10", "missing_days"), ("DGS2", "stale")]
+
+    # 채워진 구간은 재검사로 제거, 실패한 이슈는 시도 횟수 기록
+    report = data_quality.load_report(str(tmp_path))
+    assert [(i["symbol"], i["check"], i["refetch_attempts"]) for i in report["issues"]] == [("DGS2", "stale", 1)]
+
+
+# =====================
+# 손익 재생 환율
+# =====================
+def test_attach_fx_rejects_usd_orders_without_fx_history():
+    import pytest
+
+    from app.trifin.data.repository.models.order_table import UnitEnum
+    from batch.trifin.calc_pnl import attach_fx
+
+    orders = pd.DataFrame({"date": ["2024-01-02", "2024-01-05", "2024-01-08"],
+                           "unit": [UnitEnum.USD, UnitEnum.KRW, UnitEnum.USD]})
+    fx = pd.DataFrame({"fx_date": pd.to_datetime(["2024-01-03", "2024-01-04"]), "fx": [1300.0, 1310.0]})
+
+    attached = attach_fx(orders, fx)
+    # 첫 환율 이전 주문만 missing_fx (첫 환율 사용)
+    assert attached["fx"].tolist() == [1300.0, 1.0, 1310.0]
+    assert attached["missing_fx"].tolist() == [True, False, False]
+
+    empty = fx.iloc[0:0]
+    assert attach_fx(orders[orders["unit"] == UnitEnum.KRW], empty)["fx"].tolist() == [1.0]
+    # 환율 이력이 없으면 USD 주문을 환율 1로 계산하지 않음
+    with pytest.raises(ValueError, match="USD 주문 2건"):
+        attach_fx(orders, empty)
+
+
+def _replay_orders(*rows):
+    """(id, account_id, symbol, type, size, price, fx) 튜플로 attach_fx 이후 형태의 주문 chunk 생성"""
+    from app.trifin.data.repository.models.order_table import OrderTypeEnum
+
+    df = pd.DataFrame(rows, columns=["id", "account_id", "symbol", "type", "size", "price", "fx"])
+    df["type"] = df["type"].map(OrderTypeEnum)
+    df["date"] = [f"2024-01-{i:02d}" for i in df["id"]]
+    df["missing_fx"] = False
+    return df
+
+
+def test_pnl_replay_realizes_average_cost_and_deposits_shortfall():
+    from batch.trifin.calc_pnl import PnlReplay
+
+    first = _replay_orders(
+        (1, 1, "A", "buy", 10, 100.0, 1.0),
+        (2, 1, "A", "buy", 10, 200.0, 1.0),
+        (3, 1, "A", "sell", 5, 300.0, 1.0),
+        (4, 1, "B", "buy", 5, 10.0, 1300.0),
+        (5, 2, "A", "buy", 1, 100.0, 1.0),
+    )
+    first.loc[3, "missing_fx"] = True
+    replay = PnlReplay()
+    replay.apply(first)
+
+    # 평균단가 150에 5주 매도 -> 실현손익 750, 부족한 현금은 입금으로 처리
+    accounts = replay.account_summary().set_index("account_id")
+    assert accounts.loc[1].to_dict() == {
+        "cash": 0.0, "total_deposit": 66500.0, "realized_pnl": 750.0, "cost_basis": 67250.0,
+    }
+    assert accounts.loc[2, "total_deposit"] == 100.0
+    positions = replay.position_summary().set_index(["account_id", "symbol"])
+    assert positions.loc[(1, "A"), "size"] == 15 and positions.loc[(1, "A"), "avg_price"] == 150.0
+    assert positions.loc[(1, "B"), "avg_price"] == 13000.0
+    assert (replay.order_count, replay.missing_fx_count, replay.last_order_id) == (5, 1, 5)
+
+    # 보유 수량 초과 매도와 미보유 종목 매도: 초과분은 원가 0
+    replay.apply(_replay_orders((6, 1, "A", "sell", 20, 200.0, 1.0), (7, 1, "C", "sell", 3, 50.0, 1.0)))
+    accounts = replay.account_summary().set_index("account_id")
+    assert accounts.loc[1, "cash"] == 4150.0
+    assert accounts.loc[1, "realized_pnl"] == 750.0 + (4000.0 - 2250.0) + 150.0
+    assert accounts.loc[1, "cost_basis"] == 65000.0
+    positions = replay.position_summary()
+    assert set(zip(positions["account_id"], positions["symbol"])) == {(1, "B"), (2, "A")}
+    assert replay.positions[(1, "A")] == [0.0, 0.0] and replay.positions[(1, "C")] == [0.0, 0.0]
+    assert (replay.order_count, replay.last_order_id, replay.last_order_date) == (7, 7, "2024-01-07")
+
+    # chunk 분할과 무관하게 한 번에 처리한 결과와 동일
+    whole = PnlReplay()
+    whole.apply(pd.concat([first, _replay_orders((6, 1, "A", "sell", 20, 200.0, 1.0),
+                                                 (7, 1, "C", "sell", 3, 50.0, 1.0))], ignore_index=True))
+    assert whole.account_summary().equals(replay.account_summary())
+    assert whole.positions == replay.positions
+
+
+# =====================
+# 손익 스냅샷
+# =====================
+def _snapshot_db(monkeypatch):
+    from sqlalchemy import insert
+
+    from app.trifin.data.repository.models.account_table import Account
+    from app.trifin.data.repository.models.price_table import Price
+    from app.trifin.data.repository.models.user_table import User as UserModel
+    from batch.trifin import pnl_snapshot
+
+    engine = _session_db(monkeypatch)
+    monkeypatch.setattr(pnl_snapshot, "engine", engine)
+    days = pd.date_range("2024-01-01", "2024-01-12", freq="B")
+    closes = {"KODEX": [1000 + 20 * i for i in range(len(days))], "SPY": [100 + i for i in range(len(days))],
+              "KRW=X": [1300 + 5 * i for i in range(len(days))]}
+    prices = [
+        {"id": len(closes) * i + j, "symbol": symbol, "timestamp": day.to_pydatetime(), "open": close, "high": close,
+         "low": close, "close": close, "volume": 0.0}
+        for j, (symbol, values) in enumerate(closes.items()) for i, (day, close) in enumerate(zip(days, values))
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(UserModel), [{"id": 1, "uid": "u1", "name": "윤지"}])
+        conn.execute(insert(Account), [{"id": 1, "user_id": 1, "name": "미래", "balance": 0.0}])
+        conn.execute(insert(Price), prices)
+    return engine
+
+
+def _add_orders(engine, *orders):
+    from sqlalchemy import insert
+
+    from app.trifin.data.repository.models.order_table import Order, OrderTypeEnum, UnitEnum
+
+    rows = [
+        {"account_id": 1, "date": day, "type": OrderTypeEnum(kind), "symbol": symbol, "size": size, "price": price,
+         "unit": UnitEnum.USD if symbol == "SPY" else UnitEnum.KRW}
+        for day, kind, symbol, size, price in orders
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Order), rows)
+
+
+def _snapshot_rows(engine) -> tuple:
+    from app.trifin.data.repository.models.pnl_snapshot_table import PnlSnapshot
+    from app.trifin.data.repository.models.position_snapshot_table import PositionSnapshot
+
+    with engine.connect() as conn:
+        accounts = pd.read_sql(select(PnlSnapshot).order_by(PnlSnapshot.date), conn)
+        positions = pd.read_sql(select(PositionSnapshot).order_by(PositionSnapshot.date, PositionSnapshot.symbol), conn)
+    return accounts, positions
+
+
+def test_incremental_snapshots_match_full_rebuild(monkeypatch):
+    from datetime import date
+
+    from batch.trifin.pnl_snapshot import update_snapshots
+
+    engine = _snapshot_db(monkeypatch)
+    _add_orders(engine, ("2024-01-02", "buy", "KODEX", 10, 1000), ("2024-01-03", "buy", "SPY", 2, 100),
+                ("2024-01-05", "sell", "KODEX", 4, 1200))
+    assert update_snapshots(end_date=date(2024, 1, 6))["base_date"] is None
+
+    def assert_matches_full(end_date):
+        incremental = _snapshot_rows(engine)
+        update_snapshots(end_date=end_date, full=True)
+        full = _snapshot_rows(engine)
+        for left, right in zip(incremental, full):
+            pd.testing.assert_frame_equal(left, right)
+
+    # 신규 주문: 최신 스냅샷(01-06)과 신규 주문일(01-08) 중 이른 일자의 직전 스냅샷부터 재계산
+    _add_orders(engine, ("2024-01-08", "buy", "SPY", 1, 105))
+    result = update_snapshots(end_date=date(2024, 1, 10))
+    assert (result["base_date"], result["orders"]) == (date(2024, 1, 5), 1)
+    assert_matches_full(date(2024, 1, 10))
+
+    # 과거 일자로 입력된 주문: 그 일자 직전 스냅샷부터 재계산
+    _add_orders(engine, ("2024-01-03", "sell", "SPY", 1, 102))
+    result = update_snapshots(end_date=date(2024, 1, 10))
+    assert (result["base_date"], result["start_date"], result["orders"]) == (date(2024, 1, 2), date(2024, 1, 3), 4)
+    assert_matches_full(date(2024, 1, 10))
+
+    accounts, _ = _snapshot_rows(engine)
+    latest = accounts.iloc[-1]
+    # SPY 1주 매도(102 - 100) * 환율(01-03: 1310), KODEX 4주 매도 (1200 - 1000)
+    assert latest["realized_pnl"] == 2 * 1310 + 4 * 200
+
+
+def test_snapshots_forward_fill_days_without_orders(monkeypatch):
+    from datetime import date
+
+    from batch.trifin.pnl_snapshot import update_snapshots
+
+    engine = _snapshot_db(monkeypatch)
+    _add_orders(engine, ("2024-01-02", "buy", "KODEX", 10, 1000), ("2024-01-03", "buy", "SPY", 2, 100))
+    update_snapshots(end_date=date(2024, 1, 9))
+
+    accounts, positions = _snapshot_rows(engine)
+    # 주문이 없는 날(주말 포함)도 매일 스냅샷 생성
+    assert accounts["date"].astype(str).tolist() == [str(d.date()) for d in pd.date_range("2024-01-02", "2024-01-09")]
+    kodex = positions[positions["symbol"] == "KODEX"].set_index(positions["date"].astype(str)[positions["symbol"] == "KODEX"])
+    # 수량/원가는 직전 주문일 상태 유지, 평가액은 일자별 as-of 종가로 재계산 (주말은 금요일 종가)
+    assert set(kodex["size"]) == {10} and set(kodex["cost_basis"]) == {10_000}
+    assert kodex.loc["2024-01-04", "market_value"] == 10 * 1060
+    assert kodex.loc["2024-01-06", "market_value"] == kodex.loc["2024-01-05", "market_value"] == 10 * 1080
+    assert kodex.loc["2024-01-09", "market_value"] == 10 * 1120
+    spy = positions[(positions["symbol"] == "SPY")].set_index(positions["date"].astype(str)[positions["symbol"] == "SPY"])
+    assert spy.loc["2024-01-09", "market_value"] == 2 * 106 * 1330
+    day = accounts.set_index(accounts["date"].astype(str)).loc["2024-01-09"]
+    assert day["market_value"] == 10 * 1120 + 2 * 106 * 1330
+    assert day["unrealized_pnl"] == day["market_value"] - (10_000 + 2 * 100 * 1310)
@@ -0,0 +1,101 @@
+"""
+load.py
+
+동시 요청 부하 생성기 (httpx 비동기 클라이언트)
+
+- 시나리오별 가중치로 요청을 섞어 concurrency개 워커가 duration초(또는 요청 수) 동안 반복 호출
+    - 워커별 난수 seed 고정 → 같은 인자면 같은 요청 순서
+    - 본 측정 전 시나리오별 warmup회 호출 (기록 제외, 캐시/커넥션 풀 준비)
+- 결과: 시나리오별 요청 수, 오류 수(비 2xx/예외), 처리량(req/s), 지연 p50/p90/p95/p99/max/mean(ms)
+- 대상: ASGI 앱 인프로세스(httpx.ASGITransport, 네트워크 제외) 또는 실행 중인 서버 base_url
+- 작성일: 2025-06-19
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Attributes:
+        name: 시나리오 이름 (결과 키)
+        path: 난수 생성기를 받아 요청 경로(쿼리 포함)를 만드는 함수
+        weight: 요청 비중
+    """
+
+    name: str
+    path: Callable[[random.Random], str]
+    weight: float = 1.0
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    values = np.array(latencies) * 1000 if latencies else np.array([0.0])
+    p50, p90, p95, p99 = np.percentile(values, [50, 90, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+async def run_load(
+        client: httpx.AsyncClient,
+        scenarios: List[Scenario],
+        concurrency: int = 16,
+        duration: float = 10.0,
+        max_requests: Optional[int] = None,
+        warmup: int = 3,
+        seed: int = 42,
+) -> Dict[str, dict]:
+    """
+    시나리오를 섞어 부하를 주고 시나리오별/전체 통계를 반환합니다.
+    Returns:
+        dict: {시나리오 이름: 통계, "_total": 전체 통계}
+    """
+    warm_rng = random.Random(seed)
+    for scenario in scenarios:
+        for _ in range(warmup):
+            await client.get(scenario.path(warm_rng))
+
+    latencies: Dict[str, List[float]] = {s.name: [] for s in scenarios}
+    errors: Dict[str, int] = {s.name: 0 for s in scenarios}
+    weights = [s.weight for s in scenarios]
+    issued = 0
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def worker(worker_id: int):
+        nonlocal issued
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            scenario = rng.choices(scenarios, weights)[0]
+            path = scenario.path(rng)
+            request_started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                failed = not response.is_success
+            except httpx.HTTPError:
+                failed = True
+            latencies[scenario.name].append(time.perf_counter() - request_started)
+            errors[scenario.name] += failed
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = {name: summarize(latencies[name], errors[name], elapsed) for name in latencies}
+    result["_total"] = summarize([v for values in latencies.values() for v in values], sum(errors.values()), elapsed)
+    return result
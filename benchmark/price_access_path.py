@@ -0,0 +1,259 @@
+"""
+price_access_path.py
+
+price 테이블 접근 경로 벤치마크: id 기본키 + (symbol, timestamp) 유니크 키(변경 전) vs
+(symbol, timestamp) 기본키 + 연도별 RANGE 파티션(변경 후, alembic c4d8e2f6a1b3)
+
+- 의존성: SQLAlchemy, MySQL 8 (pymysql) — 파티션 비교이므로 MySQL 전용
+- 합성 데이터: symbols개 종목 x 영업일, 기본 2,000 x 5,000 = 1,000만 행 (2000-01-03부터)
+    - 실제 수집처럼 일자 순서로 적재 (변경 전 레이아웃에서는 한 종목의 행이 일자마다 다른 페이지에 흩어짐)
+    - 적재는 서버 측 INSERT ... SELECT를 연도 단위로 실행
+- 측정 쿼리 (조회 경로 대응)
+    - latest_100: get_prices_by_symbol (symbol, timestamp DESC LIMIT 100)
+    - range_1y / range_5y: backtesting load_price_history (symbol + 기간, timestamp 정렬)
+    - full_history: calc_pnl 환율 맵 (symbol 전체 이력, timestamp 정렬)
+    - append_day: 하루치 전 종목 INSERT IGNORE (수집 배치 적재 비용, 측정 후 삭제)
+- 반복마다 임의 종목/구간 (seed 고정), warm-up 후 p50/p95/평균(ms) 출력
+- 사용법 (운영 DB가 아닌 빈 스키마를 지정):
+    python -m benchmark.price_access_path --url mysql+pymysql://user:pw@localhost:3306/bench
+    python -m benchmark.price_access_path --url ... --rows 1000000 --skip-load --keep
+- 작성일: 2025-06-19
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+# alembic c4d8e2f6a1b3 파티션 범위와 동일
+FIRST_YEAR = 2000
+LAST_YEAR = 2035
+BEFORE = "bench_price_before"
+AFTER = "bench_price_after"
+COLUMNS = """
+    id BIGINT NOT NULL AUTO_INCREMENT,
+    symbol VARCHAR(20) NOT NULL,
+    open FLOAT NOT NULL,
+    high FLOAT NOT NULL,
+    low FLOAT NOT NULL,
+    close FLOAT NOT NULL,
+    volume FLOAT NOT NULL,
+    `timestamp` DATETIME NOT NULL,
+"""
+DDL = {
+    BEFORE: f"""
+        CREATE TABLE {BEFORE} ({COLUMNS}
+            PRIMARY KEY (id),
+            UNIQUE KEY uq_symbol_timestamp (symbol, `timestamp`),
+            KEY ix_price_timestamp (`timestamp`)
+        ) ENGINE=InnoDB
+    """,
+    AFTER: f"""
+        CREATE TABLE {AFTER} ({COLUMNS}
+            PRIMARY KEY (symbol, `timestamp`),
+            KEY ix_price_id (id)
+        ) ENGINE=InnoDB
+        PARTITION BY RANGE (YEAR(`timestamp`)) (
+            PARTITION p_old VALUES LESS THAN ({FIRST_YEAR}),
+            {", ".join(f"PARTITION p{y} VALUES LESS THAN ({y + 1})" for y in range(FIRST_YEAR, LAST_YEAR + 1))},
+            PARTITION p_max VALUES LESS THAN MAXVALUE
+        )
+    """,
+}
+QUERIES = {
+    "latest_100": "SELECT * FROM {table} WHERE symbol = :symbol ORDER BY `timestamp` DESC LIMIT 100",
+    "range_1y": "SELECT * FROM {table} WHERE symbol = :symbol AND `timestamp` BETWEEN :start AND :end ORDER BY `timestamp`",
+    "range_5y": "SELECT * FROM {table} WHERE symbol = :symbol AND `timestamp` BETWEEN :start AND :end ORDER BY `timestamp`",
+    "full_history": "SELECT * FROM {table} WHERE symbol = :symbol ORDER BY `timestamp`",
+}
+RANGE_DAYS = {"range_1y": 365, "range_5y": 5 * 365}
+START_DAY = date(2000, 1, 3)
+
+
+# =====================
+# 합성 데이터
+# =====================
+def business_days(count: int) -> List[date]:
+    days, day = [], START_DAY
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def symbol_names(count: int) -> List[str]:
+    return [f"S{i:05d}" for i in range(count)]
+
+
+def load(engine: Engine, rows: int, symbols: int) -> List[date]:
+    """두 테이블을 새로 만들고 같은 합성 데이터를 적재합니다. (일자 순서)"""
+    days = business_days(rows // symbols)
+    with engine.begin() as conn:
+        for table in (BEFORE, AFTER, "bench_symbol", "bench_day"):
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        conn.execute(text("CREATE TABLE bench_symbol (symbol VARCHAR(20) PRIMARY KEY)"))
+        conn.execute(text("CREATE TABLE bench_day (day DATE PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO bench_symbol VALUES (:symbol)"), [{"symbol": s} for s in symbol_names(symbols)])
+        conn.execute(text("INSERT INTO bench_day VALUES (:day)"), [{"day": d} for d in days])
+        for table, ddl in DDL.items():
+            conn.execute(text(ddl))
+
+    # 종목/일자 해시 기반 가격 (재현 가능)
+    px = "(10 + MOD(CRC32(CONCAT(s.symbol, d.day)), 100000) / 100)"
+    select_sql = f"""
+        SELECT s.symbol, {px}, {px} * 1.01, {px} * 0.99, {px}, 1000 + MOD(CRC32(d.day), 100000), d.day
+        FROM bench_day d CROSS JOIN bench_symbol s
+        WHERE d.day >= :start AND d.day < :end
+        ORDER BY d.day, s.symbol
+    """
+    for year in range(days[0].year, days[-1].year + 1):
+        for table in (BEFORE, AFTER):
+            started = time.perf_counter()
+            with engine.begin() as conn:
+                conn.execute(
+                    text(f"INSERT INTO {table} (symbol, open, high, low, close, volume, `timestamp`) {select_sql}"),
+                    {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)},
+                )
+            print(f"load {table} {year}: {time.perf_counter() - started:.1f}s")
+    with engine.begin() as conn:
+        for table in (BEFORE, AFTER):
+            conn.execute(text(f"ANALYZE TABLE {table}"))
+    return days
+
+
+def loaded(engine: Engine):
+    """--keep으로 남긴 테이블의 (일자, 종목) 목록"""
+    with engine.connect() as conn:
+        days = [row[0] for row in conn.execute(text("SELECT day FROM bench_day ORDER BY day"))]
+        symbols = [row[0] for row in conn.execute(text("SELECT symbol FROM bench_symbol ORDER BY symbol"))]
+    return days, symbols
+
+
+# =====================
+# 측정
+# =====================
+def timed(run: Callable[[], None], repeat: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def query_params(name: str, rng: random.Random, symbols: List[str], days: List[date]) -> dict:
+    params = {"symbol": rng.choice(symbols)}
+    if name in RANGE_DAYS:
+        first, last = days[0], days[-1] - timedelta(days=RANGE_DAYS[name])
+        start = first + timedelta(days=rng.randrange(max(1, (last - first).days)))
+        params.update(start=start, end=start + timedelta(days=RANGE_DAYS[name]))
+    return params
+
+
+def bench_query(conn: Connection, table: str, name: str, symbols: List[str], days: List[date], repeat: int,
+                warmup: int, seed: int) -> Dict[str, float]:
+    rng = random.Random(seed)
+    sql = text(QUERIES[name].format(table=table))
+    return timed(lambda: conn.execute(sql, query_params(name, rng, symbols, days)).fetchall(), repeat, warmup)
+
+
+def bench_append(engine: Engine, table: str, symbols: List[str], days: List[date], repeat: int) -> Dict[str, float]:
+    """마지막 적재일 이후 하루치 전 종목 INSERT IGNORE (측정 후 삭제)"""
+    next_days = iter(days[-1] + timedelta(days=i) for i in range(1, repeat + 2))
+    insert_sql = text(
+        f"INSERT IGNORE INTO {table} (symbol, open, high, low, close, volume, `timestamp`) "
+        "VALUES (:symbol, 100, 101, 99, 100, 1000, :timestamp)"
+    )
+
+    def append():
+        day = next(next_days)
+        with engine.begin() as conn:
+            conn.execute(insert_sql, [{"symbol": s, "timestamp": day} for s in symbols])
+
+    try:
+        return timed(append, repeat, warmup=1)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {table} WHERE `timestamp` > :last"), {"last": days[-1]})
+
+
+def explain(conn: Connection, table: str, days: List[date]) -> List[dict]:
+    start = days[len(days) // 2]
+    rows = conn.execute(
+        text("EXPLAIN " + QUERIES["range_1y"].format(table=table)),
+        {"symbol": "S00000", "start": start, "end": start + timedelta(days=365)},
+    ).mappings().all()
+    return [{key: row[key] for key in ("partitions", "type", "key", "rows", "Extra") if key in row} for row in rows]
+
+
+def run(url: str, rows: int, symbols: int, repeat: int, warmup: int, seed: int, skip_load: bool, keep: bool) -> dict:
+    engine = create_engine(url, pool_pre_ping=True)
+    if engine.dialect.name != "mysql":
+        raise SystemExit("MySQL URL이 필요합니다 (파티션/클러스터드 인덱스 비교)")
+    if skip_load:
+        days, names = loaded(engine)
+    else:
+        days, names = load(engine, rows, symbols), symbol_names(symbols)
+
+    result = {"rows": len(days) * len(names), "symbols": len(names), "days": len(days), "repeat": repeat, "tables": {}}
+    for table in (BEFORE, AFTER):
+        with engine.connect() as conn:
+            stats = {name: bench_query(conn, table, name, names, days, repeat, warmup, seed) for name in QUERIES}
+            plan = explain(conn, table, days)
+        stats["append_day"] = bench_append(engine, table, names, days, min(repeat, 20))
+        result["tables"][table] = {"stats": stats, "explain_range_1y": plan}
+
+    if not keep:
+        with engine.begin() as conn:
+            for table in (BEFORE, AFTER, "bench_symbol", "bench_day"):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    return result
+
+
+def print_result(result: dict) -> None:
+    print(f"\nrows={result['rows']:,} symbols={result['symbols']} days={result['days']} repeat={result['repeat']}")
+    print(f"{'query':<14}{'layout':<20}{'p50_ms':>10}{'p95_ms':>10}{'mean_ms':>10}")
+    for name in list(QUERIES) + ["append_day"]:
+        for table, data in result["tables"].items():
+            stats = data["stats"][name]
+            print(f"{name:<14}{table:<20}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['mean_ms']:>10}")
+    for table, data in result["tables"].items():
+        print(f"\nEXPLAIN range_1y ({table}): {data['explain_range_1y']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="price 테이블 접근 경로/파티션 벤치마크 (MySQL)")
+    parser.add_argument("--url", required=True, help="벤치마크용 MySQL URL (운영 DB 사용 금지)")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--symbols", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-load", action="store_true", help="이전 실행에서 --keep으로 남긴 테이블 재사용")
+    parser.add_argument("--keep", action="store_true", help="측정 후 테이블 유지")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    result = run(args.url, args.rows, args.symbols, args.repeat, args.warmup, args.seed, args.skip_load, args.keep)
+    print_result(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
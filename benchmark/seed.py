@@ -0,0 +1,239 @@
+"""
+seed.py
+
+벤치마크용 합성 데이터 생성/적재 (seed 고정, 같은 인자면 항상 같은 데이터)
+
+- product (Mongo): 실제 수집 문서 구조 (sales.{KR,US}.price/latestPrice/launchedDate, desc.{KO,EN}.name/description/...)
+    - 브랜드/가격대/출시일/색상/크기 분포, 품절(-1) 가격, 이미지 없는 문서, '데님' 설명 일부 포함
+    - 출시일은 기준 시각(reference_ms) 이전 2년에 분포 (최근 2주 출시 상품 포함)
+- price / index (MySQL 또는 SQLite): 백테스트 자산(SPY, QQQ, SCHD, BTC-USD, GLD), ^TNX, ^VIX, KRW=X 일봉과
+  FRED 지표(DGS10, VIXCLS 일간 / CPIAUCSL, UNRATE 월간)를 기하 브라운 운동으로 생성
+- user / account / order: 유저당 계좌 2개, 계좌당 주문 orders_per_account건 (최근 1년, 매수 위주)
+- 작성일: 2025-06-19
+"""
+
+import math
+import random
+from datetime import date, datetime, timedelta
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+PRODUCT_BATCH = 5_000
+SQL_BATCH = 10_000
+
+BRANDS = ["LV", "GUCCI", "PRADA", "CHANEL", "HERMES", "DIOR", "CELINE", "FENDI", "LOEWE", "BV", "YSL", "COACH"]
+TYPES = ["tote", "shoulder", "crossbody", "clutch", "backpack", "bucket", "hobo", "belt"]
+COLORS = [("black", "#000000", "블랙"), ("white", "#FFFFFF", "화이트"), ("brown", "#7B3F00", "브라운"),
+          ("beige", "#D9C3A5", "베이지"), ("red", "#C1121F", "레드"), ("blue", "#1D3557", "블루"),
+          ("green", "#2A9D8F", "그린"), ("pink", "#F4ACB7", "핑크")]
+MATERIALS = [("calfskin", "송아지 가죽"), ("canvas", "캔버스"), ("lambskin", "양가죽"), ("denim", "데님"),
+             ("nylon", "나일론"), ("raffia", "라피아")]
+BAG_SIZES = ["mini", "small", "medium", "large"]
+DAY_MS = 86_400_000
+
+BACKTEST_SYMBOLS = {
+    # 심볼: (시작가, 연 기대수익률, 연 변동성)
+    "SPY": (110.0, 0.08, 0.18),
+    "QQQ": (35.0, 0.12, 0.24),
+    "SCHD": (25.0, 0.07, 0.16),
+    "BTC-USD": (1.0, 0.60, 0.80),
+    "GLD": (45.0, 0.05, 0.15),
+    "^TNX": (4.0, 0.0, 0.25),
+    "^VIX": (18.0, 0.0, 0.60),
+    "KRW=X": (1150.0, 0.005, 0.08),
+}
+DAILY_INDEXES = {"DGS10": (4.0, 0.25), "VIXCLS": (18.0, 0.6)}
+MONTHLY_INDEXES = {"CPIAUCSL": (190.0, 0.01), "UNRATE": (5.0, 0.2)}
+
+
+# =====================
+# product (Mongo)
+# =====================
+def _price_display(value: int, country: str) -> str:
+    if value < 0:
+        return "품절" if country == "KR" else "Sold out"
+    return f"₩{value:,}" if country == "KR" else f"${value / 1300:,.0f}"
+
+
+def product_document(i: int, rng: random.Random, reference_ms: int) -> dict:
+    brand = rng.choice(BRANDS)
+    bag_type = rng.choice(TYPES)
+    colors = rng.sample(COLORS, rng.choice([1, 1, 2, 3]))
+    material_en, material_ko = rng.choice(MATERIALS)
+    launched = reference_ms - int(rng.random() ** 2 * 730 * DAY_MS)
+    base_price = int(rng.lognormvariate(math.log(3_000_000), 0.6) // 1000 * 1000)
+
+    sales = {}
+    for country in ("KR", "US"):
+        history, value, ts = [], base_price, launched
+        for _ in range(rng.choice([1, 1, 1, 2, 2, 3, 4, 6])):
+            history.append({"timestamp": ts, "value": value, "display": _price_display(value, country)})
+            ts += rng.randint(14, 120) * DAY_MS
+            value = int(value * rng.uniform(1.0, 1.12) // 1000 * 1000)
+        if rng.random() < 0.05:
+            history.append({"timestamp": ts, "value": -1, "display": _price_display(-1, country)})
+        sales[country] = {
+            "price": history,
+            "latestPrice": history[-1],
+            "productUrl": f"https://www.{brand.lower()}.com/{country.lower()}/p/{i:07d}",
+            "season": rng.choice(["SS", "FW", None]),
+            "launchedDate": launched,
+        }
+
+    name_en = f"{brand.title()} {rng.choice(['Classic', 'Mini', 'Soft', 'City', 'Re-Edition'])} {bag_type.title()}"
+    spec = f"W {rng.randint(15, 45)} x H {rng.randint(10, 35)} x D {rng.randint(5, 18)} cm"
+    desc = {
+        "KO": {
+            "name": f"{brand} {bag_type} {i}",
+            "material": material_ko,
+            "description": f"{material_ko} 소재의 {', '.join(c[2] for c in colors)} {bag_type} 백. 탈착 가능한 스트랩과 "
+                           f"금장 하드웨어, 내부 지퍼 포켓을 갖추었습니다.",
+            "spec": spec,
+            "color": [c[2] for c in colors],
+        },
+        "EN": {
+            "name": name_en,
+            "material": material_en,
+            "description": f"{material_en.title()} {bag_type} bag in {', '.join(c[0] for c in colors)} with a "
+                           f"detachable strap, gold-tone hardware and an interior zip pocket.",
+            "spec": spec,
+            "color": [c[0] for c in colors],
+        },
+    }
+    created = launched + rng.randint(0, 3) * DAY_MS
+    return {
+        "rawId": f"{brand}-{i:07d}",
+        "productId": f"{i:07d}",
+        "brand": brand,
+        "type": bag_type,
+        "sales": sales,
+        "desc": desc,
+        "colorCode": [c[1] for c in colors],
+        "standardizedColor": [c[0] for c in colors],
+        "bagSize": rng.choice(BAG_SIZES),
+        "imageUrl": "" if rng.random() < 0.02 else f"https://img.example.com/{brand.lower()}/{i:07d}/main.jpg",
+        "subImagesUrl": [f"https://img.example.com/{brand.lower()}/{i:07d}/{n}.jpg" for n in range(rng.randint(2, 6))],
+        "size": {"width": rng.randint(15, 45), "height": rng.randint(10, 35), "depth": rng.randint(5, 18), "unit": "cm"},
+        "createdDate": created,
+        "lastModifiedDate": created + rng.randint(0, 60) * DAY_MS,
+    }
+
+
+def product_documents(count: int, seed: int, reference_ms: int) -> Iterator[List[dict]]:
+    """count개 product 문서를 PRODUCT_BATCH개씩 생성"""
+    rng = random.Random(seed)
+    for start in range(0, count, PRODUCT_BATCH):
+        yield [product_document(i, rng, reference_ms) for i in range(start, min(count, start + PRODUCT_BATCH))]
+
+
+async def seed_products(database, count: int, seed: int, reference_ms: int) -> List[str]:
+    """product/product_view_count 컬렉션을 비우고 합성 문서 적재, rawId 목록 반환 (motor 호환 database)"""
+    await database["product"].drop()
+    await database["product_view_count"].drop()
+    raw_ids = []
+    for batch in product_documents(count, seed, reference_ms):
+        await database["product"].insert_many(batch, ordered=False)
+        raw_ids.extend(doc["rawId"] for doc in batch)
+    return raw_ids
+
+
+# =====================
+# price / index / order (SQL)
+# =====================
+def _gbm(rng: np.random.Generator, days: int, start: float, drift: float, vol: float, dt: float) -> np.ndarray:
+    shocks = rng.normal((drift - vol ** 2 / 2) * dt, vol * math.sqrt(dt), days)
+    return start * np.exp(np.cumsum(shocks))
+
+
+def price_rows(start: date, end: date, seed: int) -> List[dict]:
+    rng = np.random.default_rng(seed)
+    business = pd.bdate_range(start, end)
+    every_day = pd.date_range(start, end)
+    rows, next_id = [], 1
+    for symbol, (first, drift, vol) in BACKTEST_SYMBOLS.items():
+        # 가상자산은 주말 포함
+        days = every_day if symbol == "BTC-USD" else business
+        dt = 1 / (365 if symbol == "BTC-USD" else 252)
+        close = _gbm(rng, len(days), first, drift, vol, dt)
+        spread = np.abs(rng.normal(0, vol * math.sqrt(dt), len(days)))
+        volume = rng.integers(1_000_000, 80_000_000, len(days))
+        for day, c, s, v in zip(days, close, spread, volume):
+            c = float(c)
+            rows.append({
+                "id": next_id, "symbol": symbol, "timestamp": day.to_pydatetime(),
+                "open": c * (1 - s / 2), "high": c * (1 + s), "low": c * (1 - s), "close": c, "volume": float(v),
+            })
+            next_id += 1
+    return rows
+
+
+def index_rows(start: date, end: date, seed: int) -> List[dict]:
+    rng = np.random.default_rng(seed + 1)
+    rows = []
+    for symbol, (first, vol) in DAILY_INDEXES.items():
+        days = pd.bdate_range(start, end)
+        rows += [{"symbol": symbol, "date": d.date(), "value": float(v)}
+                 for d, v in zip(days, _gbm(rng, len(days), first, 0.0, vol, 1 / 252))]
+    for symbol, (first, vol) in MONTHLY_INDEXES.items():
+        months = pd.date_range(start, end, freq="MS")
+        rows += [{"symbol": symbol, "date": d.date(), "value": float(v)}
+                 for d, v in zip(months, _gbm(rng, len(months), first, 0.02, vol, 1 / 12))]
+    for i, row in enumerate(rows, start=1):
+        row["id"] = i
+    return rows
+
+
+def trifin_rows(users: int, orders_per_account: int, end: date, seed: int) -> dict:
+    """user/account/order 행 (USD 종목 주문은 unit=USD)"""
+    rng = random.Random(seed + 2)
+    symbols = [("SPY", "USD"), ("QQQ", "USD"), ("SCHD", "USD"), ("GLD", "USD"), ("BTC-USD", "USD")]
+    user_rows, account_rows, order_rows = [], [], []
+    for user_id in range(1, users + 1):
+        user_rows.append({"id": user_id, "uid": f"bench-{user_id:06d}", "name": f"user{user_id}"})
+        for n in range(2):
+            account_id = len(account_rows) + 1
+            account_rows.append({"id": account_id, "user_id": user_id, "name": f"account{n}", "balance": 0.0})
+            for _ in range(orders_per_account):
+                symbol, unit = rng.choice(symbols)
+                day = end - timedelta(days=rng.randint(0, 365))
+                order_rows.append({
+                    "id": len(order_rows) + 1,
+                    "type": "buy" if rng.random() < 0.8 else "sell",
+                    "symbol": symbol,
+                    "account_id": account_id,
+                    "date": datetime.combine(day, datetime.min.time()).isoformat(),
+                    "size": round(rng.uniform(0.1, 10), 4),
+                    "price": round(rng.uniform(50, 500), 2),
+                    "unit": unit,
+                })
+    return {"user": user_rows, "account": account_rows, "order": order_rows}
+
+
+def seed_sql(engine, start: date, end: date, users: int, orders_per_account: int, seed: int) -> dict:
+    """trifin 테이블을 새로 만들고 합성 데이터 적재 (벤치마크 전용 DB에만 사용)"""
+    from app.trifin.data.repository.models.account_table import Account
+    from app.trifin.data.repository.models.index_table import Index
+    from app.trifin.data.repository.models.order_table import Order
+    from app.trifin.data.repository.models.pnl_snapshot_table import PnlSnapshot
+    from app.trifin.data.repository.models.position_snapshot_table import PositionSnapshot
+    from app.trifin.data.repository.models.price_table import Price
+    from app.trifin.data.repository.models.user_table import User
+
+    tables = [User.__table__, Account.__table__, Order.__table__, Price.__table__, Index.__table__,
+              PnlSnapshot.__table__, PositionSnapshot.__table__]
+    metadata = User.metadata
+    metadata.drop_all(engine, tables=tables)
+    metadata.create_all(engine, tables=tables)
+
+    trifin = trifin_rows(users, orders_per_account, end, seed)
+    counts = {}
+    with engine.begin() as conn:
+        for table, rows in ((User.__table__, trifin["user"]), (Account.__table__, trifin["account"]),
+                            (Order.__table__, trifin["order"]), (Price.__table__, price_rows(start, end, seed)),
+                            (Index.__table__, index_rows(start, end, seed))):
+            for offset in range(0, len(rows), SQL_BATCH):
+                conn.execute(table.insert(), rows[offset:offset + SQL_BATCH])
+            counts[table.name] = len(rows)
+    return counts
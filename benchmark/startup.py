@@ -0,0 +1,125 @@
+"""
+startup.py
+
+API 프로세스 기동 비용 측정 (import 시간, 메모리)
+
+- 새 인터프리터에서 `python -X importtime -c "import main"` 실행 → 전체 import 시간과 누적 시간 상위 모듈
+    - 최상위 패키지별 합계 (fastapi, sqlalchemy, pymongo ...) 와 프로젝트 모듈별 누적 시간
+- 같은 방식으로 import 후 RSS(/proc/self/status VmRSS)와 로드된 모듈 수 측정
+- 배치 전용 모듈(pandas, yfinance, matplotlib, scipy, ccxt, batch.*)이 API 프로세스에 로드되면 표시
+- repeat회 측정 중앙값 (디스크 캐시 영향을 줄이기 위해 첫 실행은 버림)
+- 사용법 (DB_URL 필요, 접속하지 않음):
+    DB_URL=sqlite:// python -m benchmark.startup
+    DB_URL=sqlite:// python -m benchmark.startup --repeat 7 --top 30 --json
+- 작성일: 2025-06-20
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_PACKAGES = ("app", "core", "external_service", "batch", "main", "version")
+BATCH_ONLY_MODULES = ("pandas", "numpy", "yfinance", "matplotlib", "scipy", "ccxt", "firebase_admin", "batch")
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_PROBE = """
+import json, sys
+import main
+rss_kb = 0
+try:
+    with open("/proc/self/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"rss_kb": rss_kb, "modules": sorted(sys.modules)}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력 → [(모듈, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return rows
+
+
+def measure_once() -> dict:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    timing = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    probe = subprocess.run([sys.executable, "-c", _PROBE], cwd=PROJECT_ROOT, env=env,
+                           capture_output=True, text=True, check=True)
+    rows = parse_importtime(timing.stderr)
+    loaded = json.loads(probe.stdout.strip().splitlines()[-1])
+
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split(".", 1)[0]] += self_us
+    project = {name: cumulative for name, _, cumulative, _ in rows if name.split(".", 1)[0] in PROJECT_PACKAGES}
+    main_row = next((row for row in rows if row[0] == "main"), None)
+    return {
+        "import_ms": (main_row[2] if main_row else 0) / 1000,
+        "total_ms": sum(self_us for _, self_us, _, _ in rows) / 1000,
+        "rss_mb": loaded["rss_kb"] / 1024,
+        "module_count": len(loaded["modules"]),
+        "batch_only_loaded": sorted({m.split(".", 1)[0] for m in loaded["modules"]} & set(BATCH_ONLY_MODULES)),
+        "packages_ms": {name: us / 1000 for name, us in packages.items()},
+        "project_ms": {name: us / 1000 for name, us in project.items()},
+    }
+
+
+def measure(repeat: int) -> dict:
+    measure_once()
+    runs = [measure_once() for _ in range(repeat)]
+
+    def median_of(key: str) -> Dict[str, float]:
+        names = set().union(*(run[key] for run in runs))
+        return {name: round(statistics.median(run[key].get(name, 0.0) for run in runs), 2) for name in names}
+
+    return {
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "total_ms": round(statistics.median(run["total_ms"] for run in runs), 1),
+        "rss_mb": round(statistics.median(run["rss_mb"] for run in runs), 1),
+        "module_count": runs[-1]["module_count"],
+        "batch_only_loaded": runs[-1]["batch_only_loaded"],
+        "packages_ms": median_of("packages_ms"),
+        "project_ms": median_of("project_ms"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API 프로세스 import 시간/메모리 측정")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    print(f"import main: {result['import_ms']}ms (interpreter total {result['total_ms']}ms)  "
+          f"RSS: {result['rss_mb']}MB  modules: {result['module_count']}")
+    print(f"batch-only modules loaded: {', '.join(result['batch_only_loaded']) or '-'}")
+    print(f"\n{'package':<28}{'self ms':>10}")
+    for name, ms in sorted(result["packages_ms"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<28}{ms:>10.1f}")
+    print(f"\n{'project module':<60}{'cumulative ms':>14}")
+    for name, ms in sorted(result["project_ms"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<60}{ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+suite.py
+
+API 부하 테스트 + 백테스트 벤치마크 실행/비교 스크립트
+
+- run
+    1. SQL(MySQL/SQLite) 벤치마크 DB에 price/index/user/account/order 합성 데이터 적재 후 손익 스냅샷 생성
+    2. 백테스트: 10년/20년 구간 데이터 로딩(DB) + 전 전략 실행 wall time (repeat회 중앙값)
+    3. API: product 문서 수(기본 10k/100k/1M)별로 Mongo에 합성 문서 적재 후 home, product list/detail,
+       trifin 주문/계좌/손익 엔드포인트에 동시 부하 → 처리량/지연 백분위
+    - Mongo: 로컬 mongod URL 또는 memory (mongomock-motor 설치 시 인메모리, 대용량에는 부적합)
+    - 앱은 인프로세스(ASGITransport)로 호출, --base-url 지정 시 실행 중인 서버 호출 (같은 DB를 바라보도록 설정)
+    - 결과 JSON: benchmark/results/<시각>_<커밋>.json (커밋, 변경 여부, 환경, 인자 포함)
+- compare: 두 결과 파일의 지표를 나란히 출력 (new/old 비율)
+- 비교 가능성: 데이터/요청 순서 seed 고정, 백테스트 기준일 고정(REFERENCE_END), 상품 출시일은 실행 시각 기준 상대값
+- 사용법 (벤치마크 전용 DB만 지정, 기존 데이터는 삭제됨):
+    python -m benchmark.suite run --sql-url sqlite:////tmp/bench.db --mongo-url mongodb://localhost:27017/?directConnection=true
+    python -m benchmark.suite run --sql-url ... --mongo-url memory --sizes 10000 --duration 5
+    python -m benchmark.suite compare benchmark/results/a.json benchmark/results/b.json
+- 작성일: 2025-06-19
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from typing import List, Optional
+
+from dateutil.relativedelta import relativedelta
+
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REFERENCE_END = date(2025, 6, 13)
+PRICE_START = date(2004, 1, 1)
+HEADERS = {"X-Bagtionary-Version": "1.0.0", "X-Bagtionary-Package": "com.tricorn.bagtionary.bench"}
+
+
+# =====================
+# 실행 환경
+# =====================
+def git_revision() -> dict:
+    def git(*args) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=False).stdout.strip()
+
+    return {"commit": git("rev-parse", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count()}
+
+
+def configure(args) -> None:
+    """앱 모듈 import 전에 DB 접속 정보와 로그 레벨 지정"""
+    os.environ["DB_URL"] = args.sql_url
+    if args.mongo_url != "memory":
+        os.environ["MONGO_URL"] = args.mongo_url
+    logging.disable(getattr(logging, args.log_level))
+
+
+# =====================
+# SQL / 백테스트
+# =====================
+def seed_sql_data(args) -> dict:
+    from batch.trifin.pnl_snapshot import update_snapshots
+    from benchmark.seed import seed_sql
+    from core.config.db import engine
+
+    started = time.perf_counter()
+    counts = seed_sql(engine, PRICE_START, REFERENCE_END, args.users, args.orders_per_account, args.seed)
+    pnl = update_snapshots(end_date=REFERENCE_END, full=True)
+    counts.update(pnl_snapshot=pnl["snapshots"], position_snapshot=pnl["positions"])
+    return {"rows": counts, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def bench_backtest(years: int, repeat: int) -> dict:
+    from batch.trifin.backtesting.rebalance import run_strategies
+    from batch.trifin.backtesting.utils import generate_rebalance_dates, load_all_macro_indices, load_all_prices
+
+    end = datetime.combine(REFERENCE_END, datetime.min.time())
+    start = end - relativedelta(years=years)
+    start_with_gap = start - relativedelta(years=1)
+    samples = {"load_s": [], "run_s": [], "total_s": []}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        price_data = load_all_prices(start_with_gap, end)
+        index_data = load_all_macro_indices(start_with_gap, end)
+        loaded = time.perf_counter()
+        run_strategies(price_data, index_data, generate_rebalance_dates(start, end))
+        finished = time.perf_counter()
+        samples["load_s"].append(loaded - started)
+        samples["run_s"].append(finished - loaded)
+        samples["total_s"].append(finished - started)
+    return {key: round(statistics.median(values), 4) for key, values in samples.items()}
+
+
+# =====================
+# API 부하
+# =====================
+def connect_mongo(mongo_url: str):
+    from core.db.mongo import mongo
+
+    if mongo_url == "memory":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("--mongo-url memory 에는 mongomock-motor 패키지가 필요합니다 (pip install mongomock-motor)")
+        mongo.client = AsyncMongoMockClient()
+        mongo.db = mongo.client[mongo.settings.database]
+    else:
+        mongo.connect()
+    return mongo
+
+
+def scenarios(raw_ids: List[str], users: int) -> list:
+    from app.bagtionary.domain.home.home_model import HomeCategory
+    from benchmark.load import Scenario
+    from benchmark.seed import BRANDS
+
+    categories = [c.name for c in HomeCategory if c is not HomeCategory.unknown]
+    sorts = ["latest", "oldest", "price_asc", "price_desc"]
+
+    def product_list(rng):
+        path = f"/api/product/list?ctr=KR&page={rng.randint(0, 4)}&size=20&sort={rng.choice(sorts)}"
+        if rng.random() < 0.4:
+            path += "&brand=" + ",".join(rng.sample(BRANDS, rng.randint(1, 3)))
+        if rng.random() < 0.2:
+            path += "&keyword=" + rng.choice(["토트", "블랙", "mini", "캔버스"])
+        return path
+
+    return [
+        Scenario("home_category_list", lambda rng: "/api/home/category/list?ctr=KR", 2),
+        Scenario("home_product_list",
+                 lambda rng: f"/api/home/product/list/{rng.choice(categories)}?ctr=KR&page=0&size=20", 2),
+        Scenario("product_list", product_list, 3),
+        Scenario("product_detail", lambda rng: f"/api/product/{rng.choice(raw_ids)}?ctr=KR", 4),
+        Scenario("trifin_orders_by_user", lambda rng: f"/trifin/api/order/user/{rng.randint(1, users)}", 2),
+        Scenario("trifin_accounts_by_user", lambda rng: f"/trifin/api/account/user/{rng.randint(1, users)}", 1),
+        Scenario("trifin_profit_latest",
+                 lambda rng: f"/trifin/api/profit/account/{rng.randint(1, users * 2)}/latest", 1),
+    ]
+
+
+async def bench_api(args) -> dict:
+    import httpx
+
+    from benchmark.load import run_load
+    from benchmark.seed import seed_products
+
+    mongo = connect_mongo(args.mongo_url)
+    if args.mongo_url != "memory":
+        await mongo.warm_up()
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        import main
+        transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+        base_url = "http://benchmark"
+
+    reference_ms = int(time.time() * 1000)
+    results = {}
+    try:
+        for size in args.sizes:
+            started = time.perf_counter()
+            raw_ids = await seed_products(mongo.db, size, args.seed, reference_ms)
+            seeded = time.perf_counter() - started
+            async with httpx.AsyncClient(transport=transport, base_url=base_url, headers=HEADERS, timeout=60) as client:
+                load = await run_load(client, scenarios(raw_ids, args.users), args.concurrency, args.duration,
+                                      args.max_requests, args.warmup, args.seed)
+            results[str(size)] = {"seed_s": round(seeded, 3), "scenarios": load}
+            total = load["_total"]
+            print(f"[api] products={size:,} rps={total['rps']} p50={total['p50_ms']}ms p99={total['p99_ms']}ms "
+                  f"errors={total['errors']}")
+    finally:
+        mongo.close()
+    return results
+
+
+def run(args) -> str:
+    configure(args)
+    result = {
+        "meta": {**git_revision(), **environment(), "created_at": datetime.now().isoformat(timespec="seconds"),
+                 "args": {k: v for k, v in vars(args).items() if k != "func"}},
+        "sql_seed": seed_sql_data(args),
+    }
+    print(f"[seed] {result['sql_seed']}")
+    if not args.skip_backtest:
+        result["backtest"] = {f"{years}y": bench_backtest(years, args.backtest_repeat) for years in args.backtest_years}
+        print(f"[backtest] {result['backtest']}")
+    if not args.skip_api:
+        result["api"] = asyncio.run(bench_api(args))
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{datetime.now():%Y%m%d_%H%M%S}_{result['meta']['commit'][:8]}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+    print(f"[result] {path}")
+    return path
+
+
+# =====================
+# 비교
+# =====================
+def _ratio(new: Optional[float], old: Optional[float]) -> str:
+    if not new or not old:
+        return "-"
+    return f"{new / old:.2f}x"
+
+
+def compare(args) -> None:
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print(f"old: {old['meta']['commit'][:8]} ({old['meta']['created_at']})  new: {new['meta']['commit'][:8]} "
+          f"({new['meta']['created_at']})")
+
+    print(f"\n{'backtest':<12}{'metric':<10}{'old':>10}{'new':>10}{'new/old':>10}")
+    for key, metrics in new.get("backtest", {}).items():
+        for metric, value in metrics.items():
+            previous = old.get("backtest", {}).get(key, {}).get(metric)
+            print(f"{key:<12}{metric:<10}{previous if previous is not None else '-':>10}{value:>10}{_ratio(value, previous):>10}")
+
+    print(f"\n{'products':<10}{'scenario':<26}{'metric':<8}{'old':>10}{'new':>10}{'new/old':>10}")
+    for size, data in new.get("api", {}).items():
+        for name, stats in data["scenarios"].items():
+            previous = old.get("api", {}).get(size, {}).get("scenarios", {}).get(name, {})
+            for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+                before = previous.get(metric)
+                print(f"{size:<10}{name:<26}{metric:<8}{before if before is not None else '-':>10}{stats[metric]:>10}"
+                      f"{_ratio(stats[metric], before):>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API 부하/백테스트 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="합성 데이터 적재 후 벤치마크 실행")
+    run_parser.add_argument("--sql-url", required=True, help="벤치마크 전용 MySQL/SQLite URL (테이블 재생성)")
+    run_parser.add_argument("--mongo-url", default="memory", help="벤치마크 전용 Mongo URL 또는 memory")
+    run_parser.add_argument("--base-url", help="실행 중인 서버 주소 (미지정 시 인프로세스 호출)")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    run_parser.add_argument("--users", type=int, default=200)
+    run_parser.add_argument("--orders-per-account", type=int, default=50)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=20.0, help="product 문서 수별 부하 시간(초)")
+    run_parser.add_argument("--max-requests", type=int, default=None)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--backtest-years", type=int, nargs="+", default=[10, 20])
+    run_parser.add_argument("--backtest-repeat", type=int, default=3)
+    run_parser.add_argument("--skip-api", action="store_true")
+    run_parser.add_argument("--skip-backtest", action="store_true")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                            help="이 레벨 이하 로그 비활성화 (요청 로그가 측정에 섞이지 않도록)")
+    run_parser.add_argument("--out", default=RESULT_DIR)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = sub.add_parser("compare", help="두 결과 파일 비교")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
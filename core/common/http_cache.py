@@ -0,0 +1,252 @@
+"""
+http_cache.py
+
+목록 API 응답 캐시 + HTTP 캐시 헤더 (ETag, Cache-Control, 304)
+
+- 라우트별 정책: 엔드포인트 함수에 @cache_policy(...) 지정, 라우터는 route_class=CachedRoute
+    - 정책이 없는 라우트는 기존과 동일하게 처리
+- 캐시 대상: GET 200 응답 본문(직렬화된 JSON bytes)을 키별로 보관 (프로세스 메모리, LRU)
+    - 키: 라우트 템플릿 + 경로 + 쿼리 파라미터 + vary 헤더 값
+    - ETag: 캐시에 저장할 때 한 번 계산한 본문 digest (약한 ETag, 압축 여부와 무관)
+    - If-None-Match 일치 → 핸들러/DB/직렬화 없이 304
+    - 캐시 적중 → 저장된 bytes 그대로 응답 (재직렬화 없음)
+    - ttl 경과 또는 invalidate(scope) 시 다음 요청에서 다시 생성
+    - invalidate(scope, keys): 정책의 keys(쿼리 파라미터) 값이 겹치거나 해당 조건이 없는 항목만 제거
+        - 예: invalidate("product", {"ctr": ["KR"], "brand": ["CHANEL"]}) → ctr=US 홈 목록, brand=LV 필터 목록은 유지
+    - watch(scope): 변경 감지기가 scope 변경을 즉시 무효화하는 동안에는 watched_ttl(긴 ttl) 사용
+        - 긴 ttl로 저장할 응답은 primary_reads()로 생성 (세컨더리 지연 데이터가 오래 남지 않도록)
+- 메트릭: tricorn_http_cache_requests_total{route, result=hit|miss|not_modified}
+- 사용법:
+    router = APIRouter(prefix="/home", route_class=CachedRoute)
+
+    @router.get("/category/list")
+    @cache_policy(max_age=300, vary=("X-Bagtionary-Language", "X-Bagtionary-Version"))
+    async def get_home_category_list(...): ...
+- 작성일: 2025-06-20
+- 변경이력:
+    - 키 단위 무효화(keys), 변경 감지 중 긴 ttl(watched_ttl)
+    - 긴 ttl 응답은 primary 조회로 생성
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from starlette.datastructures import QueryParams
+from fastapi.routing import APIRoute
+
+from core.common.metrics import REGISTRY, Counter
+from core.db.mongo import primary_reads
+
+MAX_ENTRIES = 2048
+
+HTTP_CACHE_REQUESTS = REGISTRY.register(Counter(
+    "tricorn_http_cache_requests_total", "응답 캐시 결과별 요청 수", ("route", "result")))
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Attributes:
+        max_age: Cache-Control max-age(초), 클라이언트가 재검증 없이 사용하는 시간
+        ttl: 서버 응답 캐시 유지 시간(초), None이면 max_age
+        stale_while_revalidate: Cache-Control stale-while-revalidate(초), 0이면 생략
+        scope: 무효화 단위 (invalidate(scope))
+        vary: 응답을 구분하는 요청 헤더
+        keys: 무효화 범위를 좁히는 쿼리 파라미터 (값은 콤마 구분 목록 허용)
+        watched_ttl: scope 변경 감지 중(RESULT_CACHE.watch) 서버 응답 캐시 유지 시간(초), None이면 ttl
+    """
+
+    max_age: int
+    ttl: Optional[int] = None
+    stale_while_revalidate: int = 0
+    scope: str = "product"
+    vary: Tuple[str, ...] = ("X-Bagtionary-Language",)
+    keys: Tuple[str, ...] = ()
+    watched_ttl: Optional[int] = None
+
+    @property
+    def cache_control(self) -> str:
+        value = f"public, max-age={self.max_age}"
+        if self.stale_while_revalidate:
+            value += f", stale-while-revalidate={self.stale_while_revalidate}"
+        return value
+
+    def headers(self, etag: str) -> Dict[str, str]:
+        return {"ETag": etag, "Cache-Control": self.cache_control, "Vary": ", ".join(self.vary)}
+
+
+def cache_policy(max_age: int, ttl: Optional[int] = None, stale_while_revalidate: int = 0, scope: str = "product",
+                 vary: Sequence[str] = ("X-Bagtionary-Language",), keys: Sequence[str] = (),
+                 watched_ttl: Optional[int] = None) -> Callable:
+    """엔드포인트 함수에 응답 캐시 정책 지정 (CachedRoute 라우터에서만 동작)"""
+    policy = CachePolicy(max_age, ttl, stale_while_revalidate, scope, tuple(vary), tuple(keys), watched_ttl)
+
+    def decorator(endpoint):
+        endpoint.cache_policy = policy
+        return endpoint
+
+    return decorator
+
+
+def cache_keys(names: Sequence[str], query_params: QueryParams) -> Dict[str, Optional[FrozenSet[str]]]:
+    """정책 keys → {이름: 요청 값 set}, 조건이 없으면 None (모든 값에 해당)"""
+    keys = {}
+    for name in names:
+        values = frozenset(value.strip() for raw in query_params.getlist(name) for value in raw.split(",") if value.strip())
+        keys[name] = values or None
+    return keys
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    body: bytes
+    media_type: Optional[str]
+    etag: str
+    scope: str
+    keys: Dict[str, Optional[FrozenSet[str]]]
+    expires_at: float
+
+    def affected_by(self, keys: Optional[Dict[str, Optional[Iterable[str]]]]) -> bool:
+        """변경 키와 겹치지 않는 것이 확실한 경우에만 False"""
+        for name, values in (keys or {}).items():
+            mine = self.keys.get(name)
+            if mine is not None and values is not None and mine.isdisjoint(values):
+                return False
+        return True
+
+
+class ResultCache:
+    """직렬화된 응답 본문 LRU 캐시 (scope/키 단위 무효화)"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, CachedResult]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._watched: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    def get(self, key: tuple) -> Optional[CachedResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, scope: str, generation: int, body: bytes, media_type: Optional[str],
+            ttl: float, keys: Optional[Dict[str, Optional[FrozenSet[str]]]] = None) -> CachedResult:
+        etag = f'W/"{hashlib.blake2b(body, digest_size=10).hexdigest()}"'
+        entry = CachedResult(body, media_type, etag, scope, keys or {}, time.monotonic() + ttl)
+        with self._lock:
+            # 생성 중(generation 조회 이후) 무효화가 있었으면 이번 응답만 사용하고 저장하지 않음
+            if generation == self.generation(scope):
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, scope: str, keys: Optional[Dict[str, Optional[Iterable[str]]]] = None) -> int:
+        """
+        scope 항목 제거 (keys가 있으면 해당 키 값과 겹치는 항목만, 값이 None인 키는 모든 값)
+        Returns:
+            제거한 항목 수
+        """
+        with self._lock:
+            self._generations[scope] = self.generation(scope) + 1
+            stale = [key for key, entry in self._entries.items() if entry.scope == scope and entry.affected_by(keys)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def watch(self, scope: str) -> None:
+        """scope 변경을 즉시 무효화하는 감지기 동작 중 (watched_ttl 사용)"""
+        with self._lock:
+            self._watched[scope] = self._watched.get(scope, 0) + 1
+
+    def unwatch(self, scope: str) -> None:
+        """감지 중단: 긴 ttl로 저장된 항목이 오래 남지 않도록 scope 전체 무효화"""
+        with self._lock:
+            remaining = self._watched.get(scope, 0) - 1
+            if remaining > 0:
+                self._watched[scope] = remaining
+            else:
+                self._watched.pop(scope, None)
+        self.invalidate(scope)
+
+    def is_watched(self, scope: str) -> bool:
+        return self._watched.get(scope, 0) > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+RESULT_CACHE = ResultCache()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 비교 (약한 비교, 여러 값/와일드카드 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+class CachedRoute(APIRoute):
+    """cache_policy가 지정된 엔드포인트의 GET 응답을 캐시하고 ETag/Cache-Control/304 처리"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        policy: Optional[CachePolicy] = getattr(self.endpoint, "cache_policy", None)
+        if policy is None:
+            return handler
+        route = self.path
+        ttl = policy.ttl if policy.ttl is not None else policy.max_age
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            key = (route, request.url.path, tuple(sorted(request.query_params.multi_items())),
+                   tuple(request.headers.get(name) for name in policy.vary))
+            entry = RESULT_CACHE.get(key)
+            if entry is None:
+                generation = RESULT_CACHE.generation(policy.scope)
+                long_lived = bool(policy.watched_ttl) and RESULT_CACHE.is_watched(policy.scope)
+                if long_lived:
+                    with primary_reads():
+                        response = await handler(request)
+                else:
+                    response = await handler(request)
+                if response.status_code != 200 or not hasattr(response, "body"):
+                    return response
+                entry_ttl = policy.watched_ttl if long_lived else ttl
+                entry = RESULT_CACHE.put(key, policy.scope, generation, response.body, response.media_type, entry_ttl,
+                                         cache_keys(policy.keys, request.query_params))
+                result = "miss"
+            else:
+                result = "hit"
+
+            if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+                HTTP_CACHE_REQUESTS.inc(route=route, result="not_modified")
+                return Response(status_code=304, headers=policy.headers(entry.etag))
+            HTTP_CACHE_REQUESTS.inc(route=route, result=result)
+            return Response(entry.body, media_type=entry.media_type, headers=policy.headers(entry.etag))
+
+        return cached_handler
@@ -0,0 +1,393 @@
+"""
+metrics.py
+
+요청/DB 성능 계측용 Prometheus 텍스트 포맷(0.0.4) 메트릭 레지스트리 (외부 의존성 없음)
+
+- 메트릭
+    - tricorn_http_requests_total{method, route, status}: 요청 수
+    - tricorn_http_request_duration_seconds{method, route}: 라우트별 응답 시간 히스토그램
+    - tricorn_http_requests_in_progress{method, route}: 처리 중인 요청 수
+    - tricorn_http_request_db_seconds{route, db}: 요청 1건 안에서 DB(mongo/mysql)에 쓴 시간 합계 히스토그램
+    - tricorn_db_operation_duration_seconds{db, repository, operation}: Mongo 명령/SQL 쿼리 1건 시간 히스토그램
+    - tricorn_db_operation_errors_total{db, repository, operation}: 실패한 Mongo 명령/SQL 쿼리 수
+- repository 라벨: 현재 실행 중인 리포지토리 메서드 (contextvar, 바깥쪽 메서드 우선)
+    - Mongo: DefaultMongoRepository 메서드 자동 태깅 (예: ProductRepository.find_products)
+    - MySQL: core.config.db.get_db 호출 함수 자동 태깅 (예: order_repository.get_orders_by_user_id)
+    - 태깅되지 않은 호출은 "-"
+- 라벨 값은 라우트 템플릿/메서드 이름만 사용 (경로 파라미터, 쿼리 값은 넣지 않음)
+- 값은 프로세스별로 집계, 멀티 프로세스(serve.py prefork)는 TRICORN_METRICS_DIR 디렉터리로 합산
+    - 워커는 주기적으로(+ 종료 시, /metrics 응답 시) 자기 값을 worker_<pid>.json 에 저장
+    - /metrics 는 어느 워커가 받아도 디렉터리의 모든 워커 값을 합산해 응답 (다른 워커 값은 최대 저장 주기만큼 지연)
+    - 종료된 워커 값은 부모가 archive.json 에 합산 (counter/histogram 유지, gauge는 제외) → 워커 재시작 시에도 counter 감소 없음
+- 사용법:
+    from core.common.metrics import REGISTRY, render_metrics, tagged
+    render_metrics()  # /metrics 응답 본문 (단일 프로세스는 REGISTRY.render())
+- 작성일: 2025-06-19
+- 변경이력:
+    - 멀티 프로세스 워커 값 디렉터리 합산 (snapshot/merge, write_snapshot/render_directory/archive_worker): 2025-06-23
+"""
+
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+UNTAGGED = "-"
+
+METRICS_DIR_ENV = "TRICORN_METRICS_DIR"
+ARCHIVE_FILE = "archive.json"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+# =====================
+# 메트릭 타입
+# =====================
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def snapshot(self) -> list:
+        """[[라벨 값 목록, 값], ...] (JSON 저장용 복사본)"""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def merge_into(self, target: dict, values: list) -> None:
+        raise NotImplementedError
+
+    def samples(self, values: Optional[dict] = None) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self, values: Optional[dict] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples(values)]
+        return lines
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def merge_into(self, target: dict, values: list) -> None:
+        for key, value in values:
+            key = tuple(key)
+            target[key] = target.get(key, 0) + value
+
+    def samples(self, values: Optional[dict] = None):
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, _labels(self.label_names, key), value
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 라벨별 [버킷별 개수(누적 아님)..., 합계]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), list(state)] for key, state in self._values.items()]
+
+    def merge_into(self, target: dict, values: list) -> None:
+        for key, state in values:
+            key = tuple(key)
+            current = target.get(key)
+            target[key] = list(state) if current is None else [a + b for a, b in zip(current, state)]
+
+    def samples(self, values: Optional[dict] = None):
+        if values is None:
+            with self._lock:
+                values = {key: list(state) for key, state in self._values.items()}
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state[:-1]):
+                cumulative += count
+                yield (f"{self.name}_bucket", _labels(self.label_names + ("le",), key + (_format_value(bound),)),
+                       cumulative)
+            yield f"{self.name}_sum", _labels(self.label_names, key), state[-1]
+            yield f"{self.name}_count", _labels(self.label_names, key), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        """{메트릭 이름: 라벨별 값} (JSON 저장용)"""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def merge(self, snapshots: Iterable[dict], include_gauges: bool = True) -> dict:
+        """여러 프로세스의 snapshot 합산 (등록되지 않은 메트릭은 무시)"""
+        merged: Dict[str, dict] = {name: {} for name in self._metrics}
+        for snapshot in snapshots:
+            for name, values in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is not None and (include_gauges or not isinstance(metric, Gauge)):
+                    metric.merge_into(merged[name], values)
+        return {name: [[list(key), value] for key, value in values.items()] for name, values in merged.items()}
+
+    def render(self, snapshot: Optional[dict] = None) -> str:
+        """현재 프로세스 값 (snapshot을 주면 그 값) 을 텍스트 포맷으로 출력"""
+        lines = []
+        for name, metric in self._metrics.items():
+            values = None if snapshot is None else {tuple(key): value for key, value in snapshot.get(name, [])}
+            lines += metric.render(values)
+        return "\n".join(lines) + "\n"
+
+    # =====================
+    # 멀티 프로세스 합산 (TRICORN_METRICS_DIR)
+    # =====================
+    def write_snapshot(self, directory: str, pid: Optional[int] = None) -> None:
+        """현재 프로세스 값을 directory/worker_<pid>.json 에 저장 (원자적 교체)"""
+        _write_json(_worker_file(directory, pid or os.getpid()), self.snapshot())
+
+    def render_directory(self, directory: str) -> str:
+        """자기 값을 저장한 뒤 디렉터리의 모든 워커 값 + archive 합산 결과를 출력"""
+        self.write_snapshot(directory)
+        with _directory_lock(directory, exclusive=False):
+            snapshots = [
+                _read_json(os.path.join(directory, name))
+                for name in sorted(os.listdir(directory)) if name.endswith(".json")
+            ]
+        return self.render(self.merge(snapshots))
+
+    def archive_worker(self, directory: str, pid: int) -> None:
+        """종료된 워커 값을 archive에 합산하고 워커 파일 삭제 (gauge는 종료와 함께 제외)"""
+        path = _worker_file(directory, pid)
+        with _directory_lock(directory, exclusive=True):
+            if not os.path.exists(path):
+                return
+            archive_path = os.path.join(directory, ARCHIVE_FILE)
+            _write_json(archive_path, self.merge([_read_json(archive_path), _read_json(path)], include_gauges=False))
+            os.remove(path)
+
+
+def _worker_file(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"worker_{pid}.json")
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _directory_lock(directory: str, exclusive: bool):
+    """합산(공유)과 archive 이동(배타)이 겹쳐 값이 두 번/누락 집계되지 않도록 잠금"""
+    import fcntl
+
+    with open(os.path.join(directory, ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "tricorn_http_requests_total", "HTTP 요청 수", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "tricorn_http_request_duration_seconds", "라우트별 HTTP 응답 시간(초)", ("method", "route")))
+HTTP_IN_PROGRESS = REGISTRY.register(Gauge(
+    "tricorn_http_requests_in_progress", "처리 중인 HTTP 요청 수", ("method", "route")))
+HTTP_DB_TIME = REGISTRY.register(Histogram(
+    "tricorn_http_request_db_seconds", "요청 1건에서 DB별로 사용한 시간 합계(초)", ("route", "db"), DB_BUCKETS))
+DB_LATENCY = REGISTRY.register(Histogram(
+    "tricorn_db_operation_duration_seconds", "Mongo 명령/SQL 쿼리 시간(초)", ("db", "repository", "operation"), DB_BUCKETS))
+DB_ERRORS = REGISTRY.register(Counter(
+    "tricorn_db_operation_errors_total", "실패한 Mongo 명령/SQL 쿼리 수", ("db", "repository", "operation")))
+
+
+# =====================
+# 리포지토리 태깅 / 요청별 DB 시간
+# =====================
+_repository: ContextVar[Optional[str]] = ContextVar("metrics_repository", default=None)
+_route: ContextVar[Optional[str]] = ContextVar("metrics_route", default=None)
+_request_db_time: ContextVar[Optional[Dict[str, float]]] = ContextVar("metrics_request_db_time", default=None)
+
+
+def current_repository() -> str:
+    return _repository.get() or UNTAGGED
+
+
+@contextmanager
+def repository_tag(name: str):
+    """블록 안의 DB 호출에 리포지토리 라벨 지정 (이미 태깅된 경우 바깥쪽 유지)"""
+    if _repository.get() is not None:
+        yield
+        return
+    token = _repository.set(name)
+    try:
+        yield
+    finally:
+        _repository.reset(token)
+
+
+def tagged(name: str) -> Callable:
+    """함수(동기/비동기) 실행 중 DB 호출에 리포지토리 라벨 지정"""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with repository_tag(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with repository_tag(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def tag_methods(cls: type) -> type:
+    """클래스에 직접 정의된 공개 코루틴 메서드를 ClassName.method 라벨로 태깅"""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, attr, tagged(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+@contextmanager
+def track_request(route: str):
+    """요청 처리 중 라우트 템플릿을 지정하고 DB 시간을 db별로 합산할 dict를 제공"""
+    totals: Dict[str, float] = {}
+    route_token = _route.set(route)
+    token = _request_db_time.set(totals)
+    try:
+        yield totals
+    finally:
+        _request_db_time.reset(token)
+        _route.reset(route_token)
+
+
+def current_route() -> str:
+    return _route.get() or UNTAGGED
+
+
+def record_db_operation(db: str, operation: str, seconds: float, failed: bool = False) -> None:
+    """DB 명령/쿼리 1건 기록 (리포지토리 라벨은 현재 컨텍스트 기준)"""
+    repository = current_repository()
+    DB_LATENCY.observe(seconds, db=db, repository=repository, operation=operation)
+    if failed:
+        DB_ERRORS.inc(db=db, repository=repository, operation=operation)
+    totals = _request_db_time.get()
+    if totals is not None:
+        totals[db] = totals.get(db, 0.0) + seconds
+
+
+# =====================
+# /metrics 응답
+# =====================
+def render_metrics() -> str:
+    """/metrics 응답 본문 (TRICORN_METRICS_DIR 가 있으면 워커 전체 합산)"""
+    directory = os.getenv(METRICS_DIR_ENV)
+    return REGISTRY.render_directory(directory) if directory else REGISTRY.render()
+
+
+def start_snapshot_writer(directory: str, interval: float) -> threading.Event:
+    """interval초마다 현재 프로세스 값을 저장하는 daemon 스레드 시작 (반환한 Event를 set하면 종료)"""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            try:
+                REGISTRY.write_snapshot(directory)
+            except OSError:
+                pass
+
+    threading.Thread(target=loop, name="metrics-snapshot", daemon=True).start()
+    return stop
@@ -0,0 +1,102 @@
+import gzip
+import os
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MINIMUM_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """선호 순서(br > zstd > gzip)의 사용 가능한 인코더 (brotli, zstandard는 Pipfile 의존성, 미설치 환경에서는 gzip만 사용)"""
+    encoders = {}
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=4)
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        encoders["zstd"] = compressor.compress
+    encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=5, mtime=0)
+    return encoders
+
+
+ENCODERS = _encoders()
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding(q 값 포함)에서 서버 선호 순서상 가장 앞선 인코딩, 없으면 None"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODERS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    minimum_size 이상 JSON/텍스트 응답을 클라이언트가 허용하는 인코딩으로 압축 (br > zstd > gzip)
+    - 스트리밍 응답, 이미 인코딩된 응답, 본문 없는 응답(304 등)은 그대로 전달
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (message.get("more_body", False) or len(body) < self.minimum_size or "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = ENCODERS[encoding](body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
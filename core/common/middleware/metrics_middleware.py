@@ -0,0 +1,42 @@
+import time
+from typing import Callable, Awaitable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Match
+
+from core.common.metrics import HTTP_DB_TIME, HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS, track_request
+
+UNMATCHED = "<unmatched>"
+
+
+def route_template(request: Request) -> str:
+    """요청 경로에 맞는 라우트 템플릿 (예: /trifin/orders/user/{user_id}), 없으면 <unmatched>"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED)
+    return UNMATCHED
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """라우트별 응답 시간/처리 중 요청 수/DB별 시간 계측 (core.common.metrics)"""
+
+    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        method = request.method
+        route = route_template(request)
+        status = 500
+
+        HTTP_IN_PROGRESS.inc(method=method, route=route)
+        start_time = time.perf_counter()
+        try:
+            with track_request(route) as db_time:
+                response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - start_time, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            HTTP_IN_PROGRESS.dec(method=method, route=route)
+            for db, seconds in db_time.items():
+                HTTP_DB_TIME.observe(seconds, route=route, db=db)
@@ -0,0 +1,65 @@
+import threading
+from typing import Callable, Awaitable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+
+from core.common.profiler import SamplingProfiler
+
+PROFILE_HEADER = "X-Bagtionary-Profile"
+DEFAULT_INTERVAL_MS = 1.0
+MAX_INTERVAL_MS = 50.0
+
+# 동시에 하나의 요청만 프로파일링
+_profile_lock = threading.Lock()
+
+
+def is_debug_package(request: Request) -> bool:
+    return request.headers.get("X-Bagtionary-Package", "").endswith(".debug")
+
+
+def sampling_interval(value: str) -> float:
+    """헤더 값(샘플 간격 ms) → 초, 숫자가 아니면 기본값"""
+    try:
+        interval_ms = float(value)
+    except ValueError:
+        interval_ms = DEFAULT_INTERVAL_MS
+    return min(max(interval_ms, 0.1), MAX_INTERVAL_MS) / 1000
+
+
+class ProfileMiddleware(BaseHTTPMiddleware):
+    """
+    디버그 패키지 요청에 X-Bagtionary-Profile 헤더가 있으면 요청 처리 구간을 샘플링하고
+    원래 응답 대신 collapsed stack(플레임 그래프 입력) 텍스트를 반환 (원래 상태 코드는 X-Original-Status)
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        if PROFILE_HEADER not in request.headers or not is_debug_package(request):
+            return await call_next(request)
+        if not _profile_lock.acquire(blocking=False):
+            response = await call_next(request)
+            response.headers["X-Profile-Status"] = "busy"
+            return response
+
+        try:
+            profiler = SamplingProfiler(threading.get_ident(), sampling_interval(request.headers[PROFILE_HEADER]))
+            profiler.start()
+            try:
+                response = await call_next(request)
+                # 스트리밍 본문 생성 시간까지 포함
+                async for _ in response.body_iterator:
+                    pass
+            finally:
+                collapsed = profiler.stop()
+        finally:
+            _profile_lock.release()
+
+        return PlainTextResponse(
+            collapsed,
+            headers={
+                "X-Original-Status": str(response.status_code),
+                "X-Profile-Samples": str(profiler.sample_count),
+                "X-Profile-Duration-Ms": f"{profiler.elapsed * 1000:.2f}",
+            },
+        )
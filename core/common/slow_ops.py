@@ -0,0 +1,244 @@
+"""
+slow_ops.py
+
+임계 시간을 넘긴 Mongo 명령/SQL 쿼리를 쿼리 형태(shape), 실행 계획 요약, 소요 시간과 함께 기록하는 느린 작업 기록기
+
+- 의존성: pymongo(Mongo explain), SQLAlchemy(SQL EXPLAIN)
+- 설정 (환경변수)
+    - SLOW_OP_THRESHOLD_MS: 기록 임계 시간(ms), 기본 200, 0 이하이면 비활성화
+    - SLOW_OP_EXPLAIN: 실행 계획 조회 여부 (기본 1)
+- 쿼리 형태: 값은 "?"로 치환하고 키/연산자/필드 경로($brand)/정렬·프로젝션 값은 유지
+    - Mongo: {"find": "product", "filter": {"$and": [{"brand": {"$in": ["?"]}}]}, "sort": {...}, "limit": "?"}
+    - SQL: 파라미터 바인딩된 statement 그대로 (리터럴 없음)
+- 실행 계획: 별도 스레드에서 조회 (요청 처리 경로 지연 없음, 큐가 가득 차면 계획 없이 기록)
+    - Mongo: explain(queryPlanner) winningPlan 단계 요약 (예: LIMIT > FETCH > IXSCAN(sales.KR.launchedDate_-1_rawId_-1))
+    - MySQL: EXPLAIN 행 요약 (예: order:ref(ix_order_account_id) rows=12), SQLite: EXPLAIN QUERY PLAN
+    - 같은 형태는 PLAN_TTL_SECONDS 동안 계획 재사용 (explain 호출 최소화)
+- 기록: 최근 MAX_RECORDS건 메모리 보관(GET /debug/slow-ops) + 경고 로그(Logstash)
+- 사용법:
+    from core.common.slow_ops import SLOW_OPS
+    SLOW_OPS.records()
+- 작성일: 2025-06-19
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.common.metrics import current_repository, current_route, repository_tag
+from core.util.log_util import logger
+
+MAX_RECORDS = 200
+PLAN_TTL_SECONDS = 600
+EXPLAIN_TAG = "slow_ops.explain"
+SHAPE_MAX_LENGTH = 4_000
+
+# 값 자체가 쿼리 형태인 키 (정렬 방향, 프로젝션, 인덱스 힌트)
+SHAPE_LITERAL_KEYS = {"sort", "projection", "hint", "$sort", "$project"}
+# explain 대상 명령과 explain 전에 제거할 드라이버 필드
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+DRIVER_FIELDS = {"lsid", "$clusterTime", "$db", "txnNumber", "$readPreference", "readConcern", "writeConcern",
+                 "signature", "cursor", "comment", "apiVersion", "apiStrict", "apiDeprecationErrors"}
+
+
+# =====================
+# 쿼리 형태 / 계획 요약
+# =====================
+def query_shape(value: Any, literal: bool = False) -> Any:
+    """Mongo 명령 문서에서 값을 "?"로 치환한 형태"""
+    if isinstance(value, dict):
+        return {key: query_shape(item, literal or key in SHAPE_LITERAL_KEYS) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [query_shape(item, literal) for item in value]
+        # 스칼라 목록($in 등)은 길이와 무관하게 같은 형태
+        return shapes if any(isinstance(item, (dict, list)) for item in shapes) else shapes[:1]
+    if literal or (isinstance(value, str) and value.startswith("$")):
+        return value
+    return "?"
+
+
+def mongo_command_shape(command_name: str, command: dict) -> dict:
+    """드라이버 필드를 제외한 명령 형태 (컬렉션 이름 유지)"""
+    shape = {command_name: command.get(command_name)}
+    for key, value in command.items():
+        if key != command_name and key not in DRIVER_FIELDS:
+            shape[key] = query_shape(value, key in SHAPE_LITERAL_KEYS)
+    return shape
+
+
+def summarize_mongo_plan(explain: dict) -> str:
+    """explain 결과의 winningPlan 단계 체인 요약"""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # aggregate: 첫 $cursor 단계 또는 shards 생략 형태
+        for stage in explain.get("stages", []):
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner")
+                break
+    if planner is None:
+        return "unknown"
+    stage = planner.get("winningPlan", {})
+    stage = stage.get("queryPlan", stage)
+    names = []
+    while stage:
+        name = stage.get("stage", "?")
+        if "indexName" in stage:
+            name += f"({stage['indexName']})"
+        names.append(name)
+        children = stage.get("inputStages") or [stage.get("inputStage")]
+        stage = children[0] if children and children[0] else None
+    return " > ".join(names)
+
+
+def summarize_sql_plan(dialect: str, rows: List[Dict[str, Any]]) -> str:
+    if dialect == "sqlite":
+        return "; ".join(str(row.get("detail")) for row in rows)
+    parts = []
+    for row in rows:
+        key = f"({row['key']})" if row.get("key") else ""
+        parts.append(f"{row.get('table')}:{row.get('type')}{key} rows={row.get('rows')}")
+    return "; ".join(parts)
+
+
+def _mongo_explainer(run_command: Callable[[str, dict], dict], database: str, command_name: str,
+                     command: dict) -> Callable[[], str]:
+    """command의 explain(queryPlanner) 결과를 요약하는 함수 (드라이버 필드 제거)"""
+    body = {key: value for key, value in command.items() if key not in DRIVER_FIELDS}
+    if command_name == "aggregate":
+        body["cursor"] = {}
+
+    def explain() -> str:
+        return summarize_mongo_plan(run_command(database, {"explain": body, "verbosity": "queryPlanner"}))
+
+    return explain
+
+
+def _sql_explainer(engine, statement: str, parameters: Any) -> Callable[[], str]:
+    """statement의 EXPLAIN(SQLite는 EXPLAIN QUERY PLAN) 결과를 요약하는 함수"""
+    dialect = engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+
+    def explain() -> str:
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(prefix + statement, parameters)
+            return summarize_sql_plan(dialect, [dict(row._mapping) for row in result])
+
+    return explain
+
+
+# =====================
+# 기록기
+# =====================
+class SlowOpRecorder:
+    def __init__(self, threshold_ms: float, explain: bool = True, max_records: int = MAX_RECORDS):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._records = deque(maxlen=max_records)
+        self._plans: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._queue: "queue.Queue[Tuple[dict, Callable[[], str]]]" = queue.Queue(maxsize=100)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def is_slow(self, seconds: float) -> bool:
+        return self.enabled and seconds * 1000 >= self.threshold_ms and current_repository() != EXPLAIN_TAG
+
+    def records(self) -> List[dict]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._plans.clear()
+
+    def record(self, db: str, operation: str, shape: str, seconds: float,
+               explainer: Optional[Callable[[], str]] = None) -> dict:
+        record = {
+            "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "db": db,
+            "operation": operation,
+            "repository": current_repository(),
+            "route": current_route(),
+            "duration_ms": round(seconds * 1000, 3),
+            "shape": shape[:SHAPE_MAX_LENGTH],
+            "plan": None,
+        }
+        with self._lock:
+            self._records.append(record)
+            cached = self._plans.get((db, record["shape"]))
+        if cached is not None and time.monotonic() - cached[0] < PLAN_TTL_SECONDS:
+            record["plan"] = cached[1]
+        elif self.explain and explainer is not None:
+            try:
+                self._ensure_worker()
+                self._queue.put_nowait((record, explainer))
+                return record
+            except queue.Full:
+                pass
+        self._log(record)
+        return record
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._explain_loop, name="slow-op-explain", daemon=True)
+                self._worker.start()
+
+    def _explain_loop(self) -> None:
+        with repository_tag(EXPLAIN_TAG):
+            while True:
+                record, explainer = self._queue.get()
+                try:
+                    record["plan"] = explainer()
+                    with self._lock:
+                        self._plans[(record["db"], record["shape"])] = (time.monotonic(), record["plan"])
+                except Exception as e:
+                    record["plan"] = f"explain 실패: {e}"
+                self._log(record)
+                self._queue.task_done()
+
+    def wait_explained(self, timeout: float = 5.0) -> None:
+        """대기 중인 explain 완료까지 대기 (테스트/진단용)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    @staticmethod
+    def _log(record: dict) -> None:
+        logger.w(f"slow {record['db']} {record['operation']} {record['duration_ms']}ms "
+                 f"[{record['repository']} {record['route']}] plan={record['plan']} shape={record['shape']}")
+
+    # =====================
+    # DB별 진입점
+    # =====================
+    def record_mongo(self, database: str, command_name: str, command: dict, seconds: float,
+                     run_command: Optional[Callable[[str, dict], dict]] = None) -> dict:
+        shape = json.dumps(mongo_command_shape(command_name, command), ensure_ascii=False, default=str)
+        if run_command is not None and command_name in EXPLAINABLE_COMMANDS:
+            explainer = _mongo_explainer(run_command, database, command_name, command)
+        else:
+            explainer = None
+        return self.record("mongo", command_name, shape, seconds, explainer)
+
+    def record_sql(self, engine, operation: str, statement: str, parameters: Any, seconds: float) -> dict:
+        dialect = engine.dialect.name
+        if operation == "SELECT" and dialect in ("mysql", "sqlite"):
+            explainer = _sql_explainer(engine, statement, parameters)
+        else:
+            explainer = None
+        return self.record(dialect, operation, " ".join(statement.split()), seconds, explainer)
+
+
+SLOW_OPS = SlowOpRecorder(
+    threshold_ms=float(os.getenv("SLOW_OP_THRESHOLD_MS", "200")),
+    explain=os.getenv("SLOW_OP_EXPLAIN", "1") == "1",
+)
@@ -0,0 +1,322 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.common import metrics
+from core.common.metrics import Histogram, Registry, record_db_operation, repository_tag, tag_methods, track_request
+from core.common.middleware.metrics_middleware import MetricsMiddleware
+
+
+def test_histogram_render_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("latency_seconds", "응답 시간", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route='/a"b')
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds 응답 시간", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a\\"b"} 4' in lines
+    assert histogram.count(route='/a"b') == 4
+
+
+def test_registry_directory_sums_workers_and_archives_exited_ones(tmp_path):
+    from core.common.metrics import Counter, Gauge
+
+    def worker_registry():
+        registry = Registry()
+        registry.register(Counter("requests_total", "요청 수", ("route",)))
+        registry.register(Gauge("in_progress", "처리 중", ("route",)))
+        registry.register(Histogram("latency_seconds", "응답 시간", ("route",), buckets=(0.1, 1.0)))
+        return registry
+
+    def values(text):
+        return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if not line.startswith("#")}
+
+    directory = str(tmp_path)
+    workers = {101: worker_registry(), 102: worker_registry()}
+    for pid, registry in workers.items():
+        registry._metrics["requests_total"].inc(pid - 100, route="/a")
+        registry._metrics["in_progress"].inc(1, route="/a")
+        registry._metrics["latency_seconds"].observe(0.05 * (pid - 100), route="/a")
+        registry.write_snapshot(directory, pid)
+
+    # 어느 워커가 응답해도 (자기 값 포함) 전체 합산
+    scraper = worker_registry()
+    scraper._metrics["requests_total"].inc(10, route="/a")
+    merged = values(scraper.render_directory(directory))
+    assert merged['requests_total{route="/a"}'] == 13
+    assert merged['in_progress{route="/a"}'] == 2
+    assert merged['latency_seconds_bucket{route="/a",le="0.1"}'] == 2
+    assert merged['latency_seconds_count{route="/a"}'] == 2
+
+    # 종료된 워커: counter/histogram은 archive로 유지, gauge는 제외
+    scraper.archive_worker(directory, 101)
+    scraper.archive_worker(directory, 102)
+    assert sorted(name for name in os.listdir(directory) if name.endswith(".json")) == ["archive.json", f"worker_{os.getpid()}.json"]
+    merged = values(scraper.render_directory(directory))
+    assert merged['requests_total{route="/a"}'] == 13
+    assert 'in_progress{route="/a"}' not in merged
+    assert merged['latency_seconds_count{route="/a"}'] == 2
+
+
+def test_repository_tag_keeps_outer_method_and_sums_request_db_time():
+    class Repository:
+        async def find_products(self):
+            return await self.count()
+
+        async def count(self):
+            record_db_operation("mongo", "count", 0.002)
+            record_db_operation("mongo", "aggregate", 0.003)
+            return metrics.current_repository()
+
+    tag_methods(Repository)
+    before = metrics.DB_LATENCY.count(db="mongo", repository="Repository.find_products", operation="count")
+
+    with track_request("/products") as db_time:
+        assert asyncio.run(Repository().find_products()) == "Repository.find_products"
+        assert metrics.current_route() == "/products"
+        with repository_tag("order_repository.get_orders_by_user_id"):
+            record_db_operation("mysql", "SELECT", 0.01, failed=True)
+
+    assert metrics.DB_LATENCY.count(db="mongo", repository="Repository.find_products", operation="count") == before + 1
+    assert metrics.DB_ERRORS.value(db="mysql", repository="order_repository.get_orders_by_user_id", operation="SELECT") >= 1
+    assert db_time == {"mongo": 0.005, "mysql": 0.01}
+    assert metrics.current_repository() == metrics.UNTAGGED
+
+
+def test_middleware_labels_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        record_db_operation("mysql", "SELECT", 0.004)
+        return {"item_id": item_id}
+
+    client = TestClient(app)
+    for item_id in (1, 2):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    assert metrics.HTTP_REQUESTS.value(status=200, **labels) == 2
+    assert metrics.HTTP_LATENCY.count(**labels) == 2
+    assert metrics.HTTP_IN_PROGRESS.value(**labels) == 0
+    assert metrics.HTTP_DB_TIME.count(route="/items/{item_id}", db="mysql") == 2
+    assert metrics.HTTP_REQUESTS.value(method="GET", route="<unmatched>", status=404) >= 1
+
+
+def test_mongo_command_listener_records_driver_duration():
+    from core.db.mongo import MongoCommandMetrics
+
+    listener = MongoCommandMetrics()
+    before = metrics.DB_LATENCY.count(db="mongo", repository="-", operation="find")
+    listener.succeeded(SimpleNamespace(command_name="find", duration_micros=1500))
+    listener.failed(SimpleNamespace(command_name="find", duration_micros=800))
+    assert metrics.DB_LATENCY.count(db="mongo", repository="-", operation="find") == before + 2
+    assert metrics.DB_ERRORS.value(db="mongo", repository="-", operation="find") >= 1
+
+
+def test_mongo_query_shape_and_plan_summary():
+    from core.common.slow_ops import mongo_command_shape, summarize_mongo_plan
+
+    command = {
+        "find": "product",
+        "filter": {"$and": [{"brand": {"$in": ["A", "B", "C"]}}, {"desc.KO.name": {"$regex": "가방", "$options": "i"}}]},
+        "sort": {"sales.KR.launchedDate": -1, "rawId": -1},
+        "limit": 20,
+        "lsid": {"id": "x"},
+        "$db": "bag_admin",
+    }
+    assert mongo_command_shape("find", command) == {
+        "find": "product",
+        "filter": {"$and": [{"brand": {"$in": ["?"]}}, {"desc.KO.name": {"$regex": "?", "$options": "?"}}]},
+        "sort": {"sales.KR.launchedDate": -1, "rawId": -1},
+        "limit": "?",
+    }
+    group = mongo_command_shape("aggregate", {"aggregate": "product", "pipeline": [{"$group": {"_id": "$brand"}}]})
+    assert group["pipeline"] == [{"$group": {"_id": "$brand"}}]
+
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "rawId_-1"}}}}}
+    assert summarize_mongo_plan(explain) == "LIMIT > FETCH > IXSCAN(rawId_-1)"
+
+
+def test_slow_sql_recorded_with_plan():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+    from core.common.slow_ops import SlowOpRecorder
+
+    # explain은 별도 스레드에서 실행되므로 같은 인메모리 DB 연결을 공유
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE price (symbol TEXT, close REAL)"))
+    recorder = SlowOpRecorder(threshold_ms=1)
+    assert not recorder.is_slow(0.0005) and recorder.is_slow(0.002)
+
+    with track_request("/trifin/api/order/user/{user_id}"), repository_tag("price_repository.get_prices_by_symbol"):
+        record = recorder.record_sql(engine, "SELECT", "SELECT *\n FROM price WHERE symbol = ?", ("SPY",), 0.35)
+        recorder.record_sql(engine, "SELECT", "SELECT *\n FROM price WHERE symbol = ?", ("QQQ",), 0.4)
+    recorder.wait_explained()
+
+    records = recorder.records()
+    assert len(records) == 2 and records[0] is record
+    assert record["db"] == "sqlite"
+    assert record["shape"] == "SELECT * FROM price WHERE symbol = ?"
+    assert record["repository"] == "price_repository.get_prices_by_symbol"
+    assert record["route"] == "/trifin/api/order/user/{user_id}"
+    assert record["duration_ms"] == 350.0
+    assert "SCAN price" in record["plan"]
+    assert records[1]["plan"] == record["plan"]
+
+
+def test_profile_middleware_returns_collapsed_stacks():
+    import time
+    from core.common.middleware.profile_middleware import ProfileMiddleware
+
+    app = FastAPI()
+    app.add_middleware(ProfileMiddleware)
+
+    @app.get("/busy")
+    async def busy():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/busy", headers={"X-Bagtionary-Profile": "1"}).json() == {"ok": True}
+
+    response = client.get("/busy", headers={"X-Bagtionary-Profile": "1", "X-Bagtionary-Package": "com.bag.debug"})
+    assert response.status_code == 200
+    assert response.headers["X-Original-Status"] == "200"
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    lines = response.text.splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("busy (core/common/test.py:" in line for line in lines)
+
+
+def test_mongo_settings_and_read_routes(monkeypatch):
+    from pymongo.read_concern import ReadConcern
+    from pymongo.read_preferences import Primary, SecondaryPreferred
+
+    from core.db.mongo import Mongo, ReadRoute
+
+    monkeypatch.setenv("MONGO_URL", "mongodb://localhost:27017/?directConnection=true")
+    monkeypatch.setenv("MONGO_DB", "bench")
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "32")
+    monkeypatch.setenv("MONGO_COMPRESSORS", "zlib")
+    monkeypatch.setenv("MONGO_RETRY_READS", "false")
+    monkeypatch.setenv("MONGO_ANALYTICS_TAGS", "nodeType:ANALYTICS")
+    client = Mongo()
+    assert client.settings.client_options()["maxPoolSize"] == 32
+    assert client.settings.client_options()["retryReads"] is False
+    assert client.read_preferences[ReadRoute.primary] == Primary()
+    assert client.read_preferences[ReadRoute.listing] == SecondaryPreferred(max_staleness=90)
+    assert client.read_preferences[ReadRoute.analytics] == SecondaryPreferred([{"nodeType": "ANALYTICS"}, {}], 90)
+    # 연결 전에는 None, 연결 후 처음 접근 시 생성
+    assert client.collection("product") is None
+
+    client.connect()
+    try:
+        assert client.client.options.pool_options.max_pool_size == 32
+        assert client.collection("product").database.name == "bench"
+        assert client.collection("product").read_preference == Primary()
+        listing = client.collection("product", ReadRoute.listing)
+        assert listing.read_preference == client.read_preferences[ReadRoute.listing]
+        assert listing.read_concern == ReadConcern("local")
+        assert client.collection("product") is client.collection("product")
+    finally:
+        client.close()
+    assert client.collection("product") is None and not client.ready
+
+
+def test_api_process_does_not_import_batch_modules():
+    import json
+    import os
+    import subprocess
+    import sys
+
+    import tempfile
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    log_dir = os.path.join(tempfile.mkdtemp(), "log")
+    # 로그 파일 경로를 빈 임시 경로로 돌린 뒤 main import
+    probe = ("import json, os, sys, core.util.logger as log; "
+             f"log.LOG_FILE = os.path.join({log_dir!r}, 'probe.log'); import main; "
+             f"print(json.dumps([sorted({{m.split('.')[0] for m in sys.modules}}), os.path.exists({log_dir!r})]))")
+    env = {**os.environ, "DB_URL": os.environ.get("DB_URL") or "sqlite://"}
+    result = subprocess.run([sys.executable, "-c", probe], cwd=root, env=env, capture_output=True, text=True, check=True)
+    # import 시 stdout 출력 없음 (probe 결과 한 줄만)
+    assert len(result.stdout.splitlines()) == 1
+    loaded, log_dir_created = json.loads(result.stdout)
+    # 배치/분석 전용 의존성은 API 프로세스에서 로드하지 않음 (benchmark/startup.py 로 측정)
+    assert not set(loaded) & {"pandas", "numpy", "yfinance", "matplotlib", "scipy", "ccxt", "firebase_admin", "batch", "unittest"}
+    # 로그를 남기기 전까지 로그 폴더를 만들지 않음
+    assert not log_dir_created
+
+
+def test_cached_route_etag_304_and_invalidate():
+    from fastapi import APIRouter
+
+    from core.common.http_cache import RESULT_CACHE, CachedRoute, cache_policy
+
+    calls = []
+    router = APIRouter(route_class=CachedRoute)
+
+    @router.get("/items")
+    @cache_policy(max_age=60, scope="test")
+    async def items(ctr: str):
+        calls.append(ctr)
+        return {"ctr": ctr, "items": list(range(5))}
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    first = client.get("/items?ctr=KR")
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+    etag = first.headers["ETag"]
+    assert client.get("/items?ctr=KR", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/items?ctr=KR").content == first.content
+    client.get("/items?ctr=US")
+    assert calls == ["KR", "US"]
+
+    RESULT_CACHE.invalidate("test")
+    # 내용이 같으면 다시 생성해도 ETag 유지
+    assert client.get("/items?ctr=KR", headers={"If-None-Match": etag}).status_code == 304
+    assert calls == ["KR", "US", "KR"]
+
+
+def test_compression_threshold_and_encoding_selection():
+    from core.common.middleware.compression_middleware import CompressionMiddleware, select_encoding
+
+    assert select_encoding("gzip;q=0, identity") is None
+    assert select_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert select_encoding("*") is not None
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/small")
+    async def small():
+        return {"a": 1}
+
+    @app.get("/large")
+    async def large():
+        return {"items": ["https://image.example.com/products/0001.jpg"] * 50}
+
+    client = TestClient(app)
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    # 클라이언트가 해제한 본문보다 전송 크기가 작음
+    assert int(response.headers["Content-Length"]) < len(response.content)
+    assert response.json()["items"][0].endswith("0001.jpg")
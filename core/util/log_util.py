@@ -63,7 +63,7 @@ class Logger(object):
 
         # 로그스태시 핸들러 설정
         logstash_host = os.getenv("LOGSTASH_URL")
-        print(f"LOGSTASH_URL: {logstash_host}")
+        self.logger.debug("LOGSTASH_URL: %s", logstash_host)
         if logstash_host:
             # 로그스태시 핸들러 생성 및 설정
             logstash_handler = logstash.TCPLogstashHandler(
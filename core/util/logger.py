@@ -11,10 +11,12 @@ logger.py
     logger.info("로그 메시지")
 
 작성자: Cascade AI
-버전: 1.1
+버전: 1.3
 변경이력:
 - 최초 작성: 2025-05-29
 - script/log 경로 고정, 파일+콘솔 동시 출력, 24시간제 파일명, 싱글턴 개선: 2025-05-29
+- import 시 폴더/파일 생성, 경로 출력 제거 (첫 get_logger 호출 시 폴더 생성, 첫 로그 기록 시 파일 생성): 2025-06-20
+- get_logger 호출 시 폴더 생성/경로 출력 제거 (첫 로그 기록 시 폴더+파일 생성, 경로는 DEBUG 로그): 2025-06-23
 """
 
 import logging
@@ -24,19 +26,24 @@ from datetime import datetime
 # 프로젝트 루트 기준 script/log 경로 고정
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 LOG_DIR = os.path.join(PROJECT_ROOT, "python", "log")
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
-
 
 # 파일명: yyyyMMdd_HHmmss.log (24시간제, 중복 방지)
 LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S.log"))
-print("Project Root 경로:", PROJECT_ROOT)
-print("LOG DIR 경로:", LOG_DIR)
-print("LOG_FILE 경로:", LOG_FILE)
 # 싱글턴 패턴으로 logger 재사용
 _logger = None
 
 
+class _LazyDirFileHandler(logging.FileHandler):
+    """
+    첫 로그 기록 시 LOG_DIR까지 생성하는 파일 핸들러
+    (모듈 레벨에서 get_logger를 호출하는 API 프로세스는 로그를 남기기 전까지 폴더를 만들지 않음)
+    """
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 def get_logger(name: str = "trifin") -> logging.Logger:
     """
     script/log/ 폴더에 yyyyMMdd_HHmmss.log로 저장되는 로거 반환
@@ -53,7 +60,8 @@ def get_logger(name: str = "trifin") -> logging.Logger:
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     # 파일 핸들러
-    fh = logging.FileHandler(LOG_FILE, encoding="utf-8")
+    # delay: 첫 로그 기록 시 폴더/파일 생성 (로그 없는 프로세스는 빈 폴더/파일을 남기지 않음)
+    fh = _LazyDirFileHandler(LOG_FILE, encoding="utf-8", delay=True)
     fh.setLevel(logging.INFO)
     fh.setFormatter(formatter)
     logger.addHandler(fh)
@@ -63,5 +71,6 @@ def get_logger(name: str = "trifin") -> logging.Logger:
     ch.setFormatter(formatter)
     logger.addHandler(ch)
     logger.propagate = False
+    logger.debug("LOG_FILE 경로: %s", LOG_FILE)
     _logger = logger
     return logger
@@ -0,0 +1,44 @@
+import unittest
+
+from core.util.functional_util import flat_map
+from core.util.op_util import safe_dict_value, safe_int, version_compare
+
+
+class OpUtilTestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_safe_dict_value(self):
+        value = dict()
+        value["1"] = {"a": 1}
+        self.assertEqual(safe_dict_value(value, ["1"]), {"a": 1}, 'incorrect safe_dict_value logic')
+        self.assertEqual(safe_dict_value(value, ["1", "a"]), 1, 'incorrect safe_dict_value logic')
+        self.assertEqual(safe_dict_value(value, ["2"]), None, 'incorrect safe_dict_value logic')
+        self.assertEqual(safe_dict_value(value, ["2"], 1), 1, 'incorrect safe_dict_value logic')
+        self.assertEqual(safe_dict_value(value, ["1", "b"]), None, 'incorrect safe_dict_value logic')
+        self.assertEqual(safe_dict_value(value, ["1", "b"], "a"), "a", 'incorrect safe_dict_value logic')
+
+    def test_safe_int_value(self):
+        self.assertEqual(safe_int(1), 1, 'incorrect safe_int logic')
+        self.assertEqual(safe_int(1, 2), 1, 'incorrect safe_int logic')
+        self.assertEqual(safe_int(None), None, 'incorrect safe_int logic')
+        self.assertEqual(safe_int(None, 2), 2, 'incorrect safe_int logic')
+        self.assertEqual(safe_int("1"), 1, 'incorrect safe_int logic')
+        self.assertEqual(safe_int("1", 2), 1, 'incorrect safe_int logic')
+        self.assertEqual(safe_int(""), None, 'incorrect safe_int logic')
+        self.assertEqual(safe_int("", 2), 2, 'incorrect safe_int logic')
+
+    def test_version_compare(self):
+        self.assertEqual(version_compare('1.0.0', '1.0.1'), 1, 'incorrect compare')
+        self.assertEqual(version_compare('1.0.0', '0.9.9'), -1, 'incorrect compare')
+        self.assertEqual(version_compare('1.0.0', '1.0.0'), 0, 'incorrect compare')
+        self.assertEqual(version_compare('2.0.1', '1.0.1'), -1, 'incorrect compare')
+        self.assertEqual(version_compare('1.0.9', '1.0.10'), 1, 'incorrect compare')
+
+
+class FunctionalUtilTestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_flat_map_logic(self):
+        self.assertEqual(flat_map(lambda x: [x, x + 1], [1, 2, 3]), [1, 2, 2, 3, 3, 4], 'incorrect flat map logic')
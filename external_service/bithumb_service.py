@@ -1 +1,171 @@
-# https://api.bithumb.com/v1/candles/days?count=1&market=KRW-BTC
+"""
+bithumb_service.py
+
+빗썸 Open API 일봉 캔들(/v1/candles/days)을 조회해 price 테이블 bulk 저장용 row로 반환하는 서비스 모듈
+
+- 의존성: httpx(external_service.http_client), pandas
+- 원화 마켓(KRW-BTC 등) 가격을 그대로 저장하므로 BTC-USD + KRW=X 환율 변환 없이 원화 가격 사용 가능
+- 페이지 조회
+    - 한 요청당 최대 PAGE_SIZE(200)개, `to`(미포함) 이전 캔들을 최신순으로 반환
+    - 일봉은 하루 간격이므로 페이지별 `to`를 미리 계산해 여러 페이지를 asyncio로 동시에 요청
+      ("bithumb" 제공자 동시성/rate limit 적용)
+    - start가 없으면(전체 이력 백필) 동시성 크기 단위로 요청하다가 PAGE_SIZE보다 적게 온 페이지에서 종료
+- 일봉 기준: 매일 09:00 KST(00:00 UTC) 시작, 진행 중인 당일 캔들은 기본 종료일(전일)에서 제외
+- 반환 row: symbol(마켓 코드), open, high, low, close, volume, timestamp(캔들 일자 자정)
+- 사용법:
+    from external_service.bithumb_service import get_bithumb_daily_prices, aget_bithumb_daily_prices
+    rows = get_bithumb_daily_prices("KRW-BTC")                       # 전체 이력
+    rows = await aget_bithumb_daily_prices("KRW-BTC", "2025-06-01")  # 증분
+- 작성일: 2025-06-17
+- 참고: https://apidocs.bithumb.com/reference/%EC%9D%BC-day-%EC%BA%94%EB%93%A4
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+import pandas as pd
+
+from external_service.http_client import get_client, run_with_client
+
+logger = logging.getLogger(__name__)
+
+PROVIDER = "bithumb"
+BITHUMB_CANDLES_DAYS_API = "https://api.bithumb.com/v1/candles/days"
+DEFAULT_MARKET = "KRW-BTC"
+PAGE_SIZE = 200
+KST_DAY_START = pd.Timedelta(hours=9)
+PRICE_COLUMNS = ["symbol", "open", "high", "low", "close", "volume", "timestamp"]
+
+
+def last_closed_day() -> pd.Timestamp:
+    """마감된 마지막 일봉 일자 (UTC 기준 전일)"""
+    return pd.Timestamp.now(tz="UTC").tz_localize(None).normalize() - pd.Timedelta(days=1)
+
+
+def _page_params(market: str, last_day: pd.Timestamp, count: int) -> dict:
+    """last_day 일봉까지(포함) count개 요청 파라미터 (to는 KST, 다음 일봉 시작 시각으로 미포함)"""
+    to = last_day + pd.Timedelta(days=1) + KST_DAY_START
+    return {"market": market, "count": count, "to": to.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def candles_to_frame(candles: list) -> pd.DataFrame:
+    """
+    캔들 응답(JSON 배열) → OHLCV DataFrame (index=캔들 일자 자정, 오름차순)
+    """
+    if not candles:
+        return pd.DataFrame(columns=["open", "high", "low", "close", "volume"], index=pd.DatetimeIndex([]))
+    df = pd.DataFrame(candles)
+    frame = pd.DataFrame(
+        {
+            "open": df["opening_price"].astype(float).to_numpy(),
+            "high": df["high_price"].astype(float).to_numpy(),
+            "low": df["low_price"].astype(float).to_numpy(),
+            "close": df["trade_price"].astype(float).to_numpy(),
+            "volume": df["candle_acc_trade_volume"].astype(float).to_numpy(),
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(df["candle_date_time_utc"])).normalize(),
+    )
+    return frame[~frame.index.duplicated(keep="first")].sort_index()
+
+
+def frame_to_rows(symbol: str, df: pd.DataFrame) -> List[dict]:
+    """OHLCV DataFrame → price 테이블 컬럼 row 목록 (insert_price_rows_ignore_bulk 입력)"""
+    rows = df.assign(symbol=symbol, timestamp=df.index.to_pydatetime())
+    return rows[PRICE_COLUMNS].to_dict("records")
+
+
+async def _fetch_page(market: str, last_day: pd.Timestamp, count: int) -> pd.DataFrame:
+    response = await get_client().aget(PROVIDER, BITHUMB_CANDLES_DAYS_API, params=_page_params(market, last_day, count))
+    return candles_to_frame(response.json())
+
+
+async def afetch_daily_candles(
+        market: str = DEFAULT_MARKET,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+) -> pd.DataFrame:
+    """
+    [start, end] 일봉을 페이지 단위로 동시 조회해 하나의 DataFrame으로 병합
+
+    Args:
+        market (str): 마켓 코드 (예: 'KRW-BTC', 'KRW-ETH')
+        start (str): 시작일 (YYYY-MM-DD, 포함). None이면 상장일부터 전체 이력
+        end (str): 종료일 (YYYY-MM-DD, 포함). 기본값: 마감된 전일
+        page_size (int): 페이지당 캔들 수 (최대 200)
+
+    Raises:
+        ExternalServiceError: 재시도 후에도 요청 실패 시
+    """
+    last_day = pd.Timestamp(end).normalize() if end else last_closed_day()
+    first_day = pd.Timestamp(start).normalize() if start else None
+    step = pd.Timedelta(days=page_size)
+
+    frames = []
+    if first_day is not None:
+        days = (last_day - first_day).days + 1
+        if days <= 0:
+            return candles_to_frame([])
+        pages = [
+            (last_day - step * i, min(page_size, days - page_size * i))
+            for i in range((days + page_size - 1) // page_size)
+        ]
+        frames = await asyncio.gather(*(_fetch_page(market, day, count) for day, count in pages))
+    else:
+        wave = get_client().config(PROVIDER).max_concurrency
+        page = 0
+        while True:
+            results = await asyncio.gather(
+                *(_fetch_page(market, last_day - step * (page + i), page_size) for i in range(wave))
+            )
+            frames.extend(results)
+            page += wave
+            if any(len(frame) < page_size for frame in results):
+                break
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return candles_to_frame([])
+    df = pd.concat(frames)
+    df = df[~df.index.duplicated(keep="first")].sort_index()
+    if first_day is not None:
+        df = df[df.index >= first_day]
+    return df[df.index <= last_day]
+
+
+async def aget_bithumb_daily_prices(
+        market: str = DEFAULT_MARKET,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+) -> List[dict]:
+    """
+    빗썸 일봉을 price 테이블 row 목록으로 조회 (symbol=마켓 코드)
+
+    Returns:
+        List[dict]: PRICE_COLUMNS 컬럼 row 목록 (일자 오름차순, 기간 내 데이터가 없으면 빈 리스트)
+
+    Raises:
+        ValueError: 조회 실패 시
+    """
+    try:
+        df = await afetch_daily_candles(market, start, end)
+    except Exception as e:
+        raise ValueError(f"Bithumb 데이터 조회 중 오류 발생: {market}, {str(e)}")
+    logger.info(f"[bithumb] {market} 일봉 {len(df)}건 조회 ({start or '전체'} ~ {end or '전일'})")
+    return frame_to_rows(market, df)
+
+
+def get_bithumb_daily_prices(
+        market: str = DEFAULT_MARKET,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+) -> List[dict]:
+    """aget_bithumb_daily_prices의 동기 진입점 (실행 중인 이벤트 루프 밖에서만 호출)"""
+    return asyncio.run(run_with_client(aget_bithumb_daily_prices(market, start, end)))
+
+
+if __name__ == "__main__":
+    import pprint
+
+    pprint.pprint(get_bithumb_daily_prices(DEFAULT_MARKET, "2025-01-01")[-5:])
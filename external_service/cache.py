@@ -0,0 +1,277 @@
+"""
+cache.py
+
+외부 데이터 제공자(FRED, Yahoo Finance 등) 시계열 응답을 (제공자, 시리즈) 단위로 디스크에 캐시하는 모듈
+
+- 의존성: pandas
+- 저장: {CACHE_DIR}/{provider}/{series}.pkl (파싱된 DataFrame, index=DatetimeIndex) + .json (메타데이터)
+    - 메타데이터: 캐시가 커버하는 일자 범위(covered_start ~ covered_end), 마지막 조회 시각, ETag/Last-Modified
+- 조회 흐름 (plan → 어댑터가 range별 요청 → complete)
+    - 캐시에 없는 앞부분(head)과 뒷부분(tail) 범위만 요청하고 기존 데이터와 병합
+    - 과거 일자 데이터는 변하지 않는다고 보고, tail은 마지막 데이터 일자(월간 지표의 최신 값 수정 반영)와
+      covered_end - TAIL_OVERLAP_DAYS 중 이른 일자부터 다시 요청
+    - 마지막 조회 후 TTL 이내이고 요청 종료일이 커버 범위 안이면 요청하지 않음
+    - force=True면 커버 범위 안이라도 요청 범위 전체를 다시 받아 병합 (데이터 품질 검사의 누락 구간 재수집)
+    - tail 요청이 직전 요청과 같으면 If-None-Match / If-Modified-Since를 붙이고 304면 캐시 유지
+- 모드 (환경변수 EXTERNAL_CACHE_MODE)
+    - online(기본): 위 흐름대로 필요한 범위만 요청
+    - offline: 요청 없이 캐시만 사용 (개발/CI에서 네트워크 없이 수집기/백테스트 실행)
+    - refresh: 캐시를 무시하고 전체 범위를 다시 요청해 덮어씀
+    - off: 캐시를 읽지도 쓰지도 않음
+- 사용법:
+    cache = get_cache()
+    plan = cache.plan("fred", "DGS10", "2020-01-01", "2025-06-17")
+    results = [fetch(start, end, plan.headers_for(i)) for i, (start, end) in enumerate(plan.ranges)]
+    frame = cache.complete(plan, results)
+- 작성일: 2025-06-17
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv(
+    "EXTERNAL_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "external_service"),
+)
+CACHE_MODES = ("online", "offline", "refresh", "off")
+CACHE_MODE = os.getenv("EXTERNAL_CACHE_MODE", "online")
+CACHE_TTL_SECONDS = float(os.getenv("EXTERNAL_CACHE_TTL_SECONDS", str(6 * 3600)))
+TAIL_OVERLAP_DAYS = 7
+
+
+class CacheMissError(Exception):
+    """offline 모드에서 캐시에 데이터가 없는 경우"""
+
+
+@dataclass
+class FetchResult:
+    """
+    어댑터가 한 범위를 요청한 결과
+    - frame: 파싱된 DataFrame (304면 None)
+    - not_modified: 304 응답 여부
+    """
+
+    frame: Optional[pd.DataFrame] = None
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response, frame: Optional[pd.DataFrame] = None) -> "FetchResult":
+        """httpx.Response의 상태 코드와 검증자 헤더로 생성"""
+        return cls(
+            frame=frame,
+            not_modified=response.status_code == 304,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+@dataclass
+class FetchPlan:
+    """
+    요청 범위 계획
+    - ranges: 요청할 (시작일, 종료일) 목록 (포함 범위, tail이 있으면 마지막)
+    - cached: 기존 캐시 데이터
+    """
+
+    provider: str
+    series: str
+    start: pd.Timestamp
+    end: pd.Timestamp
+    ranges: List[Tuple[pd.Timestamp, pd.Timestamp]] = field(default_factory=list)
+    cached: pd.DataFrame = field(default_factory=pd.DataFrame)
+    meta: dict = field(default_factory=dict)
+    tail_key: Optional[str] = None
+
+    def headers_for(self, position: int) -> dict:
+        """range 위치별 조건부 요청 헤더 (직전과 같은 tail 요청에만 ETag/Last-Modified 사용)"""
+        if position != len(self.ranges) - 1 or self.tail_key is None:
+            return {}
+        validators = self.meta.get("validators") or {}
+        if validators.get("key") != self.tail_key:
+            return {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+
+def _day(value) -> pd.Timestamp:
+    return pd.Timestamp(value).normalize()
+
+
+def _index_days(frame: pd.DataFrame) -> pd.DatetimeIndex:
+    """frame index의 일자 (tz-aware면 현지 일자)"""
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def _range_key(start: pd.Timestamp, end: pd.Timestamp) -> str:
+    return f"{start.date()}~{end.date()}"
+
+
+class ExternalDataCache:
+    def __init__(
+            self,
+            root: str = CACHE_DIR,
+            mode: str = CACHE_MODE,
+            ttl_seconds: float = CACHE_TTL_SECONDS,
+            tail_overlap_days: int = TAIL_OVERLAP_DAYS,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 모드: {mode} (가능: {CACHE_MODES})")
+        self.root = root
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.tail_overlap_days = tail_overlap_days
+        self._lock = threading.Lock()
+
+    # ---------------------
+    # 저장소
+    # ---------------------
+    def _path(self, provider: str, series: str, suffix: str) -> str:
+        return os.path.join(self.root, provider, quote(series, safe="") + suffix)
+
+    def load(self, provider: str, series: str) -> Tuple[pd.DataFrame, dict]:
+        """캐시된 DataFrame과 메타데이터 (없으면 빈 DataFrame, {})"""
+        data_path, meta_path = self._path(provider, series, ".pkl"), self._path(provider, series, ".json")
+        if self.mode == "off" or not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return pd.DataFrame(), {}
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            return pd.read_pickle(data_path), meta
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"[cache] {provider}/{series} 캐시 읽기 실패, 무시합니다: {e}")
+            return pd.DataFrame(), {}
+
+    def save(self, provider: str, series: str, frame: pd.DataFrame, meta: dict) -> None:
+        """임시 파일에 쓴 뒤 교체 (중간에 중단돼도 기존 캐시 유지)"""
+        if self.mode == "off":
+            return
+        data_path, meta_path = self._path(provider, series, ".pkl"), self._path(provider, series, ".json")
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        with self._lock:
+            frame.to_pickle(data_path + ".tmp")
+            with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            os.replace(data_path + ".tmp", data_path)
+            os.replace(meta_path + ".tmp", meta_path)
+
+    # ---------------------
+    # 계획/병합
+    # ---------------------
+    def plan(self, provider: str, series: str, start, end, force: bool = False) -> FetchPlan:
+        """
+        [start, end] 요청에 대해 캐시에 없는 범위만 요청하도록 계획 (force면 [start, end] 전체 요청 후 병합)
+        Raises:
+            CacheMissError: offline 모드에서 캐시가 없을 때
+        """
+        start, end = _day(start), _day(end)
+        plan = FetchPlan(provider, series, start, end)
+        if self.mode == "refresh":
+            plan.ranges = [(start, end)]
+            plan.tail_key = _range_key(start, end)
+            return plan
+        plan.cached, plan.meta = self.load(provider, series)
+        if self.mode == "offline":
+            if plan.cached.empty:
+                raise CacheMissError(f"[cache] offline 모드인데 {provider}/{series} 캐시가 없습니다.")
+            return plan
+        if force:
+            plan.ranges = [(start, end)]
+            return plan
+        if plan.cached.empty or not plan.meta.get("covered_start"):
+            plan.ranges = [(start, end)]
+            plan.tail_key = _range_key(start, end)
+            return plan
+
+        covered_start, covered_end = _day(plan.meta["covered_start"]), _day(plan.meta["covered_end"])
+        if start < covered_start:
+            plan.ranges.append((start, min(end, covered_start - pd.Timedelta(days=1))))
+        fresh = time.time() - plan.meta.get("fetched_at", 0) < self.ttl_seconds
+        if end > covered_end or not fresh:
+            last_day = _index_days(plan.cached).max()
+            tail_start = min(covered_end - pd.Timedelta(days=self.tail_overlap_days), last_day)
+            tail_start = max(tail_start, start)
+            if tail_start <= end:
+                plan.ranges.append((tail_start, end))
+                plan.tail_key = _range_key(tail_start, end)
+        return plan
+
+    def complete(self, plan: FetchPlan, results: List[FetchResult]) -> pd.DataFrame:
+        """
+        요청 결과를 캐시와 병합해 저장하고 [start, end] 범위 DataFrame 반환 (같은 일자는 새 데이터 우선)
+        """
+        if self.mode == "offline":
+            return self.slice(plan.cached, plan.start, plan.end)
+
+        frames = [plan.cached] + [r.frame for r in results if r.frame is not None and not r.frame.empty]
+        frames = [f for f in frames if not f.empty]
+        if len(frames) > 1:
+            merged = pd.concat(frames)
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        else:
+            merged = frames[0] if frames else pd.DataFrame()
+
+        meta = dict(plan.meta) if self.mode != "refresh" else {}
+        covered_start = min([plan.start] + ([_day(meta["covered_start"])] if meta.get("covered_start") else []))
+        covered_end = min(plan.end, _day(pd.Timestamp.now()))
+        if meta.get("covered_end"):
+            covered_end = max(covered_end, _day(meta["covered_end"]))
+        meta.update(covered_start=str(covered_start.date()), covered_end=str(covered_end.date()))
+        if plan.tail_key is not None and results:
+            # 최신 구간(tail)을 받은 경우에만 조회 시각/검증자 갱신
+            tail = results[-1]
+            meta["fetched_at"] = time.time()
+            if not tail.not_modified:
+                meta["validators"] = {"key": plan.tail_key, "etag": tail.etag, "last_modified": tail.last_modified}
+        if plan.ranges:
+            self.save(plan.provider, plan.series, merged, meta)
+            logger.info(
+                f"[cache] {plan.provider}/{plan.series} "
+                f"{', '.join(_range_key(s, e) for s, e in plan.ranges)} 요청 후 병합 ({len(merged)}건)"
+            )
+        return self.slice(merged, plan.start, plan.end)
+
+    def fallback(self, plan: FetchPlan, error: Exception) -> pd.DataFrame:
+        """
+        요청 실패 시 캐시 범위로 대체 (캐시가 없으면 원래 예외 재발생)
+        """
+        if plan.cached.empty:
+            raise error
+        logger.warning(f"[cache] {plan.provider}/{plan.series} 요청 실패, 캐시 데이터로 대체합니다: {error}")
+        return self.slice(plan.cached, plan.start, plan.end)
+
+    @staticmethod
+    def slice(frame: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        if frame.empty:
+            return frame
+        days = _index_days(frame)
+        return frame[(days >= start) & (days <= end)]
+
+
+_cache: Optional[ExternalDataCache] = None
+
+
+def get_cache() -> ExternalDataCache:
+    """프로세스 공용 ExternalDataCache (환경변수 설정 사용)"""
+    global _cache
+    if _cache is None:
+        _cache = ExternalDataCache()
+    return _cache
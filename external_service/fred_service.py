@@ -1,53 +1,127 @@
 """
 fred_service.py
 
-FRED(Federal Reserve Economic Data) API에서 주요 경제지표(예: DGS10, CPIAUCSL, UNRATE)를 조회하여 Price 모델 리스트로 반환하는 서비스 모듈
+FRED(Federal Reserve Economic Data) API에서 주요 경제지표(예: DGS10, CPIAUCSL, UNRATE)를 조회하여 Index 모델 리스트로 반환하는 서비스 모듈
 
-- 의존성: requests, SQLAlchemy, dotenv
+- 의존성: httpx(external_service.http_client), SQLAlchemy, dotenv
+- 요청은 공용 http_client("fred" 제공자 정책: 동시성/rate limit/재시도/timeout)를 통해 전송
+- 응답은 external_service.cache에 지표별로 캐시하고, 캐시에 없는 앞/뒤 구간만 요청 (ETag/Last-Modified 조건부 요청)
+    - 요청 실패 시 캐시 데이터로 대체, EXTERNAL_CACHE_MODE=offline이면 네트워크 없이 캐시만 사용
 - 사용법:
-    from fred_service import get_fred_index_price
-    prices = get_fred_index_price('DGS10')
-    print(prices)
+    from external_service.fred_service import get_fred_index_price, aget_fred_index_price
+    indexes = get_fred_index_price('DGS10', start='2020-01-01')
+    indexes = await aget_fred_index_price('DGS10', start='2020-01-01')
 - 환경변수: FRED_API_KEY (필수)
-- 버전: 1.0.0
+- 버전: 1.2.0
 - 작성일: 2025-05-18
+- 변경이력:
+    - v1.1.0: requests 단건 호출 → 공용 http_client(keep-alive 풀, rate limit, 재시도) 사용, asyncio 진입점 추가
+    - v1.2.0: 디스크 캐시 + 미캐시 구간만 증분 요청
 - 참고: https://fred.stlouisfed.org/docs/api/fred/
 """
 
 import os
 import logging
 import datetime
-from typing import List, Optional
-import requests
+from typing import List
+
+import pandas as pd
 from dotenv import load_dotenv
 
-from src.repository.models.index_table import Index
+from app.trifin.data.repository.models.index_table import Index
+from external_service.cache import CacheMissError, FetchPlan, FetchResult, get_cache
+from external_service.http_client import ExternalServiceError, get_client
 
 # 환경변수(.env)에서 FRED_API_KEY를 읽음
 load_dotenv()
 FRED_API_KEY = os.getenv("FRED_API_KEY")
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
+PROVIDER = "fred"
 FRED_API_BASE = "https://api.stlouisfed.org/fred/series/observations"
 
 
-def get_fred_index_price(symbol: str, start: str, end: str = "") -> List[Index]:
+def _build_params(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> dict:
+    if not FRED_API_KEY:
+        raise ValueError(
+            "FRED_API_KEY 환경변수가 설정되어 있지 않습니다. .env 파일을 확인하세요."
+        )
+    return {
+        "series_id": symbol,
+        "api_key": FRED_API_KEY,
+        "file_type": "json",
+        "observation_start": start.strftime("%Y-%m-%d"),
+        "observation_end": end.strftime("%Y-%m-%d"),
+    }
+
+
+def observations_to_frame(data: dict) -> pd.DataFrame:
+    """
+    FRED observations 응답(JSON) → value 컬럼 DataFrame (index=관측 일자, 결측치 '.' 는 스킵)
+    """
+    observations = data.get("observations") or []
+    frame = pd.DataFrame(
+        {
+            "date": [obs.get("date") for obs in observations],
+            "value": pd.to_numeric([obs.get("value") for obs in observations], errors="coerce"),
+        }
+    )
+    frame = frame.dropna(subset=["value"])
+    return frame.set_index(pd.DatetimeIndex(pd.to_datetime(frame["date"], format="%Y-%m-%d")))[["value"]]
+
+
+def frame_to_indexes(symbol: str, frame: pd.DataFrame) -> List[Index]:
+    """
+    Raises:
+        ValueError: 데이터가 비어 있을 때
+    """
+    if frame.empty:
+        raise ValueError(f"FRED에서 데이터가 존재하지 않습니다: {symbol}")
+    return [
+        Index(symbol=symbol, value=value, date=ts.date())
+        for ts, value in zip(frame.index, frame["value"].tolist())
+    ]
+
+
+def parse_observations(symbol: str, data: dict) -> List[Index]:
+    """
+    FRED observations 응답(JSON)을 Index 객체 리스트로 변환 (결측치 '.' 는 스킵)
+    Raises:
+        ValueError: observations가 비어 있을 때
+    """
+    return frame_to_indexes(symbol, observations_to_frame(data))
+
+
+def _plan(symbol: str, start: str, end: str, force: bool) -> FetchPlan:
+    try:
+        return get_cache().plan(PROVIDER, symbol, start, end or datetime.date.today(), force=force)
+    except CacheMissError as e:
+        raise ValueError(str(e))
+
+
+def _to_result(response) -> FetchResult:
+    frame = None if response.status_code == 304 else observations_to_frame(response.json())
+    return FetchResult.from_response(response, frame)
+
+
+def get_fred_index_price(symbol: str, start: str, end: str = "", force: bool = False) -> List[Index]:
     """
     FRED API에서 지정한 symbol(지표코드)의 시계열 데이터를 조회하여 Index 객체 리스트로 반환합니다.
     OHLCV 구조가 아니며, value/date 필드만을 저장합니다.
+    캐시에 있는 구간은 요청하지 않고, 없는 앞/뒤 구간만 요청해 병합합니다.
 
     Args:
         symbol (str): FRED 지표 코드 (예: 'DGS10', 'CPIAUCSL', 'UNRATE')
         start (str, optional): 조회 시작일 (YYYY-MM-DD).
         end (str, optional): 조회 종료일 (YYYY-MM-DD). 기본값: 오늘
+        force (bool, optional): 캐시에 있는 구간도 다시 요청 (누락 구간 재수집)
 
     Returns:
         List[Index]: Index 객체 리스트 (날짜별 시계열)
 
     Raises:
-        ValueError: API 키 누락, symbol 미존재, 데이터 조회 실패 등
+        ValueError: API 키 누락, symbol 미존재, 데이터 조회 실패(캐시도 없을 때) 등
 
     예시:
         >>> indexes = get_fred_index_price('DGS10', start='2020-01-01')
@@ -57,50 +131,40 @@ def get_fred_index_price(symbol: str, start: str, end: str = "") -> List[Index]:
     참고:
         - FRED API 문서: https://fred.stlouisfed.org/docs/api/fred/series_observations.html
     """
-    if not FRED_API_KEY:
-        raise ValueError(
-            "FRED_API_KEY 환경변수가 설정되어 있지 않습니다. .env 파일을 확인하세요."
-        )
+    cache, plan = get_cache(), _plan(symbol, start, end, force)
+    try:
+        results = [
+            _to_result(
+                get_client().get(
+                    PROVIDER, FRED_API_BASE, params=_build_params(symbol, s, e), headers=plan.headers_for(i)
+                )
+            )
+            for i, (s, e) in enumerate(plan.ranges)
+        ]
+        frame = cache.complete(plan, results)
+    except ExternalServiceError as e:
+        logger.error(f"FRED API 요청 실패: {e}")
+        frame = cache.fallback(plan, ValueError(f"FRED API 요청 실패: {e}"))
+    return frame_to_indexes(symbol, frame)
 
-    if not end:
-        end = datetime.datetime.now().strftime("%Y-%m-%d")
 
-    params = {
-        "series_id": symbol,
-        "api_key": FRED_API_KEY,
-        "file_type": "json",
-        "observation_start": start,
-        "observation_end": end,
-    }
+async def aget_fred_index_price(symbol: str, start: str, end: str = "", force: bool = False) -> List[Index]:
+    """get_fred_index_price의 asyncio 버전 (여러 지표 병렬 조회용)"""
+    cache, plan = get_cache(), _plan(symbol, start, end, force)
     try:
-        resp = requests.get(FRED_API_BASE, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        if "observations" not in data or not data["observations"]:
-            raise ValueError(f"FRED에서 데이터가 존재하지 않습니다: {symbol}")
-        indexes = []
-        for obs in data["observations"]:
-            date_str = obs.get("date")
-            value_str = obs.get("value")
-            # 결측치 처리
-            try:
-                value = float(value_str)
-            except (TypeError, ValueError):
-                continue  # 결측치는 스킵
-            dt = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-            idx = Index(
-                symbol=symbol,
-                value=value,
-                date=dt,
+        results = [
+            _to_result(
+                await get_client().aget(
+                    PROVIDER, FRED_API_BASE, params=_build_params(symbol, s, e), headers=plan.headers_for(i)
+                )
             )
-            indexes.append(idx)
-        return indexes
-    except requests.RequestException as e:
+            for i, (s, e) in enumerate(plan.ranges)
+        ]
+        frame = cache.complete(plan, results)
+    except ExternalServiceError as e:
         logger.error(f"FRED API 요청 실패: {e}")
-        raise ValueError(f"FRED API 요청 실패: {e}")
-    except Exception as e:
-        logger.error(f"FRED 데이터 파싱 오류: {e}")
-        raise ValueError(f"FRED 데이터 파싱 오류: {e}")
+        frame = cache.fallback(plan, ValueError(f"FRED API 요청 실패: {e}"))
+    return frame_to_indexes(symbol, frame)
 
 
 if __name__ == "__main__":
@@ -110,6 +174,6 @@ if __name__ == "__main__":
     for sym in test_symbols:
         try:
             print(f"\n[{sym}] FRED 데이터:")
-            pprint.pprint(get_fred_index_price(sym))
+            pprint.pprint(get_fred_index_price(sym, "2024-01-01"))
         except Exception as ex:
             print(f"[ERROR] {sym}: {ex}")
@@ -0,0 +1,359 @@
+"""
+http_client.py
+
+외부 데이터 제공자(FRED, Yahoo Finance, Bithumb, Trading Economics 등) 호출에 공통으로 사용하는 HTTP 클라이언트 모듈
+
+- 의존성: httpx
+- 기능
+    - keep-alive 커넥션 풀을 공유하는 httpx.Client / httpx.AsyncClient (동기/asyncio 진입점 모두 제공)
+    - 제공자별 동시 요청 수 제한 (동기: BoundedSemaphore, asyncio: 이벤트 루프별 Semaphore)
+    - 제공자별 토큰 버킷 rate limit (스레드/코루틴 공용)
+    - timeout, 연결 오류/429/5xx 재시도 (full jitter 지수 backoff, Retry-After 우선)
+- 사용법:
+    from external_service.http_client import get_client
+    data = get_client().get_json("fred", FRED_API_BASE, params={...})
+    data = await get_client().aget_json("fred", FRED_API_BASE, params={...})
+- 작성일: 2025-06-17
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; tricorn-collector/1.0)"
+
+
+class ExternalServiceError(Exception):
+    """재시도 후에도 외부 제공자 요청이 실패한 경우"""
+
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"[{provider}] {message}")
+        self.provider = provider
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """
+    제공자별 호출 정책
+
+    Attributes:
+        name: 제공자 이름 (PROVIDERS 키)
+        max_concurrency: 동시 요청 수 상한
+        rate_per_second: 초당 평균 요청 수 (토큰 보충 속도)
+        burst: 토큰 버킷 크기 (순간 최대 요청 수)
+        timeout: 요청 timeout(초)
+        max_retries: 최대 재시도 횟수 (최초 요청 제외)
+        backoff_base: 재시도 대기 기본값(초)
+        backoff_max: 재시도 대기 상한(초)
+        headers: 기본 요청 헤더
+    """
+
+    name: str
+    max_concurrency: int = 4
+    rate_per_second: float = 5.0
+    burst: int = 5
+    timeout: float = 10.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    headers: dict = field(default_factory=dict)
+
+
+# 제공자별 정책 (공개 한도보다 보수적으로 설정)
+PROVIDERS = {
+    # FRED: API 키당 분당 120회
+    "fred": ProviderConfig("fred", max_concurrency=4, rate_per_second=1.8, burst=4),
+    # Yahoo Finance chart API: 비공개 한도, 과도한 병렬 요청 시 429
+    "yahoo": ProviderConfig(
+        "yahoo", max_concurrency=4, rate_per_second=2.0, burst=4, headers={"User-Agent": DEFAULT_USER_AGENT}
+    ),
+    # Bithumb public API: IP당 초당 150회
+    "bithumb": ProviderConfig("bithumb", max_concurrency=8, rate_per_second=20.0, burst=20),
+    "trading_economics": ProviderConfig("trading_economics", max_concurrency=2, rate_per_second=1.0, burst=1),
+}
+DEFAULT_PROVIDER = ProviderConfig("default")
+
+
+class TokenBucket:
+    """
+    토큰 버킷 rate limiter
+    - 토큰은 rate_per_second 속도로 burst까지 보충, 요청 1건당 1토큰 소비
+    - reserve()는 토큰을 선점하고 대기해야 할 시간을 반환하므로 동기/asyncio 양쪽에서 공유 가능
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = float(rate_per_second)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 1개를 선점하고 사용 가능 시점까지의 대기 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1.0
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+def backoff_delay(config: ProviderConfig, attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """재시도 대기 시간: Retry-After가 있으면 우선, 없으면 full jitter 지수 backoff"""
+    retry_after = _retry_after(response)
+    if retry_after is not None:
+        return min(retry_after, config.backoff_max)
+    return random.uniform(0, min(config.backoff_max, config.backoff_base * (2 ** attempt)))
+
+
+class ExternalHttpClient:
+    """
+    외부 제공자 공용 HTTP 클라이언트
+    - 동기 요청은 하나의 httpx.Client 풀을 스레드 간 공유
+    - asyncio 요청은 이벤트 루프별 httpx.AsyncClient 풀 사용 (AsyncClient는 생성된 루프에 묶이므로)
+    - 토큰 버킷은 동기/asyncio 요청이 공유해 제공자 한도를 함께 지킴
+    """
+
+    def __init__(
+            self,
+            providers: Optional[dict] = None,
+            max_connections: int = 32,
+            max_keepalive_connections: int = 16,
+            keepalive_expiry: float = 30.0,
+    ):
+        self.providers = dict(PROVIDERS if providers is None else providers)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: dict = {}  # 이벤트 루프 -> httpx.AsyncClient
+        self._buckets: dict = {}
+        self._semaphores: dict = {}
+        self._async_semaphores: dict = {}  # (이벤트 루프, 제공자) -> asyncio.Semaphore
+        self._lock = threading.Lock()
+
+    # ---------------------
+    # 내부 자원
+    # ---------------------
+    def config(self, provider: str) -> ProviderConfig:
+        return self.providers.get(provider, DEFAULT_PROVIDER)
+
+    def _bucket(self, config: ProviderConfig) -> TokenBucket:
+        with self._lock:
+            if config.name not in self._buckets:
+                self._buckets[config.name] = TokenBucket(config.rate_per_second, config.burst)
+            return self._buckets[config.name]
+
+    def _semaphore(self, config: ProviderConfig) -> threading.BoundedSemaphore:
+        with self._lock:
+            if config.name not in self._semaphores:
+                self._semaphores[config.name] = threading.BoundedSemaphore(config.max_concurrency)
+            return self._semaphores[config.name]
+
+    def _async_semaphore(self, config: ProviderConfig) -> asyncio.Semaphore:
+        key = (asyncio.get_running_loop(), config.name)
+        if key not in self._async_semaphores:
+            self._async_semaphores[key] = asyncio.Semaphore(config.max_concurrency)
+        return self._async_semaphores[key]
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self._limits, follow_redirects=True)
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._async_clients[loop] = httpx.AsyncClient(limits=self._limits, follow_redirects=True)
+        return client
+
+    # ---------------------
+    # 동기 진입점
+    # ---------------------
+    def request(
+            self,
+            provider: str,
+            method: str,
+            url: str,
+            params: Optional[dict] = None,
+            headers: Optional[dict] = None,
+            timeout: Optional[float] = None,
+            retry_statuses=RETRY_STATUS_CODES,
+    ) -> httpx.Response:
+        """
+        제공자 정책(동시성/rate limit/timeout/재시도)을 적용해 요청
+        Raises:
+            ExternalServiceError: 재시도 후에도 실패하거나 4xx 응답(304 제외)인 경우
+        """
+        config = self.config(provider)
+        request_headers = {**config.headers, **(headers or {})}
+        client = self._sync_client()
+        response = None
+        for attempt in range(config.max_retries + 1):
+            with self._semaphore(config):
+                self._bucket(config).acquire()
+                try:
+                    response = client.request(
+                        method, url, params=params, headers=request_headers, timeout=timeout or config.timeout
+                    )
+                except httpx.TransportError as e:
+                    error, response = e, None
+                else:
+                    error = None
+            if not self._should_retry(error, response, retry_statuses):
+                break
+            if attempt < config.max_retries:
+                delay = backoff_delay(config, attempt, response)
+                logger.warning(f"[{provider}] {url} 재시도 {attempt + 1}/{config.max_retries} ({delay:.2f}s 후)")
+                time.sleep(delay)
+        return self._finalize(config, url, error, response)
+
+    def get(self, provider: str, url: str, params: Optional[dict] = None, **kwargs) -> httpx.Response:
+        return self.request(provider, "GET", url, params=params, **kwargs)
+
+    def get_json(self, provider: str, url: str, params: Optional[dict] = None, **kwargs):
+        return self.get(provider, url, params=params, **kwargs).json()
+
+    # ---------------------
+    # asyncio 진입점
+    # ---------------------
+    async def arequest(
+            self,
+            provider: str,
+            method: str,
+            url: str,
+            params: Optional[dict] = None,
+            headers: Optional[dict] = None,
+            timeout: Optional[float] = None,
+            retry_statuses=RETRY_STATUS_CODES,
+    ) -> httpx.Response:
+        """request의 asyncio 버전"""
+        config = self.config(provider)
+        request_headers = {**config.headers, **(headers or {})}
+        client = self._async_client()
+        response = None
+        for attempt in range(config.max_retries + 1):
+            async with self._async_semaphore(config):
+                await self._bucket(config).acquire_async()
+                try:
+                    response = await client.request(
+                        method, url, params=params, headers=request_headers, timeout=timeout or config.timeout
+                    )
+                except httpx.TransportError as e:
+                    error, response = e, None
+                else:
+                    error = None
+            if not self._should_retry(error, response, retry_statuses):
+                break
+            if attempt < config.max_retries:
+                delay = backoff_delay(config, attempt, response)
+                logger.warning(f"[{provider}] {url} 재시도 {attempt + 1}/{config.max_retries} ({delay:.2f}s 후)")
+                await asyncio.sleep(delay)
+        return self._finalize(config, url, error, response)
+
+    async def aget(self, provider: str, url: str, params: Optional[dict] = None, **kwargs) -> httpx.Response:
+        return await self.arequest(provider, "GET", url, params=params, **kwargs)
+
+    async def aget_json(self, provider: str, url: str, params: Optional[dict] = None, **kwargs):
+        return (await self.aget(provider, url, params=params, **kwargs)).json()
+
+    # ---------------------
+    # 공통
+    # ---------------------
+    @staticmethod
+    def _should_retry(error, response, retry_statuses) -> bool:
+        if error is not None:
+            return True
+        return response.status_code in retry_statuses
+
+    @staticmethod
+    def _finalize(config: ProviderConfig, url: str, error, response) -> httpx.Response:
+        if error is not None:
+            raise ExternalServiceError(config.name, f"요청 실패: {url} ({error!r})") from error
+        if response.status_code >= 400:
+            raise ExternalServiceError(
+                config.name, f"HTTP {response.status_code}: {url} {response.text[:200]}", response.status_code
+            )
+        return response
+
+    def close(self) -> None:
+        """동기 클라이언트 종료 (asyncio 클라이언트는 aclose로 종료)"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 asyncio 클라이언트 종료"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        for key in [key for key in self._async_semaphores if key[0] is loop]:
+            del self._async_semaphores[key]
+
+
+_client: Optional[ExternalHttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ExternalHttpClient:
+    """프로세스 공용 ExternalHttpClient (최초 호출 시 생성)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ExternalHttpClient()
+        return _client
+
+
+async def run_with_client(coro):
+    """
+    코루틴 실행 후 현재 루프의 asyncio 클라이언트를 정리 (asyncio.run 진입점용)
+    예시:
+        asyncio.run(run_with_client(fetch_all()))
+    """
+    try:
+        return await coro
+    finally:
+        await get_client().aclose()
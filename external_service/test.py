@@ -0,0 +1,396 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from external_service import bithumb_service
+from external_service.http_client import run_with_client
+
+# 상장일 ~ 마지막 일자, 중간에 거래 중단 일자(캔들 없음) 포함
+HISTORY = pd.date_range("2019-01-01", "2021-12-31").difference(pd.date_range("2020-05-10", "2020-05-12"))
+
+
+class CandleStubHandler(BaseHTTPRequestHandler):
+    """/v1/candles/days 스텁: to(KST, 미포함) 이전 캔들을 최신순으로 count개 반환"""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        count = int(query["count"][0])
+        to = pd.Timestamp(query["to"][0])
+        self.requests.append((query["market"][0], count, to))
+        if count > bithumb_service.PAGE_SIZE:
+            return self._send(400, {"error": {"name": "invalid count"}})
+        starts = HISTORY + bithumb_service.KST_DAY_START
+        days = HISTORY[starts < to][::-1][:count]
+        candles = [
+            {
+                "market": query["market"][0],
+                "candle_date_time_utc": f"{day.date()}T00:00:00",
+                "candle_date_time_kst": f"{day.date()}T09:00:00",
+                "opening_price": 100.0 + i,
+                "high_price": 110.0 + i,
+                "low_price": 90.0 + i,
+                "trade_price": float(day.dayofyear),
+                "candle_acc_trade_volume": 1.5,
+            }
+            for i, day in enumerate(days)
+        ]
+        self._send(200, candles)
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def candle_stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CandleStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    CandleStubHandler.requests = []
+    monkeypatch.setattr(
+        bithumb_service, "BITHUMB_CANDLES_DAYS_API", f"http://127.0.0.1:{server.server_port}/v1/candles/days"
+    )
+    yield CandleStubHandler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch(**kwargs) -> pd.DataFrame:
+    return asyncio.run(run_with_client(bithumb_service.afetch_daily_candles("KRW-BTC", **kwargs)))
+
+
+# =====================
+# 단위테스트 코드 (pytest 등에서 활용)
+# =====================
+def test_backfill_full_history(candle_stub):
+    df = _fetch(end="2021-12-31")
+    assert df.index.equals(pd.DatetimeIndex(HISTORY))
+    assert (df["close"].to_numpy() == HISTORY.dayofyear.to_numpy()).all()
+    # 200일 단위 페이지를 동시성 크기만큼 묶어 요청 후, 마지막(짧은) 페이지에서 종료
+    assert len(candle_stub) == 8
+    assert all(count == bithumb_service.PAGE_SIZE for _, count, _ in candle_stub)
+
+
+def test_incremental_range(candle_stub):
+    df = _fetch(start="2020-04-01", end="2021-01-15")
+    expected = HISTORY[(HISTORY >= "2020-04-01") & (HISTORY <= "2021-01-15")]
+    assert df.index.equals(pd.DatetimeIndex(expected))
+    # 290일 → 200 + 90개 두 페이지
+    assert sorted(count for _, count, _ in candle_stub) == [90, 200]
+
+
+def test_empty_range(candle_stub):
+    assert _fetch(start="2022-01-05", end="2022-01-04").empty
+    assert candle_stub == []
+
+
+def test_rows_for_price_bulk_writer(candle_stub):
+    rows = bithumb_service.get_bithumb_daily_prices("KRW-BTC", "2021-12-30", "2021-12-31")
+    assert [list(row) for row in rows] == [bithumb_service.PRICE_COLUMNS] * 2
+    assert rows[-1]["symbol"] == "KRW-BTC"
+    assert rows[-1]["timestamp"] == pd.Timestamp("2021-12-31").to_pydatetime()
+    assert rows[-1]["close"] == 365.0
+
+
+# =====================
+# 외부 데이터 캐시
+# =====================
+def _series(start, end, value=1.0) -> pd.DataFrame:
+    days = pd.bdate_range(start, end)
+    return pd.DataFrame({"value": [value] * len(days)}, index=days)
+
+
+def _ranges(plan) -> list:
+    return [(str(s.date()), str(e.date())) for s, e in plan.ranges]
+
+
+def test_cache_requests_only_uncovered_head_and_tail(tmp_path):
+    from external_service.cache import ExternalDataCache, FetchResult
+
+    cache = ExternalDataCache(root=str(tmp_path), ttl_seconds=3600, tail_overlap_days=7)
+    plan = cache.plan("fred", "DGS10", "2024-03-01", "2024-03-31")
+    assert _ranges(plan) == [("2024-03-01", "2024-03-31")]
+    cache.complete(plan, [FetchResult(_series("2024-03-01", "2024-03-29"), etag='"v1"')])
+
+    # TTL 이내, 커버 범위 안이면 요청 없음
+    assert _ranges(cache.plan("fred", "DGS10", "2024-03-05", "2024-03-20")) == []
+
+    # 앞부분(head)만 요청
+    plan = cache.plan("fred", "DGS10", "2024-02-01", "2024-03-20")
+    assert (_ranges(plan), plan.tail_key) == ([("2024-02-01", "2024-02-29")], None)
+    frame = cache.complete(plan, [FetchResult(_series("2024-02-01", "2024-02-29", value=0.5))])
+    assert (str(frame.index[0].date()), str(frame.index[-1].date()), len(frame)) == ("2024-02-01", "2024-03-20", 35)
+
+    # 뒷부분(tail)은 covered_end - overlap(03-24)부터 다시 요청, 같은 일자는 새 데이터 우선
+    plan = cache.plan("fred", "DGS10", "2024-03-01", "2024-04-12")
+    assert _ranges(plan) == [("2024-03-24", "2024-04-12")]
+    # 직전 tail 요청과 범위가 다르면 조건부 요청 헤더 없음
+    assert plan.headers_for(0) == {}
+    frame = cache.complete(plan, [FetchResult(_series("2024-03-25", "2024-04-12", value=2.0))])
+    assert frame.loc["2024-03-22", "value"] == 1.0 and frame.loc["2024-03-25", "value"] == 2.0
+    assert frame.index[-1] == pd.Timestamp("2024-04-12")
+    assert cache.load("fred", "DGS10")[1]["covered_start"] == "2024-02-01"
+
+    # TTL이 지나면 커버 범위 안이어도 tail 재요청 (tail이 요청 범위와 겹칠 때)
+    cache.ttl_seconds = 0
+    assert _ranges(cache.plan("fred", "DGS10", "2024-03-01", "2024-04-12")) == [("2024-04-05", "2024-04-12")]
+    assert _ranges(cache.plan("fred", "DGS10", "2024-03-01", "2024-03-20")) == []
+
+
+def test_cache_conditional_tail_request_keeps_data_on_304(tmp_path):
+    from external_service.cache import ExternalDataCache, FetchResult
+
+    cache = ExternalDataCache(root=str(tmp_path), ttl_seconds=0, tail_overlap_days=7)
+    plan = cache.plan("yahoo", "SPY", "2024-03-01", "2024-03-29")
+    cache.complete(plan, [FetchResult(_series("2024-03-01", "2024-03-29"), etag='"v1"', last_modified="Fri, 29 Mar 2024")])
+
+    # TTL 경과: tail(03-22 ~)만 재요청, 직전 tail 범위와 다르므로 조건부 헤더 없음
+    plan = cache.plan("yahoo", "SPY", "2024-03-01", "2024-03-29")
+    assert (_ranges(plan), plan.headers_for(0)) == ([("2024-03-22", "2024-03-29")], {})
+    cache.complete(plan, [FetchResult(_series("2024-03-22", "2024-03-29"), etag='"v2"', last_modified="Sat, 30 Mar 2024")])
+
+    # 같은 tail 범위 재요청: If-None-Match / If-Modified-Since 사용
+    plan = cache.plan("yahoo", "SPY", "2024-03-01", "2024-03-29")
+    assert _ranges(plan) == [("2024-03-22", "2024-03-29")]
+    assert plan.headers_for(0) == {"If-None-Match": '"v2"', "If-Modified-Since": "Sat, 30 Mar 2024"}
+    frame = cache.complete(plan, [FetchResult(not_modified=True)])
+    assert len(frame) == 21 and (frame["value"] == 1.0).all()
+    # 304 후에도 검증자 유지
+    assert cache.plan("yahoo", "SPY", "2024-03-01", "2024-03-29").headers_for(0)["If-None-Match"] == '"v2"'
+
+    # refresh: 캐시 무시하고 전체 범위를 다시 받아 덮어씀
+    refresh = ExternalDataCache(root=str(tmp_path), mode="refresh")
+    plan = refresh.plan("yahoo", "SPY", "2024-03-11", "2024-03-15")
+    assert (_ranges(plan), plan.headers_for(0)) == ([("2024-03-11", "2024-03-15")], {})
+    refresh.complete(plan, [FetchResult(_series("2024-03-11", "2024-03-15", value=3.0))])
+    assert len(cache.load("yahoo", "SPY")[0]) == 5
+
+
+def test_cache_offline_off_and_fallback(tmp_path):
+    from external_service.cache import CacheMissError, ExternalDataCache, FetchResult
+
+    online = ExternalDataCache(root=str(tmp_path))
+    plan = online.plan("fred", "VIXCLS", "2024-03-01", "2024-03-29")
+    online.complete(plan, [FetchResult(_series("2024-03-01", "2024-03-29"))])
+
+    # offline: 요청 없이 캐시만, 캐시가 없으면 CacheMissError
+    offline = ExternalDataCache(root=str(tmp_path), mode="offline")
+    plan = offline.plan("fred", "VIXCLS", "2024-03-10", "2024-06-30")
+    assert plan.ranges == []
+    assert str(offline.complete(plan, []).index[0].date()) == "2024-03-11"
+    with pytest.raises(CacheMissError):
+        offline.plan("fred", "UNRATE", "2024-03-01", "2024-03-29")
+
+    # 요청 실패 시 캐시 범위로 대체, 캐시가 없으면 원래 예외
+    online.ttl_seconds = 0
+    plan = online.plan("fred", "VIXCLS", "2024-03-18", "2024-04-30")
+    assert len(online.fallback(plan, RuntimeError("timeout"))) == 10
+    error = RuntimeError("timeout")
+    with pytest.raises(RuntimeError):
+        online.fallback(online.plan("fred", "UNRATE", "2024-03-01", "2024-03-29"), error)
+
+    # off: 캐시를 읽지도 쓰지도 않음
+    off = ExternalDataCache(root=str(tmp_path / "off"), mode="off")
+    plan = off.plan("fred", "VIXCLS", "2024-03-01", "2024-03-29")
+    assert _ranges(plan) == [("2024-03-01", "2024-03-29")]
+    off.complete(plan, [FetchResult(_series("2024-03-01", "2024-03-29"))])
+    assert not (tmp_path / "off").exists()
+
+
+# =====================
+# 공용 HTTP 클라이언트
+# =====================
+class ScriptedStubHandler(BaseHTTPRequestHandler):
+    """요청마다 script의 다음 응답(status, headers)을 반환, "drop"이면 응답 없이 연결 종료, 소진 후 200"""
+
+    protocol_version = "HTTP/1.1"
+    script = []
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        step = self.script.pop(0) if self.script else (200, {})
+        if step == "drop":
+            self.close_connection = True
+            return
+        status, headers = step
+        data = json.dumps({"attempt": len(self.requests)}).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def scripted_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ScriptedStubHandler.script = []
+    ScriptedStubHandler.requests = []
+    yield ScriptedStubHandler, f"http://127.0.0.1:{server.server_port}/data"
+    server.shutdown()
+    server.server_close()
+
+
+def _stub_client(**kwargs):
+    from external_service.http_client import ExternalHttpClient, ProviderConfig
+
+    config = {"rate_per_second": 1000.0, "burst": 1000, "max_retries": 3, "backoff_base": 0.5, "timeout": 5.0,
+              **kwargs}
+    return ExternalHttpClient(providers={"stub": ProviderConfig("stub", **config)})
+
+
+@pytest.fixture
+def recorded_sleeps(monkeypatch):
+    """재시도 대기는 실제로 자지 않고 대기 시간만 기록 (동기/asyncio 공통)"""
+    import time
+    from types import SimpleNamespace
+
+    from external_service import http_client
+
+    sleeps = []
+
+    async def async_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(http_client, "time", SimpleNamespace(
+        sleep=sleeps.append, monotonic=time.monotonic, time=time.time
+    ))
+    monkeypatch.setattr(http_client.asyncio, "sleep", async_sleep)
+    return sleeps
+
+
+def test_http_client_retries_5xx_429_and_transport_errors(scripted_stub, recorded_sleeps):
+    stub, url = scripted_stub
+    stub.script = [(503, {}), (429, {"Retry-After": "2"}), "drop"]
+    client = _stub_client()
+    try:
+        assert client.get_json("stub", url) == {"attempt": 4}
+    finally:
+        client.close()
+
+    assert len(stub.requests) == 4
+    # 지수 backoff(full jitter, 0.5 * 2^attempt 상한), Retry-After 우선
+    assert len(recorded_sleeps) == 3
+    assert 0 <= recorded_sleeps[0] <= 0.5
+    assert recorded_sleeps[1] == 2.0
+    assert 0 <= recorded_sleeps[2] <= 2.0
+
+
+def test_http_client_raises_after_retries_exhausted(scripted_stub, recorded_sleeps):
+    import httpx
+
+    from external_service.http_client import ExternalServiceError
+
+    stub, url = scripted_stub
+    client = _stub_client(max_retries=2)
+    try:
+        stub.script = [(500, {})] * 3
+        with pytest.raises(ExternalServiceError) as exc_info:
+            client.get("stub", url)
+        assert exc_info.value.status_code == 500 and exc_info.value.provider == "stub"
+        assert len(stub.requests) == 3 and len(recorded_sleeps) == 2
+
+        stub.script = ["drop"] * 3
+        with pytest.raises(ExternalServiceError) as exc_info:
+            client.get("stub", url)
+        assert exc_info.value.status_code is None
+        assert isinstance(exc_info.value.__cause__, httpx.TransportError)
+        assert len(stub.requests) == 6
+
+        # 재시도 대상이 아닌 4xx는 즉시 실패
+        stub.script = [(404, {})]
+        with pytest.raises(ExternalServiceError) as exc_info:
+            client.get("stub", url)
+        assert exc_info.value.status_code == 404 and len(stub.requests) == 7
+    finally:
+        client.close()
+
+
+def test_async_http_client_retries_with_retry_after(scripted_stub, recorded_sleeps):
+    from external_service.http_client import ExternalServiceError
+
+    stub, url = scripted_stub
+    client = _stub_client(max_retries=1)
+
+    async def run():
+        try:
+            stub.script = [(429, {"Retry-After": "1.5"})]
+            first = await client.aget_json("stub", url)
+            stub.script = [(502, {}), (502, {})]
+            with pytest.raises(ExternalServiceError):
+                await client.aget("stub", url)
+            return first
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == {"attempt": 2}
+    assert len(stub.requests) == 4
+    assert recorded_sleeps[0] == 1.5 and len(recorded_sleeps) == 2
+
+
+def test_backoff_delay_prefers_capped_retry_after():
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+
+    import httpx
+
+    from external_service.http_client import ProviderConfig, backoff_delay
+
+    config = ProviderConfig("stub", backoff_base=1.0, backoff_max=10.0)
+    assert backoff_delay(config, 0, httpx.Response(429, headers={"Retry-After": "3"})) == 3.0
+    assert backoff_delay(config, 0, httpx.Response(429, headers={"Retry-After": "120"})) == 10.0
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+    assert 3.0 <= backoff_delay(config, 0, httpx.Response(503, headers={"Retry-After": when})) <= 5.0
+    # Retry-After가 없거나 해석할 수 없으면 full jitter (상한 base * 2^attempt, backoff_max)
+    for attempt in range(6):
+        delay = backoff_delay(config, attempt, httpx.Response(503, headers={"Retry-After": "soon"}))
+        assert 0 <= delay <= min(10.0, 2 ** attempt)
+
+
+def test_token_bucket_rate_limit(monkeypatch, scripted_stub):
+    import time
+    from types import SimpleNamespace
+
+    from external_service import http_client
+
+    now = [100.0]
+    with monkeypatch.context() as m:
+        m.setattr(http_client, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        bucket = http_client.TokenBucket(rate_per_second=10, burst=2)
+        # burst까지는 즉시, 이후 토큰 선점분만큼 1/rate 간격으로 대기
+        assert [bucket.reserve() for _ in range(4)] == pytest.approx([0.0, 0.0, 0.1, 0.2])
+        now[0] += 1.0
+        assert bucket.reserve() == 0.0
+
+    # 클라이언트 요청도 제공자 토큰 버킷을 통과 (초당 20건, burst 1 -> 5건에 최소 0.2초)
+    stub, url = scripted_stub
+    client = _stub_client(rate_per_second=20.0, burst=1)
+    started = time.monotonic()
+    try:
+        for _ in range(5):
+            client.get("stub", url)
+    finally:
+        client.close()
+    assert time.monotonic() - started >= 0.19
+    assert len(stub.requests) == 5
@@ -1,22 +1,120 @@
 """
 파일명: yahoo_finance_service.py
 설명: Yahoo Finance에서 시가(Open), 고가(High), 저가(Low), 종가(Close), 거래량(Volume) 데이터를 가져오는 서비스 모듈
-의존성: yfinance (설치: pip install yfinance)
+의존성: httpx(external_service.http_client), pandas
 사용 예시:
-    from yahoo_finance_service import get_yahoo_finance_ohlcv
-    data = get_yahoo_finance_ohlcv('SPY')
-    print(data)
+    from external_service.yahoo_finance_service import get_yahoo_finance_ohlcv, aget_yahoo_finance_ohlcv
+    data = get_yahoo_finance_ohlcv('SPY', '2015-01-01')
+    data = await aget_yahoo_finance_ohlcv('SPY', '2015-01-01')
 버전 기록:
     - v1.0 2025-05-17 최초 작성
+    - v1.1 2025-06-17 yfinance Ticker 세션 대신 공용 http_client로 chart API 직접 호출
+                      (keep-alive 풀 공유, "yahoo" 제공자 rate limit/재시도, asyncio 진입점 추가)
+                      yfinance history(auto_adjust=True)와 같이 수정주가 기준 OHLC, 거래소 현지 자정 timestamp 반환
+    - v1.2 2025-06-17 일봉(start 지정) 조회는 external_service.cache에 종목별로 캐시하고 미캐시 앞/뒤 구간만 요청
+                      (요청 실패 시 캐시로 대체, EXTERNAL_CACHE_MODE=offline이면 캐시만 사용)
 참고: https://github.com/ranaroussi/yfinance
 """
 
 import datetime
-from typing import List
+from typing import List, Optional
 
-import yfinance as yf
+import numpy as np
+import pandas as pd
 
-from src.repository.models.price_table import Price
+from app.trifin.data.repository.models.price_table import Price
+from external_service.cache import CacheMissError, FetchPlan, FetchResult, get_cache
+from external_service.http_client import ExternalServiceError, get_client
+
+PROVIDER = "yahoo"
+YAHOO_CHART_API = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+CACHED_INTERVALS = ("1d",)
+
+
+def _build_params(start: str, end: str, period: str, interval: str) -> dict:
+    params = {"interval": interval, "includePrePost": "false", "events": "div,splits"}
+    if start:
+        if not end:
+            end = datetime.datetime.now().strftime("%Y-%m-%d")
+        params["period1"] = int(pd.Timestamp(start, tz="UTC").timestamp())
+        params["period2"] = int(pd.Timestamp(end, tz="UTC").timestamp())
+    else:
+        params["range"] = period
+    return params
+
+
+def chart_to_frame(data: dict) -> pd.DataFrame:
+    """
+    chart API 응답(JSON) → 수정주가 기준 OHLCV DataFrame (index=거래소 현지 자정 timestamp)
+    - adjclose가 있으면 시가/고가/저가도 같은 비율로 조정 (yfinance auto_adjust와 동일)
+    - 종가가 없는 행(거래 정지, 당일 미확정 등)은 제외
+    """
+    chart = data.get("chart") or {}
+    if chart.get("error"):
+        raise ValueError(chart["error"].get("description") or chart["error"])
+    result = (chart.get("result") or [None])[0]
+    if not result or not result.get("timestamp"):
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+    quote = result["indicators"]["quote"][0]
+    df = pd.DataFrame(
+        {
+            "Open": quote.get("open"),
+            "High": quote.get("high"),
+            "Low": quote.get("low"),
+            "Close": quote.get("close"),
+            "Volume": quote.get("volume"),
+        },
+        dtype=float,
+    )
+    adjclose = (result["indicators"].get("adjclose") or [{}])[0].get("adjclose")
+    if adjclose is not None:
+        ratio = np.asarray(adjclose, dtype=float) / df["Close"].to_numpy()
+        df[["Open", "High", "Low"]] = df[["Open", "High", "Low"]].mul(ratio, axis=0)
+        df["Close"] = np.asarray(adjclose, dtype=float)
+    timezone = result.get("meta", {}).get("exchangeTimezoneName") or "UTC"
+    df.index = pd.to_datetime(result["timestamp"], unit="s", utc=True).tz_convert(timezone).normalize()
+    df["Volume"] = df["Volume"].fillna(0.0)
+    df = df.dropna(subset=["Close"])
+    return df[~df.index.duplicated(keep="last")]
+
+
+def frame_to_prices(symbol: str, df: pd.DataFrame) -> List[Price]:
+    return [
+        Price(symbol=symbol, open=o, high=h, low=l, close=c, volume=v, timestamp=ts.to_pydatetime())
+        for ts, o, h, l, c, v in zip(
+            df.index, df["Open"].tolist(), df["High"].tolist(), df["Low"].tolist(), df["Close"].tolist(),
+            df["Volume"].tolist(),
+        )
+    ]
+
+
+def _to_prices(symbol: str, df: pd.DataFrame) -> List[Price]:
+    if df.empty:
+        raise ValueError(f"Yahoo Finance에서 데이터를 찾을 수 없습니다: {symbol}")
+    return frame_to_prices(symbol, df)
+
+
+def _plan(symbol: str, start: str, end: str, interval: str, force: bool) -> Optional[FetchPlan]:
+    """캐시 대상(start 지정 일봉)이면 조회 계획, 아니면 None (end는 미포함이므로 전날까지가 캐시 범위)"""
+    if not start or interval not in CACHED_INTERVALS:
+        return None
+    last_day = pd.Timestamp(end) - pd.Timedelta(days=1) if end else pd.Timestamp.today()
+    try:
+        return get_cache().plan(PROVIDER, f"{symbol}:{interval}", start, last_day, force=force)
+    except CacheMissError as e:
+        raise ValueError(str(e))
+
+
+def _range_params(start: pd.Timestamp, end: pd.Timestamp, interval: str) -> dict:
+    """캐시 계획의 포함 범위 [start, end] → chart API 파라미터 (period2 미포함)"""
+    return _build_params(
+        start.strftime("%Y-%m-%d"), (end + pd.Timedelta(days=1)).strftime("%Y-%m-%d"), "", interval
+    )
+
+
+def _to_result(response) -> FetchResult:
+    frame = None if response.status_code == 304 else chart_to_frame(response.json())
+    return FetchResult.from_response(response, frame)
 
 
 def get_yahoo_finance_ohlcv(
@@ -25,16 +123,19 @@ def get_yahoo_finance_ohlcv(
     end: str = "",
     period: str = "1d",
     interval: str = "1d",
+    force: bool = False,
 ) -> List[Price]:
     """
     Yahoo Finance에서 지정한 종목의 OHLCV(시가, 고가, 저가, 종가, 거래량) 전체 데이터를 Price 객체 리스트로 조회합니다.
+    start를 지정한 일봉 조회는 캐시에 없는 앞/뒤 구간만 요청해 병합합니다.
 
     Args:
         symbol (str): 조회할 종목명 (예: 'SPY', 'QQQ', 'SCHD', 'BTC-USD', 'GLD' 등)
-        period (str): 조회 기간 (예: '1d', '5d', '1mo', '1y', 'max' 등)
+        period (str): 조회 기간 (start가 없을 때만 사용, 예: '1d', '5d', '1mo', '1y', 'max' 등)
         interval (str): 데이터 간격 (예: '1d', '1h', '1m' 등)
         start (str): 조회 시작일 (예: '2022-01-01')
-        end (str): 조회 종료일 (예: '2022-12-31')
+        end (str): 조회 종료일 (예: '2022-12-31', 미포함)
+        force (bool): 캐시에 있는 구간도 다시 요청 (누락 구간 재수집)
 
     Returns:
         List[Price]: 기간 내 모든 OHLCV가 Price 객체로 반환됨
@@ -43,46 +144,64 @@ def get_yahoo_finance_ohlcv(
         ValueError: 종목 데이터가 없거나 조회 실패 시 예외 발생
 
     예시:
-        >>> prices = get_yahoo_finance_ohlcv('SPY', period='5d')
+        >>> prices = get_yahoo_finance_ohlcv('SPY', '2024-01-01')
         >>> for price in prices:
         ...     print(price)
-
-    TODO:
-        - 멀티 심볼 지원
-        - 타임존 옵션
-        - 에러 로깅 개선
     """
-
+    url = YAHOO_CHART_API.format(symbol=symbol)
     try:
-        # 기본값 설정: end(오늘)
-        if not end:
-            end = datetime.datetime.now().strftime("%Y-%m-%d")
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period=period, interval=interval, start=start, end=end)
-        if df.empty:
-            raise ValueError(f"Yahoo Finance에서 데이터를 찾을 수 없습니다: {symbol}")
-        prices = []
-        for idx, row in df.iterrows():
-            try:
-                ts = idx.to_pydatetime()  # pyright: ignore[reportAttributeAccessIssue]
-            except AttributeError:
-                ts = idx
-            price = Price(
-                symbol=symbol,
-                open=float(row["Open"]),
-                high=float(row["High"]),
-                low=float(row["Low"]),
-                close=float(row["Close"]),
-                volume=float(row["Volume"]),
-                timestamp=ts,
-            )
-            prices.append(price)
-        return prices
+        plan = _plan(symbol, start, end, interval, force)
+        if plan is None:
+            return _to_prices(symbol, chart_to_frame(
+                get_client().get_json(PROVIDER, url, params=_build_params(start, end, period, interval))
+            ))
+        cache = get_cache()
+        try:
+            results = [
+                _to_result(get_client().get(PROVIDER, url, params=_range_params(s, e, interval), headers=plan.headers_for(i)))
+                for i, (s, e) in enumerate(plan.ranges)
+            ]
+            df = cache.complete(plan, results)
+        except ExternalServiceError as e:
+            df = cache.fallback(plan, e)
+        return _to_prices(symbol, df)
     except Exception as e:
         # 에러 발생 시 상세 메시지와 함께 예외 재발생
         raise ValueError(f"Yahoo Finance 데이터 조회 중 오류 발생: {symbol}, {str(e)}")
 
 
+async def aget_yahoo_finance_ohlcv(
+    symbol: str,
+    start: str,
+    end: str = "",
+    period: str = "1d",
+    interval: str = "1d",
+    force: bool = False,
+) -> List[Price]:
+    """get_yahoo_finance_ohlcv의 asyncio 버전 (여러 종목 병렬 조회용)"""
+    url = YAHOO_CHART_API.format(symbol=symbol)
+    try:
+        plan = _plan(symbol, start, end, interval, force)
+        if plan is None:
+            return _to_prices(symbol, chart_to_frame(
+                await get_client().aget_json(PROVIDER, url, params=_build_params(start, end, period, interval))
+            ))
+        cache = get_cache()
+        try:
+            results = [
+                _to_result(
+                    await get_client().aget(PROVIDER, url, params=_range_params(s, e, interval), headers=plan.headers_for(i))
+                )
+                for i, (s, e) in enumerate(plan.ranges)
+            ]
+            df = cache.complete(plan, results)
+        except ExternalServiceError as e:
+            df = cache.fallback(plan, e)
+        return _to_prices(symbol, df)
+    except Exception as e:
+        raise ValueError(f"Yahoo Finance 데이터 조회 중 오류 발생: {symbol}, {str(e)}")
+
+
 # 모듈 단위 테스트 코드 (직접 실행 시 동작)
 if __name__ == "__main__":
     import pprint
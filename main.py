@@ -1,12 +1,20 @@
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from pymongo.errors import PyMongoError
 
 from app.bagtionary.bagtionary_app import bagtionary_router, api_router
 from app.bagtionary.common.middleware.verify_middleware import VerifyMiddleware
+from app.bagtionary.inject import get_home_catalogue, get_product_change_watcher
 from app.trifin.app import trifin_router
+from core.common.metrics import CONTENT_TYPE, render_metrics
+from core.common.middleware.compression_middleware import CompressionMiddleware
 from core.common.middleware.logger_middleware import LoggerMiddleware
+from core.common.middleware.metrics_middleware import MetricsMiddleware
+from core.common.middleware.profile_middleware import ProfileMiddleware, is_debug_package
+from core.common.slow_ops import SLOW_OPS
+from core.config.db import engine
 from core.db.mongo import mongo
 from core.util.logger import get_logger
 from version import __version__
@@ -23,6 +31,10 @@ def create_app() -> FastAPI:
         description="Tricorn Integrated API for several services",
     )
 
+    # Accept-Encoding에 따라 br/zstd/gzip 압축 (1KB 이상 JSON/텍스트)
+    # 가장 안쪽에 두어 라우터 응답 본문을 한 번에 압축 (BaseHTTPMiddleware를 거치면 스트리밍으로 바뀜)
+    app.add_middleware(CompressionMiddleware)
+
     # CORS 설정
     app.add_middleware(
         CORSMiddleware,
@@ -35,6 +47,9 @@ def create_app() -> FastAPI:
     # 미들웨어 설정
     app.add_middleware(LoggerMiddleware)
     app.add_middleware(VerifyMiddleware)
+    app.add_middleware(ProfileMiddleware)
+    # 가장 바깥에서 전체 처리 시간 계측
+    app.add_middleware(MetricsMiddleware)
 
     # Firebase 인증 미들웨어 설정
     # auth_service = AuthService()
@@ -95,6 +110,38 @@ def ping():
     return {"message": "pong"}
 
 
+@app.get("/live", summary="Liveness Check", tags=["Common"])
+async def live():
+    """워커 이벤트 루프 응답 여부 (외부 의존성 확인 없음)"""
+    return {"alive": True}
+
+
+@app.get("/ready", summary="Readiness Check", tags=["Common"])
+async def ready():
+    """Mongo 커넥션 warm-up 완료 여부 (미완료 시 재시도 후 503)"""
+    if not mongo.ready:
+        try:
+            await mongo.warm_up()
+        except PyMongoError as e:
+            logger.warning(f"mongo warm-up failed: {e}")
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"ready": False})
+    return {"ready": True}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 수집용 요청/DB 계측 메트릭 (core.common.metrics, 멀티 프로세스는 워커 전체 합산)"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/slow-ops", include_in_schema=False)
+def slow_ops(request: Request):
+    """최근 느린 Mongo 명령/SQL 쿼리 기록 (디버그 패키지 전용, core.common.slow_ops)"""
+    if not is_debug_package(request):
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
+    return {"threshold_ms": SLOW_OPS.threshold_ms, "records": SLOW_OPS.records()}
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """예상치 못한 에러에 대한 전역 핸들러"""
@@ -108,10 +155,23 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.on_event("startup")
 async def startup_event():
     mongo.connect()
+    try:
+        # 첫 요청 전에 서버 선택/커넥션 생성 (실패 시 /ready가 503을 반환하며 재시도)
+        await mongo.warm_up()
+    except PyMongoError as e:
+        logger.error(f"mongo warm-up failed: {e}")
+    # 홈 카탈로그 스냅샷 생성/주기 갱신 (요청 경로 밖, 준비 전에는 Mongo 조회)
+    get_home_catalogue().start()
+    # product 변경 감지 → 응답 캐시/카탈로그 무효화 (change stream, 미지원 시 폴링)
+    get_product_change_watcher().start()
 
 
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
+    # 처리 중 요청이 끝난 뒤 호출 (graceful shutdown), 워커별 풀 정리
+    await get_product_change_watcher().stop()
+    await get_home_catalogue().stop()
     mongo.close()
+    engine.dispose()
     # with open("log.txt", mode="a") as log:
     #     log.write("Application shutdown")
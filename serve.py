@@ -0,0 +1,234 @@
+"""
+serve.py
+
+운영 서빙 프로필: main:app을 미리 import(preload)한 뒤 fork하는 멀티 프로세스 uvicorn 서버
+
+- 의존성: uvicorn[standard] (uvloop, httptools)
+- 부모 프로세스
+    - main import(라우터/모델 등)를 한 번만 수행 → fork 후 copy-on-write로 공유
+    - preload한 객체는 gc.freeze()로 GC 대상에서 제외 (워커 GC가 공유 페이지를 건드려 복사되는 것 방지)
+    - 리스닝 소켓을 bind 후 워커 수만큼 fork, 종료된 워커는 재시작
+    - SIGTERM/SIGINT: 워커에 SIGTERM 전달 → 처리 중 요청 완료 대기(graceful) → graceful_timeout 초과 시 SIGKILL
+- 워커 프로세스
+    - uvloop 이벤트 루프 + httptools 파서, keep-alive timeout
+    - DB 풀은 fork 이후 워커별 생성 (SQLAlchemy 풀은 fork 시 폐기, Mongo는 startup 이벤트에서 연결)
+    - max_requests(+ 워커별 jitter) 처리 후 graceful 종료 → 부모가 새 워커로 교체 (메모리 증가 방지)
+    - shutdown 이벤트에서 Mongo 클라이언트/SQL 풀 정리
+- 상태 확인: /live (프로세스 응답), /ready (Mongo warm-up 완료), /ping (기존 호환)
+- 메트릭(/metrics): 계측 값은 워커 프로세스마다 따로 쌓이므로 어느 워커가 scrape를 받아도 전체 값을 응답하도록
+  워커 간 합산 (core.common.metrics, TRICORN_METRICS_DIR)
+    - 부모가 메트릭 디렉터리를 준비 (환경변수로 지정하지 않으면 임시 디렉터리, 시작 시 이전 워커 파일 삭제)
+    - 워커는 metrics_interval초마다, 종료 시, /metrics 응답 시 자기 값을 디렉터리에 저장
+      → /metrics 응답은 모든 워커 값의 합 (다른 워커 값은 최대 metrics_interval초 지연)
+    - 종료된 워커 값은 부모가 archive에 합산 (counter/histogram 누적 유지, 처리 중 요청 gauge는 제외)
+    - 워커별 값이 필요하면 같은 디렉터리의 worker_<pid>.json 참고 (scrape 대상은 하나의 포트 그대로)
+- 설정: 인자 또는 환경변수 (WEB_CONCURRENCY, HOST, PORT, MAX_REQUESTS, MAX_REQUESTS_JITTER, KEEP_ALIVE, GRACEFUL_TIMEOUT,
+        METRICS_INTERVAL, TRICORN_METRICS_DIR)
+- 사용법:
+    python serve.py
+    python serve.py --workers 4 --port 8000 --max-requests 20000
+- 작성일: 2025-06-20
+- 변경이력:
+    - 워커 간 /metrics 합산 (메트릭 디렉터리, 종료 워커 archive): 2025-06-23
+"""
+
+import argparse
+import gc
+import os
+import random
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import uvicorn
+
+from core.common.metrics import METRICS_DIR_ENV, REGISTRY, start_snapshot_writer
+from core.util.logger import get_logger
+
+logger = get_logger("serve")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tricorn API 운영 서버 (preload + prefork uvicorn)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=_env_int("PORT", 8000))
+    parser.add_argument("--workers", type=int, default=_env_int("WEB_CONCURRENCY", os.cpu_count() or 1))
+    parser.add_argument("--max-requests", type=int, default=_env_int("MAX_REQUESTS", 10_000),
+                        help="워커 재활용 기준 요청 수 (0이면 재활용 안 함)")
+    parser.add_argument("--max-requests-jitter", type=int, default=_env_int("MAX_REQUESTS_JITTER", 1_000),
+                        help="워커별 max-requests 추가 난수 상한 (동시 재시작 방지)")
+    parser.add_argument("--keep-alive", type=int, default=_env_int("KEEP_ALIVE", 5), help="keep-alive timeout(초)")
+    parser.add_argument("--graceful-timeout", type=int, default=_env_int("GRACEFUL_TIMEOUT", 30),
+                        help="종료 시 처리 중 요청 대기 상한(초)")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--metrics-interval", type=int, default=_env_int("METRICS_INTERVAL", 5),
+                        help="워커 메트릭 저장 주기(초), 다른 워커 값의 /metrics 반영 지연 상한")
+    return parser.parse_args(argv)
+
+
+def prepare_metrics_dir() -> tuple:
+    """
+    워커 메트릭 합산 디렉터리 준비 (fork 전 환경변수로 워커에 전달)
+    Returns:
+        (디렉터리, 직접 만든 임시 디렉터리 여부)
+    """
+    directory = os.getenv(METRICS_DIR_ENV)
+    owned = not directory
+    if owned:
+        directory = tempfile.mkdtemp(prefix="tricorn-metrics-")
+    os.makedirs(directory, exist_ok=True)
+    # 이전 실행의 워커/archive 값은 이어서 합산하지 않음 (재시작 = counter 초기화)
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            os.remove(os.path.join(directory, name))
+    os.environ[METRICS_DIR_ENV] = directory
+    return directory, owned
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Arbiter:
+    """워커 fork/감시/재시작, 종료 신호 전달"""
+
+    def __init__(self, app, args: argparse.Namespace):
+        self.app = app
+        self.args = args
+        self.sock = bind_socket(args.host, args.port, args.backlog)
+        self.workers: Dict[int, float] = {}
+        self.stopping = False
+        self.metrics_dir, self.owns_metrics_dir = prepare_metrics_dir()
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        logger.info(f"listening on {self.args.host}:{self.args.port} workers={self.args.workers} pid={os.getpid()}")
+        for _ in range(self.args.workers):
+            self.spawn()
+
+        while not self.stopping:
+            self.reap(restart=True)
+            time.sleep(0.5)
+        return self.shutdown()
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self.serve_worker()
+            except BaseException:
+                logger.exception("worker failed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+        logger.info(f"worker {pid} started")
+
+    def serve_worker(self) -> None:
+        # 부모의 신호 처리기를 해제 (uvicorn이 워커 종료 신호를 직접 처리)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        max_requests = None
+        if self.args.max_requests > 0:
+            max_requests = self.args.max_requests + random.randint(0, max(self.args.max_requests_jitter, 0))
+        config = uvicorn.Config(
+            self.app,
+            loop="uvloop",
+            http="httptools",
+            lifespan="on",
+            timeout_keep_alive=self.args.keep_alive,
+            timeout_graceful_shutdown=self.args.graceful_timeout,
+            limit_max_requests=max_requests,
+            backlog=self.args.backlog,
+            proxy_headers=True,
+            access_log=False,
+        )
+        stop_snapshots = start_snapshot_writer(self.metrics_dir, self.args.metrics_interval)
+        try:
+            uvicorn.Server(config).run(sockets=[self.sock])
+        finally:
+            stop_snapshots.set()
+            # 종료 직전 값까지 부모 archive에 반영
+            REGISTRY.write_snapshot(self.metrics_dir)
+
+    def reap(self, restart: bool) -> None:
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if started is None:
+                continue
+            try:
+                REGISTRY.archive_worker(self.metrics_dir, pid)
+            except OSError as e:
+                logger.warning(f"worker {pid} metrics archive failed: {e}")
+            logger.info(f"worker {pid} exited code={os.waitstatus_to_exitcode(status)} "
+                        f"uptime={time.monotonic() - started:.0f}s")
+            if restart and not self.stopping:
+                # 시작 직후 반복 실패 시 과도한 fork 방지
+                if time.monotonic() - started < 1:
+                    time.sleep(1)
+                self.spawn()
+
+    def shutdown(self) -> int:
+        logger.info(f"stopping {len(self.workers)} workers (graceful {self.args.graceful_timeout}s)")
+        for pid in list(self.workers):
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.args.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self.reap(restart=False)
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            logger.warning(f"worker {pid} did not stop in time, killing")
+            self._kill(pid, signal.SIGKILL)
+        self.reap(restart=False)
+        self.sock.close()
+        if self.owns_metrics_dir:
+            shutil.rmtree(self.metrics_dir, ignore_errors=True)
+        return 0
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    @staticmethod
+    def _kill(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # preload: fork 전에 앱과 의존 모듈을 import (DB 커넥션은 만들지 않음)
+    gc.disable()
+    from main import app
+    gc.freeze()
+    gc.enable()
+    return Arbiter(app, args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())